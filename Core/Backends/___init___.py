@@ -2,18 +2,26 @@
 Core.Backends - Lógica de negocio de la aplicación
 """
 
+from Core.Backends.bom_backend import BOMBackend
 from Core.Backends.compras_backend import ComprasBackend
+from Core.Backends.costos_backend import CostosBackend
+from Core.Backends.escenarios_backend import EscenariosBackend
 from Core.Backends.gastos_backend import GastosBackend
 from Core.Backends.inventario_backend import InventarioBackend
+from Core.Backends.movimientos_backend import MovimientosBackend
 from Core.Backends.produccion_backend import ProduccionBackend
 from Core.Backends.ventas_backend import VentasBackend
 from Core.Backends.contabilidad_backend import ContabilidadBackend
 from Core.Backends.settings_backend import SettingsBackend
 
 __all__ = [
+    'BOMBackend',
     'ComprasBackend',
+    'CostosBackend',
+    'EscenariosBackend',
     'GastosBackend',
     'InventarioBackend',
+    'MovimientosBackend',
     'ProduccionBackend',
     'VentasBackend',
     'ContabilidadBackend',
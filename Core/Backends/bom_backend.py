@@ -0,0 +1,285 @@
+"""
+Core.Backends.bom_backend - Matriz de materiales (BOM) y factibilidad de producción
+"""
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from Core.Common.database import get_connection, close_connection
+from Core.Common.event_bus import event_bus, RecipeChanged
+from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+from Core.Common.units import convert_to_base
+
+logger = setup_logger(__name__)
+
+# Tolerancia para que 2.9999999 lotes cuenten como 3
+EPSILON = 1e-9
+
+
+# ============================================
+# MATRIZ BOM
+# ============================================
+
+class MatrizBOM:
+    """
+    Requerimientos por lote en unidad base.
+
+    - `matriz[i, j]`: cantidad del insumo j que consume un lote del subproducto i
+    - `matriz_pf[k, i]`: lotes del subproducto i por unidad del producto final k
+      (1 / unidades_rinde)
+    - Cada columna recuerda su unidad base; el stock de un insumo guardado en
+      otra unidad (ej. ml contra g) cuenta como 0
+    """
+
+    def __init__(self, recetas: List[Dict], relaciones: List[Dict]):
+        self.subproductos: List[int] = sorted({int(r["subproducto_id"]) for r in recetas})
+        self.productos: List[str] = sorted({r["producto_ingrediente"] for r in recetas})
+        self.productos_finales: List[int] = sorted({int(r["producto_final_id"]) for r in relaciones})
+
+        self.fila = {sid: i for i, sid in enumerate(self.subproductos)}
+        self.columna = {nombre: j for j, nombre in enumerate(self.productos)}
+        self.fila_pf = {pid: k for k, pid in enumerate(self.productos_finales)}
+
+        self.matriz = np.zeros((len(self.subproductos), len(self.productos)))
+        self.unidades: List[Optional[str]] = [None] * len(self.productos)
+        # Recetas con una unidad desconocida o distinta a la de otras recetas
+        self.invalidos = np.zeros(len(self.subproductos), dtype=bool)
+
+        for r in recetas:
+            i = self.fila[int(r["subproducto_id"])]
+            j = self.columna[r["producto_ingrediente"]]
+            cantidad_base, unidad_base = convert_to_base(r["cantidad_usada"], r["unidad_usada"])
+
+            if cantidad_base is None or self.unidades[j] not in (None, unidad_base):
+                self.invalidos[i] = True
+                continue
+
+            self.unidades[j] = unidad_base
+            self.matriz[i, j] += cantidad_base
+
+        self.matriz_pf = np.zeros((len(self.productos_finales), len(self.subproductos)))
+        self.pf_invalidos = np.zeros(len(self.productos_finales), dtype=bool)
+
+        for r in relaciones:
+            k = self.fila_pf[int(r["producto_final_id"])]
+            sid = int(r["subproducto_id"])
+            rinde = int(r["unidades_rinde"] or 0)
+            if sid not in self.fila or rinde <= 0:
+                # Subproducto sin receta o rendimiento inválido
+                self.pf_invalidos[k] = True
+                continue
+            self.matriz_pf[k, self.fila[sid]] += 1.0 / rinde
+
+    def vector_stock(self, stock: Dict[str, Dict]) -> np.ndarray:
+        """Stock alineado con las columnas (0 si no existe o la unidad no coincide)"""
+        vector = np.zeros(len(self.productos))
+        for j, nombre in enumerate(self.productos):
+            fila = stock.get(nombre)
+            if fila and fila["unidad_base"] == self.unidades[j]:
+                vector[j] = float(fila["cantidad_stock"] or 0)
+        return vector
+
+    @staticmethod
+    def _maximos(requerimientos: np.ndarray, stock: np.ndarray) -> np.ndarray:
+        """min_j(stock_j / req_ij) por fila; filas sin requerimientos → 0"""
+        if requerimientos.size == 0:
+            return np.zeros(requerimientos.shape[0])
+
+        usa = requerimientos > 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cocientes = np.where(usa, stock / np.where(usa, requerimientos, 1.0), np.inf)
+        maximos = cocientes.min(axis=1)
+        maximos[~usa.any(axis=1)] = 0
+        return np.floor(np.maximum(maximos, 0) + EPSILON)
+
+    def lotes_maximos(self, stock: np.ndarray) -> np.ndarray:
+        """Lotes completos posibles por subproducto"""
+        lotes = self._maximos(self.matriz, stock)
+        lotes[self.invalidos] = 0
+        return lotes
+
+    def unidades_maximas(self, stock: np.ndarray) -> np.ndarray:
+        """
+        Unidades posibles por producto final.
+
+        Los subproductos de un mismo producto final comparten stock, por eso
+        se usa el requerimiento combinado matriz_pf @ matriz y no el mínimo
+        de los lotes individuales.
+        """
+        unidades = self._maximos(self.matriz_pf @ self.matriz, stock)
+        usa_invalidos = (self.matriz_pf[:, self.invalidos] > 0).any(axis=1)
+        unidades[self.pf_invalidos | usa_invalidos] = 0
+        return unidades
+
+
+# ============================================
+# BACKEND
+# ============================================
+
+@monitor_class
+class BOMBackend:
+    """Factibilidad de producción contra el stock actual"""
+
+    _matriz: Optional[MatrizBOM] = None
+    _lock = threading.RLock()
+
+    def __init__(self):
+        self.logger = setup_logger(__name__)
+
+    # ============================================
+    # MATRIZ
+    # ============================================
+
+    @classmethod
+    def matriz(cls) -> MatrizBOM:
+        """Matriz en memoria (se construye una vez hasta el próximo RecipeChanged)"""
+        with cls._lock:
+            if cls._matriz is None:
+                cls._matriz = cls._construir_matriz()
+            return cls._matriz
+
+    @classmethod
+    def invalidar(cls):
+        with cls._lock:
+            cls._matriz = None
+
+    @staticmethod
+    def _construir_matriz() -> MatrizBOM:
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """SELECT subproducto_id, producto_ingrediente, cantidad_usada, unidad_usada
+                       FROM subproducto_ingredientes"""
+                )
+                recetas = cursor.fetchall() or []
+                cursor.execute(
+                    """SELECT producto_final_id, subproducto_id, unidades_rinde
+                       FROM producto_final_subproductos"""
+                )
+                relaciones = cursor.fetchall() or []
+        finally:
+            close_connection(conn)
+
+        return MatrizBOM(recetas, relaciones)
+
+    @staticmethod
+    def _leer_stock() -> Dict[str, Dict]:
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT producto, cantidad_stock, unidad_base FROM inventario")
+                return {r["producto"]: r for r in cursor.fetchall() or []}
+        finally:
+            close_connection(conn)
+
+    # ============================================
+    # CONSULTAS
+    # ============================================
+
+    def capacidad(self) -> Dict[str, Dict[int, int]]:
+        """
+        Lotes por subproducto y unidades por producto final con el stock actual.
+
+        Returns:
+            {"subproductos": {id: lotes}, "productos_finales": {id: unidades}}
+        """
+        bom = self.matriz()
+        stock = bom.vector_stock(self._leer_stock())
+
+        lotes = bom.lotes_maximos(stock)
+        unidades = bom.unidades_maximas(stock)
+
+        return {
+            "subproductos": dict(zip(bom.subproductos, lotes.astype(int).tolist())),
+            "productos_finales": dict(zip(bom.productos_finales, unidades.astype(int).tolist())),
+        }
+
+    def lotes_maximos(self, subproducto_id: int) -> int:
+        """Lotes completos posibles de un subproducto"""
+        return self.capacidad()["subproductos"].get(subproducto_id, 0)
+
+    def faltantes(self, subproducto_id: int, lotes: int = 1) -> List[Dict]:
+        """
+        Insumos que no alcanzan para `lotes` lotes del subproducto.
+
+        Returns:
+            List[Dict] con producto, unidad, requerido, disponible y
+            faltante (unidad base). Lista vacía = producible.
+
+        Raises:
+            ValueError: Si la receta no existe o tiene unidades incompatibles
+        """
+        return self.faltantes_lote({subproducto_id: lotes})
+
+    def requerimientos(self, lotes: Dict[int, int]) -> Dict[str, float]:
+        """
+        Consumo total por insumo (unidad base) de varios subproductos.
+
+        Args:
+            lotes: {subproducto_id: lotes}
+
+        Raises:
+            ValueError: Si una receta no existe o tiene unidades incompatibles
+        """
+        bom = self.matriz()
+        total = self._vector_lotes(bom, lotes) @ bom.matriz
+        return {bom.productos[j]: float(total[j]) for j in np.nonzero(total > 0)[0]}
+
+    def faltantes_lote(self, lotes: Dict[int, int]) -> List[Dict]:
+        """
+        Insumos que no alcanzan para producir todos los lotes juntos
+        (los insumos compartidos se suman).
+
+        Args:
+            lotes: {subproducto_id: lotes}
+
+        Returns:
+            Igual que faltantes()
+        """
+        bom = self.matriz()
+        requerido = self._vector_lotes(bom, lotes) @ bom.matriz
+        stock = bom.vector_stock(self._leer_stock())
+        cortos = np.nonzero(requerido > stock + EPSILON)[0]
+
+        return [
+            {
+                "producto": bom.productos[j],
+                "unidad": bom.unidades[j],
+                "requerido": float(requerido[j]),
+                "disponible": float(stock[j]),
+                "faltante": float(requerido[j] - stock[j]),
+            }
+            for j in cortos
+        ]
+
+    @staticmethod
+    def _vector_lotes(bom: MatrizBOM, lotes: Dict[int, int]) -> np.ndarray:
+        vector = np.zeros(len(bom.subproductos))
+        for subproducto_id, n in lotes.items():
+            i = bom.fila.get(subproducto_id)
+            if i is None:
+                raise ValueError(f"❌ Subproducto {subproducto_id} sin ingredientes")
+            if bom.invalidos[i]:
+                raise ValueError(
+                    f"❌ La receta del subproducto {subproducto_id} usa unidades "
+                    f"desconocidas o incompatibles"
+                )
+            vector[i] += n
+        return vector
+
+
+def _invalidar_matriz(events: List[RecipeChanged]):
+    BOMBackend.invalidar()
+
+
+event_bus.subscribe(RecipeChanged, _invalidar_matriz, immediate=True)
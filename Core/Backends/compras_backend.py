@@ -1,23 +1,28 @@
 """
 Core.Backends.compras_backend - Gestión de compras
 """
+import time
 from decimal import Decimal
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
 from Core.Common.database import get_connection, close_connection
 from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+from Core.Common.units import convert_to_base
+from Core.Common.event_bus import event_bus, StockChanged, CostChanged
 from Core.Backends.inventario_backend import InventarioBackend
 from Core.Backends.gastos_backend import GastosBackend
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
+@monitor_class
 class ComprasBackend:
     """Backend para gestión de compras"""
     
     def __init__(self):
         self.inventory_manager = InventarioBackend()
         self.gastos_backend = GastosBackend()
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.logger.info("✓ ComprasBackend inicializado")
     
     def save_purchase(
@@ -71,9 +76,9 @@ class ComprasBackend:
                         (nombre, str(cantidad), unidad, precio_compra, precio_total, proveedor, "granel")
                     )
                     
-                    # Actualizar inventario
-                    self.inventory_manager.actualizar_stock_desde_compra(
-                        nombre, cantidad, unidad, precio_total
+                    # Actualizar inventario (misma transacción que la compra)
+                    self._sumar_a_inventario(
+                        cursor, nombre, cantidad, unidad, precio_total, cursor.lastrowid
                     )
                     
                     self.logger.info(
@@ -105,10 +110,9 @@ class ComprasBackend:
 
                     # ✅ Registrar gasto monetario vinculado
                     try:
-                        self.gastos_backend.add_gasto_dinero(
-                            descripcion=f"Compra: {nombre}",
-                            monto=precio_total,
-                            comentario=f"Compra de {cantidad}{unidad} a {proveedor}"
+                        self._registrar_gasto_compra(
+                            cursor, nombre, precio_total,
+                            f"Compra de {cantidad}{unidad} a {proveedor}"
                         )
                         self.logger.info(f"✓ Compra registrada como gasto: ${precio_total:.2f}")
                     except Exception as e:
@@ -132,9 +136,9 @@ class ComprasBackend:
                         (nombre, cantidad_total_peso, unidad_peso, precio_paq, precio_total, proveedor, "paquetes")
                     )
                     
-                    # Actualizar inventario
-                    self.inventory_manager.actualizar_stock_desde_compra(
-                        nombre, cantidad_total_peso, unidad_peso, precio_total
+                    # Actualizar inventario (misma transacción que la compra)
+                    self._sumar_a_inventario(
+                        cursor, nombre, cantidad_total_peso, unidad_peso, precio_total, cursor.lastrowid
                     )
                     
                     self.logger.info(
@@ -167,10 +171,9 @@ class ComprasBackend:
 
                     # ✅ Registrar gasto monetario vinculado
                     try:
-                        self.gastos_backend.add_gasto_dinero(
-                            descripcion=f"Compra: {nombre}",
-                            monto=precio_total,
-                            comentario=f"Compra de {cantidad_total_peso}{unidad_peso} a {proveedor}"
+                        self._registrar_gasto_compra(
+                            cursor, nombre, precio_total,
+                            f"Compra de {cantidad_total_peso}{unidad_peso} a {proveedor}"
                         )
                         self.logger.info(f"✓ Compra registrada como gasto: ${precio_total:.2f}")
                     except Exception as e:
@@ -180,10 +183,14 @@ class ComprasBackend:
                     raise ValueError("Tipo de compra inválido")
             
             conn.commit()
+            
+            # Notificar (invalida caché, recalcula recetas y refresca vistas)
+            event_bus.publish(StockChanged(nombre), CostChanged(nombre))
             return True
             
         except ValueError as e:
             logger.error(f"❌ Validación fallida: {e}")
+            conn.rollback()
             raise
         except Exception as e:
             logger.error(f"❌ Error guardando compra: {e}")
@@ -192,6 +199,35 @@ class ComprasBackend:
         finally:
             close_connection(conn)
     
+    def _sumar_a_inventario(
+        self,
+        cursor,
+        nombre: str,
+        cantidad: float,
+        unidad: str,
+        precio_total: float,
+        compra_id: int
+    ):
+        """Suma la compra al inventario y al ledger dentro de la transacción"""
+        cantidad_base, unidad_base = convert_to_base(float(cantidad), unidad)
+        if cantidad_base is None:
+            raise ValueError(f"Unidad '{unidad}' no reconocida")
+        
+        InventarioBackend._sumar_stock(
+            cursor, nombre, cantidad_base, unidad_base, float(precio_total),
+            documento=f"compra:{compra_id}"
+        )
+        self.logger.info(f"✓ Stock actualizado: {nombre} +{cantidad_base}{unidad_base}")
+    
+    @staticmethod
+    def _registrar_gasto_compra(cursor, nombre: str, precio_total: float, comentario: str):
+        """Gasto monetario vinculado a la compra (lo usa obtener_gastos_compras)"""
+        cursor.execute(
+            """INSERT INTO gastos_money (descripcion, monto, comentarios) 
+               VALUES (%s, %s, %s)""",
+            (f"Compra: {nombre}", round(float(precio_total), 2), comentario)
+        )
+    
     def get_purchase_history(self, limit: int = 100) -> List[Dict]:
         """
         Obtiene historial de compras.
@@ -273,6 +309,267 @@ class ComprasBackend:
         finally:
             close_connection(conn)
 
+    # ============================================
+    # IMPORTACIÓN POR LOTES
+    # ============================================
+    
+    def validar_lote(
+        self,
+        lineas: List[Dict[str, Any]],
+        proveedor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Valida y normaliza todas las líneas de un lote sin tocar la BD.
+        
+        Cada línea usa los mismos campos que save_purchase:
+        - granel: producto, cantidad, unidad, precio_compra (por unidad)
+        - paquetes: producto, cantidad_paq, precio_paq, peso_paq, unidad_peso
+        "tipo" es opcional (se deduce de los campos) y "proveedor" puede
+        venir en la línea o para todo el lote.
+        
+        Args:
+            lineas: Líneas del lote (p. ej. filas de CSV o JSON)
+            proveedor: Proveedor por defecto
+            
+        Returns:
+            tuple: (líneas normalizadas, errores "Línea N: ...")
+        """
+        validas = []
+        errores = []
+        unidad_por_producto: Dict[str, str] = {}
+        
+        for numero, linea in enumerate(lineas, start=1):
+            try:
+                item = self._normalizar_linea(linea, proveedor)
+            except (ValueError, TypeError, KeyError) as e:
+                errores.append(f"Línea {numero}: {e}")
+                continue
+            
+            # Un producto no puede mezclar peso, volumen y unidades
+            previa = unidad_por_producto.setdefault(item["producto"], item["unidad_base"])
+            if previa != item["unidad_base"]:
+                errores.append(
+                    f"Línea {numero}: '{item['producto']}' mezcla unidades "
+                    f"({previa} y {item['unidad_base']})"
+                )
+                continue
+            
+            validas.append(item)
+        
+        return validas, errores
+    
+    def importar_compras_lote(
+        self,
+        lineas: List[Dict[str, Any]],
+        proveedor: Optional[str] = None,
+        validar_fondos: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Importa un lote de compras (factura de proveedor) en una transacción.
+        
+        - Valida todas las líneas antes de escribir (todo o nada)
+        - Un solo chequeo de fondos por el total del lote
+        - Inventario y costo promedio actualizados una vez por producto
+        - Compras y gastos insertados con executemany
+        
+        Args:
+            lineas: Líneas del lote
+            proveedor: Proveedor por defecto
+            validar_fondos: False para omitir el chequeo de dinero físico
+            
+        Returns:
+            Dict con resumen (líneas, productos, total, alerta, tiempos)
+            
+        Raises:
+            ValueError: Si hay líneas inválidas o fondos insuficientes
+        """
+        start = time.perf_counter()
+        
+        items, errores = self.validar_lote(lineas, proveedor)
+        if errores:
+            detalle = "\n".join(errores[:20])
+            extra = f"\n... y {len(errores) - 20} más" if len(errores) > 20 else ""
+            raise ValueError(f"❌ Lote inválido ({len(errores)} errores):\n{detalle}{extra}")
+        if not items:
+            raise ValueError("❌ El lote no tiene líneas")
+        
+        total_lote = sum(item["precio_total"] for item in items)
+        
+        # Agrupar por producto: una actualización de inventario cada uno
+        por_producto: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            grupo = por_producto.setdefault(
+                item["producto"],
+                {"cantidad_base": 0.0, "precio_total": 0.0, "unidad_base": item["unidad_base"]}
+            )
+            grupo["cantidad_base"] += item["cantidad_base"]
+            grupo["precio_total"] += item["precio_total"]
+        
+        conn = get_connection()
+        if not conn:
+            raise Exception("No hay conexión a BD")
+        
+        alerta = ""
+        try:
+            with conn.cursor() as cursor:
+                if validar_fondos:
+                    alerta = self._verificar_fondos_lote(cursor, total_lote)
+                
+                cursor.executemany(
+                    """INSERT INTO compras 
+                       (producto, cantidad, unidad, precio_compra, precio_total, proveedor, tipo) 
+                       VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                    [
+                        (
+                            item["producto"], item["cantidad"], item["unidad"],
+                            item["precio_compra"], item["precio_total"],
+                            item["proveedor"], item["tipo"]
+                        )
+                        for item in items
+                    ]
+                )
+                
+                documento = f"lote:{time.strftime('%Y%m%d%H%M%S')}"
+                for producto, grupo in por_producto.items():
+                    InventarioBackend._sumar_stock(
+                        cursor, producto, grupo["cantidad_base"],
+                        grupo["unidad_base"], grupo["precio_total"],
+                        documento=documento
+                    )
+                
+                # Mismo formato que save_purchase (lo usa obtener_gastos_compras)
+                cursor.executemany(
+                    """INSERT INTO gastos_money (descripcion, monto, comentarios) 
+                       VALUES (%s, %s, %s)""",
+                    [
+                        (
+                            f"Compra: {item['producto']}",
+                            round(item["precio_total"], 2),
+                            f"Compra de {item['cantidad']}{item['unidad']} a {item['proveedor']}"
+                        )
+                        for item in items
+                    ]
+                )
+            
+            conn.commit()
+            
+        except Exception as e:
+            logger.error(f"❌ Error importando lote de compras: {e}")
+            conn.rollback()
+            raise
+        finally:
+            close_connection(conn)
+        
+        # Un solo recálculo de recetas para todo el lote
+        event_bus.publish(
+            *(StockChanged(producto) for producto in por_producto),
+            *(CostChanged(producto) for producto in por_producto)
+        )
+        
+        elapsed = time.perf_counter() - start
+        resumen = {
+            "lineas": len(items),
+            "productos": len(por_producto),
+            "total": round(total_lote, 2),
+            "alerta": alerta,
+            "segundos": elapsed,
+            "lineas_por_segundo": len(items) / elapsed if elapsed > 0 else 0.0,
+        }
+        
+        self.logger.info(
+            f"✓ Lote de compras importado: {resumen['lineas']} líneas, "
+            f"{resumen['productos']} productos, ${resumen['total']:.2f} "
+            f"en {elapsed * 1000:.1f}ms"
+        )
+        return resumen
+    
+    def _normalizar_linea(self, linea: Dict[str, Any], proveedor: Optional[str]) -> Dict[str, Any]:
+        """Convierte una línea del lote al formato de la tabla compras"""
+        nombre = str(linea.get("producto") or linea.get("nombre") or "").strip()
+        prov = str(linea.get("proveedor") or proveedor or "").strip()
+        
+        if not nombre or not prov:
+            raise ValueError("Nombre y proveedor son obligatorios")
+        
+        tipo = str(linea.get("tipo") or "").strip().lower()
+        if not tipo:
+            tipo = "paquetes" if linea.get("cantidad_paq") not in (None, "") else "granel"
+        
+        if tipo == "granel":
+            cantidad = float(linea["cantidad"])
+            precio_compra = float(linea["precio_compra"])
+            unidad = str(linea.get("unidad") or "").strip()
+            precio_total = precio_compra * cantidad
+        elif tipo == "paquetes":
+            cantidad_paq = int(linea["cantidad_paq"])
+            precio_compra = float(linea["precio_paq"])
+            unidad = str(linea.get("unidad_peso") or "").strip()
+            cantidad = cantidad_paq * float(linea["peso_paq"])
+            precio_total = cantidad_paq * precio_compra
+        else:
+            raise ValueError(f"Tipo de compra inválido: '{tipo}'")
+        
+        if not unidad:
+            raise ValueError("Unidad es obligatoria")
+        if cantidad <= 0:
+            raise ValueError("La cantidad debe ser > 0")
+        if precio_total < 0:
+            raise ValueError("El precio no puede ser negativo")
+        
+        cantidad_base, unidad_base = convert_to_base(cantidad, unidad)
+        if cantidad_base is None:
+            raise ValueError(f"Unidad '{unidad}' no reconocida")
+        
+        return {
+            "producto": nombre,
+            "proveedor": prov,
+            "tipo": tipo,
+            "cantidad": cantidad,
+            "unidad": unidad,
+            "precio_compra": precio_compra,
+            "precio_total": precio_total,
+            "cantidad_base": cantidad_base,
+            "unidad_base": unidad_base,
+        }
+    
+    def _verificar_fondos_lote(self, cursor, total_lote: float) -> str:
+        """
+        Chequeo de fondos único para todo el lote (una consulta).
+        
+        Returns:
+            str: Alerta ("WARNING" o "")
+            
+        Raises:
+            ValueError: Si no hay dinero físico suficiente
+        """
+        cursor.execute("""
+            SELECT 
+                (SELECT COALESCE(SUM(monto), 0) FROM efectivo_movimientos 
+                 WHERE tipo = 'Capital Extra') AS capital,
+                (SELECT COALESCE(SUM(monto), 0) FROM gastos_money 
+                 WHERE descripcion LIKE 'Compra:%') AS gastos_compras
+        """)
+        resultado = cursor.fetchone() or {}
+        dinero_fisico = float(resultado.get("capital") or 0) - float(resultado.get("gastos_compras") or 0)
+        
+        puede_comprar, alerta = self._evaluar_fondos(dinero_fisico, total_lote)
+        
+        if not puede_comprar:
+            if alerta == "BLOQUEADO":
+                raise ValueError(
+                    "❌ NO SE PUEDE COMPRAR: Dinero físico en $0.00\n"
+                    "Ingresa más capital para continuar comprando."
+                )
+            raise ValueError(
+                f"❌ NO SE PUEDE COMPRAR: Dinero insuficiente\n"
+                f"Se necesita ${total_lote:.2f} pero solo hay ${dinero_fisico:.2f}"
+            )
+        
+        if alerta == "WARNING":
+            self.logger.warning("⚠️ ALERTA: Dinero físico bajo para este lote")
+        
+        return alerta
+
     def puede_realizar_compra(self, precio_total: float) -> tuple:
         """
         Valida si se puede realizar una compra.
@@ -296,34 +593,45 @@ class ComprasBackend:
             # Calcular dinero físico
             dinero_fisico = capital_total - gastos_compras
             
-            # ✅ VALIDACIÓN: Si dinero_fisico <= 0, BLOQUEAR compra
-            if dinero_fisico <= 0:
-                return (
-                    False,  # ❌ NO se puede comprar
-                    "BLOQUEADO"  # Dinero en 0, compras bloqueadas
-                )
-            
-            # Si hay dinero pero poco
-            elif dinero_fisico < precio_total:
-                return (
-                    False,  # ❌ NO hay suficiente dinero
-                    "INSUFICIENTE"  # No alcanza el dinero
-                )
-            
-            # Si hay dinero pero está bajo (menos de 1.5x la compra)
-            elif dinero_fisico < precio_total * 1.5:
-                return (
-                    True,  # ✅ Se puede comprar
-                    "WARNING"  # Pero con alerta
-                )
-            
-            # Todo bien
-            else:
-                return (
-                    True,  # ✅ Se puede comprar
-                    ""  # Sin alertas
-                )
+            return self._evaluar_fondos(dinero_fisico, precio_total)
         
         except Exception as e:
             self.logger.error(f"Error validando compra: {e}")
-            return (True, "")
\ No newline at end of file
+            return (True, "")
+    
+    @staticmethod
+    def _evaluar_fondos(dinero_fisico: float, precio_total: float) -> tuple:
+        """
+        Clasifica una compra según el dinero físico disponible.
+        
+        Returns:
+            tuple: (puede_comprar, alerta) con alerta en
+                   "BLOQUEADO", "INSUFICIENTE", "WARNING" o ""
+        """
+        # ✅ VALIDACIÓN: Si dinero_fisico <= 0, BLOQUEAR compra
+        if dinero_fisico <= 0:
+            return (
+                False,  # ❌ NO se puede comprar
+                "BLOQUEADO"  # Dinero en 0, compras bloqueadas
+            )
+        
+        # Si hay dinero pero poco
+        elif dinero_fisico < precio_total:
+            return (
+                False,  # ❌ NO hay suficiente dinero
+                "INSUFICIENTE"  # No alcanza el dinero
+            )
+        
+        # Si hay dinero pero está bajo (menos de 1.5x la compra)
+        elif dinero_fisico < precio_total * 1.5:
+            return (
+                True,  # ✅ Se puede comprar
+                "WARNING"  # Pero con alerta
+            )
+        
+        # Todo bien
+        else:
+            return (
+                True,  # ✅ Se puede comprar
+                ""  # Sin alertas
+            )
\ No newline at end of file
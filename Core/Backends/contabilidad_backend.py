@@ -3,21 +3,23 @@ VERSIÓN CORREGIDA: Obtiene datos DIRECTAMENTE de las tablas existentes
 Sin cálculos complejos, solo lectura de lo que YA ESTÁ GUARDADO
 """
 
-from decimal import Decimal
 from typing import List, Dict
 from datetime import datetime
 
 from Core.Common.database import get_connection, close_connection
 from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+from Core.Common.money import Money, Cost
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
+@monitor_class
 class ContabilidadBackend:
     """Backend para gestión centralizada de contabilidad"""
     
     def __init__(self):
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.logger.info("✅ ContabilidadBackend inicializado")
     
     def registrar_venta_contabilidad(self, venta_id: int, producto_final_id: int,
@@ -58,36 +60,36 @@ class ContabilidadBackend:
                     raise ValueError(f"❌ Producto final {producto_final_id} no encontrado")
                 
                 # ✅ Estos valores YA existen en productos_finales
-                precio_costo_unitario = Decimal(str(resultado.get('costo_unitario_total', 0) or 0))
-                precio_venta_unitario = Decimal(str(resultado.get('precio_venta', 0) or 0))
+                precio_costo_unitario = Cost.of(resultado.get('costo_unitario_total'))
+                precio_venta_unitario = Money.of(resultado.get('precio_venta'))
                 
                 # ============================================
-                # PASO 2: Calculos simples
+                # PASO 2: Calculos simples (enteros: exactos)
                 # ============================================
-                cantidad_dec = Decimal(cantidad)
+                cantidad = int(cantidad)
                 
                 # Basados en costo y venta unitarios YA existentes
-                costo_total = cantidad_dec * precio_costo_unitario
-                ingreso_total = cantidad_dec * precio_venta_unitario
-                ganancia_neta = ingreso_total - costo_total
+                costo_total = precio_costo_unitario * cantidad
+                ingreso_total = precio_venta_unitario * cantidad
+                ganancia_neta = ingreso_total.to_cost() - costo_total
                 
                 # Margen
-                if ingreso_total > 0:
-                    margen = (ganancia_neta / ingreso_total * 100)
-                else:
-                    margen = Decimal(0)
+                margen = round(ganancia_neta.ratio(ingreso_total.to_cost()) * 100, 2)
                 
                 self.logger.info(
-                    f"✅ Venta registrada en contabilidad:\n"
-                    f"   Producto ID: {producto_final_id}\n"
-                    f"   Cantidad: {cantidad} unidades\n"
-                    f"   Costo/U: ${float(precio_costo_unitario):.2f}\n"
-                    f"   Venta/U: ${float(precio_venta_unitario):.2f}\n"
-                    f"   ---\n"
-                    f"   Costo Total: ${float(costo_total):.2f}\n"
-                    f"   Ingreso Total: ${float(ingreso_total):.2f}\n"
-                    f"   Ganancia Neta: ${float(ganancia_neta):.2f}\n"
-                    f"   Margen: {float(margen):.2f}%"
+                    "✅ Venta registrada en contabilidad:\n"
+                    "   Producto ID: %s\n"
+                    "   Cantidad: %s unidades\n"
+                    "   Costo/U: $%.2f\n"
+                    "   Venta/U: $%.2f\n"
+                    "   ---\n"
+                    "   Costo Total: $%.2f\n"
+                    "   Ingreso Total: $%.2f\n"
+                    "   Ganancia Neta: $%.2f\n"
+                    "   Margen: %.2f%%",
+                    producto_final_id, cantidad, precio_costo_unitario,
+                    precio_venta_unitario, costo_total, ingreso_total,
+                    ganancia_neta, margen
                 )
                 
                 # ============================================
@@ -101,10 +103,10 @@ class ContabilidadBackend:
                         margen_ganancia, tipo_producto
                     ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                 """, (
-                    venta_id, producto_final_id, int(cantidad),
-                    float(precio_costo_unitario), float(precio_venta_unitario),
-                    float(costo_total), float(ingreso_total),
-                    float(ganancia_neta), float(margen),
+                    venta_id, producto_final_id, cantidad,
+                    precio_costo_unitario.to_decimal(), precio_venta_unitario.to_decimal(),
+                    costo_total.to_decimal(), ingreso_total.to_decimal(),
+                    ganancia_neta.to_decimal(), margen,
                     tipo_producto
                 ))
                 
@@ -112,13 +114,13 @@ class ContabilidadBackend:
                 
                 return {
                     'venta_id': venta_id,
-                    'cantidad': int(cantidad),
+                    'cantidad': cantidad,
                     'costo_unitario': float(precio_costo_unitario),
                     'precio_venta': float(precio_venta_unitario),
                     'costo_total': float(costo_total),
                     'ingreso_total': float(ingreso_total),
                     'ganancia_neta': float(ganancia_neta),
-                    'margen': float(margen)
+                    'margen': margen
                 }
         
         except Exception as e:
@@ -0,0 +1,360 @@
+"""
+Core.Backends.costos_backend - Propagación incremental de costos de recetas
+(ingredientes → subproductos → productos finales)
+"""
+
+import threading
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from Core.Common.database import get_connection, close_connection
+from Core.Common.event_bus import (
+    event_bus, CostChanged, RecipeChanged, ReferenceDataRefreshed
+)
+from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+from Core.Common.money import Money, Cost
+from Core.Common.units import convert_to_base_exact
+from Core.Common.warm_cache import warm_cache
+
+logger = setup_logger(__name__)
+
+# Mismas claves que ProduccionBackend (sin importarlo: evita el ciclo
+# produccion_backend → inventario_backend → costos_backend)
+CACHE_KEY_SUBPRODUCTOS = "subproductos"
+CACHE_KEY_PRODUCTOS_FINALES = "productos_finales_info"
+
+
+# ============================================
+# GRAFO DE DEPENDENCIAS
+# ============================================
+
+class GrafoCostos:
+    """
+    Grafo ingrediente → subproducto → producto final.
+
+    Se construye desde subproducto_ingredientes y producto_final_subproductos
+    y responde qué nodos aguas abajo dependen de un conjunto de ingredientes.
+    """
+
+    def __init__(self, recetas: List[Dict], relaciones: List[Dict]):
+        # subproducto -> [(ingrediente, cantidad, unidad)]
+        self.ingredientes_de: Dict[int, List[Tuple[str, Any, str]]] = {}
+        # ingrediente -> {subproducto}
+        self.subproductos_de: Dict[str, Set[int]] = {}
+        # producto final -> [(subproducto, unidades_rinde)]
+        self.componentes_de: Dict[int, List[Tuple[int, int]]] = {}
+        # subproducto -> {producto final}
+        self.productos_de: Dict[int, Set[int]] = {}
+
+        for r in recetas:
+            sid = int(r["subproducto_id"])
+            producto = r["producto_ingrediente"]
+            self.ingredientes_de.setdefault(sid, []).append(
+                (producto, r["cantidad_usada"], r["unidad_usada"])
+            )
+            self.subproductos_de.setdefault(producto, set()).add(sid)
+
+        for r in relaciones:
+            pid = int(r["producto_final_id"])
+            sid = int(r["subproducto_id"])
+            self.componentes_de.setdefault(pid, []).append((sid, int(r["unidades_rinde"])))
+            self.productos_de.setdefault(sid, set()).add(pid)
+
+    def afectados(self, productos: Iterable[str]) -> Tuple[Set[int], Set[int]]:
+        """
+        Nodos aguas abajo de los ingredientes dados.
+
+        Returns:
+            (ids de subproductos, ids de productos finales)
+        """
+        subproductos: Set[int] = set()
+        for producto in productos:
+            subproductos |= self.subproductos_de.get(producto, set())
+
+        productos_finales: Set[int] = set()
+        for sid in subproductos:
+            productos_finales |= self.productos_de.get(sid, set())
+
+        return subproductos, productos_finales
+
+
+# ============================================
+# BACKEND
+# ============================================
+
+@monitor_class
+class CostosBackend:
+    """Recalcula costos de recetas sólo donde cambió un ingrediente"""
+
+    _grafo: Optional[GrafoCostos] = None
+    _lock = threading.RLock()
+
+    def __init__(self):
+        self.logger = setup_logger(__name__)
+
+    # ============================================
+    # GRAFO
+    # ============================================
+
+    @classmethod
+    def grafo(cls) -> GrafoCostos:
+        """Grafo en memoria (se construye una vez hasta el próximo RecipeChanged)"""
+        with cls._lock:
+            if cls._grafo is None:
+                cls._grafo = cls._construir_grafo()
+            return cls._grafo
+
+    @classmethod
+    def invalidar_grafo(cls):
+        with cls._lock:
+            cls._grafo = None
+
+    @staticmethod
+    def _construir_grafo() -> GrafoCostos:
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """SELECT subproducto_id, producto_ingrediente, cantidad_usada, unidad_usada
+                       FROM subproducto_ingredientes"""
+                )
+                recetas = cursor.fetchall() or []
+                cursor.execute(
+                    """SELECT producto_final_id, subproducto_id, unidades_rinde
+                       FROM producto_final_subproductos"""
+                )
+                relaciones = cursor.fetchall() or []
+        finally:
+            close_connection(conn)
+
+        return GrafoCostos(recetas, relaciones)
+
+    # ============================================
+    # PROPAGACIÓN
+    # ============================================
+
+    def propagar(self, productos: Iterable[str]) -> Dict[str, int]:
+        """
+        Recalcula los subproductos y productos finales que dependen de
+        los ingredientes dados, en una sola transacción.
+
+        Args:
+            productos: Ingredientes (inventario.producto) cuyo costo cambió
+
+        Returns:
+            Dict con subproductos y productos_finales actualizados
+        """
+        grafo = self.grafo()
+        subproductos, productos_finales = grafo.afectados(productos)
+        if not subproductos:
+            return {"subproductos": 0, "productos_finales": 0}
+
+        # Subproductos que hay que leer: afectados + hermanos en productos finales
+        componentes = {
+            sid for pid in productos_finales for sid, _ in grafo.componentes_de.get(pid, [])
+        }
+        ingredientes = {
+            producto for sid in subproductos for producto, _, _ in grafo.ingredientes_de.get(sid, [])
+        }
+
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            with conn.cursor() as cursor:
+                costos = self._leer_por_clave(
+                    cursor,
+                    "SELECT producto AS clave, costo_promedio_ponderado AS valor "
+                    "FROM inventario WHERE producto IN ({})",
+                    ingredientes
+                )
+                costos_sub = self._leer_por_clave(
+                    cursor,
+                    "SELECT id AS clave, costo_total_subproducto AS valor "
+                    "FROM subproductos WHERE id IN ({})",
+                    subproductos | componentes
+                )
+                costos_pf = self._leer_por_clave(
+                    cursor,
+                    "SELECT id AS clave, costo_unitario_total AS valor "
+                    "FROM productos_finales WHERE id IN ({})",
+                    productos_finales
+                )
+
+                # ---------- Subproductos ----------
+                cambios_sub = []
+                for sid in subproductos:
+                    if sid not in costos_sub:
+                        continue
+                    nuevo = self._costo_subproducto(grafo.ingredientes_de.get(sid, []), costos)
+                    if nuevo is None:
+                        continue
+                    # Los productos finales usan el valor tal como queda guardado
+                    nuevo = self._redondear(nuevo)
+                    if nuevo != self._redondear(costos_sub[sid]):
+                        cambios_sub.append((float(nuevo), sid))
+                    costos_sub[sid] = nuevo
+
+                # ---------- Productos finales ----------
+                cambios_pf = []
+                for pid in productos_finales:
+                    if pid not in costos_pf:
+                        continue
+                    # Misma aritmética que crear_producto_final
+                    nuevo = Cost.sum(
+                        Money.of(costos_sub[sid]).to_cost() / rinde
+                        for sid, rinde in grafo.componentes_de.get(pid, [])
+                        if sid in costos_sub and rinde
+                    ).to_decimal()
+                    if self._redondear(nuevo) != self._redondear(costos_pf[pid]):
+                        cambios_pf.append((nuevo, pid))
+
+                if cambios_sub:
+                    cursor.executemany(
+                        "UPDATE subproductos SET costo_total_subproducto = %s WHERE id = %s",
+                        cambios_sub
+                    )
+                if cambios_pf:
+                    cursor.executemany(
+                        "UPDATE productos_finales SET costo_unitario_total = %s WHERE id = %s",
+                        cambios_pf
+                    )
+
+            conn.commit()
+
+        except Exception as e:
+            logger.error(f"❌ Error propagando costos: {e}")
+            conn.rollback()
+            raise
+        finally:
+            close_connection(conn)
+
+        refrescados = []
+        if cambios_sub:
+            refrescados.append(CACHE_KEY_SUBPRODUCTOS)
+        if cambios_pf:
+            refrescados.append(CACHE_KEY_PRODUCTOS_FINALES)
+
+        if refrescados:
+            warm_cache.invalidate(*refrescados)
+            event_bus.publish(*(ReferenceDataRefreshed(clave) for clave in refrescados))
+            self.logger.info(
+                f"🔁 Costos propagados: {len(cambios_sub)} subproductos, "
+                f"{len(cambios_pf)} productos finales"
+            )
+
+        return {"subproductos": len(cambios_sub), "productos_finales": len(cambios_pf)}
+
+    def recalcular_todo(self) -> Dict[str, int]:
+        """Recalcula todas las recetas (p. ej. tras una reconstrucción de inventario)"""
+        return self.propagar(list(self.grafo().subproductos_de))
+
+    # ============================================
+    # AUXILIARES
+    # ============================================
+
+    @staticmethod
+    def _costo_subproducto(
+        ingredientes: List[Tuple[str, Any, str]],
+        costos: Dict[str, Decimal]
+    ) -> Optional[Decimal]:
+        """Costo total de la receta (misma fórmula que crear_subproducto)"""
+        total = Decimal(0)
+        for producto, cantidad, unidad in ingredientes:
+            if producto not in costos:
+                # Ingrediente fuera de inventario: no se puede valorar
+                return None
+            cantidad_base, _ = convert_to_base_exact(cantidad, unidad)
+            if cantidad_base is None:
+                return None
+            total += cantidad_base * Decimal(str(costos[producto]))
+        return total
+
+    @staticmethod
+    def _leer_por_clave(cursor, sql: str, claves) -> Dict:
+        claves = list(claves)
+        if not claves:
+            return {}
+        cursor.execute(sql.format(", ".join(["%s"] * len(claves))), tuple(claves))
+        return {row["clave"]: row["valor"] or 0 for row in cursor.fetchall() or []}
+
+    @staticmethod
+    def _redondear(valor) -> Decimal:
+        # Las columnas de costo son DECIMAL(10,2)
+        return Decimal(str(valor or 0)).quantize(Decimal("0.01"))
+
+
+# ============================================
+# SUSCRIPCIONES
+# ============================================
+
+class _PropagadorCostos:
+    """
+    Propaga costos en un hilo de fondo, nunca en el que publica (el de Tk).
+
+    Se suscribe inmediato sólo para anotar los productos: las publicaciones
+    que llegan mientras el hilo trabaja se juntan en un solo recálculo. Si
+    propagar falla, los productos quedan pendientes y se reintentan con el
+    próximo CostChanged (o con recalcular_todo).
+    """
+
+    def __init__(self):
+        self._pendientes: Set[str] = set()
+        self._activo = False
+        self._lock = threading.Lock()
+        self._libre = threading.Event()
+        self._libre.set()
+
+    def __call__(self, events: List[CostChanged]):
+        with self._lock:
+            self._pendientes.update(event.producto for event in events)
+            if self._activo:
+                return
+            self._activo = True
+            self._libre.clear()
+
+        threading.Thread(target=self._trabajar, name="costos-propagacion", daemon=True).start()
+
+    def esperar(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera a que no haya propagaciones en curso (scripts antes de salir).
+
+        Returns:
+            bool: False si venció el timeout
+        """
+        return self._libre.wait(timeout)
+
+    def _trabajar(self):
+        while True:
+            with self._lock:
+                productos, self._pendientes = self._pendientes, set()
+                if not productos:
+                    self._activo = False
+                    self._libre.set()
+                    return
+
+            try:
+                CostosBackend().propagar(productos)
+            except Exception as e:
+                logger.error(f"❌ No se pudieron propagar costos ({len(productos)} productos): {e}")
+                with self._lock:
+                    self._pendientes.update(productos)
+                    self._activo = False
+                    self._libre.set()
+                return
+
+
+def _invalidar_grafo(events: List[RecipeChanged]):
+    CostosBackend.invalidar_grafo()
+
+
+# Instancia global (los scripts llaman propagador_costos.esperar() al terminar)
+propagador_costos = _PropagadorCostos()
+
+event_bus.subscribe(CostChanged, propagador_costos, immediate=True)
+event_bus.subscribe(RecipeChanged, _invalidar_grafo, immediate=True)
@@ -0,0 +1,183 @@
+"""
+Core.Backends.escenarios_backend - Simulador de costos "qué pasa si"
+"""
+
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from Core.Common.database import get_connection, close_connection
+from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+from Core.Backends.bom_backend import BOMBackend, MatrizBOM
+
+logger = setup_logger(__name__)
+
+
+# ============================================
+# MODELO DE COSTOS
+# ============================================
+
+class ModeloCostos:
+    """
+    Costeo del catálogo completo en memoria.
+
+    costo_subproducto = matriz · precios_insumos
+    costo_producto_final = matriz_pf · costo_subproducto
+
+    Con E escenarios los precios son una matriz E × insumos y cada nivel
+    es un único producto de matrices.
+    """
+
+    def __init__(self, bom: MatrizBOM, costos: Dict[str, float], productos_finales: List[Dict]):
+        self.bom = bom
+        # Insumo fuera de inventario o sin costo: no se valora como 0 (igual que
+        # CostosBackend). El precio queda en 0 sólo para el producto de matrices
+        # (NaN contagiaría a todos) y la máscara descarta lo que lo usa
+        self.sin_costo = np.array([costos.get(nombre) is None for nombre in bom.productos], dtype=bool)
+        self.precios = np.array([
+            0.0 if falta else float(costos[nombre])
+            for nombre, falta in zip(bom.productos, self.sin_costo)
+        ])
+        # uso[k, j] > 0: el producto final k usa el insumo j
+        self.uso = bom.matriz_pf @ bom.matriz
+        self.pf_sin_costo = (self.uso[:, self.sin_costo] > 0).any(axis=1)
+
+        info = {int(p["id"]): p for p in productos_finales}
+        # Sólo productos finales con receta completa y valorable
+        usa_invalidos = (bom.matriz_pf[:, bom.invalidos] > 0).any(axis=1)
+        self.validos = ~(bom.pf_invalidos | usa_invalidos | self.pf_sin_costo)
+        self.nombres = [info.get(pid, {}).get("nombre", f"#{pid}") for pid in bom.productos_finales]
+        self.precios_venta = np.array([
+            float(info.get(pid, {}).get("precio_venta") or 0) for pid in bom.productos_finales
+        ])
+
+    def variaciones(self, escenarios: List[Dict[str, float]]) -> np.ndarray:
+        """
+        Matriz E × insumos de variaciones relativas.
+
+        Args:
+            escenarios: [{insumo: porcentaje}], ej. [{"Harina": 15, "Azúcar": -5}]
+
+        Raises:
+            ValueError: Si un insumo no participa de ninguna receta
+        """
+        matriz = np.zeros((len(escenarios), len(self.bom.productos)))
+        for e, escenario in enumerate(escenarios):
+            for insumo, porcentaje in escenario.items():
+                j = self.bom.columna.get(insumo)
+                if j is None:
+                    raise ValueError(f"❌ '{insumo}' no se usa en ninguna receta")
+                matriz[e, j] = float(porcentaje) / 100.0
+        return matriz
+
+    def evaluar(self, variaciones: np.ndarray) -> np.ndarray:
+        """
+        Costo unitario de cada producto final por escenario.
+
+        Args:
+            variaciones: Matriz E × insumos (0.15 = +15%)
+
+        Returns:
+            Matriz E × productos finales (NaN donde la receta no es valorable)
+        """
+        precios = self.precios * (1.0 + variaciones)
+        costos_sub = precios @ self.bom.matriz.T
+        costos_pf = costos_sub @ self.bom.matriz_pf.T
+        costos_pf[:, ~self.validos] = np.nan
+        return costos_pf
+
+    def margenes(self, costos_pf: np.ndarray) -> np.ndarray:
+        """% de ganancia sobre costo (NaN sin precio de venta o costo 0)"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            margen = (self.precios_venta - costos_pf) / costos_pf * 100
+        margen[:, self.precios_venta <= 0] = np.nan
+        return np.where(np.isfinite(margen), margen, np.nan)
+
+
+# ============================================
+# BACKEND
+# ============================================
+
+@monitor_class
+class EscenariosBackend:
+    """API de simulación de escenarios de precios de insumos"""
+
+    def __init__(self):
+        self.bom = BOMBackend()
+        self.logger = setup_logger(__name__)
+
+    def modelo(self) -> ModeloCostos:
+        """Modelo con los costos promedio y precios de venta vigentes"""
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT producto, costo_promedio_ponderado FROM inventario")
+                costos = {
+                    r["producto"]: r["costo_promedio_ponderado"] for r in cursor.fetchall() or []
+                }
+                cursor.execute("SELECT id, nombre, precio_venta FROM productos_finales")
+                productos_finales = cursor.fetchall() or []
+        finally:
+            close_connection(conn)
+
+        return ModeloCostos(self.bom.matriz(), costos, productos_finales)
+
+    def insumos(self) -> List[str]:
+        """Insumos que participan en alguna receta"""
+        return list(self.bom.matriz().productos)
+
+    def simular(self, escenarios: List[Dict[str, float]]) -> Dict:
+        """
+        Evalúa escenarios sobre todo el catálogo.
+
+        Args:
+            escenarios: [{insumo: porcentaje}] (el escenario base se agrega solo)
+
+        Returns:
+            Dict con:
+            - productos: [{id, nombre, precio_venta, costo_base, margen_base,
+              costos: [...], margenes: [...], sin_costo: [insumos]}] (una
+              entrada por escenario; sin_costo no vacío = no calculable)
+            - escenarios: cantidad evaluada
+            - segundos: tiempo de cálculo
+        """
+        modelo = self.modelo()
+
+        start = time.perf_counter()
+        variaciones = np.vstack([
+            np.zeros((1, len(modelo.bom.productos))),
+            modelo.variaciones(escenarios)
+        ])
+        costos = modelo.evaluar(variaciones)
+        margenes = modelo.margenes(costos)
+        elapsed = time.perf_counter() - start
+
+        def _valor(x):
+            return None if np.isnan(x) else round(float(x), 4)
+
+        productos = []
+        for k, pid in enumerate(modelo.bom.productos_finales):
+            productos.append({
+                "id": pid,
+                "nombre": modelo.nombres[k],
+                "precio_venta": float(modelo.precios_venta[k]),
+                "costo_base": _valor(costos[0, k]),
+                "margen_base": _valor(margenes[0, k]),
+                "costos": [_valor(c) for c in costos[1:, k]],
+                "margenes": [_valor(m) for m in margenes[1:, k]],
+                "sin_costo": [
+                    modelo.bom.productos[j]
+                    for j in np.flatnonzero(modelo.sin_costo & (modelo.uso[k] > 0))
+                ],
+            })
+
+        self.logger.info(
+            f"🧮 {len(escenarios)} escenarios × {len(productos)} productos en {elapsed * 1000:.1f}ms"
+        )
+
+        return {"productos": productos, "escenarios": len(escenarios), "segundos": elapsed}
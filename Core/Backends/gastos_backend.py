@@ -5,17 +5,20 @@ Core.Backends.gastos_backend - Gestión de gastos
 from typing import List, Dict, Optional
 from Core.Common.database import get_connection, close_connection
 from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
 from Core.Backends.inventario_backend import InventarioBackend
+from Core.Backends.movimientos_backend import TIPO_GASTO
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
+@monitor_class
 class GastosBackend:
     """Backend para gestión de gastos"""
     
     def __init__(self):
         self.inventory = InventarioBackend()
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.logger.info("✓ GastosBackend inicializado")
     
     def add_gasto_dinero(
@@ -83,7 +86,7 @@ class GastosBackend:
         """
         # Consumir stock primero
         try:
-            self.inventory.consumir_stock(producto, cantidad, unidad)
+            self.inventory.consumir_stock(producto, cantidad, unidad, tipo=TIPO_GASTO)
         except Exception as e:
             logger.error(f"No se pudo consumir stock: {e}")
             raise
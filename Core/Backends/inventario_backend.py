@@ -3,15 +3,24 @@ Core.Backends.inventario_backend - Gestión de inventario
 """
 
 from typing import List, Dict, Optional, Tuple
-from Core.Common.database import get_connection, close_connection
+from Core.Common.database import get_connection, close_connection, INTEGRITY_ERRORS
 from Core.Common.logger import setup_logger
-from Core.Common.units import convert_to_base, CONVERSIONS
+from Core.Common.optimization_utils import monitor_class
+from Core.Common.units import convert_to_base, lookup_unit
 from Core.Common.data_cache import app_cache
+from Core.Common.event_bus import event_bus, StockChanged, CostChanged
+from Core.Common.warm_cache import warm_cache
+from Core.Backends.movimientos_backend import (
+    MovimientosBackend, TIPO_COMPRA, TIPO_CONSUMO
+)
+# Registra la propagación de costos a recetas (suscriptor de CostChanged)
+import Core.Backends.costos_backend  # noqa: F401
 from decimal import Decimal
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
+@monitor_class
 class InventarioBackend:
     """Backend de inventario con caché y optimizaciones"""
     
@@ -19,7 +28,7 @@ class InventarioBackend:
     CACHE_KEY_PRODUCT = "producto_{name}"
     
     def __init__(self):
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.logger.info("✓ InventarioBackend inicializado")
     
     def _get_unidad_base(self, unidad: str) -> Optional[str]:
@@ -32,26 +41,17 @@ class InventarioBackend:
         Returns:
             str: Unidad base o None
         """
-        if not unidad:
-            return None
-        
-        unidad = unidad.lower()
-        for category, units in CONVERSIONS.items():
-            if unidad in units:
-                if category == "weight":
-                    return "g"
-                if category == "volume":
-                    return "ml"
-                if category == "count":
-                    return "unit"
-        return None
+        info = lookup_unit(unidad)
+        return info.base if info else None
     
     def actualizar_stock_desde_compra(
         self,
         producto: str,
         cantidad: float,
         unidad: str,
-        precio_total: float
+        precio_total: float,
+        tipo: str = TIPO_COMPRA,
+        documento: Optional[str] = None
     ) -> bool:
         """
         Añade stock al inventario y recalcula costo promedio ponderado.
@@ -61,10 +61,20 @@ class InventarioBackend:
             cantidad: Cantidad comprada
             unidad: Unidad de medida
             precio_total: Precio total pagado
+            tipo: Tipo de movimiento para el ledger
+            documento: Documento origen para el ledger
             
         Returns:
             bool: True si fue exitoso
         """
+        unidad_base = self._get_unidad_base(unidad)
+        if not unidad_base:
+            raise ValueError(f"Unidad '{unidad}' no reconocida")
+        
+        cantidad_base, _ = convert_to_base(float(cantidad), unidad)
+        if cantidad_base is None:
+            raise ValueError("No se pudo convertir cantidad")
+        
         conn = get_connection()
         if not conn:
             logger.error("No hay conexión a BD")
@@ -72,67 +82,23 @@ class InventarioBackend:
         
         try:
             with conn.cursor() as cursor:
-                unidad_base = self._get_unidad_base(unidad)
-                if not unidad_base:
-                    raise ValueError(f"Unidad '{unidad}' no reconocida")
-                
-                cantidad_base, _ = convert_to_base(float(cantidad), unidad)
-                if cantidad_base is None:
-                    raise ValueError("No se pudo convertir cantidad")
-                
-                # Buscar producto existente
-                cursor.execute(
-                    "SELECT cantidad_stock, costo_promedio_ponderado FROM inventario WHERE producto = %s",
-                    (producto,)
+                nuevo = self._sumar_stock(
+                    cursor, producto, cantidad_base, unidad_base, float(precio_total),
+                    tipo=tipo, documento=documento
                 )
-                result = cursor.fetchone()
-                
-                if result:
-                    # Actualizar stock existente
-                    stock_actual = float(result.get("cantidad_stock", 0) or 0)
-                    costo_actual = float(result.get("costo_promedio_ponderado", 0) or 0)
-                    nuevo_stock = stock_actual + cantidad_base
-                    
-                    if nuevo_stock > 0:
-                        nuevo_costo_promedio = (
-                            (stock_actual * costo_actual) + float(precio_total)
-                        ) / nuevo_stock
-                    else:
-                        nuevo_costo_promedio = costo_actual
-                    
-                    cursor.execute(
-                        """UPDATE inventario 
-                           SET cantidad_stock = %s, costo_promedio_ponderado = %s, unidad_base = %s 
-                           WHERE producto = %s""",
-                        (nuevo_stock, nuevo_costo_promedio, unidad_base, producto)
-                    )
-                    
-                    self.logger.info(
-                        f"✓ Stock actualizado: {producto} +{cantidad_base}{unidad_base}, "
-                        f"total: {nuevo_stock}{unidad_base}"
-                    )
-                else:
-                    # Insertar nuevo producto
-                    costo_unitario_base = (
-                        float(precio_total) / cantidad_base if cantidad_base else 0.0
-                    )
-                    cursor.execute(
-                        """INSERT INTO inventario 
-                           (producto, cantidad_stock, unidad_base, costo_promedio_ponderado) 
-                           VALUES (%s, %s, %s, %s)""",
-                        (producto, cantidad_base, unidad_base, costo_unitario_base)
-                    )
-                    
-                    self.logger.info(
-                        f"✓ Producto nuevo en inventario: {producto} "
-                        f"({cantidad_base}{unidad_base})"
-                    )
             
             conn.commit()
             
-            # Invalidar caché
-            app_cache.invalidate(self.CACHE_KEY_INVENTORY)
-            app_cache.invalidate(self.CACHE_KEY_PRODUCT.format(name=producto))
+            if nuevo:
+                self.logger.info(
+                    "✓ Producto nuevo en inventario: %s (%s%s)",
+                    producto, cantidad_base, unidad_base
+                )
+            else:
+                self.logger.info("✓ Stock actualizado: %s +%s%s", producto, cantidad_base, unidad_base)
+            
+            # Notificar (invalida caché, recalcula recetas y refresca vistas)
+            event_bus.publish(StockChanged(producto), CostChanged(producto))
             
             return True
             
@@ -147,7 +113,9 @@ class InventarioBackend:
         self,
         producto: str,
         cantidad_a_consumir: float,
-        unidad_consumo: str
+        unidad_consumo: str,
+        tipo: str = TIPO_CONSUMO,
+        documento: Optional[str] = None
     ) -> bool:
         """
         Reduce el stock de un producto.
@@ -156,6 +124,8 @@ class InventarioBackend:
             producto: Nombre del producto
             cantidad_a_consumir: Cantidad a consumir
             unidad_consumo: Unidad de consumo
+            tipo: Tipo de movimiento para el ledger
+            documento: Documento origen para el ledger
             
         Returns:
             bool: True si fue exitoso
@@ -163,6 +133,16 @@ class InventarioBackend:
         Raises:
             ValueError: Si no hay stock suficiente
         """
+        cantidad_base_a_consumir, unidad_base = convert_to_base(
+            float(cantidad_a_consumir),
+            unidad_consumo
+        )
+        
+        if cantidad_base_a_consumir is None:
+            raise ValueError(
+                f"No se pudo convertir '{cantidad_a_consumir} {unidad_consumo}'"
+            )
+        
         conn = get_connection()
         if not conn:
             logger.error("No hay conexión a BD")
@@ -170,51 +150,19 @@ class InventarioBackend:
         
         try:
             with conn.cursor() as cursor:
-                cursor.execute(
-                    "SELECT cantidad_stock, unidad_base FROM inventario WHERE producto = %s",
-                    (producto,)
-                )
-                result = cursor.fetchone()
-                
-                if not result:
-                    raise ValueError(f"Producto '{producto}' no existe")
-                
-                stock_actual_base = float(result['cantidad_stock'])
-                unidad_base_db = result['unidad_base']
-                
-                cantidad_base_a_consumir, _ = convert_to_base(
-                    float(cantidad_a_consumir),
-                    unidad_consumo
-                )
-                
-                if cantidad_base_a_consumir is None:
-                    raise ValueError(
-                        f"No se pudo convertir '{cantidad_a_consumir} {unidad_consumo}'"
-                    )
-                
-                if stock_actual_base < cantidad_base_a_consumir:
-                    raise ValueError(
-                        f"Stock insuficiente para '{producto}'. "
-                        f"Disponible: {stock_actual_base:.2f} {unidad_base_db}, "
-                        f"Requerido: {cantidad_base_a_consumir:.2f} {unidad_base_db}"
-                    )
-                
-                nuevo_stock = stock_actual_base - cantidad_base_a_consumir
-                cursor.execute(
-                    "UPDATE inventario SET cantidad_stock = %s WHERE producto = %s",
-                    (nuevo_stock, producto)
-                )
-                
-                self.logger.info(
-                    f"✓ Stock consumido: {producto} -{cantidad_base_a_consumir}{unidad_base_db}, "
-                    f"nuevo total: {nuevo_stock}{unidad_base_db}"
+                self._descontar_stock(
+                    cursor, producto, cantidad_base_a_consumir,
+                    tipo=tipo, documento=documento
                 )
             
             conn.commit()
             
-            # Invalidar caché
-            app_cache.invalidate(self.CACHE_KEY_INVENTORY)
-            app_cache.invalidate(self.CACHE_KEY_PRODUCT.format(name=producto))
+            self.logger.info(
+                "✓ Stock consumido: %s -%s%s", producto, cantidad_base_a_consumir, unidad_base
+            )
+            
+            # Notificar (invalida caché y refresca vistas)
+            event_bus.publish(StockChanged(producto))
             
             return True
             
@@ -225,22 +173,134 @@ class InventarioBackend:
         finally:
             close_connection(conn)
     
+    # ============================================
+    # OPERACIONES ATÓMICAS (a nivel de cursor)
+    # ============================================
+    
+    @staticmethod
+    def _sumar_stock(
+        cursor,
+        producto: str,
+        cantidad_base: float,
+        unidad_base: str,
+        precio_total: float,
+        tipo: str = TIPO_COMPRA,
+        documento: Optional[str] = None
+    ) -> bool:
+        """
+        Suma stock y recalcula el costo promedio ponderado en una sola sentencia.
+        
+        El cálculo se hace en SQL sobre el valor actual de la fila, así dos
+        compras concurrentes no se pisan. Registra el movimiento en el
+        ledger dentro de la misma transacción. No hace commit.
+        
+        Returns:
+            bool: True si el producto se insertó como nuevo
+        """
+        # El costo se asigna ANTES que el stock: MySQL evalúa el SET de
+        # izquierda a derecha con los valores ya actualizados (SQLite no),
+        # así ambos motores usan el stock anterior en la fórmula.
+        update_sql = """UPDATE inventario 
+                   SET costo_promedio_ponderado = CASE 
+                           WHEN cantidad_stock + %s > 0 
+                           THEN (cantidad_stock * costo_promedio_ponderado + %s) / (cantidad_stock + %s) 
+                           ELSE costo_promedio_ponderado 
+                       END,
+                       cantidad_stock = cantidad_stock + %s,
+                       unidad_base = %s 
+                   WHERE producto = %s"""
+        update_args = (
+            cantidad_base, precio_total, cantidad_base,
+            cantidad_base, unidad_base, producto
+        )
+        
+        costo_unitario_base = precio_total / cantidad_base if cantidad_base else 0.0
+        
+        cursor.execute(update_sql, update_args)
+        nuevo = cursor.rowcount == 0
+        
+        if nuevo:
+            try:
+                cursor.execute(
+                    """INSERT INTO inventario 
+                       (producto, cantidad_stock, unidad_base, costo_promedio_ponderado) 
+                       VALUES (%s, %s, %s, %s)""",
+                    (producto, cantidad_base, unidad_base, costo_unitario_base)
+                )
+            except INTEGRITY_ERRORS:
+                # Otra terminal lo insertó entre el UPDATE y el INSERT
+                cursor.execute(update_sql, update_args)
+                if cursor.rowcount == 0:
+                    raise
+                nuevo = False
+        
+        MovimientosBackend.registrar_movimiento(
+            cursor, producto, tipo, cantidad_base, costo_unitario_base, documento
+        )
+        return nuevo
+    
+    @staticmethod
+    def _descontar_stock(
+        cursor,
+        producto: str,
+        cantidad_base: float,
+        tipo: str = TIPO_CONSUMO,
+        documento: Optional[str] = None
+    ):
+        """
+        Descuenta stock sólo si alcanza (UPDATE condicional) y lo registra
+        en el ledger. No hace commit.
+        
+        Raises:
+            ValueError: Si el producto no existe o no hay stock suficiente
+        """
+        cursor.execute(
+            """UPDATE inventario 
+               SET cantidad_stock = cantidad_stock - %s 
+               WHERE producto = %s AND cantidad_stock >= %s""",
+            (cantidad_base, producto, cantidad_base)
+        )
+        if cursor.rowcount > 0:
+            MovimientosBackend.registrar_movimiento(
+                cursor, producto, tipo, -cantidad_base, None, documento
+            )
+            return
+        
+        # Ninguna fila afectada: averiguar el motivo para el mensaje
+        cursor.execute(
+            "SELECT cantidad_stock, unidad_base FROM inventario WHERE producto = %s",
+            (producto,)
+        )
+        result = cursor.fetchone()
+        
+        if not result:
+            raise ValueError(f"Producto '{producto}' no existe")
+        
+        raise ValueError(
+            f"Stock insuficiente para '{producto}'. "
+            f"Disponible: {float(result['cantidad_stock']):.2f} {result['unidad_base']}, "
+            f"Requerido: {cantidad_base:.2f} {result['unidad_base']}"
+        )
+    
     def get_inventario_para_resumen(self) -> List[Dict]:
         """
-        Obtiene inventario completo con caché.
+        Obtiene inventario completo con caché (memoria + instantánea en disco).
         
         Returns:
             List[Dict]: Lista de productos con información de display
         """
-        # Intentar obtener del caché
-        cached = app_cache.get(self.CACHE_KEY_INVENTORY)
-        if cached is not None:
-            return cached
-        
+        try:
+            return warm_cache.get_or_fetch(self.CACHE_KEY_INVENTORY)
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo inventario: {e}")
+            return []
+    
+    @staticmethod
+    def _fetch_inventario_resumen() -> List[Dict]:
+        """Lee el inventario de la BD y lo prepara para display (sin caché)"""
         conn = get_connection()
         if not conn:
-            logger.error("No hay conexión a BD")
-            return []
+            raise ConnectionError("No hay conexión a BD")
         
         try:
             with conn.cursor() as cursor:
@@ -249,51 +309,45 @@ class InventarioBackend:
                        FROM inventario WHERE cantidad_stock > 0 ORDER BY producto"""
                 )
                 results = cursor.fetchall()
+            
+            processed_results = []
+            
+            for item in results:
+                producto = item["producto"]
+                cantidad_base = float(item["cantidad_stock"] or 0.0)
+                unidad_base = (item.get("unidad_base") or "").lower()
+                costo_por_base = float(item.get("costo_promedio_ponderado") or 0.0)
                 
-                processed_results = []
+                # Convertir a unidades más legibles
+                display_cantidad = cantidad_base
+                display_unidad = unidad_base
                 
-                for item in results:
-                    producto = item["producto"]
-                    cantidad_base = float(item["cantidad_stock"] or 0.0)
-                    unidad_base = (item.get("unidad_base") or "").lower()
-                    costo_por_base = float(item.get("costo_promedio_ponderado") or 0.0)
-                    
-                    # Convertir a unidades más legibles
-                    display_cantidad = cantidad_base
-                    display_unidad = unidad_base
-                    
-                    if unidad_base == "g":
-                        if cantidad_base >= 1000:
-                            display_cantidad = cantidad_base / 1000.0
-                            display_unidad = "kg"
-                        elif cantidad_base >= 453.592:
-                            display_cantidad = cantidad_base / 453.592
-                            display_unidad = "lb"
-                    elif unidad_base == "ml":
-                        if cantidad_base >= 1000:
-                            display_cantidad = cantidad_base / 1000.0
-                            display_unidad = "l"
-                    
-                    total_valor = cantidad_base * costo_por_base
-                    
-                    processed_results.append({
-                        "producto": producto,
-                        "cantidad_display": f"{display_cantidad:.2f}",
-                        "unidad_display": display_unidad,
-                        "costo_promedio_display": f"${costo_por_base:.4f}",
-                        "total_valor": total_valor,
-                        "cantidad_base": cantidad_base,
-                        "unidad_base": unidad_base,
-                        "costo_base": costo_por_base
-                    })
+                if unidad_base == "g":
+                    if cantidad_base >= 1000:
+                        display_cantidad = cantidad_base / 1000.0
+                        display_unidad = "kg"
+                    elif cantidad_base >= 453.592:
+                        display_cantidad = cantidad_base / 453.592
+                        display_unidad = "lb"
+                elif unidad_base == "ml":
+                    if cantidad_base >= 1000:
+                        display_cantidad = cantidad_base / 1000.0
+                        display_unidad = "l"
                 
-                # Guardar en caché
-                app_cache.set(self.CACHE_KEY_INVENTORY, processed_results)
-                return processed_results
+                total_valor = cantidad_base * costo_por_base
                 
-        except Exception as e:
-            logger.error(f"❌ Error obteniendo inventario: {e}")
-            return []
+                processed_results.append({
+                    "producto": producto,
+                    "cantidad_display": f"{display_cantidad:.2f}",
+                    "unidad_display": display_unidad,
+                    "costo_promedio_display": f"${costo_por_base:.4f}",
+                    "total_valor": total_valor,
+                    "cantidad_base": cantidad_base,
+                    "unidad_base": unidad_base,
+                    "costo_base": costo_por_base
+                })
+            
+            return processed_results
         finally:
             close_connection(conn)
     
@@ -350,6 +404,20 @@ class InventarioBackend:
             close_connection(conn)
 
 
+def _invalidar_cache_inventario(events: List[StockChanged]):
+    """Invalida el caché de inventario cuando cambia el stock"""
+    warm_cache.invalidate(InventarioBackend.CACHE_KEY_INVENTORY)
+    for event in events:
+        app_cache.invalidate(InventarioBackend.CACHE_KEY_PRODUCT.format(name=event.producto))
+
 
+event_bus.subscribe(StockChanged, _invalidar_cache_inventario, immediate=True)
 
-        
\ No newline at end of file
+# El stock cambia con cada venta/compra/producción: sólo en memoria (la
+# huella de la instantánea en disco no detectaría un UPDATE de cantidad)
+warm_cache.register(
+    InventarioBackend.CACHE_KEY_INVENTORY,
+    tables=("inventario",),
+    loader=InventarioBackend._fetch_inventario_resumen,
+    persist=False
+)
@@ -0,0 +1,353 @@
+"""
+Core.Backends.movimientos_backend - Ledger de movimientos de inventario y snapshots
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from Core.Common.constants import LEDGER_SNAPSHOT_EVERY
+from Core.Common.database import get_connection, close_connection
+from Core.Common.event_bus import event_bus, StockChanged
+from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+
+logger = setup_logger(__name__)
+
+
+# ============================================
+# TIPOS DE MOVIMIENTO
+# ============================================
+
+TIPO_COMPRA = "compra"
+TIPO_CONSUMO = "consumo"
+TIPO_GASTO = "gasto"
+TIPO_PRODUCCION = "produccion"
+TIPO_INTERCAMBIO = "intercambio"
+TIPO_AJUSTE = "ajuste"
+
+
+@monitor_class
+class MovimientosBackend:
+    """
+    Ledger append-only de inventario (kardex).
+
+    - Cada cambio de stock agrega una fila en la MISMA transacción que
+      actualiza `inventario` (registrar_movimiento)
+    - Cada fila guarda el stock y costo promedio resultantes
+    - Los snapshots copian `inventario` y marcan el último movimiento
+      incluido: una consulta a fecha X lee un snapshot y la cola del
+      ledger posterior, nunca todo el historial
+    """
+
+    def __init__(self):
+        self.logger = setup_logger(__name__)
+        self.logger.info("✓ MovimientosBackend inicializado")
+
+    # ============================================
+    # ESCRITURA (a nivel de cursor)
+    # ============================================
+
+    @staticmethod
+    def registrar_movimiento(
+        cursor,
+        producto: str,
+        tipo: str,
+        cantidad_base: float,
+        costo_unitario: Optional[float] = None,
+        documento: Optional[str] = None
+    ):
+        """
+        Agrega un movimiento leyendo el estado resultante de `inventario`.
+
+        Debe llamarse después del UPDATE/INSERT de inventario y antes del
+        commit: la fila ya está bloqueada por esta transacción. No hace commit.
+
+        Args:
+            cursor: Cursor de la transacción en curso
+            producto: Nombre del producto
+            tipo: TIPO_*
+            cantidad_base: Cantidad en unidad base (positiva entra, negativa sale)
+            costo_unitario: Costo por unidad base (None = costo promedio vigente)
+            documento: Documento origen (ej. "compra:15", "produccion:3")
+        """
+        cursor.execute(
+            """SELECT cantidad_stock, costo_promedio_ponderado, unidad_base
+               FROM inventario WHERE producto = %s""",
+            (producto,)
+        )
+        estado = cursor.fetchone()
+        if not estado:
+            raise ValueError(f"Producto '{producto}' no existe")
+
+        costo_promedio = float(estado["costo_promedio_ponderado"] or 0)
+        if costo_unitario is None:
+            costo_unitario = costo_promedio
+
+        cursor.execute(
+            """INSERT INTO inventario_movimientos
+               (producto, tipo, cantidad_base, unidad_base, costo_unitario,
+                stock_resultante, costo_promedio_resultante, documento)
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+            (
+                producto, tipo, cantidad_base, estado["unidad_base"],
+                costo_unitario, estado["cantidad_stock"], costo_promedio, documento
+            )
+        )
+
+    # ============================================
+    # SNAPSHOTS
+    # ============================================
+
+    def crear_snapshot(self) -> Optional[int]:
+        """
+        Crea un checkpoint con el inventario actual.
+
+        La cabecera se inserta primero (toma el lock de escritura) y guarda
+        el último id del ledger; los items se copian con INSERT ... SELECT.
+
+        Returns:
+            ID del snapshot o None si falla
+        """
+        conn = get_connection()
+        if not conn:
+            return None
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """INSERT INTO inventario_snapshots (ultimo_movimiento_id)
+                       SELECT COALESCE(MAX(id), 0) FROM inventario_movimientos"""
+                )
+                snapshot_id = cursor.lastrowid
+
+                cursor.execute(
+                    """INSERT INTO inventario_snapshot_items
+                       (snapshot_id, producto, cantidad_stock, unidad_base, costo_promedio_ponderado)
+                       SELECT %s, producto, cantidad_stock, unidad_base, costo_promedio_ponderado
+                       FROM inventario""",
+                    (snapshot_id,)
+                )
+
+                cursor.execute(
+                    """UPDATE inventario_snapshots
+                       SET productos = (SELECT COUNT(*) FROM inventario_snapshot_items
+                                        WHERE snapshot_id = %s),
+                           valor_total = (SELECT COALESCE(SUM(cantidad_stock * costo_promedio_ponderado), 0)
+                                          FROM inventario_snapshot_items WHERE snapshot_id = %s)
+                       WHERE id = %s""",
+                    (snapshot_id, snapshot_id, snapshot_id)
+                )
+
+            conn.commit()
+            self.logger.info(f"📸 Snapshot de inventario #{snapshot_id} creado")
+            return snapshot_id
+
+        except Exception as e:
+            logger.error(f"❌ Error creando snapshot de inventario: {e}")
+            conn.rollback()
+            return None
+        finally:
+            close_connection(conn)
+
+    def snapshot_si_corresponde(self, cada: int = LEDGER_SNAPSHOT_EVERY) -> Optional[int]:
+        """
+        Crea un snapshot si no hay ninguno o si la cola del ledger supera `cada`.
+
+        Returns:
+            ID del snapshot creado o None
+        """
+        conn = get_connection()
+        if not conn:
+            return None
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT MAX(ultimo_movimiento_id) AS marca, COUNT(*) AS n FROM inventario_snapshots"
+                )
+                fila = cursor.fetchone() or {}
+                if not fila.get("n"):
+                    pendientes = None
+                else:
+                    cursor.execute(
+                        "SELECT COUNT(*) AS n FROM inventario_movimientos WHERE id > %s",
+                        (fila["marca"] or 0,)
+                    )
+                    pendientes = int((cursor.fetchone() or {}).get("n") or 0)
+        except Exception as e:
+            logger.error(f"❌ Error revisando snapshots: {e}")
+            return None
+        finally:
+            close_connection(conn)
+
+        if pendientes is not None and pendientes < cada:
+            return None
+
+        return self.crear_snapshot()
+
+    # ============================================
+    # CONSULTAS A FECHA
+    # ============================================
+
+    def stock_a_fecha(self, fecha: datetime, producto: Optional[str] = None) -> List[Dict]:
+        """
+        Stock y costo promedio de cada producto al cierre de `fecha`.
+
+        Lee el último snapshot anterior a la fecha y aplica encima el último
+        movimiento de cada producto en la cola (id > marca, fecha <= X).
+
+        Args:
+            fecha: Momento a consultar
+            producto: Limitar a un producto (opcional)
+
+        Returns:
+            List[Dict] con producto, cantidad_stock, unidad_base,
+            costo_promedio_ponderado y valor
+        """
+        conn = get_connection()
+        if not conn:
+            return []
+
+        filtro_producto = " AND producto = %s" if producto else ""
+        extra = (producto,) if producto else ()
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    """SELECT id, ultimo_movimiento_id FROM inventario_snapshots
+                       WHERE fecha <= %s ORDER BY fecha DESC, id DESC LIMIT 1""",
+                    (fecha,)
+                )
+                snapshot = cursor.fetchone()
+
+                estado: Dict[str, Dict] = {}
+                marca = 0
+
+                if snapshot:
+                    marca = snapshot["ultimo_movimiento_id"]
+                    cursor.execute(
+                        """SELECT producto, cantidad_stock, unidad_base, costo_promedio_ponderado
+                           FROM inventario_snapshot_items WHERE snapshot_id = %s"""
+                        + filtro_producto,
+                        (snapshot["id"],) + extra
+                    )
+                    for row in cursor.fetchall() or []:
+                        estado[row["producto"]] = row
+
+                # Cola: último movimiento por producto posterior al snapshot
+                cursor.execute(
+                    """SELECT m.producto, m.stock_resultante AS cantidad_stock, m.unidad_base,
+                              m.costo_promedio_resultante AS costo_promedio_ponderado
+                       FROM inventario_movimientos m
+                       JOIN (SELECT producto, MAX(id) AS id FROM inventario_movimientos
+                             WHERE id > %s AND fecha <= %s"""
+                    + filtro_producto
+                    + """ GROUP BY producto) ult ON ult.id = m.id""",
+                    (marca, fecha) + extra
+                )
+                for row in cursor.fetchall() or []:
+                    estado[row["producto"]] = row
+
+            resultado = []
+            for nombre in sorted(estado):
+                row = estado[nombre]
+                cantidad = float(row["cantidad_stock"] or 0)
+                costo = float(row["costo_promedio_ponderado"] or 0)
+                resultado.append({
+                    "producto": nombre,
+                    "cantidad_stock": cantidad,
+                    "unidad_base": row["unidad_base"],
+                    "costo_promedio_ponderado": costo,
+                    "valor": cantidad * costo,
+                })
+            return resultado
+
+        except Exception as e:
+            logger.error(f"❌ Error consultando stock a fecha: {e}")
+            return []
+        finally:
+            close_connection(conn)
+
+    def valuacion_a_fecha(self, fecha: datetime) -> float:
+        """Valor total del inventario al cierre de `fecha`"""
+        return sum(item["valor"] for item in self.stock_a_fecha(fecha))
+
+    def get_movimientos(
+        self,
+        producto: str,
+        desde: Optional[datetime] = None,
+        limit: int = 200
+    ) -> List[Dict]:
+        """
+        Kardex de un producto (más recientes primero).
+
+        Args:
+            producto: Nombre del producto
+            desde: Fecha mínima (opcional)
+            limit: Máximo de filas
+        """
+        conn = get_connection()
+        if not conn:
+            return []
+
+        try:
+            with conn.cursor() as cursor:
+                if desde:
+                    cursor.execute(
+                        """SELECT * FROM inventario_movimientos
+                           WHERE producto = %s AND fecha >= %s
+                           ORDER BY id DESC LIMIT %s""",
+                        (producto, desde, limit)
+                    )
+                else:
+                    cursor.execute(
+                        """SELECT * FROM inventario_movimientos
+                           WHERE producto = %s ORDER BY id DESC LIMIT %s""",
+                        (producto, limit)
+                    )
+                return cursor.fetchall() or []
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo movimientos: {e}")
+            return []
+        finally:
+            close_connection(conn)
+
+
+# ============================================
+# SNAPSHOTS PERIÓDICOS
+# ============================================
+
+class _SnapshotScheduler:
+    """
+    Revisa la cola del ledger cada N eventos StockChanged (sin consultas por
+    evento). Se suscribe inmediato y el snapshot corre en un hilo de fondo,
+    como el checkpoint de arranque: nunca en el hilo de Tk.
+    """
+
+    # Eventos entre revisiones
+    CHECK_EVERY = 100
+
+    def __init__(self):
+        self._eventos = 0
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+
+    def __call__(self, events: List[StockChanged]):
+        with self._lock:
+            self._eventos += len(events)
+            if self._eventos < self.CHECK_EVERY:
+                return
+            # Uno a la vez: si el anterior sigue corriendo, se revisa en la próxima tanda
+            if self._hilo is not None and self._hilo.is_alive():
+                return
+            self._eventos = 0
+            self._hilo = threading.Thread(
+                target=MovimientosBackend().snapshot_si_corresponde,
+                name="inventario-snapshot",
+                daemon=True
+            )
+            self._hilo.start()
+
+
+event_bus.subscribe(StockChanged, _SnapshotScheduler(), immediate=True)
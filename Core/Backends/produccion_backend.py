@@ -3,28 +3,42 @@ Core.Backends.produccion_backend - Backend de gestión de producción
 CORRECCIÓN: Cálculo correcto de costos
 """
 
-import pymysql
 from decimal import Decimal
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Tuple
 
 from Core.Common.database import get_connection, close_connection
 from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+from Core.Common.money import Money, Cost
+from Core.Common.event_bus import (
+    event_bus, PriceChanged, ProductionCreated, RecipeChanged, StockChanged
+)
+from Core.Common.warm_cache import warm_cache
 from Core.Backends.inventario_backend import InventarioBackend
-from Core.Common.units import convert_to_base
+from Core.Backends.bom_backend import BOMBackend
+from Core.Backends.movimientos_backend import TIPO_PRODUCCION
+from Core.Common.units import convert_to_base_exact
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
+@monitor_class
 class ProduccionBackend:
     """
     Backend de producción con cálculos CORRECTOS
     """
     
+    # Claves de caché (memoria + instantánea en disco)
+    CACHE_KEY_SUBPRODUCTOS = "subproductos"
+    CACHE_KEY_RECETAS = "recetas_subproductos"
+    CACHE_KEY_PRODUCTOS_FINALES = "productos_finales_info"
+    
     def __init__(self):
         """Inicializa el backend"""
         self.inventory_manager = InventarioBackend()
-        self.logger = setup_logger()
+        self.bom = BOMBackend()
+        self.logger = setup_logger(__name__)
         self.logger.info("ProduccionBackend inicializado")
     
     # ============================================
@@ -57,12 +71,12 @@ class ProduccionBackend:
                         raise ValueError(f"❌ Ingrediente '{producto}' no está en inventario")
                     
                     costo_por_base = Decimal(str(result['costo_promedio_ponderado']))
-                    cantidad_base, base_unit = convert_to_base(cantidad, unidad)
+                    cantidad_base, base_unit = convert_to_base_exact(ing['cantidad'], unidad)
                     
                     if cantidad_base is None:
                         raise ValueError(f"❌ No se pudo convertir {cantidad}{unidad}")
                     
-                    costo_ingrediente = Decimal(str(cantidad_base)) * costo_por_base
+                    costo_ingrediente = cantidad_base * costo_por_base
                     total_costo += costo_ingrediente
                     
                     detalles_ingredientes.append({
@@ -96,6 +110,8 @@ class ProduccionBackend:
                     )
             
             conn.commit()
+            warm_cache.invalidate(self.CACHE_KEY_SUBPRODUCTOS, self.CACHE_KEY_RECETAS)
+            event_bus.publish(RecipeChanged(subproducto_id=subproducto_id))
             
             self.logger.info(
                 f"✅ Subproducto '{nombre_subproducto}' creado\n"
@@ -114,9 +130,37 @@ class ProduccionBackend:
     
     def get_subproductos_disponibles(self) -> List[Dict]:
         """Obtiene todos los subproductos"""
+        try:
+            return list(warm_cache.get_or_fetch(self.CACHE_KEY_SUBPRODUCTOS))
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo subproductos: {e}")
+            return []
+    
+    def get_subproducto_ingredientes(self, subproducto_id: int) -> List[Dict]:
+        """Obtiene ingredientes de un subproducto"""
+        try:
+            recetas = warm_cache.get_or_fetch(self.CACHE_KEY_RECETAS)
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo ingredientes: {e}")
+            return []
+        
+        return [
+            {
+                "id": r["id"],
+                "producto_ingrediente": r["producto_ingrediente"],
+                "cantidad_usada": r["cantidad_usada"],
+                "unidad_usada": r["unidad_usada"],
+            }
+            for r in recetas
+            if r["subproducto_id"] == subproducto_id
+        ]
+    
+    @staticmethod
+    def _fetch_subproductos() -> List[Dict]:
+        """Lee subproductos de la BD (sin caché)"""
         conn = get_connection()
         if not conn:
-            return []
+            raise ConnectionError("No hay conexión a BD")
         
         try:
             with conn.cursor() as cursor:
@@ -124,33 +168,23 @@ class ProduccionBackend:
                     "SELECT id, nombre, costo_total_subproducto FROM subproductos ORDER BY nombre"
                 )
                 return cursor.fetchall() or []
-        
-        except Exception as e:
-            logger.error(f"❌ Error obteniendo subproductos: {e}")
-            return []
-        
         finally:
             close_connection(conn)
     
-    def get_subproducto_ingredientes(self, subproducto_id: int) -> List[Dict]:
-        """Obtiene ingredientes de un subproducto"""
+    @staticmethod
+    def _fetch_recetas() -> List[Dict]:
+        """Lee los ingredientes de todos los subproductos (sin caché)"""
         conn = get_connection()
         if not conn:
-            return []
+            raise ConnectionError("No hay conexión a BD")
         
         try:
             with conn.cursor() as cursor:
                 cursor.execute(
-                    """SELECT id, producto_ingrediente, cantidad_usada, unidad_usada 
-                       FROM subproducto_ingredientes WHERE subproducto_id = %s""",
-                    (subproducto_id,)
+                    """SELECT id, subproducto_id, producto_ingrediente, cantidad_usada, unidad_usada 
+                       FROM subproducto_ingredientes ORDER BY subproducto_id, id"""
                 )
                 return cursor.fetchall() or []
-        
-        except Exception as e:
-            logger.error(f"❌ Error obteniendo ingredientes: {e}")
-            return []
-        
         finally:
             close_connection(conn)
     
@@ -166,6 +200,12 @@ class ProduccionBackend:
                 cursor.execute("DELETE FROM subproductos WHERE id = %s", (subproducto_id,))
             
             conn.commit()
+            warm_cache.invalidate(
+                self.CACHE_KEY_SUBPRODUCTOS,
+                self.CACHE_KEY_RECETAS,
+                self.CACHE_KEY_PRODUCTOS_FINALES
+            )
+            event_bus.publish(RecipeChanged(subproducto_id=subproducto_id))
             logger.info(f"✅ Subproducto {subproducto_id} eliminado")
             return True
         
@@ -201,11 +241,11 @@ class ProduccionBackend:
                 if not result:
                     raise ValueError(f"❌ Subproducto {subproducto_id} no encontrado")
                 
-                costo_total_receta = Decimal(str(result['costo_total_subproducto']))
+                costo_total_receta = Money.of(result['costo_total_subproducto'])
             
             close_connection(conn)
             
-            costo_unitario = costo_total_receta / Decimal(unidades_producidas)
+            costo_unitario = costo_total_receta.to_cost() / int(unidades_producidas)
             costo_total_masa = costo_total_receta
             
             self.logger.info(
@@ -231,41 +271,43 @@ class ProduccionBackend:
         unidades_producidas: int,
         tipo_unidad: str = "reales"
     ) -> Dict:
-        """Crea una ejecución de producción (consume stock)"""
+        """
+        Crea una ejecución de producción (consume stock).
+        
+        Mismo camino que crear_produccion_lote: el descuento de cada
+        insumo (UPDATE condicional) y la producción van en UNA transacción;
+        si un insumo no alcanza no se consume ninguno.
+        """
         if unidades_producidas <= 0:
             raise ValueError("❌ Unidades debe ser > 0")
         
+        # Verificar TODOS los insumos antes de abrir la transacción (mensaje
+        # completo); el UPDATE condicional es la garantía bajo concurrencia
+        lotes = {subproducto_id: 1}
+        faltantes = self.bom.faltantes_lote(lotes)
+        if faltantes:
+            detalle = ", ".join(
+                f"{f['producto']} (faltan {f['faltante']:.2f}{f['unidad']})"
+                for f in faltantes
+            )
+            raise ValueError(f"❌ Stock insuficiente: {detalle}")
+        
+        consumo = self.bom.requerimientos(lotes)
+        if not consumo:
+            raise ValueError("❌ Subproducto sin ingredientes")
+        
         conn = get_connection()
         if not conn:
             raise Exception("❌ No hay conexión a BD")
         
         try:
-            ingredientes = self.get_subproducto_ingredientes(subproducto_id)
-            if not ingredientes:
-                raise ValueError("❌ Subproducto sin ingredientes")
-            
             with conn.cursor() as cursor:
-                cursor.execute(
-                    "SELECT costo_total_subproducto FROM subproductos WHERE id = %s",
-                    (subproducto_id,)
+                costos = self._consumir_insumos(
+                    cursor, lotes, consumo, documento=f"subproducto:{subproducto_id}"
                 )
-                result = cursor.fetchone()
-                
-                if not result:
-                    raise ValueError(f"❌ Subproducto no encontrado")
-                
-                costo_total_receta = Decimal(str(result['costo_total_subproducto']))
-            
-            for ing in ingredientes:
-                producto = ing['producto_ingrediente']
-                cantidad = float(ing['cantidad_usada'])
-                unidad = ing['unidad_usada']
+                costo_total_receta = costos[subproducto_id]
+                costo_unitario = costo_total_receta.to_cost() / int(unidades_producidas)
                 
-                self.inventory_manager.consumir_stock(producto, cantidad, unidad)
-            
-            costo_unitario = costo_total_receta / Decimal(unidades_producidas)
-            
-            with conn.cursor() as cursor:
                 cursor.execute(
                     """INSERT INTO subproducto_producciones 
                        (subproducto_id, unidades_producidas, tipo_unidad, 
@@ -275,38 +317,190 @@ class ProduccionBackend:
                         subproducto_id,
                         int(unidades_producidas),
                         tipo_unidad,
-                        round(float(costo_total_receta), 2),
-                        round(float(costo_unitario), 4)
+                        costo_total_receta.to_decimal(),
+                        costo_unitario.to_decimal()
                     )
                 )
                 prod_id = cursor.lastrowid
             
             conn.commit()
+        
+        except Exception as e:
+            logger.error(f"❌ Error creando producción: {e}")
+            conn.rollback()
+            raise
+        
+        finally:
+            close_connection(conn)
+        
+        event_bus.publish(
+            *(StockChanged(producto) for producto in consumo),
+            ProductionCreated(subproducto_id)
+        )
+        
+        self.logger.info(
+            "✅ Producción creada:\n"
+            "   Subproducto ID: %s\n"
+            "   Unidades Producidas: %s\n"
+            "   Costo Total: $%.2f\n"
+            "   Costo/Unidad: $%.2f",
+            subproducto_id, unidades_producidas, costo_total_receta, costo_unitario
+        )
+        
+        return {
+            'produccion_id': prod_id,
+            'subproducto_id': subproducto_id,
+            'unidades_producidas': unidades_producidas,
+            'tipo_unidad': tipo_unidad,
+            'costo_total_masa': float(costo_total_receta),
+            'costo_unitario': float(costo_unitario)
+        }
+    
+    def crear_produccion_lote(
+        self,
+        runs: Sequence[Tuple[int, int]],
+        tipo_unidad: str = "reales"
+    ) -> Dict:
+        """
+        Registra varias producciones en una sola transacción.
+        
+        - Suma el consumo de todos los runs por ingrediente (matriz BOM)
+        - Verifica factibilidad una sola vez, con los insumos compartidos sumados
+        - Un descuento por ingrediente y un executemany de producciones
+        - Si algo falla no se consume nada
+        
+        Args:
+            runs: Pares (subproducto_id, unidades_producidas); un run = un lote
+            tipo_unidad: Tipo de unidad de todos los runs
             
-            self.logger.info(
-                f"✅ Producción creada:\n"
-                f"   Subproducto ID: {subproducto_id}\n"
-                f"   Unidades Producidas: {unidades_producidas}\n"
-                f"   Costo Total: ${float(costo_total_receta):.2f}\n"
-                f"   Costo/Unidad: ${float(costo_unitario):.2f}"
+        Returns:
+            Dict con runs, ingredientes (consumo en unidad base) y costo_total
+        """
+        if not runs:
+            raise ValueError("❌ No hay producciones en el lote")
+        
+        lotes: Dict[int, int] = {}
+        for subproducto_id, unidades in runs:
+            if unidades <= 0:
+                raise ValueError("❌ Unidades debe ser > 0")
+            lotes[subproducto_id] = lotes.get(subproducto_id, 0) + 1
+        
+        faltantes = self.bom.faltantes_lote(lotes)
+        if faltantes:
+            detalle = ", ".join(
+                f"{f['producto']} (faltan {f['faltante']:.2f}{f['unidad']})"
+                for f in faltantes
             )
+            raise ValueError(f"❌ Stock insuficiente para el lote: {detalle}")
+        
+        consumo = self.bom.requerimientos(lotes)
+        documento = f"lote_produccion:{datetime.now():%Y%m%d%H%M%S}"
+        
+        conn = get_connection()
+        if not conn:
+            raise Exception("❌ No hay conexión a BD")
+        
+        try:
+            with conn.cursor() as cursor:
+                costos = self._consumir_insumos(cursor, lotes, consumo, documento)
+                
+                filas = [
+                    (
+                        subproducto_id,
+                        int(unidades),
+                        tipo_unidad,
+                        costos[subproducto_id].to_decimal(),
+                        (costos[subproducto_id].to_cost() / int(unidades)).to_decimal()
+                    )
+                    for subproducto_id, unidades in runs
+                ]
+                cursor.executemany(
+                    """INSERT INTO subproducto_producciones 
+                       (subproducto_id, unidades_producidas, tipo_unidad, 
+                        costo_total_masa, costo_unitario) 
+                       VALUES (%s, %s, %s, %s, %s)""",
+                    filas
+                )
             
-            return {
-                'produccion_id': prod_id,
-                'subproducto_id': subproducto_id,
-                'unidades_producidas': unidades_producidas,
-                'tipo_unidad': tipo_unidad,
-                'costo_total_masa': float(costo_total_receta),
-                'costo_unitario': float(costo_unitario)
-            }
+            conn.commit()
         
         except Exception as e:
-            logger.error(f"❌ Error creando producción: {e}")
+            logger.error(f"❌ Error creando lote de producción: {e}")
             conn.rollback()
             raise
         
         finally:
             close_connection(conn)
+        
+        event_bus.publish(
+            *(StockChanged(producto) for producto in consumo),
+            *(ProductionCreated(subproducto_id) for subproducto_id in lotes)
+        )
+        
+        costo_total = Money.sum(costos[sid] for sid, _ in runs)
+        self.logger.info(
+            f"✅ Lote de producción: {len(runs)} runs, "
+            f"{len(consumo)} ingredientes, costo ${costo_total:.2f}"
+        )
+        
+        return {
+            'runs': len(runs),
+            'ingredientes': consumo,
+            'costo_total': float(costo_total)
+        }
+    
+    @staticmethod
+    def _consumir_insumos(
+        cursor,
+        lotes: Dict[int, int],
+        consumo: Dict[str, float],
+        documento: str
+    ) -> Dict[int, Money]:
+        """
+        Lee el costo de cada subproducto y descuenta los insumos en la
+        transacción del cursor (no hace commit).
+        
+        Returns:
+            Dict subproducto_id → costo total de la receta
+        
+        Raises:
+            ValueError: Si falta un subproducto o un insumo no alcanza
+        """
+        ids = list(lotes)
+        cursor.execute(
+            f"""SELECT id, costo_total_subproducto FROM subproductos
+                WHERE id IN ({", ".join(["%s"] * len(ids))})""",
+            tuple(ids)
+        )
+        costos = {
+            row['id']: Money.of(row['costo_total_subproducto'])
+            for row in cursor.fetchall() or []
+        }
+        
+        no_encontrados = [sid for sid in ids if sid not in costos]
+        if no_encontrados:
+            raise ValueError(f"❌ Subproductos no encontrados: {no_encontrados}")
+        
+        for producto, cantidad_base in consumo.items():
+            InventarioBackend._descontar_stock(
+                cursor, producto, cantidad_base,
+                tipo=TIPO_PRODUCCION, documento=documento
+            )
+        
+        return costos
+    
+    def get_capacidad_produccion(self) -> Dict[str, Dict[int, int]]:
+        """
+        Máximo producible con el stock actual.
+        
+        Returns:
+            {"subproductos": {id: lotes}, "productos_finales": {id: unidades}}
+        """
+        try:
+            return self.bom.capacidad()
+        except Exception as e:
+            logger.error(f"❌ Error calculando capacidad de producción: {e}")
+            return {"subproductos": {}, "productos_finales": {}}
     
     def get_producciones_por_subproducto(self, subproducto_id: int, limit: int = 50) -> List[Dict]:
         """Obtiene historial de producciones"""
@@ -354,7 +548,7 @@ class ProduccionBackend:
             raise Exception("❌ No hay conexión a BD")
         
         try:
-            costo_producto_final = Decimal(0)
+            costo_producto_final = Cost(0)
             detalles_subproductos = []
             
             with conn.cursor() as cursor:
@@ -378,8 +572,8 @@ class ProduccionBackend:
                     # unidades_rinde es cuántas UNIDADES FINALES produce
                     # El costo unitario = costo_total / unidades_rinde
                     
-                    costo_total_sub = Decimal(str(subproducto['costo_total_subproducto']))
-                    costo_por_unidad_final = costo_total_sub / Decimal(unidades_rinde)
+                    costo_total_sub = Money.of(subproducto['costo_total_subproducto'])
+                    costo_por_unidad_final = costo_total_sub.to_cost() / int(unidades_rinde)
                     
                     # Sumar al costo total del producto final
                     costo_producto_final += costo_por_unidad_final
@@ -408,8 +602,8 @@ class ProduccionBackend:
                     (
                         nombre_producto, 
                         1, 
-                        round(float(precio_venta), 2) if precio_venta else None, 
-                        round(float(costo_producto_final), 4)  # ✅ YA ES UNITARIO
+                        Money.of(precio_venta).to_decimal() if precio_venta else None, 
+                        costo_producto_final.to_decimal()  # ✅ YA ES UNITARIO
                     )
                 )
                 producto_id = cursor.lastrowid
@@ -424,11 +618,13 @@ class ProduccionBackend:
                     )
             
             conn.commit()
+            warm_cache.invalidate(self.CACHE_KEY_PRODUCTOS_FINALES)
+            event_bus.publish(RecipeChanged(producto_final_id=producto_id))
             
             # Calcular ganancia
             ganancia_margen = 0
             if costo_producto_final > 0 and precio_venta:
-                ganancia_margen = ((Decimal(precio_venta) - costo_producto_final) / costo_producto_final * 100)
+                ganancia_margen = (Cost.of(precio_venta) - costo_producto_final).ratio(costo_producto_final) * 100
             
             resultado = {
                 'producto_id': producto_id,
@@ -459,10 +655,20 @@ class ProduccionBackend:
 
             
     def get_productos_finales_info(self) -> List[Dict]:
-        """Obtiene información de productos finales con cálculos CORRECTOS"""
+        """Obtiene información de productos finales con cálculos CORRECTOS (con caché)"""
+        try:
+            return [dict(p) for p in warm_cache.get_or_fetch(self.CACHE_KEY_PRODUCTOS_FINALES)]
+        except Exception as e:
+            logger.error(f"❌ Error obteniendo productos: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            return []
+    
+    def _fetch_productos_finales_info(self) -> List[Dict]:
+        """Lee productos finales y calcula costos desde la BD (sin caché)"""
         conn = get_connection()
         if not conn:
-            return []
+            raise ConnectionError("No hay conexión a BD")
         
         try:
             with conn.cursor() as cursor:
@@ -493,7 +699,7 @@ class ProduccionBackend:
                         (pid,)
                     )
                     
-                    costo_total = Decimal(0)
+                    costo_total = Cost(0)
                     detalles = []
                     relaciones = cursor.fetchall() or []
                     
@@ -505,7 +711,7 @@ class ProduccionBackend:
                     for rel in relaciones:
                         subproducto_id = rel['subproducto_id']
                         nombre_sub = rel['nombre']
-                        costo_total_sub = Decimal(str(rel['costo_total_subproducto']))
+                        costo_total_sub = Money.of(rel['costo_total_subproducto'])
                         
                         # ✅ OBTENER COSTO UNITARIO DE LA ÚLTIMA PRODUCCIÓN
                         cursor.execute(
@@ -517,7 +723,7 @@ class ProduccionBackend:
                         
                         if prod_result:
                             # ✅ USAR costo_unitario de producción
-                            costo_unitario_real = Decimal(str(prod_result['costo_unitario']))
+                            costo_unitario_real = Cost.of(prod_result['costo_unitario'])
                             costo_total += costo_unitario_real
                             
                             detalles.append({
@@ -556,21 +762,15 @@ class ProduccionBackend:
                     
                     producto['costo_unitario_total'] = float(costo_total)
                     
-                    precio_venta = float(producto.get('precio_venta') or 0)
+                    precio_venta = Cost.of(producto.get('precio_venta'))
                     if costo_total > 0:
-                        margen = ((precio_venta - float(costo_total)) / float(costo_total) * 100)
+                        margen = (precio_venta - costo_total).ratio(costo_total) * 100
                         producto['margen_ganancia'] = round(margen, 2)
                     else:
                         producto['margen_ganancia'] = 0
                 
                 return productos
         
-        except Exception as e:
-            logger.error(f"❌ Error obteniendo productos: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return []
-        
         finally:
             close_connection(conn)
     
@@ -584,11 +784,12 @@ class ProduccionBackend:
             with conn.cursor() as cursor:
                 cursor.execute(
                     "UPDATE productos_finales SET precio_venta = %s WHERE id = %s",
-                    (round(float(precio), 2), producto_id)
+                    (Money.of(precio).to_decimal(), producto_id)
                 )
             
             conn.commit()
             logger.info(f"✅ Precio actualizado: ${precio:.2f}")
+            event_bus.publish(PriceChanged(producto_id))
             return True
         
         except Exception as e:
@@ -617,6 +818,8 @@ class ProduccionBackend:
                 )
             
             conn.commit()
+            warm_cache.invalidate(self.CACHE_KEY_PRODUCTOS_FINALES)
+            event_bus.publish(RecipeChanged(producto_final_id=producto_id))
             logger.info(f"✅ Producto {producto_id} eliminado")
             return True
         
@@ -626,4 +829,29 @@ class ProduccionBackend:
             raise
         
         finally:
-            close_connection(conn)
\ No newline at end of file
+            close_connection(conn)
+
+
+def _invalidar_cache_productos_finales(events):
+    """Precios y producciones cambian costos y márgenes de productos finales"""
+    warm_cache.invalidate(ProduccionBackend.CACHE_KEY_PRODUCTOS_FINALES)
+
+
+event_bus.subscribe(PriceChanged, _invalidar_cache_productos_finales, immediate=True)
+event_bus.subscribe(ProductionCreated, _invalidar_cache_productos_finales, immediate=True)
+
+warm_cache.register(
+    ProduccionBackend.CACHE_KEY_SUBPRODUCTOS,
+    tables=("subproductos",),
+    loader=ProduccionBackend._fetch_subproductos
+)
+warm_cache.register(
+    ProduccionBackend.CACHE_KEY_RECETAS,
+    tables=("subproducto_ingredientes",),
+    loader=ProduccionBackend._fetch_recetas
+)
+warm_cache.register(
+    ProduccionBackend.CACHE_KEY_PRODUCTOS_FINALES,
+    tables=("productos_finales", "producto_final_subproductos", "subproductos", "subproducto_producciones"),
+    loader=lambda: ProduccionBackend()._fetch_productos_finales_info()
+)
@@ -0,0 +1,541 @@
+"""
+Core.Backends.reconstruccion_backend - Reconstrucción del inventario desde el historial
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from Core.Common.database import get_connection, close_connection
+from Core.Common.event_bus import event_bus, StockChanged, CostChanged
+from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+from Core.Common.units import lookup_unit
+from Core.Backends.movimientos_backend import (
+    MovimientosBackend, TIPO_AJUSTE, TIPO_INTERCAMBIO, TIPO_PRODUCCION
+)
+
+logger = setup_logger(__name__)
+
+
+# ============================================
+# ORIGEN DE MOVIMIENTOS
+# ============================================
+
+# Desempate con la misma marca temporal (fecha tiene resolución de segundos):
+# entradas antes que salidas. Sólo hace el orden determinista: el orden real
+# de ese segundo no está en los datos y el costo promedio depende de él, así
+# que reconstruir() marca esos productos con costo_ambiguo
+ORIGEN_COMPRA = 0
+ORIGEN_ENTRADA = 1      # intercambio/ajuste del ledger que suma stock
+ORIGEN_GASTO = 2
+ORIGEN_PRODUCCION = 3   # consumo de producción (ledger o, antes del ledger, receta)
+ORIGEN_SALIDA = 4       # intercambio/ajuste del ledger que resta stock
+
+# Documento de los ajustes que escribe aplicar(): no se reproducen (corrigen
+# el desfase respecto de estas mismas fuentes)
+DOCUMENTO_RECONSTRUCCION = "reconstruccion"
+
+
+class Movimientos:
+    """
+    Movimientos de inventario en arreglos columnares (NumPy).
+
+    Atributos (mismo largo):
+        producto: índice en `nombres`
+        fecha: marca temporal POSIX (float64, segundos)
+        origen: ORIGEN_*
+        ref: id de la fila de origen (desempate estable)
+        cantidad: cantidad en la unidad registrada (positiva)
+        unidad: índice en `unidades`
+        costo: costo total (entradas; 0 en salidas y en intercambios recibidos)
+    """
+
+    def __init__(self):
+        self.nombres: List[str] = []
+        self.unidades: List[str] = []
+        self._producto_idx: Dict[str, int] = {}
+        self._unidad_idx: Dict[str, int] = {}
+        self._cols: Dict[str, list] = {
+            "producto": [], "fecha": [], "origen": [], "ref": [],
+            "cantidad": [], "unidad": [], "costo": [],
+        }
+        self.arrays: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        if self.arrays:
+            return len(self.arrays["producto"])
+        return len(self._cols["producto"])
+
+    def agregar(self, producto, fecha, origen, ref, cantidad, unidad, costo=0.0):
+        """Agrega un movimiento (fase de lectura)"""
+        cols = self._cols
+        cols["producto"].append(self._indice(self._producto_idx, self.nombres, producto))
+        cols["fecha"].append(fecha)
+        cols["origen"].append(origen)
+        cols["ref"].append(ref)
+        cols["cantidad"].append(cantidad)
+        cols["unidad"].append(self._indice(self._unidad_idx, self.unidades, unidad or ""))
+        cols["costo"].append(costo)
+
+    def cerrar(self) -> "Movimientos":
+        """Convierte las columnas a arreglos NumPy"""
+        cols = self._cols
+        self.arrays = {
+            "producto": np.asarray(cols["producto"], dtype=np.int64),
+            # timestamp() es ~7x más rápido que convertir a datetime64
+            "fecha": np.fromiter(
+                (f.timestamp() if f is not None else 0.0 for f in cols["fecha"]),
+                dtype=np.float64, count=len(cols["fecha"])
+            ),
+            "origen": np.asarray(cols["origen"], dtype=np.int8),
+            "ref": np.asarray(cols["ref"], dtype=np.int64),
+            "cantidad": np.asarray(cols["cantidad"], dtype=np.float64),
+            "unidad": np.asarray(cols["unidad"], dtype=np.int64),
+            "costo": np.asarray(cols["costo"], dtype=np.float64),
+        }
+        self._cols = {k: [] for k in cols}
+        return self
+
+    @staticmethod
+    def _indice(index: Dict[str, int], values: List[str], key: str) -> int:
+        idx = index.get(key)
+        if idx is None:
+            idx = index[key] = len(values)
+            values.append(key)
+        return idx
+
+
+# ============================================
+# MOTOR VECTORIZADO
+# ============================================
+
+def factores_unidades(unidades: List[str]):
+    """
+    Tabla de conversión por unidad distinta (no por movimiento).
+
+    Returns:
+        (factores float64, unidad base por índice; NaN/"" si no se reconoce)
+    """
+    factores = np.full(len(unidades), np.nan)
+    bases = [""] * len(unidades)
+
+    for i, unidad in enumerate(unidades):
+        info = lookup_unit(unidad)
+        if info is not None:
+            factores[i] = info.factor
+            bases[i] = info.base
+
+    return factores, bases
+
+
+def _scan_afin(coef_a: np.ndarray, coef_b: np.ndarray) -> np.ndarray:
+    """
+    Resuelve c_k = a_k * c_(k-1) + b_k (con c_(-1) = 0) para todos los k.
+
+    Scan por duplicación: en cada pasada cada posición compone su par
+    (a, b) con el de `salto` posiciones atrás, así log2(n) pasadas
+    vectorizadas. Sólo multiplica por a <= 1 y suma valores positivos:
+    sin desbordamiento ni cancelación.
+    """
+    a = coef_a.copy()
+    b = coef_b.copy()
+    n = len(a)
+    salto = 1
+    while salto < n and a[salto:].any():
+        b[salto:] = a[salto:] * b[:-salto] + b[salto:]
+        a[salto:] = a[salto:] * a[:-salto]
+        salto *= 2
+    return b
+
+
+def reconstruir(movs: Movimientos) -> Dict[str, Any]:
+    """
+    Reproduce los movimientos por producto en orden temporal.
+
+    Stock: suma acumulada segmentada por producto.
+    Costo promedio ponderado: recurrencia lineal c_k = a_k * c_(k-1) + b_k
+    (a = stock_antes / stock_después y b = costo / stock_después en
+    entradas; a = 1, b = 0 en salidas), resuelta con _scan_afin.
+
+    Returns:
+        Dict con arreglos por producto: stock, costo, unidad_base,
+        movimientos, negativos (salidas que dejaron stock < 0),
+        costo_ambiguo (entradas y salidas en el mismo segundo: el costo
+        depende de un orden que no se registró; el stock no) y el número
+        de movimientos descartados por unidad desconocida
+    """
+    a = movs.arrays
+    n_productos = len(movs.nombres)
+
+    factores, bases = factores_unidades(movs.unidades)
+    factor = factores[a["unidad"]]
+    validos = ~np.isnan(factor)
+    descartados = int((~validos).sum())
+
+    # Orden: producto, fecha, origen, id
+    orden = np.lexsort((a["ref"], a["origen"], a["fecha"], a["producto"]))
+    orden = orden[validos[orden]]
+
+    producto = a["producto"][orden]
+    origen = a["origen"][orden]
+    es_entrada = origen <= ORIGEN_ENTRADA
+    base = a["cantidad"][orden] * factor[orden]
+    delta = np.where(es_entrada, base, -base)
+    costo = np.where(es_entrada, a["costo"][orden], 0.0)
+    unidad = a["unidad"][orden]
+
+    n = len(producto)
+    stock_final = np.zeros(n_productos)
+    costo_final = np.zeros(n_productos)
+    conteo = np.bincount(producto, minlength=n_productos) if n else np.zeros(n_productos, int)
+    negativos = np.zeros(n_productos, dtype=np.int64)
+    costo_ambiguo = np.zeros(n_productos, dtype=bool)
+    unidad_base = [""] * n_productos
+
+    if n == 0:
+        return {
+            "stock": stock_final, "costo": costo_final, "unidad_base": unidad_base,
+            "movimientos": conteo, "negativos": negativos, "costo_ambiguo": costo_ambiguo,
+            "descartados": descartados,
+        }
+
+    inicio = np.ones(n, dtype=bool)
+    inicio[1:] = producto[1:] != producto[:-1]
+    fin = np.ones(n, dtype=bool)
+    fin[:-1] = inicio[1:]
+
+    # ---------- Empates: entradas y salidas en el mismo segundo ----------
+    fecha = a["fecha"][orden]
+    grupo_inicio = inicio.copy()
+    grupo_inicio[1:] |= fecha[1:] != fecha[:-1]
+    grupo = np.cumsum(grupo_inicio) - 1
+    entradas = np.bincount(grupo, weights=es_entrada)
+    salidas = np.bincount(grupo, weights=~es_entrada)
+    empatados = np.flatnonzero((entradas > 0) & (salidas > 0))
+    costo_ambiguo[producto[np.flatnonzero(grupo_inicio)[empatados]]] = True
+
+    # ---------- Stock: suma acumulada segmentada ----------
+    acumulado = np.cumsum(delta)
+    primera = np.maximum.accumulate(np.where(inicio, np.arange(n), 0))
+    stock = acumulado - (acumulado[primera] - delta[primera])
+    stock_antes = stock - delta
+
+    np.add.at(negativos, producto, (stock < -1e-9) & ~es_entrada)
+
+    # ---------- Costo promedio: recurrencia lineal ----------
+    positivo = stock > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coef_a = np.where(es_entrada & positivo, np.maximum(stock_antes, 0.0) / stock, 1.0)
+        coef_b = np.where(es_entrada & positivo, costo / stock, 0.0)
+
+    # a = 0 al empezar cada producto: el costo previo no se arrastra
+    coef_a[inicio] = 0.0
+    costo_prom = _scan_afin(coef_a, coef_b)
+
+    # ---------- Resultado por producto (última fila) ----------
+    ultimos = np.flatnonzero(fin)
+    stock_final[producto[ultimos]] = stock[ultimos]
+    costo_final[producto[ultimos]] = costo_prom[ultimos]
+
+    # Unidad base: la de la última entrada (como actualizar_stock_desde_compra)
+    for k in np.flatnonzero(es_entrada):
+        unidad_base[producto[k]] = bases[unidad[k]]
+    for k in ultimos:
+        if not unidad_base[producto[k]]:
+            unidad_base[producto[k]] = bases[unidad[k]]
+
+    return {
+        "stock": stock_final, "costo": costo_final, "unidad_base": unidad_base,
+        "movimientos": conteo, "negativos": negativos, "costo_ambiguo": costo_ambiguo,
+        "descartados": descartados,
+    }
+
+
+# ============================================
+# BACKEND
+# ============================================
+
+@monitor_class
+class ReconstruccionBackend:
+    """Recalcula inventario.cantidad_stock y costo_promedio_ponderado desde el historial"""
+
+    # Filas por lote al leer el historial
+    FETCH_SIZE = 50000
+
+    def __init__(self):
+        self.logger = setup_logger(__name__)
+        self.logger.info("✓ ReconstruccionBackend inicializado")
+
+    def cargar_movimientos(self) -> Movimientos:
+        """
+        Lee compras, gastos de productos y, del ledger, los consumos de
+        producción, intercambios y ajustes.
+
+        Los consumos de producción se leen de inventario_movimientos (lo que
+        realmente se descontó, en unidad base): editar una receta o borrar
+        un subproducto no cambia el pasado. Sólo las producciones anteriores
+        al primer movimiento del ledger se reconstruyen desde
+        produccion_detalles o, si no hay, desde la receta actual.
+
+        Intercambios y ajustes sólo existen en inventario_movimientos: lo
+        recibido entra a costo 0 (como en la pantalla de intercambios), un
+        ajuste que suma entra al costo registrado y lo que sale no tiene
+        costo. Los ajustes de una reconstrucción anterior se omiten. Un
+        intercambio anterior al ledger no se puede recuperar.
+
+        Raises:
+            ConnectionError: Si no hay conexión
+        """
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        movs = Movimientos()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, producto, cantidad, unidad, precio_total, fecha FROM compras"
+                )
+                for row in self._stream(cursor):
+                    movs.agregar(
+                        row["producto"], row["fecha"], ORIGEN_COMPRA, row["id"],
+                        float(row["cantidad"] or 0), row["unidad"], float(row["precio_total"] or 0)
+                    )
+
+                cursor.execute(
+                    "SELECT id, producto, cantidad, unidad, fecha FROM gastos_productos"
+                )
+                for row in self._stream(cursor):
+                    movs.agregar(
+                        row["producto"], row["fecha"], ORIGEN_GASTO, row["id"],
+                        float(row["cantidad"] or 0), row["unidad"]
+                    )
+
+                cursor.execute(
+                    """SELECT sp.id, sp.created_at AS fecha,
+                              COALESCE(pd.producto_ingrediente, si.producto_ingrediente) AS producto,
+                              COALESCE(pd.cantidad_usada, si.cantidad_usada) AS cantidad,
+                              COALESCE(pd.unidad_usada, si.unidad_usada) AS unidad
+                       FROM subproducto_producciones sp
+                       LEFT JOIN produccion_detalles pd ON pd.produccion_id = sp.id
+                       LEFT JOIN subproducto_ingredientes si
+                              ON pd.id IS NULL AND si.subproducto_id = sp.subproducto_id
+                       WHERE COALESCE(pd.id, si.id) IS NOT NULL
+                         AND NOT EXISTS (
+                               SELECT 1 FROM inventario_movimientos m
+                               WHERE m.fecha <= sp.created_at)"""
+                )
+                for row in self._stream(cursor):
+                    movs.agregar(
+                        row["producto"], row["fecha"], ORIGEN_PRODUCCION, row["id"],
+                        float(row["cantidad"] or 0), row["unidad"]
+                    )
+
+                cursor.execute(
+                    """SELECT id, tipo, producto, cantidad_base, unidad_base, costo_unitario, fecha
+                       FROM inventario_movimientos
+                       WHERE tipo IN (%s, %s, %s)
+                         AND (documento IS NULL OR documento <> %s)""",
+                    (TIPO_INTERCAMBIO, TIPO_AJUSTE, TIPO_PRODUCCION, DOCUMENTO_RECONSTRUCCION)
+                )
+                for row in self._stream(cursor):
+                    cantidad = float(row["cantidad_base"] or 0)
+                    if row["tipo"] == TIPO_PRODUCCION:
+                        movs.agregar(
+                            row["producto"], row["fecha"], ORIGEN_PRODUCCION, row["id"],
+                            -cantidad, row["unidad_base"]
+                        )
+                    elif cantidad >= 0:
+                        movs.agregar(
+                            row["producto"], row["fecha"], ORIGEN_ENTRADA, row["id"],
+                            cantidad, row["unidad_base"],
+                            cantidad * float(row["costo_unitario"] or 0)
+                        )
+                    else:
+                        movs.agregar(
+                            row["producto"], row["fecha"], ORIGEN_SALIDA, row["id"],
+                            -cantidad, row["unidad_base"]
+                        )
+        finally:
+            close_connection(conn)
+
+        return movs.cerrar()
+
+    def comparar(self, movs: Optional[Movimientos] = None, tolerancia: float = 1e-4) -> Dict[str, Any]:
+        """
+        Reconstruye y compara con el inventario actual (no escribe).
+
+        Args:
+            movs: Movimientos ya cargados (None = leer de la BD)
+            tolerancia: Diferencia mínima para considerar un producto desfasado
+
+        Un producto con costo_ambiguo sólo se compara por stock: su costo
+        reconstruido depende del orden de movimientos del mismo segundo.
+
+        Returns:
+            Dict con 'diferencias' (lista por producto), 'sin_historial',
+            'costo_ambiguo' (productos), 'descartados', 'movimientos' y tiempos
+        """
+        t0 = time.perf_counter()
+        if movs is None:
+            movs = self.cargar_movimientos()
+        t1 = time.perf_counter()
+        resultado = reconstruir(movs)
+        t2 = time.perf_counter()
+
+        actual = self._inventario_actual()
+
+        diferencias = []
+        for i, producto in enumerate(movs.nombres):
+            if not resultado["movimientos"][i]:
+                continue
+
+            stock = float(resultado["stock"][i])
+            costo = float(resultado["costo"][i])
+            ambiguo = bool(resultado["costo_ambiguo"][i])
+            fila = actual.get(producto)
+            stock_actual = float(fila["cantidad_stock"]) if fila else None
+            costo_actual = float(fila["costo_promedio_ponderado"]) if fila else None
+
+            desfasado = (
+                fila is None
+                or abs(stock - stock_actual) > tolerancia
+                or (not ambiguo and abs(costo - costo_actual) > tolerancia)
+            )
+            if not desfasado:
+                continue
+
+            diferencias.append({
+                "producto": producto,
+                "unidad_base": resultado["unidad_base"][i],
+                "stock_actual": stock_actual,
+                "stock_reconstruido": stock,
+                "costo_actual": costo_actual,
+                "costo_reconstruido": costo,
+                "movimientos": int(resultado["movimientos"][i]),
+                "salidas_sin_stock": int(resultado["negativos"][i]),
+                "costo_ambiguo": ambiguo,
+            })
+
+        con_historial = {p for i, p in enumerate(movs.nombres) if resultado["movimientos"][i]}
+
+        return {
+            "diferencias": diferencias,
+            "sin_historial": sorted(set(actual) - con_historial),
+            "costo_ambiguo": [
+                p for i, p in enumerate(movs.nombres) if resultado["costo_ambiguo"][i]
+            ],
+            "descartados": resultado["descartados"],
+            "movimientos": len(movs),
+            "productos": len(con_historial),
+            "segundos_lectura": t1 - t0,
+            "segundos_calculo": t2 - t1,
+        }
+
+    def aplicar(self, reporte: Dict[str, Any]) -> int:
+        """
+        Escribe la instantánea corregida en una transacción.
+
+        Sólo toca productos con historial; los que no tienen (p. ej.
+        cargados antes del ledger sin compras) se dejan como están. Un
+        stock reconstruido negativo se guarda como 0. Con costo_ambiguo se
+        corrige sólo el stock y se conserva el costo actual.
+
+        Args:
+            reporte: Resultado de comparar()
+
+        Returns:
+            int: Productos actualizados o insertados
+        """
+        diferencias = reporte["diferencias"]
+        if not diferencias:
+            return 0
+
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            with conn.cursor() as cursor:
+                existentes = [d for d in diferencias if d["stock_actual"] is not None]
+                nuevos = [d for d in diferencias if d["stock_actual"] is None]
+
+                if existentes:
+                    cursor.executemany(
+                        """UPDATE inventario
+                           SET cantidad_stock = %s, costo_promedio_ponderado = %s, unidad_base = %s
+                           WHERE producto = %s""",
+                        [
+                            (
+                                max(d["stock_reconstruido"], 0.0),
+                                d["costo_actual"] if d["costo_ambiguo"] else d["costo_reconstruido"],
+                                d["unidad_base"], d["producto"]
+                            )
+                            for d in existentes
+                        ]
+                    )
+
+                if nuevos:
+                    cursor.executemany(
+                        """INSERT INTO inventario
+                           (producto, cantidad_stock, unidad_base, costo_promedio_ponderado)
+                           VALUES (%s, %s, %s, %s)""",
+                        [
+                            (
+                                d["producto"], max(d["stock_reconstruido"], 0.0),
+                                d["unidad_base"], d["costo_reconstruido"]
+                            )
+                            for d in nuevos
+                        ]
+                    )
+
+                # Dejar constancia de la corrección en el ledger
+                for d in diferencias:
+                    delta = max(d["stock_reconstruido"], 0.0) - (d["stock_actual"] or 0.0)
+                    MovimientosBackend.registrar_movimiento(
+                        cursor, d["producto"], TIPO_AJUSTE, delta, None, DOCUMENTO_RECONSTRUCCION
+                    )
+
+            conn.commit()
+        except Exception as e:
+            logger.error(f"❌ Error aplicando reconstrucción: {e}")
+            conn.rollback()
+            raise
+        finally:
+            close_connection(conn)
+
+        event_bus.publish(
+            *(StockChanged(d["producto"]) for d in diferencias),
+            *(CostChanged(d["producto"]) for d in diferencias)
+        )
+        self.logger.info(f"✅ Inventario reconstruido: {len(diferencias)} productos corregidos")
+        return len(diferencias)
+
+    # ============================================
+    # AUXILIARES
+    # ============================================
+
+    def _stream(self, cursor):
+        """Itera el resultado por lotes (fetchmany)"""
+        while True:
+            rows = cursor.fetchmany(self.FETCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+
+    @staticmethod
+    def _inventario_actual() -> Dict[str, Dict]:
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT producto, cantidad_stock, costo_promedio_ponderado FROM inventario"
+                )
+                return {row["producto"]: row for row in cursor.fetchall() or []}
+        finally:
+            close_connection(conn)
@@ -9,17 +9,20 @@ from typing import Tuple, Dict, List
 from datetime import datetime
 
 from Core.Common.database import get_connection, close_connection, DatabaseManager
-from Core.Common.config import load_config, save_config
+from Core.Common.config import load_config, save_config, reload_config
 from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class, get_performance_monitor, memory_profiler
+from Core.Common.query_profiler import query_profiler
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
+@monitor_class
 class SettingsBackend:
     """Backend centralizado de configuración"""
     
     def __init__(self):
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
     
     # ============================================
     # BASE DE DATOS
@@ -28,6 +31,8 @@ class SettingsBackend:
     def test_db_connection(self) -> Tuple[bool, str]:
         """Prueba conexión a BD"""
         try:
+            # Toma cambios hechos a mano en app_config.json
+            reload_config()
             conn = get_connection()
             if conn:
                 close_connection(conn)
@@ -52,23 +57,8 @@ class SettingsBackend:
                 }
             
             with conn.cursor() as cursor:
-                # Contar tablas
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM information_schema.tables 
-                    WHERE table_schema = DATABASE()
-                """)
-                result1 = cursor.fetchone()
-                tables = result1.get('count', 0) if result1 else 0
-                
-                # Contar filas (aproximado)
-                cursor.execute("""
-                    SELECT SUM(table_rows) as total 
-                    FROM information_schema.tables 
-                    WHERE table_schema = DATABASE()
-                """)
-                result2 = cursor.fetchone()
-                rows = result2.get('total', 0) if result2 else 0
+                # Contar tablas y filas según el motor (MySQL: aproximado)
+                tables, rows = DatabaseManager.get_engine().table_stats(cursor)
             
             close_connection(conn)
             
@@ -109,7 +99,9 @@ class SettingsBackend:
                     'subproducto_producciones', 'produccion_detalles',
                     'producto_final_subproductos', 'productos_finales',
                     'subproducto_ingredientes', 'subproductos',
-                    'inventario', 'clientes', 'efectivo_movimientos'
+                    'inventario', 'clientes', 'efectivo_movimientos',
+                    'inventario_movimientos', 'inventario_snapshot_items',
+                    'inventario_snapshots'
                 ]
                 
                 for table in tables_to_clear:
@@ -319,6 +311,42 @@ class SettingsBackend:
             self.logger.error(f"Error: {e}")
             return False, f"❌ Error: {str(e)[:100]}"
     
+    # ============================================
+    # RENDIMIENTO
+    # ============================================
+    
+    def get_performance_report(self, limit: int = 10) -> List[Dict]:
+        """Métodos de backend con más tiempo acumulado (p50/p95/p99 en segundos)"""
+        return get_performance_monitor().report(limit)
+    
+    def export_performance_report(self) -> Tuple[bool, str]:
+        """
+        Exporta el reporte de rendimiento completo a JSON (y los de
+        consultas SQL y memoria por página si están activos).
+        """
+        try:
+            folder = self.get_db_folder()
+            os.makedirs(folder, exist_ok=True)
+            
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filenames = [f"rendimiento_{stamp}.json"]
+            get_performance_monitor().dump_json(os.path.join(folder, filenames[0]))
+            
+            if query_profiler.enabled:
+                filenames.append(f"consultas_{stamp}.json")
+                query_profiler.dump_json(os.path.join(folder, filenames[1]))
+            
+            if memory_profiler.enabled:
+                filenames.append(f"memoria_{stamp}.json")
+                memory_profiler.dump_json(os.path.join(folder, filenames[-1]))
+            
+            self.logger.info(f"✅ Reporte de rendimiento exportado: {', '.join(filenames)}")
+            return True, f"✅ Exportado: {', '.join(filenames)}"
+        
+        except Exception as e:
+            self.logger.error(f"Error: {e}")
+            return False, f"❌ Error: {str(e)[:100]}"
+    
     # ============================================
     # SISTEMA
     # ============================================
@@ -3,15 +3,21 @@ Core.Backends.ventas_backend - Backend de ventas
 Corrección de Decimal/Float
 """
 
-import pymysql
-from Core.Common.database import get_connection, close_connection
-from decimal import Decimal
+from Core.Common.database import get_connection, close_connection, INTEGRITY_ERRORS
 from Core.Common.logger import setup_logger
+from Core.Common.optimization_utils import monitor_class
+from Core.Common.money import Money, Cost
+from Core.Common.event_bus import event_bus, SaleRegistered, PriceChanged
+from Core.Common.warm_cache import warm_cache
 from Core.Backends.produccion_backend import ProduccionBackend
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
+@monitor_class
 class VentasBackend:
+    # Clave de caché de clientes (memoria + instantánea en disco)
+    CACHE_KEY_CLIENTES = "clientes"
+
     def __init__(self):
         self.prod_backend = ProduccionBackend()
         logger.info("VentasBackend inicializado")
@@ -26,9 +32,10 @@ class VentasBackend:
             with conn.cursor() as cursor:
                 cursor.execute("INSERT INTO clientes (nombre) VALUES (%s)", (nombre_cliente,))
             conn.commit()
+            warm_cache.invalidate(self.CACHE_KEY_CLIENTES)
             logger.info(f"✅ Cliente '{nombre_cliente}' creado")
         
-        except pymysql.IntegrityError:
+        except INTEGRITY_ERRORS:
             logger.warning(f"Cliente '{nombre_cliente}' ya existe")
             raise ValueError("Este cliente ya existe")
         
@@ -41,10 +48,23 @@ class VentasBackend:
             close_connection(conn)
 
     def get_clientes(self, only_active=False):
-        """Obtiene clientes"""
+        """Obtiene clientes (con caché)"""
+        try:
+            rows = warm_cache.get_or_fetch(self.CACHE_KEY_CLIENTES)
+        except Exception as e:
+            logger.error(f"❌ Error: {e}")
+            return []
+        
+        if only_active:
+            return [r for r in rows if r.get("active", 1) == 1]
+        return list(rows)
+
+    @staticmethod
+    def _fetch_clientes():
+        """Lee todos los clientes de la BD (sin caché)"""
         conn = get_connection()
         if not conn:
-            return []
+            raise ConnectionError("No hay conexión")
         
         try:
             with conn.cursor() as cursor:
@@ -52,20 +72,13 @@ class VentasBackend:
                 has_active = bool(cursor.fetchone())
                 
                 if has_active:
-                    if only_active:
-                        cursor.execute("SELECT id, nombre, active FROM clientes WHERE active = 1 ORDER BY nombre")
-                    else:
-                        cursor.execute("SELECT id, nombre, active FROM clientes ORDER BY nombre")
+                    cursor.execute("SELECT id, nombre, active FROM clientes ORDER BY nombre")
                     return cursor.fetchall()
                 else:
                     cursor.execute("SELECT id, nombre FROM clientes ORDER BY nombre")
                     rows = cursor.fetchall()
                     return [{"id": r["id"], "nombre": r["nombre"], "active": 1} for r in rows]
         
-        except Exception as e:
-            logger.error(f"❌ Error: {e}")
-            return []
-        
         finally:
             close_connection(conn)
 
@@ -91,6 +104,7 @@ class VentasBackend:
                 cursor.execute("UPDATE clientes SET active = %s WHERE id = %s", (new_state, cliente_id))
             
             conn.commit()
+            warm_cache.invalidate(self.CACHE_KEY_CLIENTES)
             return new_state
         
         except Exception as e:
@@ -117,20 +131,18 @@ class VentasBackend:
                 pid = p.get("id")
                 precio_venta = p.get("precio_venta", None)
                 
-                # ✅ Convertir a float correctamente
-                costo_unitario = float(p.get("costo_unitario_total", 0) or 0)
-                
-                precio_venta_final = float(precio_venta) if precio_venta is not None else 0.0
+                costo_unitario = Cost.of(p.get("costo_unitario_total"))
+                precio_venta_final = Money.of(precio_venta)
                 
-                ganancia = round(precio_venta_final - costo_unitario, 2)
-                ganancia_pct = round((ganancia / costo_unitario * 100), 2) if costo_unitario > 0 else 0
+                ganancia = (precio_venta_final.to_cost() - costo_unitario).to_money()
+                ganancia_pct = round(ganancia.to_cost().ratio(costo_unitario) * 100, 2)
 
                 result.append({
                     "id": pid,
                     "nombre": p.get("nombre"),
-                    "costo_unitario": costo_unitario,
-                    "precio_venta": precio_venta_final,
-                    "ganancia_unitaria": ganancia,
+                    "costo_unitario": float(costo_unitario),
+                    "precio_venta": float(precio_venta_final),
+                    "ganancia_unitaria": float(ganancia),
                     "ganancia_pct": ganancia_pct
                 })
             
@@ -156,16 +168,16 @@ class VentasBackend:
                 if not cursor.fetchone():
                     cursor.execute("ALTER TABLE productos_finales ADD COLUMN precio_venta DECIMAL(10,2) NULL DEFAULT NULL")
                 
-                # ✅ Convertir a float
-                precio_float = float(precio)
+                precio_money = Money.of(precio)
                 
                 cursor.execute(
                     "UPDATE productos_finales SET precio_venta = %s WHERE id = %s",
-                    (round(precio_float, 2), producto_final_id)
+                    (precio_money.to_decimal(), producto_final_id)
                 )
             
             conn.commit()
-            logger.info(f"✅ Precio actualizado: ${precio_float:.2f}")
+            logger.info(f"✅ Precio actualizado: ${precio_money:.2f}")
+            event_bus.publish(PriceChanged(producto_final_id))
             return True
         
         except Exception as e:
@@ -198,7 +210,7 @@ class VentasBackend:
         contabilidad_backend = ContabilidadBackend()  # ✅ AGREGAR
         
         try:
-            total_venta = 0.0
+            total_venta = Money(0)
             
             with conn.cursor() as cursor:
                 cursor.execute("SELECT id, COALESCE(active,1) as active FROM clientes WHERE id = %s", (cliente_id,))
@@ -216,16 +228,16 @@ class VentasBackend:
                 for it in items:
                     producto_id = it["product_id"]
                     cantidad = int(it.get("quantity", 1))
-                    unit_price = float(it.get("unit_price", 0))
-                    subtotal = round(cantidad * unit_price, 2)
+                    unit_price = Money.of(it.get("unit_price", 0))
+                    subtotal = unit_price * cantidad
                     total_venta += subtotal
                     
                     cursor.execute(
                         "INSERT INTO ventas_items (venta_id, producto_final_id, cantidad_vendida, precio_unitario_venta, subtotal) VALUES (%s, %s, %s, %s, %s)",
-                        (venta_id, producto_id, cantidad, unit_price, subtotal)
+                        (venta_id, producto_id, cantidad, unit_price.to_decimal(), subtotal.to_decimal())
                     )
 
-                cursor.execute("UPDATE ventas_cabecera SET total_venta = %s WHERE id = %s", (round(total_venta, 2), venta_id))
+                cursor.execute("UPDATE ventas_cabecera SET total_venta = %s WHERE id = %s", (total_venta.to_decimal(), venta_id))
 
             conn.commit()
             
@@ -247,9 +259,10 @@ class VentasBackend:
                 except Exception as e:
                     logger.warning(f"Error registrando en contabilidad: {e}")
             
-            logger.info(f"✅ Venta registrada: ${total_venta:.2f}")
+            logger.info("✅ Venta registrada: $%.2f", total_venta)
+            event_bus.publish(SaleRegistered(venta_id))
             
-            return {"venta_id": venta_id, "cliente_id": cliente_id, "total": total_venta}
+            return {"venta_id": venta_id, "cliente_id": cliente_id, "total": float(total_venta)}
         
         except Exception as e:
             logger.error(f"❌ Error: {e}")
@@ -355,4 +368,11 @@ class VentasBackend:
             return []
         
         finally:
-            close_connection(conn)
\ No newline at end of file
+            close_connection(conn)
+
+
+warm_cache.register(
+    VentasBackend.CACHE_KEY_CLIENTES,
+    tables=("clientes",),
+    loader=VentasBackend._fetch_clientes
+)
@@ -2,7 +2,7 @@
 Core.Common - Utilidades y funciones comunes del sistema
 """
 
-from Core.Common.config import load_config, save_config, get_db_config
+from Core.Common.config import load_config, save_config, get_db_config, reload_config
 from Core.Common.logger import setup_logger
 from Core.Common.constants import *
 from Core.Common.database import get_connection, close_connection
@@ -12,15 +12,31 @@ from Core.Common.units import (
     get_unit_choices_by_category,
     get_base_unit,
     convert_to_base,
+    convert_to_base_exact,
+    convert_array_to_base,
     convert_from_base,
+    lookup_unit,
     calculate_cost_per_base_unit
 )
 from Core.Common.data_cache import app_cache
+from Core.Common.event_bus import (
+    event_bus,
+    DomainEvent,
+    StockChanged,
+    CostChanged,
+    RecipeChanged,
+    SaleRegistered,
+    PriceChanged,
+    ProductionCreated,
+    ReferenceDataRefreshed
+)
+from Core.Common.warm_cache import warm_cache
 
 __all__ = [
     'load_config',
     'save_config',
     'get_db_config',
+    'reload_config',
     'setup_logger',
     'get_connection',
     'close_connection',
@@ -29,7 +45,20 @@ __all__ = [
     'get_unit_choices_by_category',
     'get_base_unit',
     'convert_to_base',
+    'convert_to_base_exact',
+    'convert_array_to_base',
     'convert_from_base',
+    'lookup_unit',
     'calculate_cost_per_base_unit',
-    'app_cache'
+    'app_cache',
+    'event_bus',
+    'DomainEvent',
+    'StockChanged',
+    'CostChanged',
+    'RecipeChanged',
+    'SaleRegistered',
+    'PriceChanged',
+    'ProductionCreated',
+    'ReferenceDataRefreshed',
+    'warm_cache'
 ]
\ No newline at end of file
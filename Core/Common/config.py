@@ -2,9 +2,11 @@
 Core.Common.config - Gestión de configuración de la aplicación
 """
 
+import copy
 import json
 import os
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Optional
 
 DEFAULT_CONFIG = {
     "db": {
@@ -13,7 +15,9 @@ DEFAULT_CONFIG = {
         "user": "pp",
         "password": "1234",
         "database": "economia_oficial",
-        "charset": "utf8mb4"
+        "charset": "utf8mb4",
+        "engine": "mysql",
+        "sqlite_path": "database/economia.sqlite3"
     },
     "user": {
         "current_user_id": None,
@@ -37,24 +41,122 @@ _CONFIG_PATH = os.path.join(
 )
 
 
+class ConfigStore:
+    """
+    app_config.json en memoria.
+    
+    - Se lee una vez; load_config() revalida con un stat (mtime y tamaño)
+      y sólo vuelve a parsear si el archivo cambió
+    - save_config() actualiza la copia en memoria sin releer
+    - get_db_config() no toca el disco: abrir conexiones no hace I/O
+    - version cambia con cada carga distinta, para quien cachea derivados
+      (DatabaseManager.get_engine)
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.version = 0
+        self._config: Optional[Dict[str, Any]] = None
+        self._firma = None
+        self._lock = threading.Lock()
+    
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _guardar_en_memoria(self, cfg: Dict[str, Any], firma):
+        self._config = _deep_merge(DEFAULT_CONFIG, cfg)
+        self._firma = firma
+        self.version += 1
+    
+    def _leer(self, firma):
+        """Relee el archivo (con el lock tomado)"""
+        cfg = {}
+        if firma is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    cfg = json.load(f)
+            except Exception as e:
+                # Se guarda igual la firma: no se reintenta hasta que el archivo cambie
+                print(f"⚠️ Error cargando config: {e}")
+                cfg = {}
+        self._guardar_en_memoria(cfg, firma)
+    
+    def get(self, revalidar: bool = True) -> Dict[str, Any]:
+        """
+        Configuración en memoria (sin copiar: no modificar).
+        
+        Args:
+            revalidar: Comparar antes con el archivo (un stat)
+        """
+        if self._config is not None and not revalidar:
+            return self._config
+        
+        firma = self._stat()
+        if self._config is None or firma != self._firma:
+            with self._lock:
+                if self._config is None or firma != self._firma:
+                    self._leer(firma)
+        return self._config
+    
+    def reload(self) -> Dict[str, Any]:
+        """Relee el archivo aunque no parezca haber cambiado"""
+        with self._lock:
+            self._leer(self._stat())
+        return self._config
+    
+    def save(self, cfg: Dict[str, Any]) -> bool:
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._lock:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(cfg, f, indent=2, ensure_ascii=False)
+                self._guardar_en_memoria(copy.deepcopy(cfg), self._stat())
+            return True
+        except Exception as e:
+            print(f"❌ Error guardando config: {e}")
+            return False
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Combina override sobre base recursivamente: una sección parcial
+    (p. ej. "db" sin "engine") conserva los defaults que no menciona.
+    """
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+# Instancia global
+config_store = ConfigStore(_CONFIG_PATH)
+
+
 def load_config() -> Dict[str, Any]:
     """
-    Carga configuración desde archivo o retorna default.
+    Carga configuración (desde memoria si el archivo no cambió).
     
     Returns:
-        Dict con configuración
+        Dict con configuración (copia: se puede modificar y pasar a save_config)
+    """
+    return copy.deepcopy(config_store.get())
+
+
+def reload_config() -> Dict[str, Any]:
     """
-    try:
-        if os.path.exists(_CONFIG_PATH):
-            with open(_CONFIG_PATH, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-            merged = DEFAULT_CONFIG.copy()
-            merged.update(cfg)
-            return merged
-    except Exception as e:
-        print(f"⚠️ Error cargando config: {e}")
+    Fuerza a releer app_config.json (p. ej. tras editarlo a mano).
     
-    return DEFAULT_CONFIG.copy()
+    Returns:
+        Dict con configuración
+    """
+    return copy.deepcopy(config_store.reload())
 
 
 def save_config(cfg: Dict[str, Any]) -> bool:
@@ -67,24 +169,23 @@ def save_config(cfg: Dict[str, Any]) -> bool:
     Returns:
         bool: True si fue exitoso
     """
-    try:
-        os.makedirs(os.path.dirname(_CONFIG_PATH), exist_ok=True)
-        with open(_CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2, ensure_ascii=False)
-        return True
-    except Exception as e:
-        print(f"❌ Error guardando config: {e}")
-        return False
+    return config_store.save(cfg)
 
 
 def get_db_config() -> Dict[str, Any]:
     """
-    Obtiene configuración de base de datos.
+    Obtiene configuración de base de datos (sin acceder al disco una
+    vez cargada; refleja save_config, reload_config y load_config).
     
     Returns:
         Dict con config de BD
     """
-    return load_config().get("db", DEFAULT_CONFIG["db"])
+    return dict(config_store.get(revalidar=False).get("db") or DEFAULT_CONFIG["db"])
+
+
+def config_version() -> int:
+    """Cambia cada vez que la configuración en memoria se reemplaza"""
+    return config_store.version
 
 
 def update_config(key: str, value: Any) -> bool:
@@ -3,10 +3,28 @@ Core.Common.constants - Constantes centralizadas del sistema
 """
 
 import os
-from dotenv import load_dotenv
+
+
+def _cargar_dotenv():
+    """
+    Carga el .env más cercano (este directorio o los superiores, como
+    find_dotenv). python-dotenv sólo se importa si el archivo existe.
+    """
+    carpeta = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        ruta = os.path.join(carpeta, ".env")
+        if os.path.isfile(ruta):
+            from dotenv import load_dotenv
+            load_dotenv(ruta)
+            return
+        padre = os.path.dirname(carpeta)
+        if padre == carpeta:
+            return
+        carpeta = padre
+
 
 # Cargar variables de entorno
-load_dotenv()
+_cargar_dotenv()
 
 # ============================================
 # APLICACIÓN
@@ -84,6 +102,38 @@ LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 10485760))  # 10MB
 LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 5))
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Niveles por logger: cada módulo loguea como "economia_app.<__name__>"; se
+# acepta el nombre con o sin prefijo y un paquete aplica a sus módulos, ej.
+# "Core.Backends=DEBUG,Core.Common.database=WARNING"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Archivo JSON-lines adicional (vacío = deshabilitado)
+LOG_JSON_FILE = os.getenv("LOG_JSON_FILE", "")
+
+# ============================================
+# PERFILADO DE CONSULTAS
+# ============================================
+QUERY_PROFILER = os.getenv("QUERY_PROFILER", "False").lower() in ("1", "true")
+# Repeticiones de una misma consulta en una acción de UI que se reportan como N+1
+QUERY_N_PLUS_ONE = int(os.getenv("QUERY_N_PLUS_ONE", 10))
+
+# ============================================
+# GRABACIÓN DE CARGA (scripts/replay_workload.py)
+# ============================================
+WORKLOAD_RECORD = os.getenv("WORKLOAD_RECORD", "False").lower() in ("1", "true")
+WORKLOAD_DIR = os.getenv("WORKLOAD_DIR", "workloads")
+
+# ============================================
+# MEMORIA POR PÁGINA (Ctrl+Shift+M lo activa / reporta en la app)
+# ============================================
+MEMORY_TRACKING = os.getenv("MEMORY_TRACKING", "False").lower() in ("1", "true")
+
+# ============================================
+# ARRANQUE (Core/Common/startup_timeline.py)
+# ============================================
+# Línea JSON por arranque (vacío = sólo el log)
+STARTUP_LOG = os.getenv("STARTUP_LOG", "logs/startup.jsonl")
+# Objetivo de tiempo hasta interactivo (desde que Main.py empieza a importar)
+STARTUP_TARGET_MS = int(os.getenv("STARTUP_TARGET_MS", 2000))
 
 # ============================================
 # CACHÉ
@@ -93,6 +143,16 @@ CACHE_TTL_DEFAULT = int(os.getenv("CACHE_TTL_DEFAULT", 600))  # 10 min
 CACHE_TTL_INVENTORY = int(os.getenv("CACHE_TTL_INVENTORY", 300))  # 5 min
 CACHE_TTL_PRODUCTS = int(os.getenv("CACHE_TTL_PRODUCTS", 600))  # 10 min
 
+# Caché persistente en disco (datos de referencia para arranque en frío)
+WARM_CACHE_ENABLED = os.getenv("WARM_CACHE_ENABLED", "True").lower() == "true"
+WARM_CACHE_FILE = os.getenv("WARM_CACHE_FILE", "warm_cache.sqlite3")
+
+# ============================================
+# LEDGER DE INVENTARIO
+# ============================================
+# Movimientos desde el último snapshot antes de crear otro
+LEDGER_SNAPSHOT_EVERY = int(os.getenv("LEDGER_SNAPSHOT_EVERY", 1000))
+
 # ============================================
 # EXPORTACIÓN
 # ============================================
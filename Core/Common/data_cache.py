@@ -7,7 +7,7 @@ from typing import Any, Optional, Dict, Callable
 import threading
 from Core.Common.logger import setup_logger
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class DataCache:
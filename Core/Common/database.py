@@ -2,14 +2,17 @@
 Core.Common.database - Gestión de conexiones y pool de base de datos
 """
 
-import pymysql
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict
 
 from Core.Common.logger import setup_logger
-from Core.Common.config import get_db_config
+from Core.Common.config import get_db_config, config_version
+from Core.Common.query_profiler import query_profiler
+from Core.Database.engines import (
+    StorageEngine, create_engine, DATABASE_ERRORS, INTEGRITY_ERRORS
+)
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 # ============================================
@@ -23,6 +26,12 @@ class DatabaseManager:
     _connection = None
     _tables_created = False
     
+    # Motor de almacenamiento (según "db.engine" de app_config.json)
+    _engine: Optional[StorageEngine] = None
+    _engine_key = None
+    _engine_version = None
+    _engine_override: Optional[StorageEngine] = None
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DatabaseManager, cls).__new__(cls)
@@ -61,7 +70,46 @@ class DatabaseManager:
             return False
     
     @classmethod
-    def get_connection(cls) -> Optional[pymysql.Connection]:
+    def get_engine(cls) -> StorageEngine:
+        """
+        Obtiene el motor de almacenamiento activo.
+        
+        Se recrea sólo si cambia la sección "db" de la configuración.
+        
+        Returns:
+            StorageEngine: Motor MySQL o SQLite
+        """
+        if cls._engine_override is not None:
+            return cls._engine_override
+        
+        # Mientras la configuración en memoria no cambie, ni se compara
+        version = config_version()
+        if cls._engine is not None and version == cls._engine_version:
+            return cls._engine
+        
+        cfg = get_db_config()
+        key = tuple(sorted((k, str(v)) for k, v in cfg.items()))
+        
+        if cls._engine is None or key != cls._engine_key:
+            cls._engine = create_engine(cfg)
+            cls._engine_key = key
+            logger.info(f"🗄️ Motor de BD: {cls._engine.describe()}")
+        cls._engine_version = version
+        
+        return cls._engine
+    
+    @classmethod
+    def set_engine(cls, engine: Optional[StorageEngine]):
+        """
+        Fuerza un motor en tiempo de ejecución (benchmarks, scripts).
+        
+        Args:
+            engine: Motor a usar, o None para volver a la configuración
+        """
+        cls._engine_override = engine
+    
+    @classmethod
+    def get_connection(cls) -> Optional[Any]:
         """
         Obtiene conexión a la base de datos.
         
@@ -69,20 +117,12 @@ class DatabaseManager:
             Connection: Conexión a BD o None
         """
         try:
-            cfg = get_db_config()
-            connection = pymysql.connect(
-                host=cfg.get("host", "localhost"),
-                user=cfg.get("user", "pp"),
-                database=cfg.get("database", "economia_oficial"),
-                password=cfg.get("password", "1234"),
-                charset=cfg.get("charset", "utf8mb4"),
-                cursorclass=pymysql.cursors.DictCursor,
-            )
+            connection = cls.get_engine().connect()
             
             logger.debug("✓ Conexión a BD establecida")
-            return connection
+            return query_profiler.wrap(connection)
         
-        except pymysql.Error as e:
+        except DATABASE_ERRORS + (RuntimeError,) as e:
             logger.error(f"❌ Error obteniendo conexión a BD: {e}")
             return None
     
@@ -105,7 +145,7 @@ class DatabaseManager:
 # FUNCIONES GLOBALES
 # ============================================
 
-def get_connection() -> Optional[pymysql.Connection]:
+def get_connection() -> Optional[Any]:
     """
     Obtiene una conexión nueva a la base de datos.
     
@@ -115,7 +155,7 @@ def get_connection() -> Optional[pymysql.Connection]:
     return DatabaseManager.get_connection()
 
 
-def close_connection(connection: Optional[pymysql.Connection]):
+def close_connection(connection: Optional[Any]):
     """
     Cierra una conexión.
     
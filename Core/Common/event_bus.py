@@ -0,0 +1,284 @@
+"""
+Core.Common.event_bus - Bus de eventos de dominio (publish/subscribe en proceso)
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Type
+
+from Core.Common.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# ============================================
+# EVENTOS DE DOMINIO
+# ============================================
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """Evento base. Los eventos son inmutables y comparables (para coalescer)."""
+
+
+@dataclass(frozen=True)
+class StockChanged(DomainEvent):
+    """El stock o el costo promedio de un producto de inventario cambió"""
+    producto: str
+
+
+@dataclass(frozen=True)
+class CostChanged(DomainEvent):
+    """El costo promedio ponderado de un producto de inventario pudo cambiar (compra)"""
+    producto: str
+
+
+@dataclass(frozen=True)
+class RecipeChanged(DomainEvent):
+    """Se creó o eliminó una receta (subproducto o producto final)"""
+    subproducto_id: Optional[int] = None
+    producto_final_id: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class SaleRegistered(DomainEvent):
+    """Se registró una venta (cabecera + items)"""
+    venta_id: int
+
+
+@dataclass(frozen=True)
+class PriceChanged(DomainEvent):
+    """Cambió el precio de venta de un producto final"""
+    producto_final_id: int
+
+
+@dataclass(frozen=True)
+class ProductionCreated(DomainEvent):
+    """Se registró una producción de un subproducto"""
+    subproducto_id: int
+
+
+@dataclass(frozen=True)
+class ReferenceDataRefreshed(DomainEvent):
+    """Se recargó un conjunto de datos de referencia (caché caliente)"""
+    clave: str
+
+
+Callback = Callable[[List[DomainEvent]], Any]
+
+
+# ============================================
+# BUS DE EVENTOS
+# ============================================
+
+class EventBus:
+    """
+    Bus publish/subscribe ligero y thread-safe.
+
+    Características:
+    - Suscriptores inmediatos (cachés): se llaman en el mismo hilo al publicar
+    - Suscriptores diferidos (UI): reciben los eventos coalescidos una vez
+      por frame de Tk, sin duplicados y en orden de publicación
+    - Sin Tk adjunto, los suscriptores diferidos se llaman de forma síncrona
+
+    Todos los callbacks reciben una lista de eventos.
+    """
+
+    # Intervalo de coalescencia (~1 frame a 60 Hz)
+    FRAME_MS = 16
+
+    # Sondeo para eventos publicados desde otros hilos
+    POLL_MS = 100
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._immediate: Dict[Type[DomainEvent], List[Callback]] = {}
+        self._deferred: Dict[Type[DomainEvent], List[Callback]] = {}
+        self._pending: List[DomainEvent] = []
+        self._root = None
+        self._flush_scheduled = False
+        self._main_thread = threading.main_thread()
+
+    # ============================================
+    # SUSCRIPCIÓN
+    # ============================================
+
+    def subscribe(
+        self,
+        event_type: Type[DomainEvent],
+        callback: Callback,
+        immediate: bool = False
+    ) -> Callback:
+        """
+        Registra un callback para un tipo de evento.
+
+        Args:
+            event_type: Clase del evento
+            callback: Función que recibe List[DomainEvent]
+            immediate: True para llamarlo al publicar (sin coalescer)
+
+        Returns:
+            El mismo callback (útil como decorador)
+        """
+        registry = self._immediate if immediate else self._deferred
+        with self.lock:
+            callbacks = registry.setdefault(event_type, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+        return callback
+
+    def unsubscribe(self, event_type: Type[DomainEvent], callback: Callback):
+        """Elimina un callback de ambos registros"""
+        with self.lock:
+            for registry in (self._immediate, self._deferred):
+                callbacks = registry.get(event_type, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+    def subscribe_widget(
+        self,
+        widget,
+        event_types: List[Type[DomainEvent]],
+        callback: Callback
+    ):
+        """
+        Suscribe un widget de Tk y lo desuscribe al destruirse.
+
+        Evita que páginas destruidas sigan recibiendo eventos.
+
+        Args:
+            widget: Widget dueño de la suscripción
+            event_types: Tipos de evento a escuchar
+            callback: Función que recibe List[DomainEvent]
+        """
+        for event_type in event_types:
+            self.subscribe(event_type, callback)
+
+        def _on_destroy(event):
+            if event.widget is widget:
+                for event_type in event_types:
+                    self.unsubscribe(event_type, callback)
+
+        widget.bind("<Destroy>", _on_destroy, add="+")
+
+    # ============================================
+    # PUBLICACIÓN
+    # ============================================
+
+    def publish(self, *events: DomainEvent):
+        """
+        Publica uno o más eventos.
+
+        Debe llamarse DESPUÉS del commit de la transacción que los origina.
+        """
+        if not events:
+            return
+
+        for event_type, batch in self._group_by_type(events).items():
+            for callback in self._callbacks(self._immediate, event_type):
+                self._invoke(callback, batch)
+
+        with self.lock:
+            self._pending.extend(events)
+            root = self._root
+
+        if root is None:
+            self.flush()
+        elif threading.current_thread() is self._main_thread:
+            self._schedule_flush()
+
+    def flush(self):
+        """Entrega los eventos pendientes a los suscriptores diferidos"""
+        with self.lock:
+            pending = self._pending
+            self._pending = []
+            self._flush_scheduled = False
+
+        if not pending:
+            return
+
+        # Coalescer: eliminar duplicados conservando el orden
+        unique = list(dict.fromkeys(pending))
+
+        # Un solo llamado por callback aunque escuche varios tipos
+        batches: Dict[Callback, List[DomainEvent]] = {}
+        for event_type, batch in self._group_by_type(unique).items():
+            for callback in self._callbacks(self._deferred, event_type):
+                batches.setdefault(callback, []).extend(batch)
+
+        for callback, batch in batches.items():
+            self._invoke(callback, batch)
+
+    # ============================================
+    # INTEGRACIÓN CON TK
+    # ============================================
+
+    def attach_tk(self, root):
+        """
+        Adjunta la ventana raíz: los eventos diferidos se entregan en el
+        hilo de Tk, coalescidos por frame.
+
+        Args:
+            root: Ventana raíz de Tk
+        """
+        with self.lock:
+            self._root = root
+        root.after(self.POLL_MS, self._poll)
+
+    def detach_tk(self):
+        """Desadjunta la ventana raíz (entrega síncrona)"""
+        with self.lock:
+            self._root = None
+            self._flush_scheduled = False
+        self.flush()
+
+    def _schedule_flush(self):
+        with self.lock:
+            if self._flush_scheduled or self._root is None:
+                return
+            self._flush_scheduled = True
+            root = self._root
+        root.after(self.FRAME_MS, self.flush)
+
+    def _poll(self):
+        """Recoge eventos publicados desde hilos secundarios"""
+        with self.lock:
+            root = self._root
+            has_pending = bool(self._pending)
+
+        if root is None:
+            return
+
+        if has_pending:
+            self._schedule_flush()
+
+        try:
+            root.after(self.POLL_MS, self._poll)
+        except Exception:
+            # La ventana fue destruida
+            self.detach_tk()
+
+    # ============================================
+    # AUXILIARES
+    # ============================================
+
+    @staticmethod
+    def _group_by_type(events) -> Dict[Type[DomainEvent], List[DomainEvent]]:
+        grouped: Dict[Type[DomainEvent], List[DomainEvent]] = {}
+        for event in events:
+            grouped.setdefault(type(event), []).append(event)
+        return grouped
+
+    def _callbacks(self, registry, event_type) -> List[Callback]:
+        with self.lock:
+            return list(registry.get(event_type, []))
+
+    @staticmethod
+    def _invoke(callback: Callback, batch: List[DomainEvent]):
+        try:
+            callback(batch)
+        except Exception as e:
+            logger.error(f"❌ Error en suscriptor de {type(batch[0]).__name__}: {e}")
+
+
+# Instancia global del bus
+event_bus = EventBus()
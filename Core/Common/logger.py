@@ -1,19 +1,37 @@
 """
 Core.Common.logger - Sistema centralizado de logging
+
+Los loggers sólo encolan el registro (QueueHandler); un hilo de fondo
+(QueueListener) lo formatea y escribe en consola, archivo rotativo y,
+opcionalmente, un archivo JSON-lines. El hilo que loguea (el de Tk) nunca
+espera I/O.
 """
 
+import atexit
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
+
 from Core.Common.constants import (
-    LOG_LEVEL, LOG_FILE, LOG_MAX_BYTES, 
+    LOG_LEVEL, LOG_LEVELS, LOG_FILE, LOG_JSON_FILE, LOG_MAX_BYTES,
     LOG_BACKUP_COUNT, LOG_FORMAT, LOG_DATE_FORMAT
 )
 
 
+# ============================================
+# FORMATTERS
+# ============================================
+
 class ColoredFormatter(logging.Formatter):
-    """Formatter con colores para consola"""
-    
+    """Formatter con colores para consola (no modifica el registro)"""
+
     COLORS = {
         'DEBUG': '\033[36m',      # Cyan
         'INFO': '\033[32m',       # Green
@@ -22,60 +40,212 @@ class ColoredFormatter(logging.Formatter):
         'CRITICAL': '\033[41m',   # Red background
         'RESET': '\033[0m'        # Reset
     }
-    
+
     def format(self, record):
+        # El mismo registro lo formatean después otros handlers: se colorea una copia
         log_color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
+        record = logging.makeLogRecord(record.__dict__)
         record.levelname = f"{log_color}{record.levelname}{self.COLORS['RESET']}"
         return super().format(record)
 
 
-def setup_logger(name="economia_app"):
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro (para herramientas de análisis)"""
+
+    def format(self, record):
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+# ============================================
+# COLA
+# ============================================
+
+# Logger raíz: el único con handler; los de cada módulo son hijos
+LOGGER_RAIZ = "economia_app"
+
+# Argumentos que se pueden formatear más tarde sin riesgo: nadie los muta
+# entre el encolado y el listener
+_INMUTABLES = (str, bytes, int, float, bool, type(None), Decimal, date, time, Enum)
+
+
+def _es_inmutable(valor) -> bool:
+    if isinstance(valor, (tuple, frozenset)):
+        return all(_es_inmutable(v) for v in valor)
+    return isinstance(valor, _INMUTABLES)
+
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo que loguea.
+
+    El QueueHandler estándar arma el mensaje (msg % args) antes de encolar;
+    aquí, si todos los args son inmutables, el registro se encola tal cual y
+    el formateo ocurre en el listener. Si alguno es mutable (lista, dict,
+    objeto) se formatea ya: el listener vería el estado posterior.
+    """
+
+    def prepare(self, record):
+        args = record.args
+        if args:
+            valores = args.values() if isinstance(args, dict) else args
+            if not all(_es_inmutable(v) for v in valores):
+                record.msg = record.getMessage()
+                record.args = None
+        return record
+
+
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+
+def nombre_logger(name: str) -> str:
+    """
+    Nombre completo de un logger: todo cuelga de LOGGER_RAIZ.
+
+    "Core.Backends.costos_backend" → "economia_app.Core.Backends.costos_backend"
+    """
+    if name == LOGGER_RAIZ or name.startswith(LOGGER_RAIZ + "."):
+        return name
+    return f"{LOGGER_RAIZ}.{name}"
+
+
+def parse_log_levels(spec: str) -> Dict[str, int]:
+    """
+    Parsea "logger=NIVEL,logger=NIVEL" (entradas inválidas se ignoran).
+
+    Los nombres son módulos (`__name__`) con o sin el prefijo
+    "economia_app."; un paquete aplica a todos sus módulos
+    ("Core.Backends=DEBUG").
+
+    Returns:
+        Dict[str, int]: Nombre completo de logger → nivel numérico
+    """
+    niveles = {}
+    for parte in spec.split(","):
+        nombre, _, nivel = parte.partition("=")
+        nivel = logging.getLevelName(nivel.strip().upper())
+        if nombre.strip() and isinstance(nivel, int):
+            niveles[nombre_logger(nombre.strip())] = nivel
+    return niveles
+
+
+_NIVELES = parse_log_levels(LOG_LEVELS)
+
+
+def _crear_handlers():
+    """Handlers reales (corren en el hilo del listener)"""
+    # Crear directorio de logs si no existe
+    os.makedirs(os.path.dirname(LOG_FILE) or "logs", exist_ok=True)
+
+    # Handler para consola (coloreado)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(ColoredFormatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+
+    # Handler para archivo (rotativo)
+    file_handler = RotatingFileHandler(
+        LOG_FILE,
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT))
+
+    handlers = [console_handler, file_handler]
+
+    # Handler JSON-lines (opcional)
+    if LOG_JSON_FILE:
+        os.makedirs(os.path.dirname(LOG_JSON_FILE) or ".", exist_ok=True)
+        json_handler = RotatingFileHandler(
+            LOG_JSON_FILE,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        json_handler.setFormatter(JsonFormatter())
+        handlers.append(json_handler)
+
+    return handlers
+
+
+def _iniciar_listener():
+    global _listener
+    with _lock:
+        if _listener is None:
+            _listener = QueueListener(_queue, *_crear_handlers(), respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Vacía la cola y detiene el hilo de escritura (se llama al salir)"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+# ============================================
+# API
+# ============================================
+
+def setup_logger(name=LOGGER_RAIZ):
     """
     Configura un logger centralizado con:
     - Console handler (coloreado)
     - File handler (rotativo)
+    - File handler JSON-lines si LOG_JSON_FILE está definido
+    - Nivel propio si aparece en LOG_LEVELS
     - Evita duplicación de handlers
-    
+
+    Cada módulo pide el suyo con `setup_logger(__name__)`: es un hijo de
+    "economia_app" (sin handlers propios, propaga a la raíz) y hereda su
+    nivel salvo que LOG_LEVELS lo fije para él o para su paquete.
+
+    Todos los handlers escriben desde un hilo de fondo; usar formato lazy
+    (`logger.info("Stock: %s", producto)`) para que el mensaje sólo se
+    arme si el nivel está habilitado y fuera del hilo de la UI.
+
     Args:
-        name: Nombre del logger
-        
+        name: Nombre del módulo o logger
+
     Returns:
         logging.Logger: Logger configurado
     """
+    name = nombre_logger(name)
     logger = logging.getLogger(name)
-    
+
+    if name != LOGGER_RAIZ:
+        setup_logger(LOGGER_RAIZ)
+        return logger
+
     # Evitar duplicación de handlers
     if logger.handlers:
         return logger
-    
-    # Nivel de logging
+
+    _iniciar_listener()
+
+    # Nivel de logging (raíz y loggers/paquetes de LOG_LEVELS)
     logger.setLevel(LOG_LEVEL)
+    for nombre, nivel in _NIVELES.items():
+        logging.getLogger(nombre).setLevel(nivel)
     logger.propagate = False
-    
-    # Crear directorio de logs si no existe
-    os.makedirs(os.path.dirname(LOG_FILE) or "logs", exist_ok=True)
-    
-    # Handler para consola (coloreado)
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(LOG_LEVEL)
-    console_formatter = ColoredFormatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
-    console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # Handler para archivo (rotativo)
-    file_handler = RotatingFileHandler(
-        LOG_FILE,
-        maxBytes=LOG_MAX_BYTES,
-        backupCount=LOG_BACKUP_COUNT,
-        encoding='utf-8'
-    )
-    file_handler.setLevel(LOG_LEVEL)
-    file_formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
-    file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
-    
+    logger.addHandler(_LazyQueueHandler(_queue))
+
     return logger
 
 
 # Logger por defecto
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
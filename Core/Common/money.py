@@ -0,0 +1,214 @@
+"""
+Core.Common.money - Dinero en enteros de punto fijo (centavos y costos a 4 decimales)
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+from typing import Iterable, Union
+
+Numero = Union[int, float, Decimal, str, None]
+
+
+def _div_redondeo(numerador: int, denominador: int) -> int:
+    """División entera redondeando mitades lejos de cero (como ROUND_HALF_UP)"""
+    if denominador < 0:
+        numerador, denominador = -numerador, -denominador
+    cociente = (2 * abs(numerador) + denominador) // (2 * denominador)
+    return cociente if numerador >= 0 else -cociente
+
+
+def _fraccion(valor: Union[float, Decimal]) -> Fraction:
+    """Fracción del valor decimal escrito (1.15 → 115/100, no el binario)"""
+    return Fraction(Decimal(repr(valor)) if isinstance(valor, float) else valor)
+
+
+class _PuntoFijo:
+    """
+    Valor entero en unidades mínimas (raw = valor × SCALE).
+
+    - Suma, resta y multiplicación por enteros son aritmética de int: exactas
+      y más baratas que Decimal
+    - Multiplicar por no enteros o dividir redondea una sola vez (mitad arriba)
+    - Dividir dos valores del mismo tipo devuelve un float (razón)
+    """
+
+    __slots__ = ("raw",)
+
+    SCALE = 1
+    DECIMALS = 0
+
+    def __init__(self, raw: int = 0):
+        self.raw = raw
+
+    # ============================================
+    # CONSTRUCCIÓN
+    # ============================================
+
+    @classmethod
+    def of(cls, value: Numero):
+        """
+        Decodifica un valor de BD, formulario o cálculo.
+
+        Decimal (columnas DECIMAL) es el camino rápido; float y str pasan
+        por su representación decimal para no arrastrar error binario.
+        """
+        if type(value) is Decimal:
+            numerador, denominador = value.as_integer_ratio()
+            return cls(_div_redondeo(numerador * cls.SCALE, denominador))
+        if value is None or value == "":
+            return cls(0)
+        if isinstance(value, _PuntoFijo):
+            return cls(_div_redondeo(value.raw * cls.SCALE, value.SCALE))
+        if isinstance(value, int):
+            return cls(value * cls.SCALE)
+        if isinstance(value, float):
+            value = Decimal(repr(value))
+        elif not isinstance(value, Decimal):
+            value = Decimal(str(value).strip())
+        numerador, denominador = value.as_integer_ratio()
+        return cls(_div_redondeo(numerador * cls.SCALE, denominador))
+
+    @classmethod
+    def sum(cls, valores: Iterable["_PuntoFijo"]):
+        """Suma exacta (enteros) de valores del mismo tipo"""
+        return cls(sum(v.raw for v in valores))
+
+    # ============================================
+    # ARITMÉTICA
+    # ============================================
+
+    def _mismo(self, other) -> int:
+        if isinstance(other, type(self)):
+            return other.raw
+        if isinstance(other, int) and other == 0:
+            # Permite sum() con start=0
+            return 0
+        raise TypeError(
+            f"No se puede operar {type(self).__name__} con {type(other).__name__}"
+        )
+
+    def __add__(self, other):
+        return type(self)(self.raw + self._mismo(other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return type(self)(self.raw - self._mismo(other))
+
+    def __rsub__(self, other):
+        return type(self)(self._mismo(other) - self.raw)
+
+    def __neg__(self):
+        return type(self)(-self.raw)
+
+    def __abs__(self):
+        return type(self)(abs(self.raw))
+
+    def __mul__(self, factor):
+        if isinstance(factor, int):
+            return type(self)(self.raw * factor)
+        if isinstance(factor, (Decimal, float)):
+            factor = _fraccion(factor)
+        if isinstance(factor, Fraction):
+            return type(self)(_div_redondeo(self.raw * factor.numerator, factor.denominator))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, divisor):
+        if isinstance(divisor, type(self)):
+            return self.raw / divisor.raw
+        if isinstance(divisor, int):
+            return type(self)(_div_redondeo(self.raw, divisor))
+        if isinstance(divisor, (Decimal, float)):
+            divisor = _fraccion(divisor)
+            return type(self)(_div_redondeo(self.raw * divisor.denominator, divisor.numerator))
+        return NotImplemented
+
+    def ratio(self, other) -> float:
+        """self / other como float (0.0 si other es cero)"""
+        return self.raw / other.raw if other.raw else 0.0
+
+    # ============================================
+    # COMPARACIÓN
+    # ============================================
+
+    def __eq__(self, other):
+        if isinstance(other, type(self)):
+            return self.raw == other.raw
+        if isinstance(other, int):
+            return self.raw == other * self.SCALE
+        return NotImplemented
+
+    def __lt__(self, other):
+        return self.raw < self._comparable(other)
+
+    def __le__(self, other):
+        return self.raw <= self._comparable(other)
+
+    def __gt__(self, other):
+        return self.raw > self._comparable(other)
+
+    def __ge__(self, other):
+        return self.raw >= self._comparable(other)
+
+    def _comparable(self, other) -> int:
+        if isinstance(other, type(self)):
+            return other.raw
+        if isinstance(other, int):
+            return other * self.SCALE
+        raise TypeError(
+            f"No se puede comparar {type(self).__name__} con {type(other).__name__}"
+        )
+
+    def __hash__(self):
+        return hash((type(self), self.raw))
+
+    def __bool__(self):
+        return self.raw != 0
+
+    # ============================================
+    # SALIDA
+    # ============================================
+
+    def to_decimal(self) -> Decimal:
+        """Valor exacto para insertar en columnas DECIMAL"""
+        return Decimal(self.raw).scaleb(-self.DECIMALS)
+
+    def __float__(self):
+        return self.raw / self.SCALE
+
+    def __str__(self):
+        signo = "-" if self.raw < 0 else ""
+        entero, fraccion = divmod(abs(self.raw), self.SCALE)
+        return f"{signo}{entero}.{fraccion:0{self.DECIMALS}d}"
+
+    def __repr__(self):
+        return f"{type(self).__name__}('{self}')"
+
+    def __format__(self, spec: str):
+        return format(self.to_decimal(), spec) if spec else str(self)
+
+
+class Money(_PuntoFijo):
+    """Importe en centavos (precios de venta, totales, caja)"""
+
+    __slots__ = ()
+
+    SCALE = 100
+    DECIMALS = 2
+
+    def to_cost(self) -> "Cost":
+        return Cost.of(self)
+
+
+class Cost(_PuntoFijo):
+    """Costo unitario a 4 decimales (costo de productos, costo de ventas)"""
+
+    __slots__ = ()
+
+    SCALE = 10_000
+    DECIMALS = 4
+
+    def to_money(self) -> Money:
+        return Money.of(self)
@@ -4,21 +4,54 @@ Core.Common.optimization_utils - Utilidades de optimización y monitoreo
 
 import time
 import functools
+import inspect
+import json
 from typing import Callable, Any, Optional
 from datetime import datetime, timedelta
 import threading
 
 from Core.Common.logger import setup_logger
+from Core.Common.workload_recorder import workload_recorder
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 # ============================================
 # PERFORMANCE MONITORING
 # ============================================
 
+# Histograma logarítmico: 8 sub-buckets por potencia de 2 (error relativo ≤ 12.5%)
+_SUB_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BITS
+_LINEAL = _SUB_BUCKETS * 2
+
+
+def _bucket(ns: int) -> int:
+    """Índice del bucket de una duración en nanosegundos"""
+    if ns < _LINEAL:
+        return ns
+    shift = ns.bit_length() - _SUB_BITS - 1
+    return shift * _SUB_BUCKETS + (ns >> shift)
+
+
+def _limite_superior(indice: int) -> int:
+    """Mayor duración (ns) que cae en el bucket"""
+    if indice < _LINEAL:
+        return indice
+    shift = indice // _SUB_BUCKETS - 1
+    mantisa = indice - shift * _SUB_BUCKETS
+    return ((mantisa + 1) << shift) - 1
+
+
 class PerformanceMonitor:
-    """Monitor de rendimiento para funciones"""
+    """
+    Monitor de rendimiento para funciones.
+
+    - Claves por nombre calificado (`VentasBackend.set_precio_venta`)
+    - Cada hilo acumula en sus propios contadores (sin locks en la llamada);
+      los reportes combinan los de todos los hilos
+    - Histograma logarítmico por función para p50/p95/p99
+    """
     
     def __init__(self, threshold_seconds: float = 1.0):
         """
@@ -26,7 +59,42 @@ class PerformanceMonitor:
             threshold_seconds: Umbral de alerta (segundos)
         """
         self.threshold = threshold_seconds
-        self.metrics = {}
+        self._threshold_ns = int(threshold_seconds * 1e9)
+        self._local = threading.local()
+        # Métricas de cada hilo: [{nombre: [calls, total_ns, min_ns, max_ns, {bucket: n}]}]
+        self._por_hilo = []
+        self._lock = threading.Lock()
+    
+    def _metricas_hilo(self) -> dict:
+        metricas = getattr(self._local, "metricas", None)
+        if metricas is None:
+            metricas = self._local.metricas = {}
+            with self._lock:
+                self._por_hilo.append(metricas)
+        return metricas
+    
+    def record(self, name: str, elapsed_ns: int):
+        """Registra una duración medida fuera del decorator"""
+        metricas = self._metricas_hilo()
+        metric = metricas.get(name)
+        if metric is None:
+            metric = metricas[name] = [0, 0, elapsed_ns, elapsed_ns, {}]
+        
+        metric[0] += 1
+        metric[1] += elapsed_ns
+        if elapsed_ns < metric[2]:
+            metric[2] = elapsed_ns
+        if elapsed_ns > metric[3]:
+            metric[3] = elapsed_ns
+        buckets = metric[4]
+        indice = _bucket(elapsed_ns)
+        buckets[indice] = buckets.get(indice, 0) + 1
+        
+        # Alerta si excede umbral
+        if elapsed_ns > self._threshold_ns:
+            logger.warning(
+                "⏱️ %s tomó %.3fs (umbral: %ss)", name, elapsed_ns / 1e9, self.threshold
+            )
     
     def performance_monitor(self, func: Callable) -> Callable:
         """
@@ -38,48 +106,124 @@ class PerformanceMonitor:
         Returns:
             Función envuelta
         """
+        func_name = func.__qualname__
+        record = self.record
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
-            func_name = func.__name__
-            start_time = time.time()
-            
+            start = time.perf_counter_ns()
             try:
-                result = func(*args, **kwargs)
-                return result
+                return func(*args, **kwargs)
             finally:
-                elapsed = time.time() - start_time
-                
-                # Registrar métrica
-                if func_name not in self.metrics:
-                    self.metrics[func_name] = {
-                        "calls": 0,
-                        "total_time": 0,
-                        "max_time": 0,
-                        "min_time": float('inf'),
-                    }
-                
-                metric = self.metrics[func_name]
-                metric["calls"] += 1
-                metric["total_time"] += elapsed
-                metric["max_time"] = max(metric["max_time"], elapsed)
-                metric["min_time"] = min(metric["min_time"], elapsed)
-                
-                # Alerta si excede umbral
-                if elapsed > self.threshold:
-                    logger.warning(
-                        f"⏱️ {func_name} tomó {elapsed:.3f}s "
-                        f"(umbral: {self.threshold}s)"
-                    )
-                else:
-                    logger.debug(f"✓ {func_name}: {elapsed:.3f}s")
+                record(func_name, time.perf_counter_ns() - start)
         
         return wrapper
     
+    def monitor_class(self, cls: type) -> type:
+        """
+        Decorator de clase: monitorea todos sus métodos públicos
+        (incluye staticmethod y classmethod).
+        """
+        for nombre, atributo in list(vars(cls).items()):
+            if nombre.startswith("_"):
+                continue
+            if isinstance(atributo, (staticmethod, classmethod)):
+                envuelto = type(atributo)(self.performance_monitor(atributo.__func__))
+            elif inspect.isfunction(atributo) and not inspect.isgeneratorfunction(atributo):
+                envuelto = self.performance_monitor(atributo)
+            else:
+                continue
+            setattr(cls, nombre, envuelto)
+        return cls
+    
+    # ============================================
+    # REPORTES
+    # ============================================
+    
+    def _combinar(self) -> dict:
+        """Suma las métricas de todos los hilos"""
+        with self._lock:
+            por_hilo = list(self._por_hilo)
+        
+        combinadas = {}
+        for metricas in por_hilo:
+            for name, (calls, total, minimo, maximo, buckets) in metricas.copy().items():
+                actual = combinadas.get(name)
+                if actual is None:
+                    combinadas[name] = [calls, total, minimo, maximo, dict(buckets)]
+                    continue
+                actual[0] += calls
+                actual[1] += total
+                actual[2] = min(actual[2], minimo)
+                actual[3] = max(actual[3], maximo)
+                for indice, n in buckets.copy().items():
+                    actual[4][indice] = actual[4].get(indice, 0) + n
+        return combinadas
+    
+    @staticmethod
+    def _percentiles(buckets: dict, calls: int, maximo: int, qs=(50, 95, 99)) -> dict:
+        """Percentiles (ns) desde el histograma, acotados por el máximo real"""
+        resultado = {}
+        acumulado = 0
+        pendientes = list(qs)
+        for indice in sorted(buckets):
+            acumulado += buckets[indice]
+            while pendientes and acumulado >= calls * pendientes[0] / 100:
+                resultado[pendientes.pop(0)] = min(_limite_superior(indice), maximo)
+            if not pendientes:
+                break
+        return resultado
+    
     def get_metrics(self, func_name: Optional[str] = None) -> dict:
-        """Obtiene métricas de rendimiento"""
+        """
+        Obtiene métricas de rendimiento (segundos).
+        
+        Returns:
+            {nombre: {calls, total_time, avg_time, min_time, max_time, p50, p95, p99}}
+            o las métricas de func_name ({} si no hay)
+        """
+        metricas = {}
+        for name, (calls, total, minimo, maximo, buckets) in self._combinar().items():
+            if func_name and name != func_name:
+                continue
+            p = self._percentiles(buckets, calls, maximo)
+            metricas[name] = {
+                "calls": calls,
+                "total_time": total / 1e9,
+                "avg_time": total / calls / 1e9,
+                "min_time": minimo / 1e9,
+                "max_time": maximo / 1e9,
+                "p50": p[50] / 1e9,
+                "p95": p[95] / 1e9,
+                "p99": p[99] / 1e9,
+            }
+        
         if func_name:
-            return self.metrics.get(func_name, {})
-        return self.metrics
+            return metricas.get(func_name, {})
+        return metricas
+    
+    def report(self, limit: Optional[int] = None) -> list:
+        """Métricas ordenadas por tiempo total (descendente)"""
+        filas = [
+            {"name": name, **metric} for name, metric in self.get_metrics().items()
+        ]
+        filas.sort(key=lambda m: m["total_time"], reverse=True)
+        return filas[:limit] if limit else filas
+    
+    def dump_json(self, path: str) -> str:
+        """Guarda el reporte en JSON y retorna la ruta"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"generated_at": datetime.now().isoformat(), "metrics": self.report()},
+                f, indent=2, ensure_ascii=False
+            )
+        return path
+    
+    def reset(self):
+        """Descarta las métricas de todos los hilos"""
+        with self._lock:
+            for metricas in self._por_hilo:
+                metricas.clear()
     
     def print_report(self):
         """Imprime reporte de rendimiento"""
@@ -87,15 +231,17 @@ class PerformanceMonitor:
         logger.info("📊 REPORTE DE RENDIMIENTO")
         logger.info("=" * 60)
         
-        for func_name, metric in self.metrics.items():
-            avg_time = metric["total_time"] / metric["calls"] if metric["calls"] > 0 else 0
+        for metric in self.report():
             logger.info(
-                f"\n{func_name}:"
-                f"\n  Llamadas: {metric['calls']}"
-                f"\n  Promedio: {avg_time:.3f}s"
-                f"\n  Máximo: {metric['max_time']:.3f}s"
-                f"\n  Mínimo: {metric['min_time']:.3f}s"
-                f"\n  Total: {metric['total_time']:.3f}s"
+                "\n%s:"
+                "\n  Llamadas: %s"
+                "\n  Promedio: %.3fms"
+                "\n  p50/p95/p99: %.3f / %.3f / %.3fms"
+                "\n  Máximo: %.3fms"
+                "\n  Total: %.3fs",
+                metric["name"], metric["calls"], metric["avg_time"] * 1000,
+                metric["p50"] * 1000, metric["p95"] * 1000, metric["p99"] * 1000,
+                metric["max_time"] * 1000, metric["total_time"]
             )
 
 
@@ -103,6 +249,11 @@ class PerformanceMonitor:
 _perf_monitor = PerformanceMonitor()
 
 
+def get_performance_monitor() -> PerformanceMonitor:
+    """Monitor global usado por monitor_performance y monitor_class"""
+    return _perf_monitor
+
+
 def monitor_performance(func: Callable) -> Callable:
     """
     Decorator global para monitorear rendimiento.
@@ -115,6 +266,20 @@ def monitor_performance(func: Callable) -> Callable:
     return _perf_monitor.performance_monitor(func)
 
 
+def monitor_class(cls: type) -> type:
+    """
+    Decorator global para monitorear todos los métodos públicos de una clase.
+    
+    Usage:
+        @monitor_class
+        class VentasBackend:
+            ...
+    
+    Además deja la clase lista para workload_recorder (inactivo por defecto).
+    """
+    return workload_recorder.instrument_class(_perf_monitor.monitor_class(cls))
+
+
 # ============================================
 # SMART CACHING
 # ============================================
@@ -242,16 +407,46 @@ class RateLimiter:
 # MEMORY PROFILING
 # ============================================
 
-import psutil
+import gc
+import logging
 import os
+import tracemalloc
+from collections import Counter, deque
 
 
 class MemoryProfiler:
-    """Perfilador de memoria"""
+    """
+    Perfilador de memoria.
+    
+    Además del RSS, sigue el ciclo de vida de las páginas: tras destruir la
+    página anterior y tras construir la nueva se toma un snapshot de
+    tracemalloc y se cuentan widgets Tk y objetos por tipo. Dos estados
+    "sin página" consecutivos deberían ser iguales: la diferencia es lo que
+    sobrevivió a la navegación.
+    """
+    
+    def __init__(self, top_n: int = 15, frames: int = 1, ciclos: int = 100):
+        """
+        Args:
+            top_n: Líneas / tipos que se reportan por ciclo
+            frames: Profundidad de traceback que guarda tracemalloc
+            ciclos: Cantidad de navegaciones que se conservan
+        """
+        self.top_n = top_n
+        self.frames = frames
+        self.enabled = False
+        self._tracemalloc_propio = False
+        self._inicial: Optional[dict] = None
+        self._base: Optional[dict] = None
+        self._ciclos = deque(maxlen=ciclos)
+        self._lock = threading.Lock()
     
     @staticmethod
     def get_memory_usage() -> dict:
         """Obtiene uso actual de memoria"""
+        # psutil tarda en importarse: sólo cuando se pide la medición
+        import psutil
+        
         process = psutil.Process(os.getpid())
         info = process.memory_info()
         
@@ -282,6 +477,211 @@ class MemoryProfiler:
             return result
         
         return wrapper
+    
+    @staticmethod
+    def widget_count(root) -> int:
+        """Widgets vivos en el árbol de Tk bajo root"""
+        pendientes = [root]
+        total = 0
+        while pendientes:
+            widget = pendientes.pop()
+            total += 1
+            try:
+                pendientes.extend(widget.winfo_children())
+            except Exception:
+                pass
+        return total
+    
+    # ============================================
+    # CICLO DE VIDA DE PÁGINAS
+    # ============================================
+    
+    def start(self):
+        """Activa el seguimiento (tracemalloc arranca aquí si no estaba)"""
+        with self._lock:
+            if self.enabled:
+                return
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._tracemalloc_propio = True
+            self._inicial = self._base = None
+            self._ciclos.clear()
+            self.enabled = True
+        logger.info("🧠 Seguimiento de memoria por página activado")
+    
+    def stop(self):
+        with self._lock:
+            if not self.enabled:
+                return
+            self.enabled = False
+            self._inicial = self._base = None
+            if self._tracemalloc_propio:
+                tracemalloc.stop()
+                self._tracemalloc_propio = False
+    
+    def _estado(self, root) -> dict:
+        """Snapshot tras recolectar basura: memoria por línea, tipos y widgets"""
+        import tkinter
+        
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        
+        tipos = Counter()
+        widgets_python = 0
+        for objeto in gc.get_objects():
+            tipos[type(objeto)] += 1
+            if isinstance(objeto, tkinter.Misc):
+                widgets_python += 1
+        # Por nombre con módulo (sin los objetos del propio tracemalloc)
+        por_nombre = Counter()
+        for t, n in tipos.items():
+            if t.__module__ != "tracemalloc":
+                por_nombre[t.__qualname__ if t.__module__ == "builtins" else f"{t.__module__}.{t.__qualname__}"] += n
+        
+        return {
+            "snapshot": snapshot,
+            "traced": tracemalloc.get_traced_memory()[0],
+            "tipos": por_nombre,
+            # Objetos widget de Python vs widgets reales de Tk: la diferencia
+            # son widgets destruidos que algo sigue referenciando
+            "widgets_tk": self.widget_count(root) if root is not None else 0,
+            "widgets_python": widgets_python,
+        }
+    
+    def _diferencia(self, actual: dict, anterior: dict) -> dict:
+        """Crecimiento de actual respecto de anterior (top-N por archivo:línea y tipo)"""
+        stats = actual["snapshot"].compare_to(anterior["snapshot"], "lineno")
+        lineas = [
+            {
+                "linea": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                "kb": stat.size_diff / 1024,
+                "bloques": stat.count_diff,
+            }
+            for stat in stats
+            if stat.size_diff > 0
+        ][:self.top_n]
+        return {
+            "kb": (actual["traced"] - anterior["traced"]) / 1024,
+            "lineas": lineas,
+            "tipos": dict((actual["tipos"] - anterior["tipos"]).most_common(self.top_n)),
+            "widgets_tk": actual["widgets_tk"] - anterior["widgets_tk"],
+            "widgets_python": actual["widgets_python"] - anterior["widgets_python"],
+        }
+    
+    def page_destroyed(self, anterior: Optional[str], siguiente: str, root=None):
+        """
+        Llamar con la página anterior ya destruida y antes de construir
+        la siguiente. Compara contra el estado "sin página" previo.
+        """
+        if not self.enabled:
+            return
+        
+        estado = self._estado(root)
+        with self._lock:
+            base, self._base = self._base, estado
+            if self._inicial is None:
+                self._inicial = estado
+        if base is None:
+            return
+        
+        sobrevive = self._diferencia(estado, base)
+        ciclo = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "desde": anterior,
+            "hacia": siguiente,
+            "sobrevive": sobrevive,
+            "construccion_kb": None,
+            "widgets_pagina": None,
+            "rss_mb": self.get_memory_usage()["rss_mb"],
+        }
+        with self._lock:
+            self._ciclos.append(ciclo)
+        
+        nivel = logging.WARNING if sobrevive["kb"] > 256 or sobrevive["widgets_python"] > 0 else logging.DEBUG
+        logger.log(
+            nivel,
+            "🧠 Tras dejar '%s': %+.1f KB y %+d widgets sobreviven (RSS %.1f MB)",
+            anterior, sobrevive["kb"], sobrevive["widgets_python"], ciclo["rss_mb"]
+        )
+    
+    def page_built(self, nombre: str, root=None):
+        """Llamar con la página nueva ya construida: costo de construirla"""
+        if not self.enabled:
+            return
+        
+        with self._lock:
+            base = self._base
+            ciclo = self._ciclos[-1] if self._ciclos and self._ciclos[-1]["hacia"] == nombre else None
+        if base is None:
+            return
+        
+        gc.collect()
+        construccion_kb = (tracemalloc.get_traced_memory()[0] - base["traced"]) / 1024
+        widgets = (self.widget_count(root) if root is not None else 0) - base["widgets_tk"]
+        if ciclo is not None:
+            ciclo["construccion_kb"] = construccion_kb
+            ciclo["widgets_pagina"] = widgets
+        
+        logger.debug("🧠 Página '%s' construida: %+.1f KB, %d widgets", nombre, construccion_kb, widgets)
+    
+    # ============================================
+    # REPORTES
+    # ============================================
+    
+    def report(self) -> dict:
+        """Ciclos recientes y crecimiento acumulado desde el primer estado sin página"""
+        with self._lock:
+            ciclos = list(self._ciclos)
+            inicial, base = self._inicial, self._base
+        
+        acumulado = self._diferencia(base, inicial) if inicial is not None and base is not inicial else None
+        return {"enabled": self.enabled, "ciclos": ciclos, "acumulado": acumulado}
+    
+    def dump_json(self, path: str) -> str:
+        """Guarda el reporte en JSON y retorna la ruta"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"generated_at": datetime.now().isoformat(), **self.report()},
+                f, indent=2, ensure_ascii=False
+            )
+        return path
+    
+    def print_report(self):
+        """Imprime lo que sobrevivió a cada navegación y el acumulado"""
+        reporte = self.report()
+        logger.info("=" * 60)
+        logger.info("🧠 MEMORIA POR NAVEGACIÓN (%d ciclos)", len(reporte["ciclos"]))
+        logger.info("=" * 60)
+        
+        for ciclo in reporte["ciclos"]:
+            logger.info(
+                "%s → %s: sobrevive %+.1f KB / %+d widgets · construcción %s KB · RSS %.1f MB",
+                ciclo["desde"], ciclo["hacia"], ciclo["sobrevive"]["kb"],
+                ciclo["sobrevive"]["widgets_python"],
+                "?" if ciclo["construccion_kb"] is None else f"{ciclo['construccion_kb']:.1f}",
+                ciclo["rss_mb"]
+            )
+        
+        acumulado = reporte["acumulado"]
+        if acumulado:
+            logger.info(
+                "Acumulado: %+.1f KB, %+d widgets Tk, %+d objetos widget",
+                acumulado["kb"], acumulado["widgets_tk"], acumulado["widgets_python"]
+            )
+            for linea in acumulado["lineas"]:
+                logger.info("  %+9.1f KB %+7d  %s", linea["kb"], linea["bloques"], linea["linea"])
+            for tipo, n in acumulado["tipos"].items():
+                logger.info("  %+7d  %s", n, tipo)
+
+
+# Instancia global (seguimiento de páginas)
+memory_profiler = MemoryProfiler()
 
 
 # ============================================
@@ -327,8 +727,11 @@ class BulkOperation:
 __all__ = [
     'PerformanceMonitor',
     'monitor_performance',
+    'monitor_class',
+    'get_performance_monitor',
     'SmartCache',
     'RateLimiter',
     'MemoryProfiler',
+    'memory_profiler',
     'BulkOperation',
 ]
\ No newline at end of file
@@ -0,0 +1,326 @@
+"""
+Core.Common.query_profiler - Perfilador de consultas SQL y detector de N+1
+
+get_connection envuelve la conexión cuando el perfilador está activo
+(QUERY_PROFILER=1 o query_profiler.enable()). Cada consulta se agrupa por
+huella (SQL normalizado) con llamadas, latencia, filas y método de backend
+que la ejecutó. Los handlers de las páginas abren una "acción de UI":
+
+    @ui_action("Precios: cargar")
+    def load_precios(self):
+        ...
+
+y al cerrarla se avisa si una misma huella se repitió más de
+QUERY_N_PLUS_ONE veces (típico N+1).
+"""
+
+import contextvars
+import functools
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ContextDecorator
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from Core.Common.constants import QUERY_PROFILER, QUERY_N_PLUS_ONE
+from Core.Common.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# ============================================
+# HUELLAS
+# ============================================
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%s|\?")
+_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """
+    SQL normalizado: literales y parámetros → ?, listas IN → (?+),
+    espacios colapsados.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMERO.sub("?", sql)
+    sql = _PARAM.sub("?", sql)
+    sql = _LISTA.sub("(?+)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def _llamador() -> str:
+    """Primer método de backend (o el primero fuera de la capa de BD) en la pila"""
+    frame = sys._getframe(2)
+    primero = None
+    while frame is not None:
+        archivo = frame.f_code.co_filename
+        if "Backends" in archivo:
+            return frame.f_code.co_qualname
+        if primero is None and not archivo.endswith(("query_profiler.py", "database.py", "engines.py")):
+            primero = frame.f_code.co_qualname
+        frame = frame.f_back
+    return primero or "?"
+
+
+# ============================================
+# ACCIONES DE UI
+# ============================================
+
+class _Accion:
+    __slots__ = ("nombre", "inicio", "consultas", "total_ns", "huellas")
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self.inicio = time.perf_counter_ns()
+        self.consultas = 0
+        self.total_ns = 0
+        self.huellas: Counter = Counter()
+
+
+_accion_actual: contextvars.ContextVar[Optional[_Accion]] = contextvars.ContextVar(
+    "accion_ui", default=None
+)
+
+
+class ui_action(ContextDecorator):
+    """
+    Agrupa las consultas de una acción de UI (context manager o decorator).
+
+    Las acciones anidadas cuentan en la más externa.
+    """
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        # Un token por entrada (None si la acción ya estaba abierta): una
+        # instancia reutilizada con "with" puede re-entrar
+        self._tokens: List[Optional[contextvars.Token]] = []
+
+    def _recreate_cm(self):
+        # Como decorator, cada llamada usa su propia instancia (hilos, re-entrada)
+        return type(self)(self.nombre)
+
+    def __enter__(self):
+        token = None
+        if query_profiler.enabled and _accion_actual.get() is None:
+            token = _accion_actual.set(_Accion(self.nombre))
+        self._tokens.append(token)
+        return self
+
+    def __exit__(self, *exc):
+        token = self._tokens.pop()
+        if token is not None:
+            accion = _accion_actual.get()
+            _accion_actual.reset(token)
+            query_profiler.cerrar_accion(accion)
+        return False
+
+
+# ============================================
+# PERFILADOR
+# ============================================
+
+class QueryProfiler:
+    """Estadísticas de consultas por huella y por acción de UI"""
+
+    def __init__(self, enabled: bool = False, n_plus_one: int = 10, acciones: int = 200):
+        """
+        Args:
+            enabled: Si get_connection debe envolver las conexiones
+            n_plus_one: Repeticiones de una huella por acción que disparan el aviso
+            acciones: Cantidad de acciones recientes que se conservan
+        """
+        self.enabled = enabled
+        self.n_plus_one = n_plus_one
+        self._lock = threading.Lock()
+        # huella → [calls, total_ns, max_ns, rows, Counter(llamador)]
+        self._consultas: Dict[str, list] = {}
+        self._acciones: deque = deque(maxlen=acciones)
+
+    def enable(self, enabled: bool = True):
+        self.enabled = enabled
+
+    def wrap(self, connection: Any) -> Any:
+        """Envuelve una conexión (no-op si está inactivo o ya envuelta)"""
+        if not self.enabled or connection is None or isinstance(connection, ProfiledConnection):
+            return connection
+        return ProfiledConnection(connection, self)
+
+    # ============================================
+    # REGISTRO
+    # ============================================
+
+    def registrar(self, sql: str, elapsed_ns: int) -> list:
+        """Registra una ejecución y retorna su entrada (para sumar filas)"""
+        huella = fingerprint(sql)
+        llamador = _llamador()
+
+        with self._lock:
+            entrada = self._consultas.get(huella)
+            if entrada is None:
+                entrada = self._consultas[huella] = [0, 0, 0, 0, Counter()]
+            entrada[0] += 1
+            entrada[1] += elapsed_ns
+            entrada[2] = max(entrada[2], elapsed_ns)
+            entrada[4][llamador] += 1
+
+        accion = _accion_actual.get()
+        if accion is not None:
+            accion.consultas += 1
+            accion.total_ns += elapsed_ns
+            accion.huellas[huella] += 1
+
+        return entrada
+
+    def sumar_filas(self, entrada: Optional[list], filas: int):
+        if entrada is not None and filas:
+            with self._lock:
+                entrada[3] += filas
+
+    def cerrar_accion(self, accion: _Accion):
+        """Guarda el resumen de la acción y avisa de consultas repetidas"""
+        repetidas = {h: n for h, n in accion.huellas.items() if n > self.n_plus_one}
+        resumen = {
+            "accion": accion.nombre,
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "duracion_ms": (time.perf_counter_ns() - accion.inicio) / 1e6,
+            "consultas": accion.consultas,
+            "distintas": len(accion.huellas),
+            "sql_ms": accion.total_ns / 1e6,
+            "repetidas": repetidas,
+        }
+        with self._lock:
+            self._acciones.append(resumen)
+
+        for huella, n in repetidas.items():
+            logger.warning("🔁 Posible N+1 en '%s': %d× %s", accion.nombre, n, huella[:120])
+
+        logger.debug(
+            "🔎 %s: %d consultas (%d distintas) en %.1fms",
+            accion.nombre, accion.consultas, len(accion.huellas), resumen["sql_ms"]
+        )
+
+    # ============================================
+    # REPORTES
+    # ============================================
+
+    def report(self) -> Dict[str, List[Dict]]:
+        """Consultas ordenadas por tiempo total y acciones recientes"""
+        with self._lock:
+            consultas = [
+                {
+                    "fingerprint": huella,
+                    "calls": calls,
+                    "total_ms": total / 1e6,
+                    "avg_ms": total / calls / 1e6,
+                    "max_ms": maximo / 1e6,
+                    "rows": filas,
+                    "callers": dict(llamadores.most_common()),
+                }
+                for huella, (calls, total, maximo, filas, llamadores) in self._consultas.items()
+            ]
+            acciones = list(self._acciones)
+
+        consultas.sort(key=lambda c: c["total_ms"], reverse=True)
+        return {"queries": consultas, "actions": acciones}
+
+    def total(self) -> int:
+        """Consultas registradas desde el último reset"""
+        with self._lock:
+            return sum(entrada[0] for entrada in self._consultas.values())
+
+    def dump_json(self, path: str) -> str:
+        """Guarda el reporte en JSON y retorna la ruta"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"generated_at": datetime.now().isoformat(), **self.report()},
+                f, indent=2, ensure_ascii=False
+            )
+        return path
+
+    def reset(self):
+        with self._lock:
+            self._consultas.clear()
+            self._acciones.clear()
+
+
+# ============================================
+# WRAPPERS
+# ============================================
+
+class ProfiledCursor:
+    """Cursor que mide execute/executemany y cuenta filas leídas"""
+
+    def __init__(self, cursor: Any, profiler: QueryProfiler):
+        self._cursor = cursor
+        self._profiler = profiler
+        self._entrada = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self.fetchall() or [])
+
+    def execute(self, query: str, args: Any = None):
+        start = time.perf_counter_ns()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            self._entrada = self._profiler.registrar(query, time.perf_counter_ns() - start)
+
+    def executemany(self, query: str, seq_args: Any):
+        start = time.perf_counter_ns()
+        try:
+            return self._cursor.executemany(query, seq_args)
+        finally:
+            self._entrada = self._profiler.registrar(query, time.perf_counter_ns() - start)
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        self._profiler.sumar_filas(self._entrada, 1 if row is not None else 0)
+        return row
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._profiler.sumar_filas(self._entrada, len(rows) if rows else 0)
+        return rows
+
+    def fetchmany(self, size: int = 1):
+        rows = self._cursor.fetchmany(size)
+        self._profiler.sumar_filas(self._entrada, len(rows) if rows else 0)
+        return rows
+
+    def close(self):
+        self._cursor.close()
+
+
+class ProfiledConnection:
+    """Conexión cuyos cursores quedan instrumentados"""
+
+    def __init__(self, connection: Any, profiler: QueryProfiler):
+        self._connection = connection
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def cursor(self, *args, **kwargs) -> ProfiledCursor:
+        return ProfiledCursor(self._connection.cursor(*args, **kwargs), self._profiler)
+
+
+# Instancia global
+query_profiler = QueryProfiler(enabled=QUERY_PROFILER, n_plus_one=QUERY_N_PLUS_ONE)
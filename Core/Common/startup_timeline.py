@@ -0,0 +1,119 @@
+"""
+Core.Common.startup_timeline - Línea de tiempo del arranque
+
+Main.py la importa antes que nada y marca cada etapa (imports, tema,
+ventana, primer paint, BD, caché, primera página). Al quedar la app
+interactiva se escribe en el log y se agrega una línea JSON a
+STARTUP_LOG, comparando el tiempo hasta interactivo con STARTUP_TARGET_MS.
+
+Sólo usa la biblioteca estándar al importarse: no debe sumar al arranque
+que mide.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+_INICIO = time.perf_counter()
+
+
+class StartupTimeline:
+    """Etapas del arranque con su duración y el instante en que terminaron"""
+
+    def __init__(self, inicio: float):
+        self.inicio = inicio
+        self._ultimo = inicio
+        self.etapas: List[Dict] = []
+        self.primer_paint_ms: Optional[float] = None
+        self.interactivo_ms: Optional[float] = None
+
+    def _ms(self, instante: float) -> float:
+        return (instante - self.inicio) * 1000
+
+    def marcar(self, etapa: str):
+        """Cierra una etapa: dura desde la marca anterior hasta ahora"""
+        ahora = time.perf_counter()
+        self.etapas.append({
+            "etapa": etapa,
+            "ms": (ahora - self._ultimo) * 1000,
+            "hasta_ms": self._ms(ahora),
+        })
+        self._ultimo = ahora
+
+    @contextmanager
+    def medir(self, etapa: str):
+        """Etapa delimitada (lo anterior queda como '(entre etapas)')"""
+        if time.perf_counter() - self._ultimo > 0.001:
+            self.marcar("(entre etapas)")
+        try:
+            yield
+        finally:
+            self.marcar(etapa)
+
+    def al_primer_paint(self, root, callback: Callable[[], None]):
+        """
+        Ejecuta callback cuando la ventana ya se dibujó por primera vez
+        (Map de la raíz + idle: Tk pinta en las tareas idle).
+        """
+        def _mapeada(event):
+            if event.widget is not root or self.primer_paint_ms is not None:
+                return
+            root.unbind("<Map>", id_bind)
+            root.after_idle(_pintada)
+
+        def _pintada():
+            self.marcar("primer paint")
+            self.primer_paint_ms = self.etapas[-1]["hasta_ms"]
+            # after(1): deja que Tk termine de procesar el paint antes del trabajo pesado
+            root.after(1, callback)
+
+        id_bind = root.bind("<Map>", _mapeada, add="+")
+
+    def interactivo(self) -> Dict:
+        """Marca la app como usable: escribe la línea de tiempo y la retorna"""
+        from Core.Common.constants import STARTUP_LOG, STARTUP_TARGET_MS
+        from Core.Common.logger import setup_logger
+
+        logger = setup_logger(__name__)
+        self.marcar("interactivo")
+        self.interactivo_ms = self.etapas[-1]["hasta_ms"]
+
+        resumen = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "primer_paint_ms": self.primer_paint_ms,
+            "interactivo_ms": self.interactivo_ms,
+            "objetivo_ms": STARTUP_TARGET_MS,
+            "etapas": self.etapas,
+        }
+
+        logger.info("⏱️ ARRANQUE")
+        for etapa in self.etapas:
+            logger.info("   %-28s %8.1fms  (t=%.0fms)", etapa["etapa"], etapa["ms"], etapa["hasta_ms"])
+
+        if self.interactivo_ms > STARTUP_TARGET_MS:
+            logger.warning(
+                "🐢 Arranque hasta interactivo: %.0fms (objetivo %dms)",
+                self.interactivo_ms, STARTUP_TARGET_MS
+            )
+        else:
+            logger.info(
+                "🚀 Arranque hasta interactivo: %.0fms (objetivo %dms)",
+                self.interactivo_ms, STARTUP_TARGET_MS
+            )
+
+        if STARTUP_LOG:
+            try:
+                os.makedirs(os.path.dirname(STARTUP_LOG) or ".", exist_ok=True)
+                with open(STARTUP_LOG, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(resumen, ensure_ascii=False) + "\n")
+            except OSError as e:
+                logger.warning(f"⚠️ No se pudo escribir {STARTUP_LOG}: {e}")
+
+        return resumen
+
+
+# Instancia global (el reloj arranca al importar el módulo)
+startup_timeline = StartupTimeline(_INICIO)
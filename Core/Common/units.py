@@ -2,9 +2,14 @@
 Core.Common.units - Sistema de conversión de unidades
 """
 
+from decimal import Decimal, InvalidOperation
+from typing import Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
 from Core.Common.logger import setup_logger
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 # Factores de conversión a unidades base
 CONVERSIONS = {
@@ -67,6 +72,65 @@ ALIASES = {
     "diez": "decen",
 }
 
+# Unidad base por categoría
+BASE_UNITS = {
+    "weight": "g",
+    "volume": "ml",
+    "count": "unit",
+}
+
+
+# ============================================
+# TABLA COMPILADA
+# ============================================
+
+class UnitInfo(NamedTuple):
+    """Entrada de la tabla plana de unidades"""
+    factor: float
+    factor_exacto: Decimal
+    base: str
+    category: str
+
+
+def _compile_unit_table() -> Dict[str, UnitInfo]:
+    """
+    Unidad canónica y alias → (factor, base, categoría), en un solo dict.
+
+    Se construye una vez al importar: convertir es un lookup, sin recorrer
+    categorías ni normalizar cuando la unidad ya viene canónica.
+    """
+    table = {}
+    for category, factors in CONVERSIONS.items():
+        for unit, factor in factors.items():
+            table[unit] = UnitInfo(
+                float(factor), Decimal(str(factor)), BASE_UNITS[category], category
+            )
+
+    for alias, unit in ALIASES.items():
+        if unit in table:
+            table[alias] = table[unit]
+
+    return table
+
+
+UNIT_TABLE = _compile_unit_table()
+
+
+def lookup_unit(unit: str) -> Optional[UnitInfo]:
+    """
+    Busca una unidad (canónica, alias, con espacios o mayúsculas).
+
+    Returns:
+        UnitInfo o None si no se reconoce
+    """
+    if not unit:
+        return None
+
+    info = UNIT_TABLE.get(unit)
+    if info is None and isinstance(unit, str):
+        info = UNIT_TABLE.get(unit.strip().lower())
+    return info
+
 
 def normalize_unit(unit: str) -> str:
     """
@@ -105,12 +169,7 @@ def get_base_unit(category: str) -> str:
     Returns:
         str: Unidad base
     """
-    base_units = {
-        "weight": "g",
-        "volume": "ml",
-        "count": "unit"
-    }
-    return base_units.get(category)
+    return BASE_UNITS.get(category)
 
 
 def convert_to_base(quantity: float, unit: str) -> tuple:
@@ -124,27 +183,85 @@ def convert_to_base(quantity: float, unit: str) -> tuple:
     Returns:
         tuple: (cantidad_convertida, unidad_base) o (None, None)
     """
-    try:
-        quantity = float(quantity)
-        unit_norm = normalize_unit(unit)
-        
-        for category, factors in CONVERSIONS.items():
-            if unit_norm in factors:
-                base_unit = get_base_unit(category)
-                converted = quantity * factors[unit_norm]
-                logger.debug(
-                    f"Convertido {quantity} {unit_norm} a {converted} {base_unit}"
-                )
-                return converted, base_unit
-        
-        logger.error(f"Unidad {unit} no reconocida (normalizada: {unit_norm})")
+    info = lookup_unit(unit)
+    if info is None:
+        logger.error(f"Unidad {unit} no reconocida (normalizada: {normalize_unit(unit)})")
         return None, None
-        
+    
+    try:
+        return float(quantity) * info.factor, info.base
     except (ValueError, TypeError) as e:
         logger.error(f"Error convirtiendo cantidad: {e}")
         return None, None
 
 
+def convert_to_base_exact(quantity, unit: str) -> tuple:
+    """
+    Igual que convert_to_base pero en Decimal (sin error de punto flotante).
+    
+    Para cálculos de dinero: costos de recetas, totales de compras.
+    
+    Returns:
+        tuple: (Decimal, unidad_base) o (None, None)
+    """
+    info = lookup_unit(unit)
+    if info is None:
+        logger.error(f"Unidad {unit} no reconocida (normalizada: {normalize_unit(unit)})")
+        return None, None
+    
+    try:
+        if not isinstance(quantity, Decimal):
+            quantity = Decimal(str(quantity))
+        return quantity * info.factor_exacto, info.base
+    except (InvalidOperation, ValueError, TypeError) as e:
+        logger.error(f"Error convirtiendo cantidad: {e}")
+        return None, None
+
+
+def convert_array_to_base(
+    quantities,
+    units: Union[str, Sequence[str]]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Conversión vectorizada de muchas cantidades.
+    
+    La tabla se consulta una vez por unidad DISTINTA, no por elemento.
+    
+    Args:
+        quantities: Array o secuencia de cantidades
+        units: Una unidad para todas o una por cantidad
+        
+    Returns:
+        tuple: (cantidades en base float64 — NaN si la unidad no se reconoce,
+                array de unidades base — "" si no se reconoce)
+    """
+    quantities = np.asarray(quantities, dtype=np.float64)
+    
+    if isinstance(units, str):
+        info = lookup_unit(units)
+        if info is None:
+            return np.full(quantities.shape, np.nan), np.full(quantities.shape, "", dtype=object)
+        return quantities * info.factor, np.full(quantities.shape, info.base, dtype=object)
+    
+    # Código por unidad distinta (dict: más rápido que ordenar strings)
+    codigos: Dict[str, int] = {}
+    indices = np.fromiter(
+        (codigos.setdefault(unit, len(codigos)) for unit in units),
+        dtype=np.intp,
+        count=len(units)
+    )
+    factores = np.full(len(codigos), np.nan)
+    bases = np.full(len(codigos), "", dtype=object)
+    
+    for unit, i in codigos.items():
+        info = lookup_unit(unit)
+        if info is not None:
+            factores[i] = info.factor
+            bases[i] = info.base
+    
+    return quantities * factores[indices], bases[indices]
+
+
 def convert_from_base(quantity: float, from_unit: str, to_unit: str) -> float:
     """
     Convierte desde unidad base a otra unidad.
@@ -157,35 +274,17 @@ def convert_from_base(quantity: float, from_unit: str, to_unit: str) -> float:
     Returns:
         float: Cantidad convertida o None
     """
-    try:
-        quantity = float(quantity)
-        from_unit_norm = normalize_unit(from_unit)
-        to_unit_norm = normalize_unit(to_unit)
-        
-        # Encontrar categoría
-        category = None
-        for cat, factors in CONVERSIONS.items():
-            if from_unit_norm in factors:
-                category = cat
-                break
-        
-        if not category or to_unit_norm not in CONVERSIONS[category]:
-            logger.error(f"No se puede convertir de {from_unit_norm} a {to_unit_norm}")
-            return None
-        
-        # Convertir a base primero si es necesario
-        if from_unit_norm != get_base_unit(category):
-            quantity, _ = convert_to_base(quantity, from_unit_norm)
-        
-        # Convertir a unidad destino
-        factor = CONVERSIONS[category][to_unit_norm]
-        converted = quantity / factor
-        
-        logger.debug(
-            f"Convertido {quantity} {get_base_unit(category)} a {converted} {to_unit_norm}"
+    origen = lookup_unit(from_unit)
+    destino = lookup_unit(to_unit)
+    
+    if origen is None or destino is None or origen.category != destino.category:
+        logger.error(
+            f"No se puede convertir de {normalize_unit(from_unit)} a {normalize_unit(to_unit)}"
         )
-        return converted
-        
+        return None
+    
+    try:
+        return float(quantity) * origen.factor / destino.factor
     except (ValueError, TypeError) as e:
         logger.error(f"Error en conversión: {e}")
         return None
@@ -0,0 +1,365 @@
+"""
+Core.Common.warm_cache - Caché persistente en disco para datos de referencia
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from Core.Common.constants import WARM_CACHE_ENABLED, WARM_CACHE_FILE
+from Core.Common.data_cache import app_cache
+from Core.Common.event_bus import event_bus, ReferenceDataRefreshed
+from Core.Common.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# ============================================
+# SERIALIZACIÓN (conserva Decimal y fechas)
+# ============================================
+
+def _encode(value: Any):
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def _decode(obj: Dict):
+    if len(obj) == 1:
+        if "__decimal__" in obj:
+            return Decimal(obj["__decimal__"])
+        if "__datetime__" in obj:
+            return datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=_encode, ensure_ascii=False)
+
+
+def _loads(payload: str) -> Any:
+    return json.loads(payload, object_hook=_decode)
+
+
+# ============================================
+# CACHÉ CALIENTE
+# ============================================
+
+class WarmCache:
+    """
+    Instantánea local (SQLite) de datos de referencia poco cambiantes.
+
+    Flujo:
+    - prime(): al arrancar, carga la instantánea en app_cache sin tocar MySQL
+    - reconcile_async(): en segundo plano compara huellas por tabla
+      (COUNT, MAX(id), MAX(updated_at)) y recarga sólo lo que cambió
+    - get_or_fetch(): lectura normal; al ir a BD guarda el resultado en disco
+
+    Cada entrada guarda la huella tomada ANTES de leer los datos, así un
+    cambio concurrente deja la instantánea marcada como obsoleta.
+
+    La huella sólo detecta altas, bajas y ediciones que tocan updated_at
+    (con resolución de 1 segundo): datos que cambian con cada operación,
+    como el stock, se registran con persist=False y viven sólo en memoria.
+    """
+
+    # Columna de marca temporal por tabla (None = sólo COUNT y MAX(id))
+    TIMESTAMP_COLUMNS = {
+        "subproductos": "updated_at",
+        "productos_finales": "updated_at",
+        "clientes": "updated_at",
+        "subproducto_ingredientes": None,
+        "producto_final_subproductos": None,
+        "subproducto_producciones": "created_at",
+    }
+
+    def __init__(self, path: str, enabled: bool = True):
+        """
+        Args:
+            path: Ruta del archivo SQLite
+            enabled: False desactiva la persistencia (sólo app_cache)
+        """
+        self.path = path
+        self.enabled = enabled
+        self.lock = threading.RLock()
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._tables: Dict[str, Sequence[str]] = {}
+        self._persist: Dict[str, bool] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._ready = False
+
+    # ============================================
+    # REGISTRO
+    # ============================================
+
+    def register(
+        self,
+        key: str,
+        tables: Sequence[str],
+        loader: Callable[[], Any],
+        persist: bool = True
+    ):
+        """
+        Registra un conjunto de datos de referencia.
+
+        Args:
+            key: Clave en app_cache y en disco
+            tables: Tablas de las que depende (para la huella)
+            loader: Función sin argumentos que lee de la BD. Debe lanzar
+                    excepción ante errores (nunca cachear un resultado vacío
+                    por fallo de conexión).
+            persist: False = sólo app_cache, nunca se escribe ni se carga
+                     de disco (datos mutables que la huella no detecta)
+        """
+        with self.lock:
+            self._loaders[key] = loader
+            self._tables[key] = tuple(tables)
+            self._persist[key] = persist
+
+        if not persist:
+            # Descarta una instantánea guardada por una versión anterior
+            self.invalidate(key)
+
+    def get_or_fetch(self, key: str) -> Any:
+        """
+        Obtiene datos desde app_cache o desde la BD (persistiéndolos).
+
+        Args:
+            key: Clave registrada
+
+        Returns:
+            Datos del loader
+
+        Raises:
+            Exception: Si el loader falla
+        """
+        cached = app_cache.get(key)
+        if cached is not None:
+            return cached
+
+        loader = self._loaders[key]
+        tables = self._tables[key]
+
+        persist = self.enabled and self._persist.get(key, True)
+        fingerprint = self._fingerprint(tables) if persist else None
+        value = loader()
+        app_cache.set(key, value)
+
+        if fingerprint is not None:
+            self._store(key, tables, fingerprint, value)
+
+        return value
+
+    def invalidate(self, *keys: str):
+        """Invalida claves en memoria y en disco"""
+        for key in keys:
+            app_cache.invalidate(key)
+
+        if not self.enabled or not keys:
+            return
+
+        try:
+            with self.lock, self._connect() as db:
+                db.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in keys])
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Warm cache: no se pudo invalidar {keys}: {e}")
+
+    # ============================================
+    # ARRANQUE
+    # ============================================
+
+    def prime(self) -> int:
+        """
+        Carga la instantánea de disco en app_cache.
+
+        Returns:
+            Número de entradas cargadas
+        """
+        if not self.enabled:
+            return 0
+
+        start = time.perf_counter()
+        try:
+            with self.lock, self._connect() as db:
+                rows = db.execute("SELECT key, payload FROM entries").fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Warm cache no disponible: {e}")
+            return 0
+
+        loaded = 0
+        for key, payload in rows:
+            if not self._persist.get(key, True):
+                continue
+            try:
+                app_cache.set(key, _loads(payload))
+                loaded += 1
+            except (ValueError, TypeError) as e:
+                logger.warning(f"⚠️ Warm cache: entrada '{key}' corrupta: {e}")
+
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(f"🔥 Warm cache: {loaded} entradas cargadas en {elapsed:.1f}ms")
+        return loaded
+
+    def reconcile(self) -> List[str]:
+        """
+        Compara huellas con la BD y recarga las entradas obsoletas.
+
+        Publica ReferenceDataRefreshed por cada entrada recargada.
+
+        Returns:
+            Claves recargadas o descartadas
+        """
+        if not self.enabled:
+            return []
+
+        try:
+            with self.lock, self._connect() as db:
+                rows = db.execute("SELECT key, tables, fingerprint FROM entries").fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Warm cache: no se pudo leer la instantánea: {e}")
+            return []
+
+        if not rows:
+            return []
+
+        stored = {key: (json.loads(tables), json.loads(fp)) for key, tables, fp in rows}
+        all_tables = sorted({t for tables, _ in stored.values() for t in tables})
+
+        current = self._fingerprint(all_tables)
+        if current is None:
+            logger.warning("⚠️ Warm cache: sin BD, se mantiene la instantánea")
+            return []
+
+        stale = [
+            key for key, (tables, fp) in stored.items()
+            if any(current.get(t) != fp.get(t) for t in tables)
+        ]
+
+        for key in stale:
+            if key in self._loaders:
+                app_cache.invalidate(key)
+                try:
+                    self.get_or_fetch(key)
+                except Exception as e:
+                    logger.error(f"❌ Warm cache: error recargando '{key}': {e}")
+                    self.invalidate(key)
+            else:
+                # Sin loader registrado: se descarta y se cargará bajo demanda
+                self.invalidate(key)
+
+        if stale:
+            logger.info(f"🔄 Warm cache: {len(stale)} entradas actualizadas {stale}")
+            event_bus.publish(*(ReferenceDataRefreshed(key) for key in stale))
+        else:
+            logger.info("✅ Warm cache: instantánea al día")
+
+        return stale
+
+    def reconcile_async(self):
+        """Ejecuta reconcile() en un hilo en segundo plano"""
+        if not self.enabled:
+            return
+
+        with self.lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self.reconcile, name="warm-cache-reconcile", daemon=True
+            )
+            self._thread.start()
+
+    # ============================================
+    # AUXILIARES
+    # ============================================
+
+    @contextmanager
+    def _connect(self):
+        """Conexión SQLite de corta duración (commit y cierre al salir)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=5)
+        try:
+            if not self._ready:
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(
+                    """CREATE TABLE IF NOT EXISTS entries (
+                        key TEXT PRIMARY KEY,
+                        tables TEXT NOT NULL,
+                        fingerprint TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        saved_at REAL NOT NULL
+                    )"""
+                )
+                self._ready = True
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    def _store(self, key: str, tables: Sequence[str], fingerprint: Dict, value: Any):
+        try:
+            payload = _dumps(value)
+            fp = {t: fingerprint.get(t) for t in tables}
+            with self.lock, self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (key, json.dumps(list(tables)), json.dumps(fp), payload, time.time())
+                )
+        except (sqlite3.Error, TypeError) as e:
+            logger.warning(f"⚠️ Warm cache: no se pudo guardar '{key}': {e}")
+
+    def _fingerprint(self, tables: Sequence[str]) -> Optional[Dict[str, List]]:
+        """Huella por tabla en una sola consulta (UNION ALL)"""
+        if not tables:
+            return {}
+
+        from Core.Common.database import get_connection, close_connection
+
+        parts = []
+        for table in tables:
+            ts_col = self.TIMESTAMP_COLUMNS.get(table)
+            ts_expr = f"MAX({ts_col})" if ts_col else "NULL"
+            parts.append(
+                f"SELECT '{table}' AS tabla, COUNT(*) AS n, MAX(id) AS max_id, "
+                f"{ts_expr} AS max_ts FROM {table}"
+            )
+
+        conn = get_connection()
+        if not conn:
+            return None
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(" UNION ALL ".join(parts))
+                rows = cursor.fetchall() or []
+            return {
+                r["tabla"]: [int(r["n"] or 0), r["max_id"], str(r["max_ts"]) if r["max_ts"] else None]
+                for r in rows
+            }
+        except Exception as e:
+            logger.warning(f"⚠️ Warm cache: error calculando huellas: {e}")
+            return None
+        finally:
+            close_connection(conn)
+
+
+# Instancia global (archivo en la carpeta /database del proyecto)
+warm_cache = WarmCache(
+    path=os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "database",
+        WARM_CACHE_FILE
+    ),
+    enabled=WARM_CACHE_ENABLED
+)
@@ -0,0 +1,321 @@
+"""
+Core.Common.workload_recorder - Grabación de la carga real para reproducirla
+
+Opt-in (WORKLOAD_RECORD=1 o workload_recorder.start()). Cada llamada de
+primer nivel a un método público de backend (las anidadas no: se
+reproducen solas) se escribe en un journal JSON-lines comprimido:
+
+    {"m": "Core.Backends.ventas_backend:VentasBackend.crear_venta_multiple",
+     "a": [3, [{"product_id": 7, "quantity": 2, "unit_price": 1.5}]], "t": 12.503, "d": 18.2}
+
+a/k = argumentos, t = segundos desde el inicio, d = duración (ms),
+e = excepción (si falló), x = argumento no serializable (no se reproduce). La escritura ocurre en un hilo de fondo.
+
+Con SQLite se guarda además una copia de la BD al iniciar (snapshot);
+con MySQL hay que restaurar un dump tomado al iniciar la grabación.
+scripts/replay_workload.py reproduce el journal contra ese snapshot.
+"""
+
+import atexit
+import functools
+import gzip
+import inspect
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from Core.Common.constants import WORKLOAD_RECORD, WORKLOAD_DIR
+from Core.Common.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+JOURNAL = "journal.jsonl.gz"
+SNAPSHOT = "snapshot.sqlite3"
+VERSION = 1
+
+
+# ============================================
+# CODIFICACIÓN DE ARGUMENTOS
+# ============================================
+
+class NoSerializable(TypeError):
+    """Argumento que el journal no puede representar"""
+
+
+def codificar(valor: Any) -> Any:
+    """
+    Valor → JSON. Los tipos sin equivalente JSON van etiquetados con "$".
+
+    Raises:
+        NoSerializable: Si el valor no se puede reproducir
+    """
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    if isinstance(valor, (list, tuple)):
+        return [codificar(v) for v in valor]
+    if isinstance(valor, dict):
+        if all(isinstance(k, str) for k in valor) and "$" not in valor:
+            return {k: codificar(v) for k, v in valor.items()}
+        return {"$": "dict", "v": [[codificar(k), codificar(v)] for k, v in valor.items()]}
+    if isinstance(valor, Decimal):
+        return {"$": "decimal", "v": str(valor)}
+    if isinstance(valor, datetime):
+        return {"$": "datetime", "v": valor.isoformat()}
+    if isinstance(valor, date):
+        return {"$": "date", "v": valor.isoformat()}
+    if isinstance(valor, (set, frozenset)):
+        return {"$": "set", "v": [codificar(v) for v in valor]}
+    raise NoSerializable(type(valor).__name__)
+
+
+def decodificar(valor: Any) -> Any:
+    """Inversa de codificar"""
+    if isinstance(valor, list):
+        return [decodificar(v) for v in valor]
+    if not isinstance(valor, dict):
+        return valor
+
+    etiqueta = valor.get("$")
+    if etiqueta is None:
+        return {k: decodificar(v) for k, v in valor.items()}
+    if etiqueta == "dict":
+        return {decodificar(k): decodificar(v) for k, v in valor["v"]}
+    if etiqueta == "decimal":
+        return Decimal(valor["v"])
+    if etiqueta == "datetime":
+        return datetime.fromisoformat(valor["v"])
+    if etiqueta == "date":
+        return date.fromisoformat(valor["v"])
+    if etiqueta == "set":
+        return {decodificar(v) for v in valor["v"]}
+    raise ValueError(f"Etiqueta desconocida en el journal: {etiqueta}")
+
+
+def leer_journal(path: str) -> Tuple[Dict, Iterator[Dict]]:
+    """
+    Abre un journal (archivo o carpeta de grabación).
+
+    Returns:
+        (encabezado, iterador de llamadas). Un journal cortado (la app
+        se cerró de golpe) se lee hasta el último registro completo.
+    """
+    if os.path.isdir(path):
+        path = os.path.join(path, JOURNAL)
+
+    f = gzip.open(path, "rt", encoding="utf-8")
+    try:
+        encabezado = json.loads(f.readline())
+    except Exception:
+        f.close()
+        raise
+
+    def _llamadas():
+        try:
+            for linea in f:
+                if linea.strip():
+                    yield json.loads(linea)
+        except (EOFError, json.JSONDecodeError):
+            logger.warning("⚠️ Journal truncado: %s", path)
+        finally:
+            f.close()
+
+    return encabezado, _llamadas()
+
+
+# ============================================
+# GRABADOR
+# ============================================
+
+class WorkloadRecorder:
+    """Graba las llamadas de primer nivel a los backends instrumentados"""
+
+    def __init__(self):
+        self.enabled = False
+        self.carpeta: Optional[str] = None
+        self._inicio_ns = 0
+        self._local = threading.local()
+        self._queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.llamadas = 0
+        self.omitidas = 0
+
+    # ============================================
+    # INSTRUMENTACIÓN
+    # ============================================
+
+    def instrument_class(self, cls: type) -> type:
+        """Envuelve los métodos públicos (mismo criterio que monitor_class)"""
+        for nombre, atributo in list(vars(cls).items()):
+            if nombre.startswith("_"):
+                continue
+            if isinstance(atributo, staticmethod):
+                envuelto = staticmethod(self._envolver(cls, nombre, atributo.__func__, 0))
+            elif isinstance(atributo, classmethod):
+                envuelto = classmethod(self._envolver(cls, nombre, atributo.__func__, 1))
+            elif inspect.isfunction(atributo) and not inspect.isgeneratorfunction(atributo):
+                envuelto = self._envolver(cls, nombre, atributo, 1)
+            else:
+                continue
+            setattr(cls, nombre, envuelto)
+        return cls
+
+    def _envolver(self, cls: type, nombre: str, func, omitir: int):
+        metodo = f"{cls.__module__}:{cls.__qualname__}.{nombre}"
+        local = self._local
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled or getattr(local, "profundidad", 0):
+                return func(*args, **kwargs)
+
+            # Se codifica antes de llamar: el método puede mutar sus argumentos
+            entrada = self._entrada(metodo, args[omitir:], kwargs)
+            local.profundidad = 1
+            inicio = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                entrada["e"] = type(e).__name__
+                raise
+            finally:
+                fin = time.perf_counter_ns()
+                local.profundidad = 0
+                self._grabar(entrada, inicio, fin)
+
+        return wrapper
+
+    def _entrada(self, metodo: str, args: tuple, kwargs: dict) -> Dict[str, Any]:
+        entrada: Dict[str, Any] = {"m": metodo}
+        try:
+            entrada["a"] = codificar(args)
+            if kwargs:
+                entrada["k"] = codificar(kwargs)
+        except NoSerializable as e:
+            # Se conserva para el reporte, pero no se reproduce
+            entrada.pop("a", None)
+            entrada["x"] = str(e)
+        return entrada
+
+    def _grabar(self, entrada: Dict[str, Any], inicio: int, fin: int):
+        entrada["t"] = round((inicio - self._inicio_ns) / 1e9, 6)
+        entrada["d"] = round((fin - inicio) / 1e6, 3)
+        self.llamadas += 1
+        if "x" in entrada:
+            self.omitidas += 1
+        self._queue.put(json.dumps(entrada, ensure_ascii=False, separators=(",", ":")))
+
+    # ============================================
+    # CICLO DE VIDA
+    # ============================================
+
+    def start(self, carpeta: Optional[str] = None) -> str:
+        """
+        Comienza una grabación nueva (toma el snapshot con SQLite).
+
+        Returns:
+            str: Carpeta de la grabación
+        """
+        from Core.Common.database import DatabaseManager
+
+        with self._lock:
+            if self.enabled:
+                return self.carpeta
+
+            carpeta = carpeta or os.path.join(
+                WORKLOAD_DIR, datetime.now().strftime("%Y%m%d_%H%M%S")
+            )
+            os.makedirs(carpeta, exist_ok=True)
+
+            engine = DatabaseManager.get_engine()
+            snapshot = None
+            if engine.name == "sqlite":
+                snapshot = SNAPSHOT
+                origen = sqlite3.connect(engine.path)
+                destino = sqlite3.connect(os.path.join(carpeta, SNAPSHOT))
+                try:
+                    origen.backup(destino)
+                finally:
+                    destino.close()
+                    origen.close()
+            else:
+                logger.warning(
+                    "⚠️ Grabando sobre %s: para reproducir, restaura un dump tomado ahora",
+                    engine.describe()
+                )
+
+            encabezado = {
+                "journal": VERSION,
+                "inicio": datetime.now().isoformat(timespec="seconds"),
+                "engine": engine.describe(),
+                "snapshot": snapshot,
+            }
+
+            self.carpeta = carpeta
+            self.llamadas = self.omitidas = 0
+            # Cola nueva: lo que llegue tarde de una grabación anterior no se mezcla
+            self._queue = queue.SimpleQueue()
+            self._writer = threading.Thread(
+                target=self._escribir,
+                args=(self._queue, os.path.join(carpeta, JOURNAL), json.dumps(encabezado)),
+                name="workload-journal",
+                daemon=True,
+            )
+            self._writer.start()
+            self._inicio_ns = time.perf_counter_ns()
+            self.enabled = True
+
+        atexit.register(self.stop)
+        logger.info("🎥 Grabando carga de trabajo en %s", carpeta)
+        return carpeta
+
+    def stop(self) -> Optional[str]:
+        """Termina la grabación y cierra el journal"""
+        with self._lock:
+            if not self.enabled:
+                return None
+            self.enabled = False
+            self._queue.put(None)
+            writer, self._writer = self._writer, None
+
+        writer.join()
+        logger.info(
+            "🎥 Grabación cerrada: %d llamadas (%d no reproducibles) en %s",
+            self.llamadas, self.omitidas, self.carpeta
+        )
+        return self.carpeta
+
+    @staticmethod
+    def _escribir(cola: queue.SimpleQueue, path: str, encabezado: str):
+        """Hilo de escritura: vacía la cola al journal comprimido"""
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+            f.write(encabezado + "\n")
+            while True:
+                linea = cola.get()
+                if linea is None:
+                    break
+                f.write(linea + "\n")
+                if cola.empty():
+                    # Bloque gzip completo: un cierre abrupto pierde sólo lo último
+                    f.flush()
+
+
+# Instancia global
+workload_recorder = WorkloadRecorder()
+
+
+def start_if_configured() -> Optional[str]:
+    """Inicia la grabación si WORKLOAD_RECORD está activo"""
+    if not WORKLOAD_RECORD:
+        return None
+    try:
+        return workload_recorder.start()
+    except Exception as e:
+        logger.error(f"❌ No se pudo iniciar la grabación de carga: {e}")
+        return None
@@ -4,5 +4,18 @@ Core.Database - Gestión de esquema y migraciones de BD
 
 from Core.Database.schema import DatabaseSchema
 from Core.Database.manager import DatabaseMigrationManager
+from Core.Database.engines import (
+    StorageEngine, MySQLEngine, SQLiteEngine, create_engine,
+    DATABASE_ERRORS, INTEGRITY_ERRORS
+)
 
-__all__ = ['DatabaseSchema', 'DatabaseMigrationManager']
\ No newline at end of file
+__all__ = [
+    'DatabaseSchema',
+    'DatabaseMigrationManager',
+    'StorageEngine',
+    'MySQLEngine',
+    'SQLiteEngine',
+    'create_engine',
+    'DATABASE_ERRORS',
+    'INTEGRITY_ERRORS'
+]
\ No newline at end of file
@@ -10,7 +10,7 @@ from typing import Dict, Optional, Tuple
 from Core.Common.logger import setup_logger
 from Core.Common.config import load_config, save_config
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class LocalDatabaseManager:
@@ -39,7 +39,7 @@ class LocalDatabaseManager:
     
     def __init__(self):
         """Inicializa el gestor"""
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.config = load_config()
         self._ensure_db_folder()
     
@@ -0,0 +1,295 @@
+"""
+Core.Database.engines - Motores de almacenamiento (MySQL/MariaDB y SQLite)
+
+Todos los motores entregan conexiones con la misma interfaz que pymysql con
+DictCursor: conn.cursor() como context manager, execute/executemany con
+parámetros %s, fetchone/fetchall que retornan dicts, lastrowid, rowcount,
+commit/rollback/close.
+"""
+
+import os
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from Core.Common.logger import setup_logger
+from Core.Database import sqlite_dialect
+
+try:
+    import pymysql
+    from pymysql.constants import CLIENT
+except ImportError:  # pragma: no cover - motor MySQL no disponible
+    pymysql = None
+    CLIENT = None
+
+logger = setup_logger(__name__)
+
+# Raíz del proyecto (para rutas relativas de la BD SQLite)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ============================================
+# EXCEPCIONES INDEPENDIENTES DEL MOTOR
+# ============================================
+
+INTEGRITY_ERRORS: Tuple[type, ...] = (sqlite3.IntegrityError,)
+DATABASE_ERRORS: Tuple[type, ...] = (sqlite3.Error,)
+
+if pymysql is not None:
+    INTEGRITY_ERRORS += (pymysql.IntegrityError,)
+    DATABASE_ERRORS += (pymysql.Error,)
+
+
+# ============================================
+# MOTOR BASE
+# ============================================
+
+class StorageEngine:
+    """Interfaz común de los motores de almacenamiento"""
+
+    name = "base"
+
+    def connect(self):
+        """Abre una conexión nueva (interfaz pymysql/DictCursor)"""
+        raise NotImplementedError
+
+    def table_stats(self, cursor) -> Tuple[int, int]:
+        """
+        Cuenta tablas y filas de la BD.
+
+        Returns:
+            (número de tablas, número de filas)
+        """
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        """Descripción legible (para logs y configuración)"""
+        return self.name
+
+
+# ============================================
+# MOTOR MYSQL / MARIADB
+# ============================================
+
+class MySQLEngine(StorageEngine):
+    """Motor MySQL/MariaDB vía pymysql"""
+
+    name = "mysql"
+
+    def __init__(self, cfg: Dict[str, Any]):
+        self.cfg = cfg
+
+    def connect(self):
+        if pymysql is None:
+            raise RuntimeError("pymysql no está instalado (motor 'mysql')")
+
+        cfg = self.cfg
+        return pymysql.connect(
+            host=cfg.get("host", "localhost"),
+            port=int(cfg.get("port", 3306)),
+            user=cfg.get("user", "pp"),
+            database=cfg.get("database", "economia_oficial"),
+            password=cfg.get("password", "1234"),
+            charset=cfg.get("charset", "utf8mb4"),
+            cursorclass=pymysql.cursors.DictCursor,
+            # rowcount = filas que cumplen el WHERE (igual que SQLite)
+            client_flag=CLIENT.FOUND_ROWS,
+        )
+
+    def table_stats(self, cursor) -> Tuple[int, int]:
+        cursor.execute("""
+            SELECT COUNT(*) as count, SUM(table_rows) as total
+            FROM information_schema.tables
+            WHERE table_schema = DATABASE()
+        """)
+        result = cursor.fetchone() or {}
+        return int(result.get("count") or 0), int(result.get("total") or 0)
+
+    def describe(self) -> str:
+        return f"mysql://{self.cfg.get('host', 'localhost')}/{self.cfg.get('database', '')}"
+
+
+# ============================================
+# MOTOR SQLITE (embebido, WAL)
+# ============================================
+
+def _convert_decimal(raw: bytes) -> Decimal:
+    value = Decimal(raw.decode())
+    # Columnas con afinidad NUMERIC guardan REAL: recortar ruido binario
+    if value.as_tuple().exponent < -10:
+        value = value.quantize(Decimal("1e-10")).normalize()
+    return value
+
+
+def _convert_timestamp(raw: bytes) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(raw.decode())
+    except ValueError:
+        return None
+
+
+# Tipos equivalentes a los que entrega pymysql
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DECIMAL", _convert_decimal)
+sqlite3.register_converter("TIMESTAMP", _convert_timestamp)
+sqlite3.register_converter("DATETIME", _convert_timestamp)
+
+
+def _dict_row(cursor, row) -> Dict[str, Any]:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SQLiteCursor:
+    """Cursor con la interfaz de pymysql DictCursor sobre sqlite3"""
+
+    def __init__(self, connection: "SQLiteConnection"):
+        self.connection = connection
+        self._cursor = connection.raw.cursor()
+        self.lastrowid: Optional[int] = None
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def execute(self, query: str, args: Any = None) -> int:
+        for sql, params in sqlite_dialect.translate(query, args):
+            self._cursor.execute(sql, params)
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+
+    def executemany(self, query: str, seq_args: Sequence[Any]) -> int:
+        sql, params = sqlite_dialect.translate_many(query, seq_args)
+        if not params:
+            return 0
+        self._cursor.executemany(sql, params)
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        return self.rowcount
+
+    def fetchone(self) -> Optional[Dict[str, Any]]:
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size: int = 1):
+        return self._cursor.fetchmany(size)
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Conexión sqlite3 con la interfaz de pymysql"""
+
+    def __init__(self, raw: sqlite3.Connection):
+        self.raw = raw
+
+    def cursor(self) -> SQLiteCursor:
+        return SQLiteCursor(self)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+
+class SQLiteEngine(StorageEngine):
+    """
+    Motor SQLite embebido para una sola terminal.
+
+    - Modo WAL: lectores no bloquean al escritor
+    - BEGIN IMMEDIATE en escrituras: evita deadlocks al promover el lock
+    - Traducción del dialecto MySQL en Core.Database.sqlite_dialect
+    """
+
+    name = "sqlite"
+
+    # Espera máxima por el lock de escritura (ms)
+    BUSY_TIMEOUT_MS = 5000
+
+    def __init__(self, path: str):
+        self.path = path if os.path.isabs(path) else os.path.join(_PROJECT_ROOT, path)
+        self._wal_ready = False
+
+    def connect(self) -> SQLiteConnection:
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        raw = sqlite3.connect(
+            self.path,
+            timeout=self.BUSY_TIMEOUT_MS / 1000,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level="IMMEDIATE",
+        )
+        raw.row_factory = _dict_row
+
+        if not self._wal_ready:
+            # journal_mode es persistente en el archivo: basta una vez
+            raw.execute("PRAGMA journal_mode=WAL")
+            self._wal_ready = True
+
+        raw.execute(f"PRAGMA busy_timeout = {self.BUSY_TIMEOUT_MS}")
+        raw.execute("PRAGMA synchronous = NORMAL")
+        raw.execute("PRAGMA foreign_keys = ON")
+        return SQLiteConnection(raw)
+
+    def table_stats(self, cursor) -> Tuple[int, int]:
+        cursor.execute("SHOW TABLES")
+        tables = [row["Tables"] for row in cursor.fetchall()]
+        rows = 0
+        for table in tables:
+            cursor.execute(f"SELECT COUNT(*) AS total FROM {table}")
+            rows += int(cursor.fetchone()["total"] or 0)
+        return len(tables), rows
+
+    def describe(self) -> str:
+        return f"sqlite://{self.path}"
+
+
+# ============================================
+# FÁBRICA
+# ============================================
+
+ENGINES = {
+    "mysql": MySQLEngine,
+    "mariadb": MySQLEngine,
+    "sqlite": SQLiteEngine,
+}
+
+
+def create_engine(db_config: Dict[str, Any]) -> StorageEngine:
+    """
+    Crea el motor indicado en la configuración ("db.engine").
+
+    Args:
+        db_config: Sección "db" de app_config.json
+
+    Returns:
+        StorageEngine
+    """
+    engine_name = str(db_config.get("engine", "mysql")).lower()
+
+    if engine_name not in ENGINES:
+        raise ValueError(f"Motor de BD desconocido: {engine_name}")
+
+    if engine_name == "sqlite":
+        return SQLiteEngine(db_config.get("sqlite_path", "database/economia.sqlite3"))
+
+    return MySQLEngine(db_config)
@@ -2,13 +2,13 @@
 Core.Database.manager - Gestor de migraciones de base de datos
 """
 
-from typing import Optional
-import pymysql
+from typing import Any, Optional
 
 from Core.Common.logger import setup_logger
 from Core.Database.schema import DatabaseSchema
+from Core.Database.engines import DATABASE_ERRORS
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class DatabaseMigrationManager:
@@ -19,18 +19,19 @@ class DatabaseMigrationManager:
     """
     
     # Versión actual del esquema
-    SCHEMA_VERSION = 1
+    SCHEMA_VERSION = 2
     
     # Historial de migraciones
     MIGRATIONS = {
-        1: "Initial schema creation"
+        1: "Initial schema creation",
+        2: "Ledger de movimientos de inventario y snapshots"
     }
     
     def __init__(self):
         """Inicializa el gestor de migraciones"""
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
     
-    def migrate_to_latest(self, conn: Optional[pymysql.Connection] = None) -> bool:
+    def migrate_to_latest(self, conn: Optional[Any] = None) -> bool:
         """
         Ejecuta todas las migraciones pendientes.
         
@@ -70,7 +71,7 @@ class DatabaseMigrationManager:
             if should_close:
                 close_connection(conn)
     
-    def _create_all_tables(self, conn: pymysql.Connection) -> bool:
+    def _create_all_tables(self, conn: Any) -> bool:
         """
         Crea todas las tablas del esquema.
         
@@ -87,7 +88,7 @@ class DatabaseMigrationManager:
                         cursor.execute(table_sql)
                         logger.info(f"✓ Tabla '{table_name}' verificada/creada")
                     
-                    except pymysql.Error as e:
+                    except DATABASE_ERRORS as e:
                         if "already exists" in str(e):
                             logger.debug(f"Tabla '{table_name}' ya existe")
                         else:
@@ -103,7 +104,7 @@ class DatabaseMigrationManager:
             conn.rollback()
             return False
     
-    def get_schema_version(self, conn: pymysql.Connection) -> int:
+    def get_schema_version(self, conn: Any) -> int:
         """
         Obtiene la versión actual del esquema.
         
@@ -207,12 +207,11 @@ class DatabaseSchema:
         id INT AUTO_INCREMENT PRIMARY KEY,
         venta_id INT NOT NULL,
         producto_final_id INT NOT NULL,
-        cantidades_producto INT NOT NULL,
+        cantidades_producto INT NOT NULL DEFAULT 0,
         cantidad_vendida INT NOT NULL,
         precio_unitario_venta DECIMAL(10,2) NOT NULL,
         subtotal DECIMAL(12,2) NOT NULL,
         
-        FOREIGN kEY (subproducto_id) REFERENCES subproducto_producciones(id), 
         FOREIGN KEY (venta_id) REFERENCES ventas_cabecera(id) ON DELETE CASCADE,
         FOREIGN KEY (producto_final_id) REFERENCES productos_finales(id),
         INDEX idx_subproducto_producciones(id),
@@ -325,6 +324,56 @@ class DatabaseSchema:
     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
     """
 
+    # ============================================
+    # TABLA: LEDGER DE MOVIMIENTOS DE INVENTARIO (append-only)
+    # ============================================
+    INVENTARIO_MOVIMIENTOS_TABLE = """
+    CREATE TABLE IF NOT EXISTS inventario_movimientos (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        producto VARCHAR(100) NOT NULL,
+        tipo VARCHAR(20) NOT NULL,
+        cantidad_base DECIMAL(15,4) NOT NULL,
+        unidad_base VARCHAR(20) NOT NULL,
+        costo_unitario DECIMAL(14,6) NOT NULL DEFAULT 0,
+        stock_resultante DECIMAL(15,4) NOT NULL,
+        costo_promedio_resultante DECIMAL(14,6) NOT NULL,
+        documento VARCHAR(100),
+        fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        
+        INDEX idx_producto_id (producto, id),
+        INDEX idx_fecha (fecha)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """
+    
+    # ============================================
+    # TABLA: SNAPSHOTS DE INVENTARIO (checkpoints)
+    # ============================================
+    INVENTARIO_SNAPSHOTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS inventario_snapshots (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        ultimo_movimiento_id BIGINT NOT NULL DEFAULT 0,
+        productos INT NOT NULL DEFAULT 0,
+        valor_total DECIMAL(14,2) NOT NULL DEFAULT 0,
+        fecha TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        
+        INDEX idx_fecha (fecha)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """
+    
+    INVENTARIO_SNAPSHOT_ITEMS_TABLE = """
+    CREATE TABLE IF NOT EXISTS inventario_snapshot_items (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        snapshot_id INT NOT NULL,
+        producto VARCHAR(100) NOT NULL,
+        cantidad_stock DECIMAL(15,4) NOT NULL,
+        unidad_base VARCHAR(20) NOT NULL,
+        costo_promedio_ponderado DECIMAL(14,6) NOT NULL,
+        
+        FOREIGN KEY (snapshot_id) REFERENCES inventario_snapshots(id) ON DELETE CASCADE,
+        UNIQUE KEY uk_snapshot_producto (snapshot_id, producto)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """
+
     
     # Lista de todas las tablas
     TABLES = [
@@ -346,6 +395,9 @@ class DatabaseSchema:
         ("efectivo_movimientos", EFECTIVO_MOVIMIENTOS_TABLE),
         ("efectivo_contador", EFECTIVO_CONTADOR_TABLE),
         ("dinero_fisico", DINERO_FISICO_TABLE),
+        ("inventario_movimientos", INVENTARIO_MOVIMIENTOS_TABLE),
+        ("inventario_snapshots", INVENTARIO_SNAPSHOTS_TABLE),
+        ("inventario_snapshot_items", INVENTARIO_SNAPSHOT_ITEMS_TABLE),
     ]
     
     @classmethod
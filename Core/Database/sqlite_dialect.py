@@ -0,0 +1,297 @@
+"""
+Core.Database.sqlite_dialect - Traducción del dialecto MySQL usado por los
+backends a SQLite
+
+Cubre lo que el código realmente usa:
+- Parámetros pymysql (%s, %(nombre)s, %%) → parámetros SQLite (?, :nombre)
+- GROUP_CONCAT(x SEPARATOR 's') → GROUP_CONCAT(x, 's')
+- NOW(), CURDATE(), SELECT ... FOR UPDATE
+- SHOW COLUMNS / SHOW TABLES, TRUNCATE TABLE, SET FOREIGN_KEY_CHECKS
+- DDL de DatabaseSchema (AUTO_INCREMENT, índices, UNIQUE KEY,
+  ON UPDATE CURRENT_TIMESTAMP, opciones de tabla)
+"""
+
+import re
+from typing import Any, List, Sequence, Tuple
+
+from Core.Common.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Marca temporal local (equivalente a NOW()/CURRENT_TIMESTAMP de MySQL)
+SQLITE_NOW = "datetime('now','localtime')"
+
+Statement = Tuple[str, Any]
+
+
+# ============================================
+# PARÁMETROS
+# ============================================
+
+_PARAM_RE = re.compile(r"%\((\w+)\)s|%s|%%")
+
+
+def normalize_args(args: Any) -> Any:
+    """
+    Normaliza argumentos al formato de sqlite3.
+
+    pymysql acepta un escalar como argumento único; sqlite3 no.
+    """
+    if args is None:
+        return ()
+    if isinstance(args, dict):
+        return args
+    if isinstance(args, (list, tuple)):
+        return tuple(args)
+    return (args,)
+
+
+def convert_params(query: str, args: Any) -> str:
+    """
+    Convierte marcadores pymysql a marcadores SQLite.
+
+    Igual que pymysql, sólo se formatea cuando hay argumentos: sin ellos
+    un '%' literal (ej. LIKE 'Compra:%') se deja intacto.
+    """
+    if args is None:
+        return query
+
+    def _sub(match):
+        token = match.group(0)
+        if token == "%%":
+            return "%"
+        if match.group(1):
+            return f":{match.group(1)}"
+        return "?"
+
+    return _PARAM_RE.sub(_sub, query)
+
+
+# ============================================
+# CONSULTAS
+# ============================================
+
+_GROUP_CONCAT_RE = re.compile(
+    r"GROUP_CONCAT\(\s*(.+?)\s+SEPARATOR\s+('(?:[^']|'')*')\s*\)", re.I | re.S
+)
+_NOW_RE = re.compile(r"\b(?:NOW|CURRENT_TIMESTAMP|LOCALTIMESTAMP)\s*\(\s*\)", re.I)
+_CURDATE_RE = re.compile(r"\b(?:CURDATE|CURRENT_DATE)\s*\(\s*\)", re.I)
+_FOR_UPDATE_RE = re.compile(r"\s+FOR\s+UPDATE\b", re.I)
+
+_SHOW_COLUMNS_RE = re.compile(
+    r"^\s*SHOW\s+(?:FULL\s+)?COLUMNS\s+FROM\s+`?(\w+)`?(?:\s+LIKE\s+'([^']*)')?\s*;?\s*$", re.I
+)
+_SHOW_TABLES_RE = re.compile(r"^\s*SHOW\s+TABLES\s*;?\s*$", re.I)
+_TRUNCATE_RE = re.compile(r"^\s*TRUNCATE\s+(?:TABLE\s+)?`?(\w+)`?\s*;?\s*$", re.I)
+_FK_CHECKS_RE = re.compile(r"^\s*SET\s+FOREIGN_KEY_CHECKS\s*=\s*([01])\s*;?\s*$", re.I)
+_CREATE_TABLE_RE = re.compile(r"^\s*CREATE\s+TABLE\b", re.I)
+
+
+def translate(query: str, args: Any = None) -> List[Statement]:
+    """
+    Traduce una sentencia MySQL a una o más sentencias SQLite.
+
+    Args:
+        query: SQL en dialecto MySQL con parámetros pymysql
+        args: Argumentos (tupla, lista, dict o escalar)
+
+    Returns:
+        Lista de (sql, parámetros) a ejecutar en orden
+    """
+    match = _SHOW_COLUMNS_RE.match(query)
+    if match:
+        table, pattern = match.groups()
+        sql = (
+            "SELECT name AS Field, type AS Type, "
+            "CASE \"notnull\" WHEN 1 THEN 'NO' ELSE 'YES' END AS \"Null\", "
+            "CASE pk WHEN 1 THEN 'PRI' ELSE '' END AS \"Key\", "
+            "dflt_value AS \"Default\" "
+            f"FROM pragma_table_info('{table}')"
+        )
+        if pattern is not None:
+            return [(sql + " WHERE name LIKE ?", (pattern,))]
+        return [(sql, ())]
+
+    if _SHOW_TABLES_RE.match(query):
+        return [(
+            "SELECT name AS Tables FROM sqlite_master "
+            "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name",
+            ()
+        )]
+
+    match = _TRUNCATE_RE.match(query)
+    if match:
+        table = match.group(1)
+        return [
+            (f"DELETE FROM {table}", ()),
+            ("DELETE FROM sqlite_sequence WHERE name = ?", (table,)),
+        ]
+
+    match = _FK_CHECKS_RE.match(query)
+    if match:
+        return [(f"PRAGMA foreign_keys = {'ON' if match.group(1) == '1' else 'OFF'}", ())]
+
+    if _CREATE_TABLE_RE.match(query):
+        return [(stmt, ()) for stmt in translate_ddl(query)]
+
+    sql = convert_params(query, args)
+    sql = _GROUP_CONCAT_RE.sub(r"GROUP_CONCAT(\1, \2)", sql)
+    sql = _NOW_RE.sub(SQLITE_NOW, sql)
+    sql = _CURDATE_RE.sub("date('now','localtime')", sql)
+    sql = _FOR_UPDATE_RE.sub("", sql)
+
+    return [(sql, normalize_args(args))]
+
+
+# ============================================
+# DDL
+# ============================================
+
+_TABLE_RE = re.compile(
+    r"^\s*CREATE\s+TABLE\s+(IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?\s*\((.*)\)([^)]*)$", re.I | re.S
+)
+_INDEX_RE = re.compile(r"^(?:INDEX|KEY)\s*`?(\w+)`?\s*\((.*)\)$", re.I | re.S)
+_UNIQUE_RE = re.compile(r"^UNIQUE\s+(?:KEY|INDEX)\s*`?(\w+)`?\s*\((.*)\)$", re.I | re.S)
+_FK_RE = re.compile(r"^(?:CONSTRAINT\s+`?\w+`?\s+)?FOREIGN\s+KEY\s*\(([^)]*)\)", re.I)
+_CONSTRAINT_RE = re.compile(r"^(?:PRIMARY\s+KEY|UNIQUE\s*\(|CHECK\s*\(|CONSTRAINT\s)", re.I)
+_PREFIX_LEN_RE = re.compile(r"`?(\w+)`?\s*\(\d+\)")
+_AUTO_PK_RE = re.compile(
+    r"\b(?:BIG|SMALL|MEDIUM|TINY)?INT(?:EGER)?(?:\(\d+\))?\s+(?:UNSIGNED\s+)?(?:NOT\s+NULL\s+)?"
+    r"AUTO_INCREMENT\s+PRIMARY\s+KEY",
+    re.I
+)
+_ON_UPDATE_RE = re.compile(r"\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP(?:\(\))?", re.I)
+_DEFAULT_NOW_RE = re.compile(r"\bDEFAULT\s+CURRENT_TIMESTAMP(?:\(\))?", re.I)
+_COLUMN_NOISE_RE = re.compile(
+    r"\s+(?:UNSIGNED|CHARACTER\s+SET\s+\w+|COLLATE\s+\w+|COMMENT\s+'(?:[^']|'')*')", re.I
+)
+
+
+def _split_top_level(body: str) -> List[str]:
+    """Divide por comas que no están dentro de paréntesis ni comillas"""
+    parts, depth, quote, current = [], 0, None, []
+    for ch in body:
+        if quote:
+            current.append(ch)
+            if ch == quote:
+                quote = None
+            continue
+        if ch in ("'", '"', "`"):
+            quote = ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(ch)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _column_list(cols: str) -> str:
+    """Elimina longitudes de prefijo (ej. descripcion(100) → descripcion)"""
+    return _PREFIX_LEN_RE.sub(r"\1", cols).replace("`", "")
+
+
+def translate_ddl(sql: str) -> List[str]:
+    """
+    Traduce un CREATE TABLE de MySQL a sentencias SQLite.
+
+    - INT AUTO_INCREMENT PRIMARY KEY → INTEGER PRIMARY KEY AUTOINCREMENT
+    - INDEX/KEY → CREATE INDEX separado
+    - UNIQUE KEY → restricción UNIQUE
+    - ON UPDATE CURRENT_TIMESTAMP → trigger AFTER UPDATE
+    - Se descartan opciones de tabla (ENGINE, CHARSET, COLLATE) y claves
+      foráneas que referencian columnas inexistentes en la tabla
+
+    Args:
+        sql: CREATE TABLE en dialecto MySQL
+
+    Returns:
+        Lista de sentencias SQLite (tabla, índices, triggers)
+    """
+    match = _TABLE_RE.match(sql.strip())
+    if not match:
+        raise ValueError("DDL no reconocido para SQLite")
+
+    if_not_exists, table, body, _options = match.groups()
+    if_not_exists = "IF NOT EXISTS " if if_not_exists else ""
+
+    columns, constraints, extra = [], [], []
+    column_names = set()
+    foreign_keys = []
+
+    for part in _split_top_level(body):
+        index = _INDEX_RE.match(part)
+        if index:
+            name, cols = index.groups()
+            extra.append(
+                f"CREATE INDEX IF NOT EXISTS {table}_{name} ON {table} ({_column_list(cols)})"
+            )
+            continue
+
+        unique = _UNIQUE_RE.match(part)
+        if unique:
+            constraints.append(f"UNIQUE ({_column_list(unique.group(2))})")
+            continue
+
+        if _FK_RE.match(part):
+            foreign_keys.append(part)
+            continue
+
+        if _CONSTRAINT_RE.match(part):
+            constraints.append(part)
+            continue
+
+        # Definición de columna
+        name = part.split()[0].strip("`")
+        column_names.add(name)
+
+        column = _AUTO_PK_RE.sub("INTEGER PRIMARY KEY AUTOINCREMENT", part)
+        column = re.sub(r"\s+AUTO_INCREMENT\b", "", column, flags=re.I)
+        column = _COLUMN_NOISE_RE.sub("", column)
+
+        if _ON_UPDATE_RE.search(column):
+            column = _ON_UPDATE_RE.sub("", column)
+            extra.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{table}_{name}_on_update "
+                f"AFTER UPDATE ON {table} FOR EACH ROW "
+                f"WHEN NEW.{name} IS OLD.{name} "
+                f"BEGIN UPDATE {table} SET {name} = {SQLITE_NOW} WHERE rowid = NEW.rowid; END"
+            )
+
+        column = _DEFAULT_NOW_RE.sub(f"DEFAULT ({SQLITE_NOW})", column)
+        columns.append(column.replace("`", ""))
+
+    for fk in foreign_keys:
+        child_cols = [c.strip(" `") for c in _FK_RE.match(fk).group(1).split(",")]
+        if all(c in column_names for c in child_cols):
+            constraints.append(fk.replace("`", ""))
+        else:
+            logger.warning(f"⚠️ SQLite: FK descartada en '{table}' (columna inexistente): {fk}")
+
+    create = (
+        f"CREATE TABLE {if_not_exists}{table} (\n    "
+        + ",\n    ".join(columns + constraints)
+        + "\n)"
+    )
+    return [create] + extra
+
+
+def translate_many(query: str, seq_args: Sequence[Any]) -> Tuple[str, List[Any]]:
+    """
+    Traduce una sentencia para executemany.
+
+    Returns:
+        (sql, lista de parámetros normalizados)
+    """
+    seq = list(seq_args)
+    first = seq[0] if seq else ()
+    statements = translate(query, first)
+    if len(statements) != 1:
+        raise ValueError("executemany no soporta sentencias emuladas")
+    return statements[0][0], [normalize_args(a) for a in seq]
@@ -19,7 +19,7 @@ from Core.Styles.base_components import (
     CardFrame, FormRow
 )
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class ComprasFrame(BaseFrame):
@@ -33,7 +33,7 @@ class ComprasFrame(BaseFrame):
         super().__init__(parent, theme_name=theme)
         
         self.backend = ComprasBackend()
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.tipo_var = StringVar(value="granel")
         
         ModernStyleManager.configure_modern_styles(self.winfo_toplevel().style, theme)
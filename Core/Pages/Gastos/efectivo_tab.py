@@ -15,7 +15,7 @@ from Core.Styles.base_components import (
 )
 from Core.Styles.modern_styles import ModernStyleManager
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class EfectivoTab(ttk.Frame):
@@ -39,7 +39,7 @@ class EfectivoTab(ttk.Frame):
         from Core.Common.config import load_config
         self.config_data = load_config()
         self.theme_name = self.config_data.get("theme", "solar")
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         
         # Estado de efectivo
         self.capital_fisico = Decimal(0)  # Dinero en caja
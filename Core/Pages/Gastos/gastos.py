@@ -12,7 +12,7 @@ from Core.Pages.Gastos.gastos_tab import GastosTab
 from Core.Common.logger import setup_logger
 from Core.Styles.base_components import BaseFrame, StyledLabel
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class GastosFrame(BaseFrame):
@@ -24,7 +24,7 @@ class GastosFrame(BaseFrame):
         theme = config.get("theme", "solar")
         
         super().__init__(parent, theme_name=theme)
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         
         # Título principal
         title = StyledLabel(
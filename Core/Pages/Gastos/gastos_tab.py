@@ -9,8 +9,9 @@ from Core.Common.logger import setup_logger
 from Core.Backends.gastos_backend import GastosBackend
 from Core.Common.units import get_unit_choices, convert_to_base
 from Core.Backends.inventario_backend import InventarioBackend
+from Core.Common.event_bus import event_bus, StockChanged
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class GastosTab(ttk.Frame):
@@ -18,7 +19,7 @@ class GastosTab(ttk.Frame):
     
     def __init__(self, parent):
         super().__init__(parent)
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.backend = GastosBackend()
         self.inv_backend = InventarioBackend()
         self.product_info = {}
@@ -26,6 +27,11 @@ class GastosTab(ttk.Frame):
         self.setup_ui()
         self.reload_product_choices()
         self.load_recent_gastos()
+        event_bus.subscribe_widget(self, [StockChanged], self._on_stock_changed)
+    
+    def _on_stock_changed(self, events):
+        """Refresca productos disponibles al cambiar el stock"""
+        self.reload_product_choices()
     
     def setup_ui(self):
         """Configura la interfaz"""
@@ -13,15 +13,20 @@ from Core.Backends.produccion_backend import ProduccionBackend
 from Core.Backends.inventario_backend import InventarioBackend
 from Core.Common.database import get_connection, close_connection
 from Core.Common.logger import setup_logger
+from Core.Common.query_profiler import ui_action
+from Core.Common.event_bus import (
+    event_bus, StockChanged, ProductionCreated, PriceChanged, ReferenceDataRefreshed
+)
 from Core.Common.units import get_unit_choices
 from Core.Common.constants import COLOR_SUCCESS, COLOR_PRIMARY, COLOR_INFO, COLOR_DANGER
 from Core.Styles.modern_styles import ModernStyleManager
+from Core.Styles.tree_sync import sync_treeview
 from Core.Styles.base_components import (
     BaseFrame, StyledLabel, StyledEntry, StyledCombobox,
     CardFrame, FormRow
 )
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class ProduccionFrame(BaseFrame):
@@ -36,7 +41,7 @@ class ProduccionFrame(BaseFrame):
         
         self.backend = ProduccionBackend()
         self.inv_backend = InventarioBackend()
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         
         ModernStyleManager.configure_modern_styles(self.winfo_toplevel().style, theme)
         
@@ -48,6 +53,28 @@ class ProduccionFrame(BaseFrame):
         self.reload_inventario()
         self.load_subproductos()
         self.load_productos_finales()
+        
+        event_bus.subscribe_widget(self, [StockChanged], self._on_stock_changed)
+        event_bus.subscribe_widget(
+            self, [ProductionCreated, PriceChanged], self._on_produccion_changed
+        )
+        event_bus.subscribe_widget(self, [ReferenceDataRefreshed], self._on_reference_refreshed)
+    
+    def _on_stock_changed(self, events):
+        """Refresca inventario al cambiar el stock"""
+        self.reload_inventario()
+    
+    def _on_produccion_changed(self, events):
+        """Refresca producciones y productos finales"""
+        if any(isinstance(e, ProductionCreated) for e in events):
+            self.load_producciones_for_selected()
+        self.load_productos_finales()
+    
+    def _on_reference_refreshed(self, events):
+        """Refresca todo lo que se dibujó desde la instantánea local"""
+        self.reload_inventario()
+        self.load_subproductos()
+        self.load_productos_finales()
     
     def setup_ui(self):
         """Configura la interfaz completa"""
@@ -632,13 +659,12 @@ class ProduccionFrame(BaseFrame):
         finally:
             close_connection(conn_db)
     
+    @ui_action("Producción: cargar productos finales")
     def load_productos_finales(self):
         """Carga productos finales"""
         try:
-            for i in self.pf_tree.get_children():
-                self.pf_tree.delete(i)
-            
             pf_list = self.backend.get_productos_finales_info()
+            rows = []
             
             for p in pf_list:
                 pid = p.get("id")
@@ -648,10 +674,9 @@ class ProduccionFrame(BaseFrame):
                 precio = p.get("precio_venta", 0.0) or 0.0
                 margen = p.get("margen_ganancia", 0)
                 
-                self.pf_tree.insert(
-                    "",
-                    END,
-                    values=(
+                rows.append((
+                    pid,
+                    (
                         pid,
                         name,
                         sp,
@@ -659,7 +684,9 @@ class ProduccionFrame(BaseFrame):
                         f"${float(precio):.2f}",
                         f"{margen:.1f}%"
                     )
-                )
+                ))
+            
+            sync_treeview(self.pf_tree, rows)
         
         except Exception as e:
             self.logger.error(f"Error: {e}")
@@ -872,17 +899,12 @@ class ProduccionFrame(BaseFrame):
     def reload_inventario(self):
         """Recarga inventario"""
         try:
-            for i in self.inv_tree.get_children():
-                self.inv_tree.delete(i)
-            
             inv = self.inv_backend.get_inventario_para_resumen()
             
-            for item in inv:
-                self.inv_tree.insert(
-                    "",
-                    END,
-                    values=(item["producto"], item["cantidad_display"], item["unidad_display"])
-                )
+            sync_treeview(self.inv_tree, [
+                (item["producto"], (item["producto"], item["cantidad_display"], item["unidad_display"]))
+                for item in inv
+            ])
         
         except Exception as e:
             self.logger.error(f"Error: {e}")
@@ -890,21 +912,16 @@ class ProduccionFrame(BaseFrame):
     def load_subproductos(self):
         """Carga subproductos"""
         try:
-            for i in self.subproductos_tree.get_children():
-                self.subproductos_tree.delete(i)
-            
             subs = self.backend.get_subproductos_disponibles()
             self.subproductos_map.clear()
+            rows = []
             
             for s in subs:
                 sid = s['id']
                 self.subproductos_map[sid] = s
-                self.subproductos_tree.insert(
-                    "",
-                    END,
-                    iid=str(sid),
-                    values=(sid, s.get('nombre'), f"${float(s['costo_total_subproducto']):.2f}")
-                )
+                rows.append((sid, (sid, s.get('nombre'), f"${float(s['costo_total_subproducto']):.2f}")))
+            
+            sync_treeview(self.subproductos_tree, rows)
         
         except Exception as e:
             messagebox.showerror("Error", str(e)[:100])
@@ -1012,6 +1029,7 @@ class ProduccionFrame(BaseFrame):
         except Exception as e:
             messagebox.showerror("❌", str(e)[:100])
     
+    @ui_action("Producción: producir")
     def on_produce(self):
         """Produce"""
         if not self.selected_subproducto_id:
@@ -1050,8 +1068,7 @@ class ProduccionFrame(BaseFrame):
             self.unidades_entry.delete(0, END)
             self.lbl_costo_total.config(text="$0.00")
             self.lbl_costo_unit.config(text="$0.00")
-            self.reload_inventario()
-            self.load_producciones_for_selected()
+            # Inventario y producciones se refrescan vía event_bus
             self.load_subproductos()
         
         except Exception as e:
@@ -0,0 +1,183 @@
+"""
+Core.Pages.Productos.escenarios_tab - Simulador de escenarios de costos
+"""
+
+import re
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Dict, List
+
+from Core.Backends.escenarios_backend import EscenariosBackend
+from Core.Common.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# "Harina +15", "Azúcar -5%", "Leche entera 7,5"
+_VARIACION = re.compile(r"^(.+?)\s*([+-]?\d+(?:[.,]\d+)?)\s*%?$")
+# Separa variaciones por ";" o por comas que no sean decimales
+_SEPARADOR = re.compile(r";|,(?!\d)")
+
+
+def parse_escenarios(texto: str) -> List[Dict[str, float]]:
+    """
+    Una línea por escenario, variaciones separadas por coma o punto y coma.
+
+    Raises:
+        ValueError: Si una variación no tiene el formato "Insumo ±N%"
+    """
+    escenarios = []
+    for numero, linea in enumerate(texto.splitlines(), start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+
+        escenario = {}
+        for parte in _SEPARADOR.split(linea):
+            parte = parte.strip()
+            if not parte:
+                continue
+            match = _VARIACION.match(parte)
+            if not match:
+                raise ValueError(f"Línea {numero}: '{parte}' no tiene formato 'Insumo ±N%'")
+            escenario[match.group(1).strip()] = float(match.group(2).replace(",", "."))
+
+        escenarios.append(escenario)
+    return escenarios
+
+
+class EscenariosTab(ttk.Frame):
+    """Tab de simulación "qué pasa si" sobre costos y márgenes"""
+
+    tab_name = "Escenarios"
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.backend = EscenariosBackend()
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura la interfaz"""
+        frame = ttk.Frame(self)
+        frame.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)
+
+        ttk.Label(
+            frame,
+            text="🧮 Escenarios de Costos",
+            font=("Segoe UI", 14, "bold")
+        ).pack(pady=5)
+
+        ttk.Label(
+            frame,
+            text="Un escenario por línea, ej.:  Harina +15, Azúcar -5",
+        ).pack(anchor=tk.W)
+
+        self.escenarios_text = tk.Text(frame, height=4, font=("Segoe UI", 10))
+        self.escenarios_text.pack(fill=tk.X, pady=5)
+
+        btn_frame = tk.Frame(frame)
+        btn_frame.pack(fill=tk.X, pady=5)
+
+        tk.Button(
+            btn_frame,
+            text="▶️ Simular",
+            command=self.simular,
+            bg="#28a745",
+            fg="white",
+            relief="flat",
+            cursor="hand2"
+        ).pack(side=tk.LEFT, padx=5)
+
+        tk.Button(
+            btn_frame,
+            text="📋 Insumos",
+            command=self.show_insumos,
+            bg="#17a2b8",
+            fg="white",
+            relief="flat",
+            cursor="hand2"
+        ).pack(side=tk.LEFT, padx=5)
+
+        self.status_label = ttk.Label(btn_frame, text="")
+        self.status_label.pack(side=tk.RIGHT, padx=5)
+
+        self.tree = ttk.Treeview(frame, show="headings", height=15)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self.tree.tag_configure("perdida", foreground="#dc3545")
+        self.tree.tag_configure("sin_costo", foreground="#6c757d")
+
+    def show_insumos(self):
+        """Muestra los insumos que participan en recetas"""
+        try:
+            insumos = self.backend.insumos()
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudieron cargar insumos: {str(e)[:100]}")
+            return
+
+        messagebox.showinfo(
+            "📋 Insumos",
+            "\n".join(insumos) if insumos else "No hay recetas registradas"
+        )
+
+    def simular(self):
+        """Evalúa los escenarios y muestra costo y margen por producto"""
+        try:
+            escenarios = parse_escenarios(self.escenarios_text.get("1.0", tk.END))
+            resultado = self.backend.simular(escenarios)
+        except ValueError as e:
+            messagebox.showwarning("Escenario inválido", str(e))
+            return
+        except Exception as e:
+            logger.error(f"❌ Error simulando escenarios: {e}")
+            messagebox.showerror("Error", f"Error simulando: {str(e)[:100]}")
+            return
+
+        self._render(resultado)
+
+    def _render(self, resultado: Dict):
+        """Reconstruye columnas y filas (las columnas dependen de los escenarios)"""
+        n = resultado["escenarios"]
+        columnas = ["Producto", "Precio", "Costo/U", "% Ganancia"]
+        for e in range(1, n + 1):
+            columnas += [f"Costo E{e}", f"% E{e}"]
+
+        self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = columnas
+        for c in columnas:
+            self.tree.heading(c, text=c)
+            self.tree.column(c, width=200 if c == "Producto" else 90, anchor=tk.W if c == "Producto" else tk.E)
+
+        def _dinero(valor):
+            return "-" if valor is None else f"${valor:.2f}"
+
+        def _pct(valor):
+            return "-" if valor is None else f"{valor:.1f}%"
+
+        sin_costo = 0
+        for p in resultado["productos"]:
+            if p["sin_costo"]:
+                # Un insumo sin costo en inventario: no calculable (no se asume 0)
+                sin_costo += 1
+                faltan = ", ".join(p["sin_costo"])
+                valores = [f"{p['nombre']} (sin costo: {faltan})", _dinero(p["precio_venta"] or None)]
+                valores += ["sin costo"] * (len(columnas) - 2)
+                self.tree.insert("", tk.END, iid=str(p["id"]), values=valores, tags=("sin_costo",))
+                continue
+
+            valores = [
+                p["nombre"],
+                _dinero(p["precio_venta"] or None),
+                _dinero(p["costo_base"]),
+                _pct(p["margen_base"]),
+            ]
+            for costo, margen in zip(p["costos"], p["margenes"]):
+                valores += [_dinero(costo), _pct(margen)]
+
+            perdida = any(m is not None and m < 0 for m in p["margenes"])
+            self.tree.insert("", tk.END, iid=str(p["id"]), values=valores,
+                             tags=("perdida",) if perdida else ())
+
+        self.status_label.config(
+            text=f"{n} escenarios × {len(resultado['productos'])} productos "
+                 f"en {resultado['segundos'] * 1000:.1f}ms"
+                 + (f" · {sin_costo} sin costo" if sin_costo else "")
+        )
@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import messagebox, END, ttk, messagebox
 
 from Core.Backends.inventario_backend import InventarioBackend
+from Core.Backends.movimientos_backend import TIPO_INTERCAMBIO
 from Core.Common.units import get_unit_choices
 
 
@@ -151,7 +152,9 @@ class IntercambiosTab(ttk.Frame):
         # Consumir entregados
         for e in self.entregados:
             try:
-                self.inv_backend.consumir_stock(e['producto'], e['cantidad'], e['unidad'])
+                self.inv_backend.consumir_stock(
+                    e['producto'], e['cantidad'], e['unidad'], tipo=TIPO_INTERCAMBIO
+                )
             except Exception as ex:
                 messagebox.showerror("Error", f"Error: {ex}")
                 return
@@ -172,7 +175,9 @@ class IntercambiosTab(ttk.Frame):
             return
         
         try:
-            self.inv_backend.actualizar_stock_desde_compra(prod_rec, cant_f, unidad_rec, 0.0)
+            self.inv_backend.actualizar_stock_desde_compra(
+                prod_rec, cant_f, unidad_rec, 0.0, tipo=TIPO_INTERCAMBIO
+            )
             messagebox.showinfo(
                 "✅ OK",
                 f"Intercambio registrado\n"
@@ -8,8 +8,13 @@ from tkinter import ttk, messagebox
 from decimal import Decimal
 from Core.Backends.produccion_backend import ProduccionBackend
 from Core.Common.logger import setup_logger
+from Core.Common.query_profiler import ui_action
+from Core.Common.event_bus import (
+    event_bus, PriceChanged, ProductionCreated, ReferenceDataRefreshed
+)
+from Core.Styles.tree_sync import sync_treeview
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class PreciosTab(ttk.Frame):
@@ -23,6 +28,9 @@ class PreciosTab(ttk.Frame):
         self.product_ids = {}  # Mapeo de producto a ID
         self.setup_ui()
         self.load_precios()
+        event_bus.subscribe_widget(
+            self, [PriceChanged, ProductionCreated, ReferenceDataRefreshed], self._on_precios_changed
+        )
 
     def setup_ui(self):
         """Configura la interfaz"""
@@ -110,17 +118,19 @@ class PreciosTab(ttk.Frame):
         """
         messagebox.showinfo("ℹ️ Instrucciones", msg)
 
+    def _on_precios_changed(self, events):
+        """Refresca al cambiar precios o registrar producciones"""
+        self.load_precios()
+
+    @ui_action("Precios: cargar")
     def load_precios(self):
         """Carga PRODUCTOS FINALES con sus precios"""
         try:
             # ✅ Obtener información de PRODUCTOS FINALES
             productos_finales = self.backend.get_productos_finales_info()
             
-            # Limpiar tabla
-            for i in self.precios_tree.get_children():
-                self.precios_tree.delete(i)
-            
             self.product_ids.clear()
+            rows = []
             
             logger.info(f"📊 Cargando {len(productos_finales)} productos finales")
             
@@ -148,12 +158,9 @@ class PreciosTab(ttk.Frame):
                 # Guardar mapping
                 self.product_ids[str(pid)] = pid
                 
-                # Insertar fila
-                self.precios_tree.insert(
-                    "",
-                    tk.END,
-                    iid=str(pid),
-                    values=(
+                rows.append((
+                    pid,
+                    (
                         nombre,
                         f"${costo_unitario:.2f}",
                         f"${precio_venta_float:.2f}" if precio_venta_float > 0 else "(sin precio)",
@@ -161,8 +168,11 @@ class PreciosTab(ttk.Frame):
                         ganancia_display,
                         pct_display
                     ),
-                    tags=("sin_precio",) if precio_venta_float == 0 else ()
-                )
+                    ("sin_precio",) if precio_venta_float == 0 else ()
+                ))
+            
+            # Sólo se tocan filas nuevas, modificadas o eliminadas
+            sync_treeview(self.precios_tree, rows)
             
             # Estilo para productos sin precio
             self.precios_tree.tag_configure("sin_precio", foreground="#FFC107")
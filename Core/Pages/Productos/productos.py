@@ -7,10 +7,11 @@ from tkinter import ttk
 from ttkbootstrap.constants import BOTH, LEFT, RIGHT
 
 from Core.Pages.Productos.precios_tab import PreciosTab
+from Core.Pages.Productos.escenarios_tab import EscenariosTab
 from Core.Common.logger import setup_logger
 from Core.Styles.base_components import BaseFrame, StyledLabel
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class ProductosFrame(BaseFrame):
@@ -23,7 +24,7 @@ class ProductosFrame(BaseFrame):
         
         super().__init__(parent, theme_name=theme)
         
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         
         # Header
         title = StyledLabel(
@@ -41,4 +42,8 @@ class ProductosFrame(BaseFrame):
         
         # Tab Precios
         self.precios_tab = PreciosTab(notebook)
-        notebook.add(self.precios_tab, text="💰 Precios")
\ No newline at end of file
+        notebook.add(self.precios_tab, text="💰 Precios")
+        
+        # Tab Escenarios
+        self.escenarios_tab = EscenariosTab(notebook)
+        notebook.add(self.escenarios_tab, text="🧮 Escenarios")
@@ -12,8 +12,11 @@ from Core.Backends.contabilidad_backend import ContabilidadBackend
 from Core.Backends.inventario_backend import InventarioBackend
 from Core.Backends.gastos_backend import GastosBackend
 from Core.Common.logger import setup_logger
+from Core.Common.money import Money
+from Core.Common.event_bus import event_bus, SaleRegistered, StockChanged
+from Core.Styles.tree_sync import sync_treeview
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class ContabilidadTab(ttk.Frame):
@@ -28,6 +31,9 @@ class ContabilidadTab(ttk.Frame):
         
         self.setup_ui()
         self.actualizar_datos()
+        event_bus.subscribe_widget(
+            self, [SaleRegistered, StockChanged], self._on_datos_changed
+        )
 
     def setup_ui(self):
         """Configura la interfaz"""
@@ -196,6 +202,10 @@ class ContabilidadTab(ttk.Frame):
         
         self.kpi_widgets[key] = value_label
     
+    def _on_datos_changed(self, events):
+        """Refresca al registrar ventas o cambiar el stock"""
+        self.actualizar_datos()
+    
     def actualizar_datos(self):
         """Actualiza todos los datos con cálculos CORRECTOS"""
         try:
@@ -210,23 +220,21 @@ class ContabilidadTab(ttk.Frame):
             resumen = self.contabilidad_backend.obtener_resumen_general()
 
                        # Obtener capital desde Gastos
-            capital_total = Decimal(str(self.gastos_backend.obtener_capital_total()))
+            capital_total = Money.of(self.gastos_backend.obtener_capital_total())
             
             # Obtener gastos totales (para referencia)
-            gastos_totales = Decimal(str(self.gastos_backend.get_total_gastos()))
+            gastos_totales = Money.of(self.gastos_backend.get_total_gastos())
             
             # Obtener gastos de COMPRAS (para dinero_fisico) ✅ NUEVO
-            gastos_compras = Decimal(str(self.gastos_backend.obtener_gastos_compras()))
+            gastos_compras = Money.of(self.gastos_backend.obtener_gastos_compras())
 
             # 3. Extraer valores
-            ingresos = Decimal(str(resumen.get('total_ingresos', 0) or 0))
-            costos_productos_vendidos = Decimal(str(resumen.get('total_costos', 0) or 0))
-            ganancia_neta = Decimal(str(resumen.get('total_ganancia', 0) or 0))
-            margen = Decimal(str(resumen.get('margen_promedio', 0) or 0))
+            ingresos = Money.of(resumen.get('total_ingresos'))
+            costos_productos_vendidos = Money.of(resumen.get('total_costos'))
+            ganancia_neta = Money.of(resumen.get('total_ganancia'))
+            margen = float(resumen.get('margen_promedio', 0) or 0)
 
             ganancia_calculada = ingresos - costos_productos_vendidos
-            
-            gastos_compras = Decimal(str(self.gastos_backend.obtener_gastos_compras()))
 
             
             
@@ -238,7 +246,7 @@ class ContabilidadTab(ttk.Frame):
             
             # ✅ NO PERMITIR QUE DINERO FÍSICO SEA NEGATIVO EN PANTALLA
             # Si es negativo, mostrar 0 pero mantener el valor real internamente
-            dinero_fisico = max(dinero_fisico_calculado, Decimal(0))
+            dinero_fisico = max(dinero_fisico_calculado, Money(0))
             dinero_fisico_real = dinero_fisico_calculado  # Para lógica interna
             
             # Determinar color basado en estado ✅ NUEVO
@@ -314,7 +322,7 @@ class ContabilidadTab(ttk.Frame):
             import traceback
             logger.error(traceback.format_exc())
     
-    def _obtener_inversion(self) -> Decimal:
+    def _obtener_inversion(self) -> Money:
         """
         Obtiene inversión en inventario.
         
@@ -324,26 +332,19 @@ class ContabilidadTab(ttk.Frame):
         """
         try:
             inventario = self.inv_backend.get_inventario_para_resumen()
-            total = Decimal(0)
-            
-            for item in inventario:
-                valor_item = Decimal(str(item.get("total_valor", 0) or 0))
-                total += valor_item
+            total = Money.sum(Money.of(item.get("total_valor")) for item in inventario)
             
             logger.info(f"💰 Inversión en inventario: ${float(total):.2f}")
             return total
         except Exception as e:
             logger.error(f"Error obteniendo inversión: {e}")
-            return Decimal(0)
+            return Money(0)
     
     def _actualizar_tabla_tipo(self):
         """Actualiza tabla por tipo"""
-        for item in self.tree_tipo.get_children():
-            self.tree_tipo.delete(item)
-        
         tipos = self.contabilidad_backend.obtener_resumen_por_tipo_producto()
-        for t in tipos:
-            self.tree_tipo.insert("", tk.END, values=(
+        sync_treeview(self.tree_tipo, [
+            (t['tipo_producto'], (
                 t['tipo_producto'],
                 t['num_ventas'],
                 t['total_unidades'],
@@ -352,15 +353,14 @@ class ContabilidadTab(ttk.Frame):
                 f"${t['total_ganancia']:.2f}",
                 f"{t['margen_promedio']:.1f}%"
             ))
+            for t in tipos
+        ])
     
     def _actualizar_tabla_producto(self):
         """Actualiza tabla por producto"""
-        for item in self.tree_producto.get_children():
-            self.tree_producto.delete(item)
-        
         productos = self.contabilidad_backend.obtener_resumen_por_producto()
-        for p in productos:
-            self.tree_producto.insert("", tk.END, values=(
+        sync_treeview(self.tree_producto, [
+            (f"{p['producto_id']}:{p['tipo_producto']}", (
                 p['nombre_producto'],
                 p['num_ventas'],
                 p['total_unidades'],
@@ -368,6 +368,8 @@ class ContabilidadTab(ttk.Frame):
                 f"${p['total_costos']:.2f}",
                 f"${p['total_ganancia']:.2f}"
             ))
+            for p in productos
+        ])
     
 # Capital viene de la BD (efectivo_movimientos)
 # Solo mostrar, no usar entrada aquí
@@ -395,12 +397,9 @@ class ContabilidadTab(ttk.Frame):
 
     def _actualizar_historial(self):
         """Actualiza historial"""
-        for item in self.tree_historial.get_children():
-            self.tree_historial.delete(item)
-        
         historial = self.contabilidad_backend.obtener_historial_contabilidad(limit=50)
-        for h in historial:
-            self.tree_historial.insert("", tk.END, values=(
+        sync_treeview(self.tree_historial, [
+            (h['id'], (
                 str(h['fecha'])[:10],
                 h['producto'],
                 h['tipo_producto'],
@@ -409,6 +408,8 @@ class ContabilidadTab(ttk.Frame):
                 f"${h['venta_unitaria']:.2f}",
                 f"${h['ganancia_neta']:.2f}"
             ))
+            for h in historial
+        ])
     
     def exportar(self):
         """Exporta reporte"""
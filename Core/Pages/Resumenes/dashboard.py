@@ -8,8 +8,10 @@ from datetime import datetime, timedelta
 
 from Core.Backends.produccion_backend import ProduccionBackend
 from Core.Common.logger import setup_logger
+from Core.Common.query_profiler import ui_action
+from Core.Common.money import Cost
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class DashboardTab(ttk.Frame):
@@ -18,7 +20,7 @@ class DashboardTab(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.backend = ProduccionBackend()
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.selected_subproducto_id = None
         self.setup_ui()
         self.load_subproductos()
@@ -66,6 +68,7 @@ class DashboardTab(ttk.Frame):
         except Exception as e:
             self.logger.error(f"Error cargando subproductos: {e}")
     
+    @ui_action("Dashboard: cargar")
     def load_dashboard(self):
         """Carga dashboard"""
         nombre = self.subproducto_combo.get()
@@ -91,11 +94,11 @@ class DashboardTab(ttk.Frame):
                 texto += f"Producciones: {len(prods)}\n\n"
                 
                 total_unidades = sum(p['unidades_producidas'] for p in prods)
-                total_costo = sum(float(p['costo_total_masa']) for p in prods)
+                total_costo = Cost.sum(Cost.of(p['costo_total_masa']) for p in prods)
                 
                 texto += f"Total Unidades: {total_unidades}\n"
                 texto += f"Costo Total: ${total_costo:.2f}\n"
-                texto += f"Costo Promedio/Unidad: ${total_costo/total_unidades:.4f}\n\n"
+                texto += f"Costo Promedio/Unidad: ${total_costo / int(total_unidades):.4f}\n\n"
                 
                 texto += "Producciones:\n"
                 texto += "-" * 60 + "\n"
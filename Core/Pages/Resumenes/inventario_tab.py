@@ -5,6 +5,10 @@ Core.Pages.Resumenes.inventario_tab - Tab de inventario
 import tkinter as tk
 from tkinter import ttk, messagebox, END 
 
+from Core.Common.event_bus import event_bus, StockChanged, ReferenceDataRefreshed
+from Core.Styles.tree_sync import sync_treeview
+from Core.Common.query_profiler import ui_action
+
 
 class InventarioTab(ttk.Frame):
     """Tab de inventario"""
@@ -13,6 +17,9 @@ class InventarioTab(ttk.Frame):
         super().__init__(parent)
         self.backend = backend
         self.setup_ui()
+        event_bus.subscribe_widget(
+            self, [StockChanged, ReferenceDataRefreshed], self._on_stock_changed
+        )
     
     def setup_ui(self):
         """Configura la interfaz"""
@@ -49,27 +56,31 @@ class InventarioTab(ttk.Frame):
         
         self.load_inventario()
     
+    def _on_stock_changed(self, events):
+        """Refresca al cambiar el stock (una vez por frame)"""
+        self.load_inventario()
+    
+    @ui_action("Inventario: cargar")
     def load_inventario(self):
         """Carga inventario"""
-        for item in self.inv_tree.get_children():
-            self.inv_tree.delete(item)
-        
         inventario_data = self.backend.get_inventario_para_resumen()
         
         total_invertido = 0
+        rows = []
         
         for item in inventario_data:
-            self.inv_tree.insert(
-                "",
-                tk.END,
-                values=(
+            rows.append((
+                item["producto"],
+                (
                     item["producto"],
                     item["cantidad_display"],
                     item["unidad_display"],
                     item["costo_promedio_display"],
                     f"${item['total_valor']:.2f}",
                 ),
-            )
+            ))
             total_invertido += item["total_valor"]
         
+        sync_treeview(self.inv_tree, rows)
+        
         self.total_label.config(text=f"Total Invertido: ${total_invertido:.2f}")
\ No newline at end of file
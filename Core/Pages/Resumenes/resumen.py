@@ -15,7 +15,7 @@ from Core.Common.logger import setup_logger
 from Core.Styles.modern_styles import ModernStyleManager
 from Core.Styles.base_components import BaseFrame, StyledLabel
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class ResumenesFrame(BaseFrame):
@@ -27,7 +27,7 @@ class ResumenesFrame(BaseFrame):
         theme = config.get("theme", "solar")
         
         super().__init__(parent, theme_name=theme)
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.backend = InventarioBackend()
         
         ModernStyleManager.configure_modern_styles(self.winfo_toplevel().style, theme)
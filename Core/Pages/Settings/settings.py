@@ -12,7 +12,7 @@ from Core.Backends.settings_backend import SettingsBackend
 from Core.Common.logger import setup_logger
 from ttkbootstrap.constants import LEFT, RIGHT, X, Y, BOTH
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class SettingsFrame(BaseFrame):
@@ -24,7 +24,7 @@ class SettingsFrame(BaseFrame):
         theme = config.get("theme", "solar")
         
         super().__init__(parent, theme_name=theme)
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.backend = SettingsBackend()
         
         self.setup_ui()
@@ -117,7 +117,12 @@ class SettingsFrame(BaseFrame):
         self._create_stats_section(right_column)
         
         # ============================================
-        # SECCIÓN 6: UTILIDADES
+        # SECCIÓN 6: RENDIMIENTO
+        # ============================================
+        self._create_performance_section(right_column)
+        
+        # ============================================
+        # SECCIÓN 7: UTILIDADES
         # ============================================
         self._create_utilities_section(right_column)
         
@@ -320,7 +325,38 @@ class SettingsFrame(BaseFrame):
         self.load_stats()
     
     # ============================================
-    # SECCIÓN 6: UTILIDADES
+    # SECCIÓN 6: RENDIMIENTO
+    # ============================================
+    def _create_performance_section(self, parent):
+        """Crea la sección de rendimiento (latencias de backends)"""
+        card = CardFrame(parent, title="⏱️ RENDIMIENTO", theme_name=self.theme_name)
+        card.pack(fill=X, pady=(0, 10))
+        
+        self.perf_text = tk.Text(
+            card, height=6, wrap=tk.NONE, bg="white", relief="solid", bd=1,
+            font=("Consolas", 8), state=tk.DISABLED
+        )
+        self.perf_text.pack(fill=X, padx=10, pady=(10, 8))
+        
+        btn_frame = BaseFrame(card, theme_name=self.theme_name)
+        btn_frame.pack(fill=X, padx=10, pady=(0, 10))
+        
+        tk.Button(
+            btn_frame, text="🔄 Actualizar", command=self.load_performance,
+            bg="#0dcaf0", fg="white", relief="flat", cursor="hand2", bd=0,
+            font=("Segoe UI", 9, "bold"), padx=10, pady=4
+        ).pack(side=LEFT, fill=X, expand=True, padx=(0, 5))
+        
+        tk.Button(
+            btn_frame, text="💾 Exportar JSON", command=self.export_performance,
+            bg="#6c757d", fg="white", relief="flat", cursor="hand2", bd=0,
+            font=("Segoe UI", 9, "bold"), padx=10, pady=4
+        ).pack(side=LEFT, fill=X, expand=True)
+        
+        self.load_performance()
+    
+    # ============================================
+    # SECCIÓN 7: UTILIDADES
     # ============================================
     def _create_utilities_section(self, parent):
         """Crea la sección de utilidades"""
@@ -488,6 +524,36 @@ class SettingsFrame(BaseFrame):
         except Exception as e:
             self.logger.error(f"Error: {e}")
     
+    # ============================================
+    # MÉTODOS: RENDIMIENTO
+    # ============================================
+    def load_performance(self):
+        try:
+            filas = self.backend.get_performance_report()
+            
+            if filas:
+                lineas = [f"{'Método':<38}{'n':>6}{'p50':>9}{'p95':>9}{'p99':>9}"]
+                for m in filas:
+                    lineas.append(
+                        f"{m['name'][:37]:<38}{m['calls']:>6}"
+                        f"{m['p50'] * 1000:>7.1f}ms{m['p95'] * 1000:>7.1f}ms{m['p99'] * 1000:>7.1f}ms"
+                    )
+                msg = "\n".join(lineas)
+            else:
+                msg = "Sin mediciones todavía"
+            
+            self.perf_text.config(state=tk.NORMAL)
+            self.perf_text.delete(1.0, tk.END)
+            self.perf_text.insert(1.0, msg)
+            self.perf_text.config(state=tk.DISABLED)
+        
+        except Exception as e:
+            self.logger.error(f"Error: {e}")
+    
+    def export_performance(self):
+        success, msg = self.backend.export_performance_report()
+        messagebox.showinfo("✅" if success else "❌", msg)
+    
     # ============================================
     # MÉTODOS: UTILIDADES
     # ============================================
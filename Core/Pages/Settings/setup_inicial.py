@@ -14,7 +14,7 @@ from Core.Styles.base_components import BaseFrame, StyledLabel, StyledEntry
 from Core.Common.config import load_config
 from Core.Common.units import get_unit_choices
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class SetupInicial(tk.Toplevel):
@@ -31,7 +31,7 @@ class SetupInicial(tk.Toplevel):
         self.theme_name = config.get("theme", "solar")
         
         self.inventory_backend = InventarioBackend()
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         
         # Variables de productos
         self.productos = []
@@ -6,8 +6,10 @@ import tkinter as tk
 import tkinter as tk
 from tkinter import messagebox, END, ttk, messagebox
 from Core.Common.logger import setup_logger
+from Core.Common.event_bus import event_bus, SaleRegistered, ReferenceDataRefreshed
+from Core.Styles.tree_sync import sync_treeview
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class ClientesTab(ttk.Frame):
@@ -18,6 +20,8 @@ class ClientesTab(ttk.Frame):
         self.backend = backend
         self.setup_ui()
         self.load_clients()
+        event_bus.subscribe_widget(self, [SaleRegistered], self._on_sale_registered)
+        event_bus.subscribe_widget(self, [ReferenceDataRefreshed], self._on_reference_refreshed)
     
     def setup_ui(self):
         """Configura la interfaz"""
@@ -80,20 +84,23 @@ class ClientesTab(ttk.Frame):
         try:
             rows = self.backend.get_clientes()
             
-            for i in self.clients_tree.get_children():
-                self.clients_tree.delete(i)
-            
-            for r in rows:
-                active = r.get("active", 1)
-                self.clients_tree.insert(
-                    "",
-                    tk.END,
-                    iid=str(r["id"]),
-                    values=(r["nombre"], "✅ Activo" if active else "❌ Inactivo")
-                )
+            sync_treeview(self.clients_tree, [
+                (r["id"], (r["nombre"], "✅ Activo" if r.get("active", 1) else "❌ Inactivo"))
+                for r in rows
+            ])
         except Exception as e:
             messagebox.showerror("Error", f"Error: {e}")
     
+    def _on_sale_registered(self, events):
+        """Refresca estadísticas del cliente seleccionado"""
+        if self.clients_tree.selection():
+            self.on_client_select(None)
+    
+    def _on_reference_refreshed(self, events):
+        """Refresca la lista si se recargaron los clientes en segundo plano"""
+        if any(e.clave == self.backend.CACHE_KEY_CLIENTES for e in events):
+            self.load_clients()
+    
     def create_client(self):
         """Crea un cliente"""
         name = self.new_client_entry.get().strip()
@@ -6,6 +6,8 @@ import tkinter as tk
 import tkinter as tk
 from tkinter import messagebox, END, ttk, messagebox
 
+from Core.Common.event_bus import event_bus, SaleRegistered
+
 
 class HistorialTab(ttk.Frame):
     """Tab de historial de ventas"""
@@ -15,6 +17,11 @@ class HistorialTab(ttk.Frame):
         self.backend = backend
         self.setup_ui()
         self.load_historial()
+        event_bus.subscribe_widget(self, [SaleRegistered], self._on_sale_registered)
+    
+    def _on_sale_registered(self, events):
+        """Refresca el historial al registrar ventas"""
+        self.load_historial()
     
     def setup_ui(self):
         """Configura la interfaz"""
@@ -6,7 +6,9 @@ import tkinter as tk
 import tkinter as tk
 from tkinter import messagebox, END, ttk, messagebox
 
-logger = __import__('Core.Common.logger', fromlist=['setup_logger']).setup_logger()
+from Core.Common.query_profiler import ui_action
+
+logger = __import__('Core.Common.logger', fromlist=['setup_logger']).setup_logger(__name__)
 
 
 class RegistrarVentaTab(ttk.Frame):
@@ -235,6 +237,7 @@ class RegistrarVentaTab(ttk.Frame):
         subtotal = sum(r["unit_price"] * r["quantity"] for r in self.item_rows)
         self.total_label.config(text=f"${subtotal:.2f}")
     
+    @ui_action("Ventas: registrar")
     def submit_sale(self):
         """Registra la venta"""
         if not self.selected_client_id:
@@ -14,7 +14,7 @@ from Core.Pages.Ventas.history_tab import HistorialTab
 from Core.Backends.ventas_backend import VentasBackend
 from Core.Common.logger import setup_logger
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class VentasFrame(ttk.Frame):
@@ -23,7 +23,7 @@ class VentasFrame(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent)
         self.backend = VentasBackend()
-        self.logger = setup_logger()
+        self.logger = setup_logger(__name__)
         self.setup_ui()
         
         self.clientes_tab = ClientesTab(self.notebook, self.backend)
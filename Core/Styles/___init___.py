@@ -10,6 +10,7 @@ from Core.Styles.base_components import (
 from Core.Styles.modern_styles import ModernStyleManager
 from Core.Styles.theme_manager import CustomThemeManager, ThemePreset
 from Core.Styles.compat_manager import CompatibilityManager
+from Core.Styles.tree_sync import sync_treeview, clear_treeview
 
 __all__ = [
     'BaseFrame',
@@ -27,5 +28,7 @@ __all__ = [
     'ModernStyleManager',
     'CustomThemeManager',
     'ThemePreset',
-    'CompatibilityManager'
+    'CompatibilityManager',
+    'sync_treeview',
+    'clear_treeview'
 ]
\ No newline at end of file
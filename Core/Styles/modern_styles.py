@@ -1,5 +1,7 @@
 # Core/Styles/modern_styles.py - Estilos modernos y consistentes para temas
 
+from functools import lru_cache
+
 from ttkbootstrap import Style
 
 class ModernStyleManager:
@@ -90,52 +92,69 @@ class ModernStyleManager:
         }
         return accent_colors.get(theme_name, "#0078d4")
     
+    # (intérprete Tk, tema ttk activo, tema) ya configurados: ttk guarda los
+    # estilos por tema en el intérprete, repetirlo en cada página sólo cuesta
+    _configurados = set()
+    
     @staticmethod
-    def configure_modern_styles(style, theme_name):
-        """Configura estilos modernos sin crear estilos personalizados"""
-        
-        # === BUTTONS ===
-        style.configure(
-            "TButton",
-            font=("Segoe UI", 10, "bold"),
-            padding=10,
-            relief="flat"
-        )
-        
-        # === ENTRY ===
-        style.configure(
-            "TEntry",
-            font=("Segoe UI", 10),
-            padding=8,
-            relief="solid",
-            borderwidth=1
-        )
-        
-        # === COMBOBOX ===
-        style.configure(
-            "TCombobox",
-            font=("Segoe UI", 10),
-            padding=8,
-            relief="solid",
-            borderwidth=1
+    @lru_cache(maxsize=None)
+    def _opciones(theme_name):
+        """Opciones por estilo para un tema (se calculan una sola vez por tema)"""
+        return (
+            # === BUTTONS ===
+            ("TButton", {
+                "font": ("Segoe UI", 10, "bold"),
+                "padding": 10,
+                "relief": "flat",
+            }),
+            # === ENTRY ===
+            ("TEntry", {
+                "font": ("Segoe UI", 10),
+                "padding": 8,
+                "relief": "solid",
+                "borderwidth": 1,
+            }),
+            # === COMBOBOX ===
+            ("TCombobox", {
+                "font": ("Segoe UI", 10),
+                "padding": 8,
+                "relief": "solid",
+                "borderwidth": 1,
+            }),
+            # === TREEVIEW ===
+            ("Treeview", {
+                "font": ("Segoe UI", 9),
+                "rowheight": 28,
+                "relief": "solid",
+                "borderwidth": 1,
+            }),
+            ("Treeview.Heading", {
+                "font": ("Segoe UI", 9, "bold"),
+                "relief": "solid",
+                "borderwidth": 1,
+            }),
         )
+    
+    @staticmethod
+    def configure_modern_styles(style, theme_name, force=False):
+        """
+        Configura estilos modernos sin crear estilos personalizados.
         
-        # === TREEVIEW ===
-        tree_bg = "#ffffff" if "dark" not in theme_name.lower() else "#2b2d42"
+        Sólo trabaja la primera vez por tema: las páginas pueden llamarlo
+        al construirse sin repetir la configuración ttk (ni pisar un tema
+        personalizado aplicado encima). force=True la rehace.
+        """
+        clave = (id(style.master), style.theme_use(), theme_name)
+        if not force and clave in ModernStyleManager._configurados:
+            return style
         
-        style.configure(
-            "Treeview",
-            font=("Segoe UI", 9),
-            rowheight=28,
-            relief="solid",
-            borderwidth=1
-        )
+        for nombre, opciones in ModernStyleManager._opciones(theme_name):
+            style.configure(nombre, **opciones)
         
-        style.configure(
-            "Treeview.Heading",
-            font=("Segoe UI", 9, "bold"),
-            relief="solid",
-            borderwidth=1
-        )
-        
-        return style
\ No newline at end of file
+        ModernStyleManager._configurados.add(clave)
+        return style
+    
+    @staticmethod
+    def invalidate_cache():
+        """Olvida los temas configurados (la próxima llamada los rehace)"""
+        ModernStyleManager._configurados.clear()
@@ -12,7 +12,7 @@ from Core.Styles.theme_manager import CustomThemeManager, ThemePreset
 from Core.Common.logger import setup_logger
 from Core.Styles.base_components import BaseFrame, StyledLabel
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class ThemeDesignerWindow(Toplevel):
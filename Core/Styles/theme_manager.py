@@ -2,14 +2,15 @@
 Core.Styles.theme_manager - Gestión de temas personalizados y presets
 """
 
+import copy
 import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 from ttkbootstrap import Style
 
 from Core.Common.logger import setup_logger
 
-logger = setup_logger()
+logger = setup_logger(__name__)
 
 
 class CustomThemeManager:
@@ -65,22 +66,34 @@ class CustomThemeManager:
         "custom_themes.json"
     )
     
+    # Contenido de CUSTOM_THEMES_PATH leído una vez (None = por leer)
+    _cache: Optional[Dict] = None
+    
     @staticmethod
     def load_custom_themes() -> Dict:
         """
-        Carga temas personalizados desde archivo.
+        Carga temas personalizados desde archivo (se lee una vez; guardar
+        o eliminar un tema invalida la copia en memoria).
         
         Returns:
-            Dict: Temas personalizados
+            Dict: Temas personalizados (copia: se puede modificar)
         """
-        if os.path.exists(CustomThemeManager.CUSTOM_THEMES_PATH):
-            try:
-                with open(CustomThemeManager.CUSTOM_THEMES_PATH, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"Error cargando temas personalizados: {e}")
-                return {}
-        return {}
+        if CustomThemeManager._cache is None:
+            if os.path.exists(CustomThemeManager.CUSTOM_THEMES_PATH):
+                try:
+                    with open(CustomThemeManager.CUSTOM_THEMES_PATH, 'r', encoding='utf-8') as f:
+                        CustomThemeManager._cache = json.load(f)
+                except Exception as e:
+                    logger.error(f"Error cargando temas personalizados: {e}")
+                    return {}
+            else:
+                CustomThemeManager._cache = {}
+        return copy.deepcopy(CustomThemeManager._cache)
+    
+    @staticmethod
+    def invalidate_cache():
+        """Fuerza a releer los temas personalizados en la próxima carga"""
+        CustomThemeManager._cache = None
     
     @staticmethod
     def save_custom_theme(theme_name: str, theme_data: Dict) -> bool:
@@ -102,6 +115,7 @@ class CustomThemeManager:
             
             with open(CustomThemeManager.CUSTOM_THEMES_PATH, 'w', encoding='utf-8') as f:
                 json.dump(themes, f, indent=2, ensure_ascii=False)
+            CustomThemeManager.invalidate_cache()
             
             logger.info(f"✅ Tema guardado: {theme_name}")
             return True
@@ -129,6 +143,7 @@ class CustomThemeManager:
                 
                 with open(CustomThemeManager.CUSTOM_THEMES_PATH, 'w', encoding='utf-8') as f:
                     json.dump(themes, f, indent=2, ensure_ascii=False)
+                CustomThemeManager.invalidate_cache()
                 
                 logger.info(f"✅ Tema eliminado: {theme_name}")
                 return True
@@ -0,0 +1,99 @@
+"""
+Core.Styles.tree_sync - Actualización incremental de Treeviews por clave
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+# Atributo donde se guarda la última versión sincronizada de cada fila
+_CACHE_ATTR = "_sync_rows"
+
+
+def sync_treeview(tree, rows: Iterable[Sequence[Any]], parent: str = "") -> Dict[str, int]:
+    """
+    Reconcilia un Treeview con un nuevo conjunto de filas con clave.
+
+    En lugar de borrar todo y reinsertar, sólo:
+    - Elimina las filas que ya no existen
+    - Inserta las filas nuevas en su posición
+    - Actualiza las celdas de filas que cambiaron
+    - Mueve filas cuando cambió el orden
+
+    Así un refresco tras un cambio de stock toca una sola fila y se
+    conservan selección y posición del scroll.
+
+    Args:
+        tree: ttk.Treeview a sincronizar
+        rows: Secuencia ordenada de (iid, values) o (iid, values, tags).
+              El iid debe ser único (ej. id de BD o nombre de producto).
+        parent: Nodo padre (por defecto la raíz)
+
+    Returns:
+        Dict con conteos: insertadas, actualizadas, eliminadas, movidas
+    """
+    cache: Dict[str, Tuple[tuple, tuple]] = getattr(tree, _CACHE_ATTR, None)
+    if cache is None:
+        cache = {}
+        setattr(tree, _CACHE_ATTR, cache)
+
+    # Normalizar filas: iid como str, values/tags como tuplas
+    nuevas: List[Tuple[str, tuple, tuple]] = []
+    vistos = set()
+    for row in rows:
+        iid = str(row[0])
+        if iid in vistos:
+            raise ValueError(f"iid duplicado en sync_treeview: {iid}")
+        vistos.add(iid)
+        values = tuple(row[1])
+        tags = tuple(row[2]) if len(row) > 2 and row[2] else ()
+        nuevas.append((iid, values, tags))
+
+    stats = {"insertadas": 0, "actualizadas": 0, "eliminadas": 0, "movidas": 0}
+
+    existentes = tree.get_children(parent)
+
+    # 1. Eliminar filas que ya no están (una sola llamada a Tcl)
+    eliminar = [iid for iid in existentes if iid not in vistos]
+    if eliminar:
+        tree.delete(*eliminar)
+        for iid in eliminar:
+            cache.pop(iid, None)
+        stats["eliminadas"] = len(eliminar)
+
+    # Espejo del orden actual del árbol
+    actuales = [iid for iid in existentes if iid in vistos]
+    presentes = set(actuales)
+
+    # 2. Insertar / mover / actualizar en orden
+    for idx, (iid, values, tags) in enumerate(nuevas):
+        if iid not in presentes:
+            tree.insert(parent, idx, iid=iid, values=values, tags=tags)
+            actuales.insert(idx, iid)
+            presentes.add(iid)
+            cache[iid] = (values, tags)
+            stats["insertadas"] += 1
+            continue
+
+        if idx >= len(actuales) or actuales[idx] != iid:
+            tree.move(iid, parent, idx)
+            actuales.remove(iid)
+            actuales.insert(idx, iid)
+            stats["movidas"] += 1
+
+        # Filas insertadas fuera de este helper no están en caché: se actualizan
+        if cache.get(iid) != (values, tags):
+            tree.item(iid, values=values, tags=tags)
+            cache[iid] = (values, tags)
+            stats["actualizadas"] += 1
+
+    return stats
+
+
+def clear_treeview(tree, parent: str = ""):
+    """Vacía un Treeview y su caché de sincronización"""
+    children = tree.get_children(parent)
+    if children:
+        tree.delete(*children)
+    cache = getattr(tree, _CACHE_ATTR, None)
+    if cache:
+        for iid in children:
+            cache.pop(iid, None)
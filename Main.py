@@ -1,5 +1,6 @@
 import sys
 import os
+import time
 from pathlib import Path
 from datetime import datetime
 import logging
@@ -10,9 +11,14 @@ from contextlib import contextmanager
 # Asegurar que el directorio actual está en el path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Primero: el reloj del arranque empieza aquí
+from Core.Common.startup_timeline import startup_timeline
+startup_timeline.marcar("import stdlib + tkinter")
+
 from ttkbootstrap import Window
 from ttkbootstrap.constants import *
 from tkinter import messagebox
+startup_timeline.marcar("import ttkbootstrap")
 
 # ============================================
 # IMPORTS: CORE MODULES
@@ -22,7 +28,7 @@ from Core.Common.config import load_config, save_config, get_db_config
 from Core.Common.constants import (
     APP_TITLE, DEFAULT_THEME, AVAILABLE_THEMES, DEFAULT_WINDOW_WIDTH,
     DEFAULT_WINDOW_HEIGHT, MENU_WIDTH, MENU_ITEMS, COLOR_PRIMARY, COLOR_DANGER,
-    COLOR_INFO
+    COLOR_INFO, MEMORY_TRACKING
 )
 
 from Core.Styles.modern_styles import ModernStyleManager
@@ -30,14 +36,15 @@ from Core.Styles.base_components import (
     MenuFrame, StyledLabel, InfoFrame, SeparatorFrame, BaseFrame
 )
 from Core.Styles.theme_manager import CustomThemeManager
-from Core.Common.database import DatabaseManager
-from Core.Pages.Settings.setup_inicial import SetupInicial
-from Core.Common.database import revisar_setup_completado
+from Core.Common.event_bus import event_bus
+from Core.Common.optimization_utils import memory_profiler, get_performance_monitor
+# BD, caché y setup inicial se importan en _deferred_startup (después del primer paint)
+startup_timeline.marcar("import core + estilos")
 
 # ============================================
 # GLOBAL LOGGER - Single instance
 # ============================================
-logger = setup_logger()
+logger = setup_logger("Main")
 
 
 # ============================================
@@ -195,28 +202,81 @@ class MainApplication:
         # Validar e inicializar tema
         self.current_theme = self._validate_and_setup_theme()
         
+        # Hasta que la BD esté lista, show_page sólo recuerda la página pedida
+        self._db_ready = False
+        self._pending_page = "compras"
+        
         # Configurar ventana
-        self._setup_window()
+        with startup_timeline.medir("tema + ventana"):
+            self._setup_window()
+        
+        # Eventos de dominio: entregar en el hilo de Tk, coalescidos por frame
+        event_bus.attach_tk(self.root)
+        
+        # Configurar UI (menú y contenedor: no tocan la BD)
+        with startup_timeline.medir("ui (menú)"):
+            self.setup_ui()
+            self._show_loading()
+        
+        # Bindings
+        self._setup_bindings()
+        
+        # BD y primera página, una vez que la ventana ya se ve
+        startup_timeline.al_primer_paint(self.root, self._deferred_startup)
+    
+    def _deferred_startup(self):
+        """Arranque que necesita la BD (corre después del primer paint)"""
+        from Core.Common.database import revisar_setup_completado
+        from Core.Common.warm_cache import warm_cache
+        from Core.Common.workload_recorder import start_if_configured as start_workload_recording
         
         # Verificar setup inicial
-        if not revisar_setup_completado():
-            self._show_initial_setup()
+        with startup_timeline.medir("setup inicial"):
+            if not revisar_setup_completado():
+                self._show_initial_setup()
         
         # Inicializar base de datos
-        if not self._initialize_database():
-            sys.exit(1)
+        with startup_timeline.medir("bd (migraciones)"):
+            if not self._initialize_database():
+                sys.exit(1)
         
-        # Configurar UI
-        self.setup_ui()
+        # Grabación de carga (WORKLOAD_RECORD=1) con snapshot de la BD recién abierta
+        start_workload_recording()
         
-        # Mostrar página inicial
-        self.show_page("compras")
+        # Datos de referencia desde la instantánea local (sin ir a MySQL)
+        with startup_timeline.medir("caché caliente"):
+            warm_cache.prime()
         
-        # Bindings
-        self._setup_bindings()
+        # Seguimiento de memoria por página (MEMORY_TRACKING=1 o Ctrl+Shift+M)
+        if MEMORY_TRACKING:
+            memory_profiler.start()
+        
+        # Mostrar página inicial (o la que se pidió mientras cargaba)
+        self._db_ready = True
+        self._loading_label.destroy()
+        with startup_timeline.medir("primera página"):
+            self.show_page(self._pending_page)
+            self.root.update_idletasks()
+        
+        # Reconciliar instantánea con la BD en segundo plano
+        self._start_warm_cache_reconcile()
+        
+        # Checkpoint del ledger de inventario si hace falta (segundo plano)
+        self._start_inventory_checkpoint()
         
         # Log de inicio
         self._log_startup()
+        startup_timeline.interactivo()
+    
+    def _show_loading(self):
+        """Aviso en el área de contenido mientras se abre la BD"""
+        self._loading_label = StyledLabel(
+            self.content_frame,
+            text="⏳ Cargando datos...",
+            label_type="heading",
+            theme_name=self.current_theme
+        )
+        self._loading_label.pack(expand=True)
     
     def _validate_and_setup_theme(self) -> str:
         """Valida y configura el tema"""
@@ -249,6 +309,8 @@ class MainApplication:
     
     def _show_initial_setup(self):
         """Muestra pantalla de setup inicial"""
+        from Core.Pages.Settings.setup_inicial import SetupInicial
+        
         try:
             setup_window = SetupInicial(self.root)
             self.root.wait_window(setup_window)
@@ -264,6 +326,8 @@ class MainApplication:
         Returns:
             bool: True si fue exitoso
         """
+        from Core.Common.database import DatabaseManager
+        
         try:
             if not DatabaseManager.initialize_database():
                 self.logger.error("No se pudo inicializar la BD")
@@ -282,6 +346,25 @@ class MainApplication:
             messagebox.showerror("❌ Error Crítico", f"Error de BD: {e}")
             return False
     
+    def _start_warm_cache_reconcile(self):
+        """Registra los loaders de datos de referencia y reconcilia en segundo plano"""
+        from Core.Common.warm_cache import warm_cache
+        # Importar backends registra sus loaders en warm_cache
+        import Core.Backends.ventas_backend  # noqa: F401
+        
+        warm_cache.reconcile_async()
+    
+    def _start_inventory_checkpoint(self):
+        """Crea el snapshot inicial o periódico del ledger sin bloquear la UI"""
+        import threading
+        from Core.Backends.movimientos_backend import MovimientosBackend
+        
+        threading.Thread(
+            target=MovimientosBackend().snapshot_si_corresponde,
+            name="inventario-snapshot",
+            daemon=True
+        ).start()
+    
     def _setup_bindings(self):
         """Configura bindings de teclado y ventana"""
         def on_close_or_escape(event=None):
@@ -290,6 +373,18 @@ class MainApplication:
         
         self.root.bind("<Escape>", on_close_or_escape)
         self.root.protocol("WM_DELETE_WINDOW", on_close_or_escape)
+        self.root.bind("<Control-M>", self._memory_debug)
+    
+    def _memory_debug(self, event=None):
+        """
+        Ctrl+Shift+M: activa el seguimiento de memoria por página; si ya
+        está activo, reporta lo que sobrevivió a cada navegación.
+        """
+        if not memory_profiler.enabled:
+            memory_profiler.start()
+            self.logger.info("🧠 Navega entre páginas y vuelve a pulsar Ctrl+Shift+M para el reporte")
+        else:
+            memory_profiler.print_report()
     
     def _log_startup(self):
         """Registra información de startup"""
@@ -447,9 +542,20 @@ class MainApplication:
         if self.current_page_name == page_name and self.current_page:
             return True
         
+        # BD aún abriéndose: se mostrará al terminar el arranque
+        if not self._db_ready:
+            self._pending_page = page_name
+            return True
+        
+        # Latencia del cambio de página (destruir + construir), en el monitor
+        inicio = time.perf_counter_ns()
+        
         # Destruir página anterior (con context manager)
         with managed_page(self.current_page):
             pass
+        # Soltar la referencia: la página destruida no debe sobrevivir
+        self.current_page = None
+        memory_profiler.page_destroyed(self.current_page_name, page_name, self.root)
         
         # Cargar nueva página
         try:
@@ -462,8 +568,11 @@ class MainApplication:
             self.current_page = PageClass(self.content_frame)
             self.current_page.pack(fill=BOTH, expand=True)
             self.current_page_name = page_name
+            elapsed = time.perf_counter_ns() - inicio
+            get_performance_monitor().record(f"show_page:{page_name}", elapsed)
+            memory_profiler.page_built(page_name, self.root)
             
-            self.logger.info(f"✅ Página cargada: {page_name.upper()}")
+            self.logger.info(f"✅ Página cargada: {page_name.upper()} ({elapsed / 1e6:.0f}ms)")
             return True
         
         except Exception as e:
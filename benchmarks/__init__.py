@@ -0,0 +1,5 @@
+"""
+benchmarks - Suite de benchmarks de backends sobre datasets sintéticos
+
+Ver benchmarks/runner.py para el uso.
+"""
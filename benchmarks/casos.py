@@ -0,0 +1,258 @@
+"""
+benchmarks.casos - Casos de benchmark por método público de backend
+
+Cada caso arma los argumentos de la iteración i a partir de un Contexto
+con ids y nombres reales del dataset. Los métodos que destruyen datos
+tienen un `preparar` que crea el objetivo fuera de la medición.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from Core.Backends.compras_backend import ComprasBackend
+from Core.Backends.contabilidad_backend import ContabilidadBackend
+from Core.Backends.gastos_backend import GastosBackend
+from Core.Backends.inventario_backend import InventarioBackend
+from Core.Backends.produccion_backend import ProduccionBackend
+from Core.Backends.ventas_backend import VentasBackend
+from Core.Common.database import get_connection, close_connection
+
+BACKENDS = [
+    ComprasBackend, InventarioBackend, ProduccionBackend,
+    VentasBackend, ContabilidadBackend, GastosBackend,
+]
+
+Args = Tuple[tuple, dict]
+
+
+# ============================================
+# CONTEXTO
+# ============================================
+
+@dataclass
+class Contexto:
+    """Muestras del dataset que usan los casos"""
+
+    insumos: List[Dict] = field(default_factory=list)
+    subproductos: List[int] = field(default_factory=list)
+    productos_finales: List[Dict] = field(default_factory=list)
+    clientes: List[int] = field(default_factory=list)
+    proveedor: str = "Proveedor 01"
+    fecha_inicio: str = "2000-01-01"
+    fecha_fin: str = "2100-01-01"
+
+    @classmethod
+    def cargar(cls, muestras: int = 50) -> "Contexto":
+        conn = get_connection()
+        if not conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, producto, unidad_base FROM inventario ORDER BY id LIMIT %s",
+                    (muestras,)
+                )
+                insumos = cursor.fetchall() or []
+                cursor.execute("SELECT id FROM subproductos ORDER BY id LIMIT %s", (muestras,))
+                subproductos = [r["id"] for r in cursor.fetchall() or []]
+                cursor.execute(
+                    "SELECT id, nombre, precio_venta FROM productos_finales ORDER BY id LIMIT %s",
+                    (muestras,)
+                )
+                productos_finales = cursor.fetchall() or []
+                cursor.execute(
+                    "SELECT id FROM clientes WHERE active = 1 ORDER BY id LIMIT %s", (muestras,)
+                )
+                clientes = [r["id"] for r in cursor.fetchall() or []]
+                cursor.execute("SELECT proveedor FROM compras LIMIT 1")
+                compra = cursor.fetchone()
+                cursor.execute("SELECT MIN(fecha) AS desde, MAX(fecha) AS hasta FROM gastos_money")
+                rango = cursor.fetchone() or {}
+        finally:
+            close_connection(conn)
+
+        if not (insumos and subproductos and productos_finales and clientes):
+            raise RuntimeError("El dataset no tiene catálogo (ver scripts/generate_dataset.py)")
+
+        return cls(
+            insumos=list(insumos),
+            subproductos=subproductos,
+            productos_finales=list(productos_finales),
+            clientes=clientes,
+            proveedor=compra["proveedor"] if compra else "Proveedor 01",
+            fecha_inicio=str(rango.get("desde") or "2000-01-01")[:10],
+            fecha_fin=str(rango.get("hasta") or "2100-01-01")[:10],
+        )
+
+    def insumo(self, i: int) -> Dict:
+        return self.insumos[i % len(self.insumos)]
+
+    def subproducto(self, i: int) -> int:
+        return self.subproductos[i % len(self.subproductos)]
+
+    def producto_final(self, i: int) -> Dict:
+        return self.productos_finales[i % len(self.productos_finales)]
+
+    def cliente(self, i: int) -> int:
+        return self.clientes[i % len(self.clientes)]
+
+
+# ============================================
+# CASOS
+# ============================================
+
+@dataclass
+class Caso:
+    """
+    args(ctx, i) → (args, kwargs) de la iteración i.
+    preparar(ctx, i) → valor que recibe args como `objetivo` (fuera de la medición).
+    """
+
+    args: Callable[..., Args]
+    preparar: Optional[Callable[[Contexto, int], Any]] = None
+
+
+def _sin_args(ctx, i) -> Args:
+    return (), {}
+
+
+def _ingredientes(ctx: Contexto, i: int) -> List[Dict]:
+    return [
+        {"producto": ctx.insumo(i + k)["producto"], "cantidad": 10, "unidad": ctx.insumo(i + k)["unidad_base"]}
+        for k in range(3)
+    ]
+
+
+def _crear_subproducto(ctx: Contexto, i: int) -> int:
+    nombre = f"bench_sub_{i}"
+    ProduccionBackend().crear_subproducto(nombre, _ingredientes(ctx, i))
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT id FROM subproductos WHERE nombre = %s", (nombre,))
+            return cursor.fetchone()["id"]
+    finally:
+        close_connection(conn)
+
+
+def _crear_producto_final(ctx: Contexto, i: int) -> int:
+    res = ProduccionBackend().crear_producto_final(
+        f"bench_pf_{i}",
+        [{"subproducto_id": ctx.subproducto(i), "unidades_rinde": 20}],
+        precio_venta=10
+    )
+    return res["producto_id"]
+
+
+def _linea_compra(ctx: Contexto, i: int) -> Dict:
+    insumo = ctx.insumo(i)
+    return {
+        "producto": insumo["producto"], "cantidad": 1,
+        "unidad": insumo["unidad_base"], "precio_compra": 1.0,
+    }
+
+
+CASOS: Dict[str, Caso] = {
+    # Compras
+    "ComprasBackend.save_purchase": Caso(lambda ctx, i: (("granel", ctx.insumo(i)["producto"], ctx.proveedor), {
+        "cantidad": 1, "unidad": ctx.insumo(i)["unidad_base"], "precio_compra": 1.0
+    })),
+    "ComprasBackend.get_purchase_history": Caso(_sin_args),
+    "ComprasBackend.obtener_compras_por_producto": Caso(lambda ctx, i: ((ctx.insumo(i)["producto"],), {})),
+    "ComprasBackend.obtener_compras_por_proveedor": Caso(lambda ctx, i: ((ctx.proveedor,), {})),
+    "ComprasBackend.validar_lote": Caso(lambda ctx, i: (
+        ([_linea_compra(ctx, i + k) for k in range(20)],), {"proveedor": ctx.proveedor}
+    )),
+    "ComprasBackend.importar_compras_lote": Caso(lambda ctx, i: (
+        ([_linea_compra(ctx, i + k) for k in range(20)],),
+        {"proveedor": ctx.proveedor, "validar_fondos": False}
+    )),
+    "ComprasBackend.puede_realizar_compra": Caso(lambda ctx, i: ((10.0,), {})),
+
+    # Inventario
+    "InventarioBackend.actualizar_stock_desde_compra": Caso(lambda ctx, i: (
+        (ctx.insumo(i)["producto"], 1, ctx.insumo(i)["unidad_base"], 1.0), {}
+    )),
+    "InventarioBackend.consumir_stock": Caso(lambda ctx, i: (
+        (ctx.insumo(i)["producto"], 1, ctx.insumo(i)["unidad_base"]), {}
+    )),
+    "InventarioBackend.get_inventario_para_resumen": Caso(_sin_args),
+    "InventarioBackend.obtener_producto": Caso(lambda ctx, i: ((ctx.insumo(i)["id"],), {})),
+    "InventarioBackend.obtener_total_invertido": Caso(_sin_args),
+
+    # Producción
+    "ProduccionBackend.crear_subproducto": Caso(lambda ctx, i: (
+        (f"bench_crear_sub_{i}", _ingredientes(ctx, i)), {}
+    )),
+    "ProduccionBackend.get_subproductos_disponibles": Caso(_sin_args),
+    "ProduccionBackend.get_subproducto_ingredientes": Caso(lambda ctx, i: ((ctx.subproducto(i),), {})),
+    "ProduccionBackend.eliminar_subproducto": Caso(
+        lambda ctx, i, objetivo: ((objetivo,), {}), preparar=_crear_subproducto
+    ),
+    "ProduccionBackend.estimar_costo_produccion": Caso(lambda ctx, i: ((ctx.subproducto(i), 10), {})),
+    "ProduccionBackend.crear_produccion_run": Caso(lambda ctx, i: ((ctx.subproducto(i), 1), {})),
+    "ProduccionBackend.crear_produccion_lote": Caso(lambda ctx, i: (
+        ([(ctx.subproducto(i + k), 1) for k in range(3)],), {}
+    )),
+    "ProduccionBackend.get_capacidad_produccion": Caso(_sin_args),
+    "ProduccionBackend.get_producciones_por_subproducto": Caso(lambda ctx, i: ((ctx.subproducto(i),), {})),
+    "ProduccionBackend.crear_producto_final": Caso(lambda ctx, i: (
+        (f"bench_crear_pf_{i}", [{"subproducto_id": ctx.subproducto(i), "unidades_rinde": 20}]),
+        {"precio_venta": 10}
+    )),
+    "ProduccionBackend.get_productos_finales_info": Caso(_sin_args),
+    "ProduccionBackend.set_precio_venta": Caso(lambda ctx, i: ((ctx.producto_final(i)["id"], 12.5), {})),
+    "ProduccionBackend.eliminar_producto_final": Caso(
+        lambda ctx, i, objetivo: ((objetivo,), {}), preparar=_crear_producto_final
+    ),
+
+    # Ventas
+    "VentasBackend.add_cliente": Caso(lambda ctx, i: ((f"bench_cliente_{i}",), {})),
+    "VentasBackend.get_clientes": Caso(_sin_args),
+    "VentasBackend.toggle_cliente_active": Caso(lambda ctx, i: ((ctx.cliente(-1),), {})),
+    "VentasBackend.get_clientes_activos": Caso(_sin_args),
+    "VentasBackend.get_productos_con_costo": Caso(_sin_args),
+    "VentasBackend.set_precio_venta": Caso(lambda ctx, i: ((ctx.producto_final(i)["id"], 12.5), {})),
+    "VentasBackend.registrar_venta": Caso(lambda ctx, i: (
+        (ctx.cliente(i), ctx.producto_final(i)["id"], 1, float(ctx.producto_final(i)["precio_venta"] or 1)), {}
+    )),
+    "VentasBackend.crear_venta_multiple": Caso(lambda ctx, i: ((ctx.cliente(i), [
+        {"product_id": ctx.producto_final(i + k)["id"], "quantity": 2,
+         "unit_price": float(ctx.producto_final(i + k)["precio_venta"] or 1)}
+        for k in range(3)
+    ]), {})),
+    "VentasBackend.get_cliente_stats": Caso(lambda ctx, i: ((ctx.cliente(i),), {})),
+    "VentasBackend.get_ventas_por_dia": Caso(lambda ctx, i: ((ctx.cliente(i),), {})),
+    "VentasBackend.get_historial_ventas": Caso(_sin_args),
+
+    # Contabilidad
+    "ContabilidadBackend.registrar_venta_contabilidad": Caso(lambda ctx, i: (
+        (1, ctx.producto_final(i)["id"], 2, ctx.producto_final(i)["nombre"]), {}
+    )),
+    "ContabilidadBackend.obtener_resumen_general": Caso(_sin_args),
+    "ContabilidadBackend.obtener_resumen_por_tipo_producto": Caso(_sin_args),
+    "ContabilidadBackend.obtener_resumen_por_producto": Caso(_sin_args),
+    "ContabilidadBackend.obtener_historial_contabilidad": Caso(_sin_args),
+
+    # Gastos
+    "GastosBackend.add_gasto_dinero": Caso(lambda ctx, i: (("bench", 1.0), {})),
+    "GastosBackend.add_gasto_producto": Caso(lambda ctx, i: (
+        (ctx.insumo(i)["producto"], 1, ctx.insumo(i)["unidad_base"], 1.0), {}
+    )),
+    "GastosBackend.get_total_gastos": Caso(_sin_args),
+    "GastosBackend.get_gastos_recientes": Caso(_sin_args),
+    "GastosBackend.get_gastos_por_rango_fechas": Caso(lambda ctx, i: ((ctx.fecha_inicio, ctx.fecha_fin), {})),
+    "GastosBackend.obtener_capital_total": Caso(_sin_args),
+    "GastosBackend.obtener_gastos_compras": Caso(_sin_args),
+}
+
+
+def metodos_publicos() -> List[str]:
+    """Métodos públicos de los backends medidos ("Clase.metodo")"""
+    return [
+        f"{backend.__name__}.{nombre}"
+        for backend in BACKENDS
+        for nombre, atributo in vars(backend).items()
+        if not nombre.startswith("_") and callable(getattr(atributo, "__func__", atributo))
+    ]
@@ -0,0 +1,314 @@
+"""
+benchmarks.runner - Ejecuta los casos contra datasets sembrados y compara resultados
+
+    python -m benchmarks run --tamanos chico,mediano --salida benchmarks/results/actual.json
+    python -m benchmarks compare benchmarks/results/baseline.json benchmarks/results/actual.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from Core.Common.data_cache import app_cache
+from Core.Common.database import DatabaseManager
+from Core.Common.logger import setup_logger
+from Core.Common.query_profiler import query_profiler
+from Core.Common.warm_cache import warm_cache
+from Core.Database.engines import SQLiteEngine
+
+logger = setup_logger("benchmarks.runner")
+
+# Volúmenes por tamaño (argumentos de scripts/generate_dataset.py)
+TAMANOS: Dict[str, Dict[str, int]] = {
+    "chico": dict(insumos=200, subproductos=50, productos_finales=40, clientes=200,
+                  compras=2_000, gastos=500, ventas=5_000),
+    "mediano": dict(insumos=1_000, subproductos=200, productos_finales=150, clientes=2_000,
+                    compras=20_000, gastos=5_000, ventas=100_000),
+    "grande": dict(insumos=3_000, subproductos=400, productos_finales=300, clientes=5_000,
+                   compras=50_000, gastos=20_000, ventas=1_000_000),
+}
+
+# Fecha fija: el mismo seed produce el mismo dataset en cualquier día
+HASTA = "2025-12-31"
+CARPETA_DATASETS = os.path.join("datasets", "benchmarks")
+
+
+# ============================================
+# DATASETS
+# ============================================
+
+def dataset(tamano: str, seed: int) -> str:
+    """Ruta del dataset sembrado (se genera la primera vez y se reutiliza)"""
+    from scripts.generate_dataset import GeneradorDataset, VERSION
+
+    ruta = os.path.join(CARPETA_DATASETS, f"{tamano}_seed{seed}_v{VERSION}.sqlite3")
+    if os.path.exists(ruta):
+        return ruta
+
+    print(f"🌱 Generando dataset '{tamano}' (seed {seed})...")
+    os.makedirs(CARPETA_DATASETS, exist_ok=True)
+    temporal = ruta + ".tmp"
+    if os.path.exists(temporal):
+        os.remove(temporal)
+
+    DatabaseManager.set_engine(SQLiteEngine(temporal))
+    try:
+        if not DatabaseManager.initialize_database():
+            raise RuntimeError("No se pudo crear el esquema")
+        args = argparse.Namespace(
+            seed=seed, anios=3, hasta=HASTA, lote=5000, limpiar=False, **TAMANOS[tamano]
+        )
+        GeneradorDataset(args).ejecutar()
+    finally:
+        DatabaseManager.set_engine(None)
+
+    os.replace(temporal, ruta)
+    return ruta
+
+
+# ============================================
+# MEDICIÓN
+# ============================================
+
+def _percentil(ordenadas: List[float], q: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * q / 100))]
+
+
+def medir_caso(caso, ctx, iteraciones: int) -> Dict:
+    """
+    Latencia (ms), consultas por llamada y pico de memoria de un caso.
+
+    La iteración 0 calienta (y no se mide); la memoria se mide en una
+    pasada aparte con tracemalloc para no inflar las latencias. La caché
+    de la app se vacía antes del caso, no entre iteraciones: las lecturas
+    repetidas miden el camino cacheado, como en la UI.
+    """
+    consultas = 0
+
+    def _llamar(metodo, i, medir: bool):
+        nonlocal consultas
+        objetivo = caso.preparar(ctx, i) if caso.preparar else None
+        args, kwargs = caso.args(ctx, i, objetivo) if caso.preparar else caso.args(ctx, i)
+        antes = query_profiler.total()
+        start = time.perf_counter_ns()
+        metodo(*args, **kwargs)
+        elapsed = (time.perf_counter_ns() - start) / 1e6
+        consultas += query_profiler.total() - antes
+        return elapsed if medir else None
+
+    metodo = caso.metodo
+    _llamar(metodo, 0, False)
+
+    consultas = 0
+    muestras = [_llamar(metodo, i, True) for i in range(1, iteraciones + 1)]
+
+    tracemalloc.start()
+    try:
+        _llamar(metodo, iteraciones + 1, False)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    ordenadas = sorted(muestras)
+    return {
+        "n": len(muestras),
+        "media_ms": statistics.fmean(muestras),
+        "min_ms": ordenadas[0],
+        "p50_ms": _percentil(ordenadas, 50),
+        "p95_ms": _percentil(ordenadas, 95),
+        "p99_ms": _percentil(ordenadas, 99),
+        "max_ms": ordenadas[-1],
+        "consultas": consultas / len(muestras),
+        "memoria_kb": pico / 1024,
+    }
+
+
+def correr_tamano(tamano: str, seed: int, iteraciones: int, filtro: Optional[str]) -> Dict:
+    """Mide todos los casos sobre una copia del dataset (las escrituras no lo alteran)"""
+    from benchmarks.casos import CASOS, Contexto, metodos_publicos
+
+    copia = os.path.join(tempfile.mkdtemp(prefix="bench_"), "dataset.sqlite3")
+    shutil.copyfile(dataset(tamano, seed), copia)
+    DatabaseManager.set_engine(SQLiteEngine(copia))
+
+    faltantes = [m for m in metodos_publicos() if m not in CASOS]
+    if faltantes:
+        print(f"⚠️ Métodos sin caso (se omiten): {', '.join(faltantes)}")
+
+    resultados = {}
+    try:
+        ctx = Contexto.cargar()
+        instancias = {}
+        for nombre, caso in CASOS.items():
+            if filtro and filtro not in nombre:
+                continue
+
+            clase, metodo = nombre.split(".")
+            if clase not in instancias:
+                instancias[clase] = _instanciar(clase)
+            caso.metodo = getattr(instancias[clase], metodo)
+
+            app_cache.clear()
+            try:
+                resultados[nombre] = medir_caso(caso, ctx, iteraciones)
+            except Exception as e:
+                print(f"   ❌ {nombre}: {e}")
+                resultados[nombre] = {"error": str(e)[:200]}
+                continue
+
+            r = resultados[nombre]
+            print(f"   {nombre:<52}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}"
+                  f"{r['consultas']:>8.1f}{r['memoria_kb']:>10.0f}")
+    finally:
+        DatabaseManager.set_engine(None)
+        shutil.rmtree(os.path.dirname(copia), ignore_errors=True)
+
+    return resultados
+
+
+def _instanciar(clase: str):
+    from benchmarks.casos import BACKENDS
+    return next(b for b in BACKENDS if b.__name__ == clase)()
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def run(args) -> int:
+    warm_cache.enabled = False
+    query_profiler.enable()
+    # El benchmark mide backends, no el aviso de N+1
+    query_profiler.n_plus_one = sys.maxsize
+
+    tamanos = [t.strip() for t in args.tamanos.split(",") if t.strip()]
+    desconocidos = [t for t in tamanos if t not in TAMANOS]
+    if desconocidos:
+        print(f"❌ Tamaños desconocidos: {', '.join(desconocidos)} (opciones: {', '.join(TAMANOS)})")
+        return 2
+
+    reporte = {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "seed": args.seed,
+            "iteraciones": args.iteraciones,
+        },
+        "resultados": {},
+    }
+
+    for tamano in tamanos:
+        print(f"\n📦 Tamaño '{tamano}'")
+        print(f"   {'Caso':<52}{'p50 ms':>9}{'p95 ms':>9}{'cons.':>8}{'mem KB':>10}")
+        reporte["resultados"][tamano] = correr_tamano(tamano, args.seed, args.iteraciones, args.filtro)
+
+    os.makedirs(os.path.dirname(args.salida) or ".", exist_ok=True)
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(reporte, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Resultados: {args.salida}")
+    return 0
+
+
+# ============================================
+# COMPARACIÓN
+# ============================================
+
+def comparar(base: Dict, actual: Dict, umbral: float, minimo_ms: float) -> List[Dict]:
+    """
+    Casos comunes con su variación de p50 y de consultas por llamada.
+
+    Es regresión si el p50 crece más que `umbral` (y más que `minimo_ms`,
+    para no reportar ruido en operaciones de microsegundos) o si las
+    consultas por llamada suben más de 10% (mínimo media consulta: los
+    snapshots del ledger y las invalidaciones agregan consultas ocasionales).
+    """
+    filas = []
+    for tamano, casos in actual.get("resultados", {}).items():
+        for nombre, r in casos.items():
+            b = base.get("resultados", {}).get(tamano, {}).get(nombre)
+            if not b or "error" in b or "error" in r:
+                continue
+            delta = (r["p50_ms"] - b["p50_ms"]) / b["p50_ms"] if b["p50_ms"] else 0.0
+            regresion = (
+                (delta > umbral and r["p50_ms"] - b["p50_ms"] > minimo_ms)
+                or r["consultas"] > b["consultas"] + max(0.5, 0.1 * b["consultas"])
+            )
+            filas.append({
+                "tamano": tamano, "caso": nombre,
+                "base_ms": b["p50_ms"], "actual_ms": r["p50_ms"], "delta": delta,
+                "base_consultas": b["consultas"], "consultas": r["consultas"],
+                "regresion": regresion,
+                "mejora": delta < -umbral and b["p50_ms"] - r["p50_ms"] > minimo_ms,
+            })
+    return filas
+
+
+def compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.actual, encoding="utf-8") as f:
+        actual = json.load(f)
+
+    filas = comparar(base, actual, args.umbral, args.minimo_ms)
+    if not filas:
+        print("❌ Sin casos comunes para comparar")
+        return 2
+
+    print(f"\n📊 p50 base → actual (umbral {args.umbral:.0%})")
+    print(f"{'Tamaño':<9}{'Caso':<52}{'base':>9}{'actual':>9}{'Δ':>8}{'cons.':>11}")
+    for r in sorted(filas, key=lambda r: r["delta"], reverse=True):
+        marca = "🔴" if r["regresion"] else ("🟢" if r["mejora"] else "  ")
+        print(f"{r['tamano']:<9}{r['caso']:<52}{r['base_ms']:>9.3f}{r['actual_ms']:>9.3f}"
+              f"{r['delta']:>+8.0%}{r['base_consultas']:>5.1f}→{r['consultas']:<5.1f}{marca}")
+
+    regresiones = [r for r in filas if r["regresion"]]
+    mejoras = [r for r in filas if r["mejora"]]
+    print(f"\n🔴 {len(regresiones)} regresiones · 🟢 {len(mejoras)} mejoras · {len(filas)} casos")
+    return 1 if regresiones else 0
+
+
+# ============================================
+# CLI
+# ============================================
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="benchmarks", description="Benchmarks de backends")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_run = sub.add_parser("run", help="Mide los casos y guarda un JSON")
+    p_run.add_argument("--tamanos", default="chico,mediano", help=f"Separados por coma ({', '.join(TAMANOS)})")
+    p_run.add_argument("--iteraciones", type=int, default=30, help="Llamadas medidas por caso")
+    p_run.add_argument("--seed", type=int, default=42)
+    p_run.add_argument("--filtro", help="Sólo casos cuyo nombre contenga este texto")
+    p_run.add_argument(
+        "--salida",
+        default=os.path.join("benchmarks", "results", f"{datetime.now():%Y%m%d_%H%M%S}.json")
+    )
+    p_run.set_defaults(func=run)
+
+    p_cmp = sub.add_parser("compare", help="Compara un resultado contra una línea base")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("actual")
+    p_cmp.add_argument("--umbral", type=float, default=0.15, help="Aumento relativo de p50 tolerado")
+    p_cmp.add_argument("--minimo-ms", type=float, default=0.05, help="Diferencia absoluta mínima (ms)")
+    p_cmp.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
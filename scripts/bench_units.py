@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# scripts/bench_units.py - Micro-benchmark de conversión de unidades
+
+import argparse
+import random
+import sys
+import timeit
+
+import numpy as np
+
+from Core.Common.units import (
+    UNIT_TABLE,
+    convert_to_base,
+    convert_to_base_exact,
+    convert_array_to_base,
+    lookup_unit,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo por llamada de Core.Common.units")
+    parser.add_argument("--llamadas", type=int, default=200_000, help="Llamadas escalares por caso")
+    parser.add_argument("--elementos", type=int, default=1_000_000, help="Tamaño del array")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    unidades = list(UNIT_TABLE)
+    muestra = [random.choice(unidades) for _ in range(1024)]
+
+    casos = [
+        ("lookup_unit (canónica)", lambda: lookup_unit("kg")),
+        ("lookup_unit (alias ' Litros')", lambda: lookup_unit(" Litros")),
+        ("convert_to_base", lambda: convert_to_base(2.5, "kg")),
+        ("convert_to_base_exact", lambda: convert_to_base_exact(2.5, "kg")),
+    ]
+
+    print(f"\n⏱️ Escalar ({args.llamadas:,} llamadas, mejor de {args.repeticiones}):")
+    for nombre, funcion in casos:
+        mejor = min(timeit.repeat(funcion, number=args.llamadas, repeat=args.repeticiones))
+        print(f"   {nombre:<32}{mejor / args.llamadas * 1e9:>10.0f} ns/llamada")
+
+    cantidades = np.random.rand(args.elementos) * 100
+    por_elemento = [muestra[i % len(muestra)] for i in range(args.elementos)]
+
+    print(f"\n⏱️ Array ({args.elementos:,} elementos, mejor de {args.repeticiones}):")
+    for nombre, unidad in (("una unidad", "kg"), ("unidad por elemento", por_elemento)):
+        mejor = min(timeit.repeat(
+            lambda: convert_array_to_base(cantidades, unidad),
+            number=1, repeat=args.repeticiones
+        ))
+        print(f"   {nombre:<32}{mejor / args.elementos * 1e9:>10.1f} ns/elemento "
+              f"({mejor * 1000:.1f}ms)")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# scripts/benchmark_engines.py - Compara latencia de los motores MySQL y SQLite
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from Core.Common.config import get_db_config
+from Core.Common.data_cache import app_cache
+from Core.Common.database import DatabaseManager, get_connection, close_connection
+from Core.Common.logger import setup_logger
+from Core.Common.warm_cache import warm_cache
+from Core.Database.engines import MySQLEngine, SQLiteEngine
+
+logger = setup_logger("scripts.benchmark_engines")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de motores de BD")
+    parser.add_argument(
+        "--engines", default="sqlite,mysql",
+        help="Motores a comparar separados por coma (sqlite,mysql)"
+    )
+    parser.add_argument("--productos", type=int, default=50, help="Productos distintos")
+    parser.add_argument("--operaciones", type=int, default=500, help="Operaciones por prueba")
+    parser.add_argument(
+        "--mysql-database",
+        help="BD MySQL de pruebas (OBLIGATORIA para mysql: se escriben datos)"
+    )
+    args = parser.parse_args()
+
+    # Medir el motor, no las cachés
+    warm_cache.enabled = False
+
+    results = {}
+    for name in [e.strip() for e in args.engines.split(",") if e.strip()]:
+        engine = _build_engine(name, args)
+        if engine is None:
+            continue
+
+        print(f"\n🗄️ Motor: {engine.describe()}")
+        DatabaseManager.set_engine(engine)
+        try:
+            results[name] = run_benchmark(args.productos, args.operaciones)
+        except Exception as e:
+            print(f"❌ Error en {name}: {e}")
+        finally:
+            DatabaseManager.set_engine(None)
+
+    _print_report(results)
+
+
+def _build_engine(name: str, args):
+    """Crea el motor a medir (SQLite en archivo temporal)"""
+    if name == "sqlite":
+        path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.sqlite3")
+        return SQLiteEngine(path)
+
+    if name == "mysql":
+        if not args.mysql_database:
+            print("⚠️ mysql omitido: indica --mysql-database (BD de pruebas)")
+            return None
+        cfg = dict(get_db_config())
+        cfg["database"] = args.mysql_database
+        return MySQLEngine(cfg)
+
+    print(f"⚠️ Motor desconocido: {name}")
+    return None
+
+
+def run_benchmark(productos: int, operaciones: int) -> dict:
+    """
+    Ejecuta la carga de trabajo con los backends reales.
+
+    Returns:
+        Dict prueba -> lista de latencias (ms)
+    """
+    from Core.Backends.inventario_backend import InventarioBackend
+
+    timings = {}
+
+    start = time.perf_counter()
+    if not DatabaseManager.initialize_database():
+        raise RuntimeError("No se pudo crear el esquema")
+    timings["crear_esquema"] = [(time.perf_counter() - start) * 1000]
+
+    _reset_tables()
+    inv = InventarioBackend()
+    nombres = [f"bench_producto_{i}" for i in range(productos)]
+
+    timings["conexion"] = _measure(operaciones, lambda i: close_connection(get_connection()))
+
+    timings["compra (WAC)"] = _measure(
+        operaciones,
+        lambda i: inv.actualizar_stock_desde_compra(nombres[i % productos], 1, "kg", 10.0)
+    )
+
+    timings["consumo stock"] = _measure(
+        operaciones,
+        lambda i: inv.consumir_stock(nombres[i % productos], 100, "g")
+    )
+
+    def _leer_inventario(i):
+        app_cache.clear()
+        InventarioBackend._fetch_inventario_resumen()
+
+    timings["lectura inventario"] = _measure(operaciones, _leer_inventario)
+
+    def _punto(i):
+        conn = get_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT cantidad_stock FROM inventario WHERE producto = %s",
+                    (nombres[i % productos],)
+                )
+                cursor.fetchone()
+        finally:
+            close_connection(conn)
+
+    timings["consulta puntual"] = _measure(operaciones, _punto)
+
+    _reset_tables()
+    return timings
+
+
+def _measure(n: int, func) -> list:
+    samples = []
+    for i in range(n):
+        start = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _reset_tables():
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM inventario WHERE producto LIKE 'bench_producto_%'")
+        conn.commit()
+    finally:
+        close_connection(conn)
+
+
+def _print_report(results: dict):
+    if not results:
+        print("\n❌ Sin resultados")
+        return
+
+    engines = list(results)
+    tests = list(next(iter(results.values())))
+
+    print("\n📊 Latencia por operación (ms): media / p50 / p95")
+    header = f"{'Prueba':<22}" + "".join(f"{e:>28}" for e in engines)
+    print(header)
+    print("-" * len(header))
+
+    for test in tests:
+        row = f"{test:<22}"
+        for engine in engines:
+            samples = results[engine].get(test) or [0.0]
+            p95 = sorted(samples)[max(0, int(len(samples) * 0.95) - 1)]
+            row += f"{statistics.mean(samples):>10.3f} /{statistics.median(samples):>7.3f} /{p95:>7.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
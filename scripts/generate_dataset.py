@@ -0,0 +1,519 @@
+#!/usr/bin/env python3
+# scripts/generate_dataset.py - Genera un dataset sintético de gran volumen
+
+"""
+Siembra una BD vacía con volúmenes realistas para pruebas de rendimiento:
+insumos con stock y costo promedio, recetas (subproductos), productos
+finales, clientes, compras, gastos, movimientos de efectivo y ventas
+multi-ítem repartidas en varios años (con su contabilidad).
+
+- Determinista: mismo --seed y --hasta → mismos datos
+- Estacionalidad anual, más ventas el fin de semana y en horas pico,
+  crecimiento leve año a año
+- Popularidad de productos y clientes tipo Pareto (Zipf)
+- Inserciones masivas con executemany por lotes e ids explícitos
+
+Uso:
+    python -m scripts.generate_dataset --engine sqlite --sqlite-path datasets/grande.sqlite3
+    python -m scripts.generate_dataset --engine mysql --mysql-database economia_bench --ventas 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from Core.Common.config import get_db_config
+from Core.Common.database import DatabaseManager, get_connection, close_connection
+from Core.Common.logger import setup_logger
+from Core.Common.warm_cache import warm_cache
+from Core.Database.engines import MySQLEngine, SQLiteEngine
+
+logger = setup_logger("scripts.generate_dataset")
+
+# Versión de los datos generados: cambiarla invalida los datasets cacheados
+# (benchmarks/runner.py la incluye en el nombre del archivo)
+VERSION = 2
+
+# Tablas que escribe el generador (en orden de borrado)
+TABLAS = [
+    "contabilidad", "ventas_items", "ventas_cabecera", "clientes",
+    "producto_final_subproductos", "productos_finales",
+    "subproducto_ingredientes", "subproductos",
+    "inventario_movimientos", "inventario", "compras",
+    "gastos_money", "gastos_productos", "efectivo_movimientos",
+]
+
+# (nombre base, unidad base, unidad de compra, factor compra→base, costo base min, max)
+CATEGORIAS = [
+    ("Harina", "g", "kg", 1000, 0.0008, 0.003),
+    ("Azúcar", "g", "kg", 1000, 0.001, 0.004),
+    ("Manteca", "g", "kg", 1000, 0.006, 0.015),
+    ("Chocolate", "g", "kg", 1000, 0.01, 0.04),
+    ("Fruta", "g", "kg", 1000, 0.002, 0.012),
+    ("Leche", "ml", "l", 1000, 0.0008, 0.002),
+    ("Crema", "ml", "l", 1000, 0.004, 0.01),
+    ("Esencia", "ml", "l", 1000, 0.02, 0.08),
+    ("Huevo", "unit", "docen", 12, 0.12, 0.3),
+    ("Packaging", "unit", "unit", 1, 0.05, 0.6),
+]
+
+PROVEEDORES = [f"Proveedor {i:02d}" for i in range(1, 41)]
+GASTOS = ["Luz", "Gas", "Agua", "Alquiler", "Internet", "Transporte",
+          "Mantenimiento", "Limpieza", "Publicidad", "Impuestos"]
+
+
+# ============================================
+# DISTRIBUCIONES
+# ============================================
+
+def zipf_pesos(n: int, rng: np.random.Generator, s: float = 1.16) -> np.ndarray:
+    """Pesos Zipf (s≈1.16 → 80/20) en un orden aleatorio"""
+    pesos = 1.0 / np.arange(1, n + 1) ** s
+    rng.shuffle(pesos)
+    return pesos / pesos.sum()
+
+
+def fechas_estacionales(n: int, desde: datetime, dias: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    n instantes ordenados (datetime64[s]) con estacionalidad anual, semanal,
+    horaria y una tendencia de crecimiento.
+    """
+    d = np.arange(dias)
+    fechas = np.datetime64(desde.date()) + d
+    dia_anio = (fechas - fechas.astype("datetime64[Y]")).astype(int)
+    dia_semana = (fechas.astype("datetime64[D]").view("int64") + 3) % 7  # 0 = lunes
+
+    pesos = (
+        (1 + 0.25 * np.cos(2 * np.pi * (dia_anio - 350) / 365))  # pico en diciembre
+        * np.where(dia_semana >= 5, 1.4, 1.0)                      # fin de semana
+        * (1 + 0.15 * d / 365)                                     # crecimiento anual
+    )
+    dia = rng.choice(dias, size=n, p=pesos / pesos.sum())
+
+    # Horas pico: media mañana y tarde
+    horas = np.arange(24)
+    pesos_hora = (np.exp(-((horas - 11.5) ** 2) / 4) + np.exp(-((horas - 18.5) ** 2) / 5)
+                  + 0.02 * ((horas >= 8) & (horas <= 21)))
+    hora = rng.choice(24, size=n, p=pesos_hora / pesos_hora.sum())
+
+    segundos = dia * 86400 + hora * 3600 + rng.integers(0, 3600, size=n)
+    return np.sort(np.datetime64(desde.date(), "s") + segundos.astype("timedelta64[s]"))
+
+
+def _texto_fechas(instantes: np.ndarray) -> list:
+    """datetime64[s] → 'YYYY-MM-DD HH:MM:SS' (formato TIMESTAMP)"""
+    return np.char.replace(np.datetime_as_string(instantes, unit="s"), "T", " ").tolist()
+
+
+# ============================================
+# GENERADOR
+# ============================================
+
+class GeneradorDataset:
+    """Genera e inserta el dataset por lotes"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = np.random.default_rng(args.seed)
+        self.hasta = (
+            datetime.strptime(args.hasta, "%Y-%m-%d") if args.hasta
+            else datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        )
+        self.dias = int(args.anios * 365)
+        self.desde = self.hasta - timedelta(days=self.dias)
+        self.conn = None
+        self.filas = {}
+
+    # ============================================
+    # INSERCIÓN
+    # ============================================
+
+    def _insertar(self, tabla: str, columnas: str, filas):
+        """executemany por lotes de --lote filas (commit por lote)"""
+        marcadores = ", ".join(["%s"] * (columnas.count(",") + 1))
+        sql = f"INSERT INTO {tabla} ({columnas}) VALUES ({marcadores})"
+        lote = self.args.lote
+
+        with self.conn.cursor() as cursor:
+            for i in range(0, len(filas), lote):
+                cursor.executemany(sql, filas[i:i + lote])
+                self.conn.commit()
+
+        self.filas[tabla] = self.filas.get(tabla, 0) + len(filas)
+
+    def limpiar(self):
+        with self.conn.cursor() as cursor:
+            for tabla in TABLAS:
+                cursor.execute(f"DELETE FROM {tabla}")
+        self.conn.commit()
+
+    def vacia(self) -> bool:
+        with self.conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) AS n FROM ventas_cabecera")
+            ventas = cursor.fetchone()["n"]
+            cursor.execute("SELECT COUNT(*) AS n FROM inventario")
+            return not ventas and not cursor.fetchone()["n"]
+
+    # ============================================
+    # CATÁLOGO
+    # ============================================
+
+    def insumos(self):
+        """Inventario con stock, costo promedio y su movimiento de apertura"""
+        rng = self.rng
+        n = self.args.insumos
+        categoria = rng.integers(0, len(CATEGORIAS), size=n)
+
+        self.insumo_nombre = []
+        self.insumo_cat = categoria
+        self.insumo_costo = np.empty(n)
+        self.insumo_stock = np.empty(n)
+        inventario, movimientos = [], []
+        apertura = self.desde.strftime("%Y-%m-%d %H:%M:%S")
+
+        for i in range(n):
+            base, unidad, _, factor, cmin, cmax = CATEGORIAS[categoria[i]]
+            nombre = f"{base} {i + 1:05d}"
+            costo = round(float(rng.uniform(cmin, cmax)), 4)
+            stock = round(float(rng.uniform(5, 200)) * factor, 4)
+
+            self.insumo_nombre.append(nombre)
+            self.insumo_costo[i] = costo
+            self.insumo_stock[i] = stock
+            inventario.append((i + 1, nombre, stock, unidad, costo))
+            movimientos.append((nombre, "ajuste", stock, unidad, costo, stock, costo,
+                                "dataset:apertura", apertura))
+
+        self.insumo_pesos = zipf_pesos(n, rng)
+        self._insertar(
+            "inventario", "id, producto, cantidad_stock, unidad_base, costo_promedio_ponderado",
+            inventario
+        )
+        self._insertar(
+            "inventario_movimientos",
+            "producto, tipo, cantidad_base, unidad_base, costo_unitario, stock_resultante, "
+            "costo_promedio_resultante, documento, fecha",
+            movimientos
+        )
+
+    def recetas(self):
+        """Subproductos con 3-8 ingredientes (los insumos populares se repiten)"""
+        rng = self.rng
+        n = self.args.subproductos
+        self.sub_costo = np.empty(n)
+        subproductos, ingredientes = [], []
+
+        for s in range(n):
+            k = int(rng.integers(3, 9))
+            elegidos = rng.choice(len(self.insumo_nombre), size=k, replace=False, p=self.insumo_pesos)
+            costo = 0.0
+            for j in elegidos:
+                base, unidad, unidad_compra, factor, _, _ = CATEGORIAS[self.insumo_cat[j]]
+                # La mitad de las recetas usa la unidad de compra (kg, l, docena)
+                if unidad != "unit" and rng.random() < 0.5:
+                    cantidad = round(float(rng.uniform(0.1, 2.0)), 3)
+                    unidad_receta, base_usada = unidad_compra, cantidad * factor
+                else:
+                    cantidad = float(rng.integers(1, 12)) if unidad == "unit" else float(rng.integers(5, 800))
+                    unidad_receta, base_usada = unidad, cantidad
+                costo += base_usada * self.insumo_costo[j]
+                ingredientes.append((s + 1, self.insumo_nombre[j], cantidad, unidad_receta))
+
+            self.sub_costo[s] = round(costo, 2)
+            subproductos.append((s + 1, f"Masa {s + 1:04d}", self.sub_costo[s], int(rng.integers(10, 61))))
+
+        self._insertar(
+            "subproductos", "id, nombre, costo_total_subproducto, unidades_rendimiento", subproductos
+        )
+        self._insertar(
+            "subproducto_ingredientes",
+            "subproducto_id, producto_ingrediente, cantidad_usada, unidad_usada", ingredientes
+        )
+
+    def productos_finales(self):
+        """Productos finales de 1-3 subproductos con margen 30%-150%"""
+        rng = self.rng
+        n = self.args.productos_finales
+        self.pf_nombre, self.pf_costo, self.pf_precio = [], np.empty(n), np.empty(n)
+        productos, relaciones = [], []
+
+        for p in range(n):
+            k = int(rng.integers(1, 4))
+            costo = 0.0
+            for sid in rng.choice(len(self.sub_costo), size=k, replace=False):
+                rinde = int(rng.integers(10, 61))
+                costo += self.sub_costo[sid] / rinde
+                relaciones.append((p + 1, int(sid) + 1, rinde))
+
+            costo = round(costo, 2)
+            precio = round(max(costo * float(rng.uniform(1.3, 2.5)), 0.05) * 20) / 20
+            nombre = f"Producto {p + 1:04d}"
+            self.pf_nombre.append(nombre)
+            self.pf_costo[p], self.pf_precio[p] = costo, precio
+            productos.append((p + 1, nombre, 0, precio, costo))
+
+        self.pf_pesos = zipf_pesos(n, rng)
+        self._insertar(
+            "productos_finales",
+            "id, nombre, unidades_producidas, precio_venta, costo_unitario_total", productos
+        )
+        self._insertar(
+            "producto_final_subproductos", "producto_final_id, subproducto_id, unidades_rinde",
+            relaciones
+        )
+
+    def clientes(self):
+        n = self.args.clientes
+        self.cliente_pesos = zipf_pesos(n, self.rng, s=0.9)
+        self._insertar(
+            "clientes", "id, nombre, active",
+            [(c + 1, f"Cliente {c + 1:06d}", int(self.rng.random() > 0.05)) for c in range(n)]
+        )
+
+    # ============================================
+    # MOVIMIENTOS
+    # ============================================
+
+    def compras(self):
+        """
+        Compras con su movimiento en el ledger; el stock y el costo promedio
+        final de cada insumo salen de la apertura más sus compras (lo mismo
+        que haría save_purchase, así reconstruir no ve desfases).
+        """
+        rng = self.rng
+        n = self.args.compras
+        fechas = _texto_fechas(fechas_estacionales(n, self.desde, self.dias, rng))
+        insumo = rng.choice(len(self.insumo_nombre), size=n, p=self.insumo_pesos)
+        cantidad = rng.integers(1, 26, size=n)
+        proveedor = rng.integers(0, len(PROVEEDORES), size=n)
+        ruido = rng.uniform(0.85, 1.15, size=n)
+
+        stock = self.insumo_stock.copy()
+        costo = self.insumo_costo.copy()
+        filas, movimientos = [], []
+        for i in range(n):
+            j = insumo[i]
+            _, unidad, unidad_compra, factor, _, _ = CATEGORIAS[self.insumo_cat[j]]
+            precio = round(float(self.insumo_costo[j] * factor * ruido[i]), 2) or 0.01
+            precio_total = round(precio * int(cantidad[i]), 2)
+            filas.append((
+                i + 1, self.insumo_nombre[j], int(cantidad[i]), unidad_compra, precio,
+                precio_total, PROVEEDORES[proveedor[i]], "granel", fechas[i]
+            ))
+
+            # Costo promedio ponderado como en InventarioBackend._sumar_stock
+            cantidad_base = int(cantidad[i]) * factor
+            costo[j] = (stock[j] * costo[j] + precio_total) / (stock[j] + cantidad_base)
+            stock[j] += cantidad_base
+            movimientos.append((
+                self.insumo_nombre[j], "compra", cantidad_base, unidad,
+                round(precio_total / cantidad_base, 6), round(float(stock[j]), 4),
+                round(float(costo[j]), 6), f"compra:{i + 1}", fechas[i]
+            ))
+
+        self._insertar(
+            "compras",
+            "id, producto, cantidad, unidad, precio_compra, precio_total, proveedor, tipo, fecha", filas
+        )
+        self._insertar(
+            "inventario_movimientos",
+            "producto, tipo, cantidad_base, unidad_base, costo_unitario, stock_resultante, "
+            "costo_promedio_resultante, documento, fecha",
+            movimientos
+        )
+
+        comprados = np.unique(insumo)
+        with self.conn.cursor() as cursor:
+            cursor.executemany(
+                "UPDATE inventario SET cantidad_stock = %s, costo_promedio_ponderado = %s WHERE id = %s",
+                [(round(float(stock[j]), 4), round(float(costo[j]), 4), int(j) + 1) for j in comprados]
+            )
+        self.conn.commit()
+
+    def gastos(self):
+        rng = self.rng
+        n = self.args.gastos
+        fechas = _texto_fechas(fechas_estacionales(n, self.desde, self.dias, rng))
+        concepto = rng.integers(0, len(GASTOS), size=n)
+        # Montos log-normales: muchos chicos, pocos grandes
+        monto = np.round(rng.lognormal(3.5, 1.0, size=n), 2)
+        self._insertar(
+            "gastos_money", "descripcion, monto, comentarios, fecha",
+            [(GASTOS[concepto[i]], float(monto[i]), "dataset", fechas[i]) for i in range(n)]
+        )
+
+    def efectivo(self):
+        """Capital inicial y aportes mensuales con saldo acumulado"""
+        rng = self.rng
+        filas, saldo = [], 0.0
+        mes = self.desde
+        while mes < self.hasta:
+            monto = round(float(rng.uniform(500, 5000)) if filas else 20000.0, 2)
+            saldo = round(saldo + monto, 2)
+            filas.append(("Capital Extra", monto, saldo, mes.strftime("%Y-%m-%d %H:%M:%S")))
+            mes += timedelta(days=30)
+        self._insertar("efectivo_movimientos", "tipo, monto, saldo, fecha", filas)
+
+    def ventas(self):
+        """
+        Ventas multi-ítem con su contabilidad, generadas por bloques para
+        acotar memoria (ids explícitos: no hay ida y vuelta por lastrowid).
+        """
+        rng = self.rng
+        n = self.args.ventas
+        instantes = fechas_estacionales(n, self.desde, self.dias, rng)
+        bloque = max(self.args.lote * 10, 10_000)
+        item_id = 0
+
+        for inicio in range(0, n, bloque):
+            fin = min(inicio + bloque, n)
+            m = fin - inicio
+            fechas = _texto_fechas(instantes[inicio:fin])
+            cliente = rng.choice(len(self.cliente_pesos), size=m, p=self.cliente_pesos) + 1
+            # Ítems por carrito: 1 + geométrica (media ≈ 2.2), máximo 8
+            items_por_venta = np.minimum(rng.geometric(0.45, size=m), 8)
+            total_items = int(items_por_venta.sum())
+            producto = rng.choice(len(self.pf_nombre), size=total_items, p=self.pf_pesos)
+            cantidad = 1 + rng.poisson(1.5, size=total_items)
+
+            cabeceras, items, contables = [], [], []
+            k = 0
+            for v in range(m):
+                venta_id = inicio + v + 1
+                total = 0
+                for _ in range(items_por_venta[v]):
+                    p, c = producto[k], int(cantidad[k])
+                    k += 1
+                    item_id += 1
+                    # Centavos enteros: totales exactos
+                    precio_c = int(round(self.pf_precio[p] * 100))
+                    costo_c = int(round(self.pf_costo[p] * 100))
+                    subtotal_c = precio_c * c
+                    total += subtotal_c
+                    ganancia_c = subtotal_c - costo_c * c
+                    margen = round(ganancia_c / subtotal_c * 100, 2) if subtotal_c else 0
+                    items.append((item_id, venta_id, int(p) + 1, c, precio_c / 100, subtotal_c / 100))
+                    contables.append((
+                        venta_id, int(p) + 1, c, costo_c / 100, precio_c / 100,
+                        costo_c * c / 100, subtotal_c / 100, ganancia_c / 100, margen,
+                        self.pf_nombre[p], fechas[v]
+                    ))
+                cabeceras.append((venta_id, int(cliente[v]), total / 100, fechas[v]))
+
+            self._insertar("ventas_cabecera", "id, cliente_id, total_venta, fecha_venta", cabeceras)
+            self._insertar(
+                "ventas_items",
+                "id, venta_id, producto_final_id, cantidad_vendida, precio_unitario_venta, subtotal",
+                items
+            )
+            self._insertar(
+                "contabilidad",
+                "venta_id, producto_final_id, cantidad_vendida, precio_unitario_costo, "
+                "precio_unitario_venta, costo_total, ingreso_total, ganancia_neta, "
+                "margen_ganancia, tipo_producto, fecha_venta",
+                contables
+            )
+            print(f"   💰 Ventas {fin:,}/{n:,}", end="\r", flush=True)
+
+        print()
+
+    # ============================================
+    # EJECUCIÓN
+    # ============================================
+
+    def ejecutar(self):
+        pasos = [
+            ("Insumos", self.insumos),
+            ("Recetas", self.recetas),
+            ("Productos finales", self.productos_finales),
+            ("Clientes", self.clientes),
+            ("Compras", self.compras),
+            ("Gastos", self.gastos),
+            ("Efectivo", self.efectivo),
+            ("Ventas", self.ventas),
+        ]
+
+        self.conn = get_connection()
+        if not self.conn:
+            raise ConnectionError("No hay conexión a BD")
+
+        try:
+            if self.args.limpiar:
+                self.limpiar()
+            elif not self.vacia():
+                raise RuntimeError("La BD ya tiene datos: usa --limpiar para reemplazarlos")
+
+            for nombre, paso in pasos:
+                start = time.perf_counter()
+                paso()
+                print(f"✓ {nombre:<18} {time.perf_counter() - start:>8.1f}s")
+        finally:
+            close_connection(self.conn)
+
+
+# ============================================
+# CLI
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera un dataset sintético de gran volumen")
+    parser.add_argument("--engine", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--sqlite-path", default=os.path.join("datasets", "dataset.sqlite3"))
+    parser.add_argument(
+        "--mysql-database",
+        help="BD MySQL destino (OBLIGATORIA para mysql: se escriben datos)"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (determinista)")
+    parser.add_argument("--anios", type=float, default=3, help="Años de historia")
+    parser.add_argument("--hasta", help="Último día YYYY-MM-DD (por defecto hoy; fíjalo para reproducir)")
+    parser.add_argument("--insumos", type=int, default=3000)
+    parser.add_argument("--subproductos", type=int, default=400)
+    parser.add_argument("--productos-finales", type=int, default=300)
+    parser.add_argument("--clientes", type=int, default=5000)
+    parser.add_argument("--compras", type=int, default=50_000)
+    parser.add_argument("--gastos", type=int, default=20_000)
+    parser.add_argument("--ventas", type=int, default=1_000_000)
+    parser.add_argument("--lote", type=int, default=5000, help="Filas por executemany")
+    parser.add_argument("--limpiar", action="store_true", help="Borra los datos existentes")
+    args = parser.parse_args()
+
+    warm_cache.enabled = False
+
+    if args.engine == "mysql":
+        if not args.mysql_database:
+            parser.error("--mysql-database es obligatorio con --engine mysql")
+        cfg = dict(get_db_config())
+        cfg["database"] = args.mysql_database
+        engine = MySQLEngine(cfg)
+    else:
+        engine = SQLiteEngine(args.sqlite_path)
+
+    print(f"🗄️ Motor: {engine.describe()} (seed {args.seed})")
+    DatabaseManager.set_engine(engine)
+
+    try:
+        if not DatabaseManager.initialize_database():
+            print("❌ No se pudo crear el esquema")
+            return 1
+
+        start = time.perf_counter()
+        generador = GeneradorDataset(args)
+        generador.ejecutar()
+    except Exception as e:
+        print(f"❌ Error generando dataset: {e}")
+        return 1
+    finally:
+        DatabaseManager.set_engine(None)
+
+    print(f"\n📊 Filas insertadas en {time.perf_counter() - start:.1f}s:")
+    for tabla, n in generador.filas.items():
+        print(f"   {tabla:<30}{n:>12,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# scripts/import_compras.py - Importa un lote de compras (factura) desde CSV o JSON
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+from Core.Backends.compras_backend import ComprasBackend
+from Core.Backends.costos_backend import propagador_costos
+from Core.Common.logger import setup_logger
+
+logger = setup_logger("scripts.import_compras")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Importa compras por lote",
+        epilog=(
+            "Columnas granel: producto,cantidad,unidad,precio_compra | "
+            "paquetes: producto,cantidad_paq,precio_paq,peso_paq,unidad_peso "
+            "(proveedor y tipo opcionales por línea)"
+        )
+    )
+    parser.add_argument("archivo", help="Archivo .csv o .json")
+    parser.add_argument("--proveedor", help="Proveedor para las líneas que no lo indiquen")
+    parser.add_argument("--dry-run", action="store_true", help="Sólo validar, no escribir")
+    parser.add_argument(
+        "--sin-validar-fondos", action="store_true",
+        help="Omitir el chequeo de dinero físico"
+    )
+    args = parser.parse_args()
+
+    try:
+        lineas, proveedor = leer_lote(args.archivo)
+    except (OSError, ValueError) as e:
+        print(f"❌ No se pudo leer el archivo: {e}")
+        return 1
+
+    backend = ComprasBackend()
+    proveedor = args.proveedor or proveedor
+
+    if args.dry_run:
+        validas, errores = backend.validar_lote(lineas, proveedor)
+        print(f"\n🔎 {len(validas)} líneas válidas, {len(errores)} con errores")
+        for error in errores:
+            print(f"   ❌ {error}")
+        return 1 if errores else 0
+
+    try:
+        resumen = backend.importar_compras_lote(
+            lineas, proveedor, validar_fondos=not args.sin_validar_fondos
+        )
+    except ValueError as e:
+        print(f"\n{e}")
+        return 1
+
+    print("\n✅ Lote importado:")
+    print(f"   Líneas: {resumen['lineas']}")
+    print(f"   Productos: {resumen['productos']}")
+    print(f"   Total: ${resumen['total']:.2f}")
+    print(f"   Tiempo: {resumen['segundos'] * 1000:.1f}ms "
+          f"({resumen['lineas_por_segundo']:.0f} líneas/s)")
+    if resumen["alerta"] == "WARNING":
+        print("   ⚠️ Dinero físico bajo tras este lote")
+
+    # Los costos de recetas se recalculan en segundo plano
+    propagador_costos.esperar()
+    return 0
+
+
+def leer_lote(path: str):
+    """
+    Lee un lote desde CSV o JSON.
+
+    JSON acepta una lista de líneas o {"proveedor": ..., "lineas": [...]}.
+
+    Returns:
+        (líneas, proveedor del archivo o None)
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return list(data.get("lineas") or []), data.get("proveedor")
+        if isinstance(data, list):
+            return data, None
+        raise ValueError("JSON debe ser una lista o un objeto con 'lineas'")
+
+    if ext == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return [
+                {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+                for row in csv.DictReader(f)
+            ], None
+
+    raise ValueError(f"Formato no soportado: {ext or '(sin extensión)'}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,629 @@
+#!/usr/bin/env python3
+# scripts/load_test.py - Carga concurrente multi-terminal contra los backends reales
+
+"""
+Simula varias terminales trabajando a la vez sobre la misma BD. Cada
+worker (hilo o proceso) ejecuta una mezcla configurable de operaciones
+reales de los backends:
+
+    venta       VentasBackend.crear_venta_multiple
+    compra      ComprasBackend.save_purchase (granel)
+    produccion  ProduccionBackend.crear_produccion_run
+    consumo     InventarioBackend.consumir_stock
+    lectura     resúmenes de inventario, contabilidad y productos finales
+
+Al terminar reporta throughput, percentiles de latencia por operación,
+deadlocks / esperas de lock y concilia el stock final:
+
+- stock final vs stock inicial + ledger  → actualizaciones perdidas
+- stock final vs stock inicial + operaciones exitosas del cliente
+  → consumos que quedaron sin operación que los explique
+- filas nuevas de ventas/compras/producciones vs operaciones exitosas
+
+Uso:
+    python -m scripts.load_test --workers 8 --duracion 30
+    python -m scripts.load_test --engine mysql --mysql-database economia_bench \\
+        --workers 16 --modo procesos --mezcla "venta=50,compra=10,lectura=40"
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from Core.Common.config import get_db_config
+from Core.Common.database import DatabaseManager, get_connection, close_connection
+from Core.Common.logger import setup_logger
+from Core.Common.units import convert_to_base
+from Core.Common.warm_cache import warm_cache
+from Core.Database.engines import MySQLEngine, SQLiteEngine
+
+logger = setup_logger("scripts.load_test")
+
+OPERACIONES = ("venta", "compra", "produccion", "consumo", "lectura")
+MEZCLA_DEFAULT = "venta=40,compra=15,produccion=10,consumo=15,lectura=20"
+RESULTADOS = ("ok", "rechazo", "deadlock", "lock_wait", "error")
+
+# Códigos de error de MySQL/MariaDB
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_LOCK_DEADLOCK = 1213
+
+# Compra fija por operación (en unidad base del insumo)
+COMPRA_CANTIDAD = 500
+COMPRA_PRECIO = 0.01
+
+TOLERANCIA = 1e-6
+
+
+# ============================================
+# PLAN
+# ============================================
+
+@dataclass
+class Plan:
+    """Lo que necesita cada worker (se serializa a los procesos)"""
+
+    mezcla: Dict[str, int]
+    operaciones: Optional[int]
+    duracion: Optional[float]
+    seed: int
+    insumos: List[Dict] = field(default_factory=list)
+    subproductos: List[int] = field(default_factory=list)
+    productos_finales: List[Dict] = field(default_factory=list)
+    clientes: List[int] = field(default_factory=list)
+
+
+def parse_mezcla(spec: str) -> Dict[str, int]:
+    """
+    Parsea "venta=40,compra=15,..." (pesos relativos).
+
+    Raises:
+        ValueError: Si hay operaciones desconocidas o ningún peso positivo
+    """
+    mezcla = {}
+    for parte in spec.split(","):
+        if not parte.strip():
+            continue
+        nombre, _, peso = parte.partition("=")
+        nombre = nombre.strip()
+        if nombre not in OPERACIONES:
+            raise ValueError(f"Operación desconocida '{nombre}' (válidas: {', '.join(OPERACIONES)})")
+        mezcla[nombre] = int(peso or 1)
+
+    mezcla = {k: v for k, v in mezcla.items() if v > 0}
+    if not mezcla:
+        raise ValueError("La mezcla no tiene operaciones")
+    return mezcla
+
+
+def cargar_plan(args, mezcla: Dict[str, int]) -> Plan:
+    """
+    Conjunto caliente: los primeros --productos subproductos y productos
+    finales, y los insumos de esas recetas (compras, consumos y
+    producciones compiten por las mismas filas de inventario).
+    """
+    conn = get_connection()
+    if not conn:
+        raise ConnectionError("No hay conexión a BD")
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT id FROM subproductos ORDER BY id LIMIT %s", (args.productos,))
+            subproductos = [r["id"] for r in cursor.fetchall() or []]
+
+            insumos = []
+            if subproductos:
+                marcas = ", ".join(["%s"] * len(subproductos))
+                cursor.execute(
+                    f"""SELECT DISTINCT i.producto, i.unidad_base
+                        FROM subproducto_ingredientes si
+                        JOIN inventario i ON i.producto = si.producto_ingrediente
+                        WHERE si.subproducto_id IN ({marcas})
+                        ORDER BY i.producto""",
+                    tuple(subproductos)
+                )
+                insumos = cursor.fetchall() or []
+            if not insumos:
+                cursor.execute(
+                    "SELECT producto, unidad_base FROM inventario ORDER BY id LIMIT %s",
+                    (args.productos,)
+                )
+                insumos = cursor.fetchall() or []
+
+            cursor.execute(
+                "SELECT id, precio_venta FROM productos_finales ORDER BY id LIMIT %s",
+                (args.productos,)
+            )
+            productos_finales = [
+                {"id": r["id"], "precio": float(r["precio_venta"] or 1)}
+                for r in cursor.fetchall() or []
+            ]
+            cursor.execute("SELECT id FROM clientes WHERE active = 1 ORDER BY id LIMIT 50")
+            clientes = [r["id"] for r in cursor.fetchall() or []]
+    finally:
+        close_connection(conn)
+
+    requeridos = {
+        "venta": productos_finales and clientes,
+        "compra": insumos,
+        "produccion": subproductos,
+        "consumo": insumos,
+    }
+    faltan = [op for op, hay in requeridos.items() if op in mezcla and not hay]
+    if faltan:
+        raise RuntimeError(
+            f"El dataset no tiene datos para: {', '.join(faltan)} (ver scripts/generate_dataset.py)"
+        )
+
+    return Plan(
+        mezcla=mezcla,
+        operaciones=args.operaciones,
+        duracion=None if args.operaciones else args.duracion,
+        seed=args.seed,
+        insumos=[{"producto": r["producto"], "unidad": r["unidad_base"]} for r in insumos],
+        subproductos=subproductos,
+        productos_finales=productos_finales,
+        clientes=clientes,
+    )
+
+
+# ============================================
+# WORKER
+# ============================================
+
+def _clasificar(e: BaseException) -> str:
+    """Resultado de una operación fallida (sigue la cadena de excepciones)"""
+    actual, vistos = e, 0
+    while actual is not None and vistos < 10:
+        codigo = actual.args[0] if actual.args and isinstance(actual.args[0], int) else None
+        texto = str(actual).lower()
+        if codigo == ER_LOCK_DEADLOCK or "deadlock" in texto:
+            return "deadlock"
+        if codigo == ER_LOCK_WAIT_TIMEOUT or "lock wait timeout" in texto or "database is locked" in texto:
+            return "lock_wait"
+        actual = actual.__cause__ or actual.__context__
+        vistos += 1
+    return "rechazo" if isinstance(e, ValueError) else "error"
+
+
+class Terminal:
+    """Una terminal: sus backends, su generador aleatorio y sus resultados"""
+
+    def __init__(self, plan: Plan, indice: int):
+        from Core.Backends.compras_backend import ComprasBackend
+        from Core.Backends.contabilidad_backend import ContabilidadBackend
+        from Core.Backends.inventario_backend import InventarioBackend
+        from Core.Backends.produccion_backend import ProduccionBackend
+        from Core.Backends.ventas_backend import VentasBackend
+
+        self.plan = plan
+        self.indice = indice
+        self.rng = random.Random(plan.seed * 1000 + indice)
+
+        self.ventas = VentasBackend()
+        self.compras = ComprasBackend()
+        self.inventario = InventarioBackend()
+        self.produccion = ProduccionBackend()
+        self.contabilidad = ContabilidadBackend()
+
+        self.latencias: Dict[str, List[int]] = defaultdict(list)
+        self.resultados: Dict[str, Counter] = defaultdict(Counter)
+        # Cambio de stock esperado por las operaciones exitosas (unidad base)
+        self.deltas: Dict[str, float] = defaultdict(float)
+        self.errores: List[str] = []
+
+        self._ops = list(plan.mezcla)
+        self._pesos = [plan.mezcla[op] for op in self._ops]
+        self._lecturas = [
+            self.inventario.get_inventario_para_resumen,
+            self.contabilidad.obtener_resumen_general,
+            self.produccion.get_productos_finales_info,
+        ]
+
+    # ---------- operaciones (retornan {producto: delta}) ----------
+
+    def venta(self) -> Dict[str, float]:
+        items = [
+            {"product_id": pf["id"], "quantity": self.rng.randint(1, 3), "unit_price": pf["precio"]}
+            for pf in self.rng.sample(
+                self.plan.productos_finales, min(len(self.plan.productos_finales), self.rng.randint(1, 3))
+            )
+        ]
+        self.ventas.crear_venta_multiple(self.rng.choice(self.plan.clientes), items)
+        return {}
+
+    def compra(self) -> Dict[str, float]:
+        insumo = self.rng.choice(self.plan.insumos)
+        self.compras.save_purchase(
+            "granel", insumo["producto"], f"Terminal {self.indice:02d}",
+            cantidad=COMPRA_CANTIDAD, unidad=insumo["unidad"], precio_compra=COMPRA_PRECIO
+        )
+        return {insumo["producto"]: convert_to_base(COMPRA_CANTIDAD, insumo["unidad"])[0]}
+
+    def produccion_run(self) -> Dict[str, float]:
+        subproducto_id = self.rng.choice(self.plan.subproductos)
+        ingredientes = self.produccion.get_subproducto_ingredientes(subproducto_id)
+        self.produccion.crear_produccion_run(subproducto_id, self.rng.randint(1, 20))
+
+        deltas: Dict[str, float] = defaultdict(float)
+        for ing in ingredientes:
+            cantidad, _ = convert_to_base(float(ing["cantidad_usada"]), ing["unidad_usada"])
+            deltas[ing["producto_ingrediente"]] -= cantidad or 0
+        return deltas
+
+    def consumo(self) -> Dict[str, float]:
+        insumo = self.rng.choice(self.plan.insumos)
+        cantidad = self.rng.randint(1, 10)
+        self.inventario.consumir_stock(insumo["producto"], cantidad, insumo["unidad"])
+        return {insumo["producto"]: -convert_to_base(cantidad, insumo["unidad"])[0]}
+
+    def lectura(self) -> Dict[str, float]:
+        self.rng.choice(self._lecturas)()
+        return {}
+
+    # ---------- bucle ----------
+
+    def ejecutar(self, esperar_inicio: Callable[[], None]) -> Dict:
+        metodos = {
+            "venta": self.venta, "compra": self.compra, "produccion": self.produccion_run,
+            "consumo": self.consumo, "lectura": self.lectura,
+        }
+        esperar_inicio()
+
+        fin = time.perf_counter() + self.plan.duracion if self.plan.duracion else None
+        hechas = 0
+        while (fin is None and hechas < self.plan.operaciones) or (fin is not None and time.perf_counter() < fin):
+            op = self.rng.choices(self._ops, self._pesos)[0]
+            start = time.perf_counter_ns()
+            try:
+                deltas = metodos[op]()
+                resultado = "ok"
+            except Exception as e:
+                deltas = {}
+                resultado = _clasificar(e)
+                if resultado == "error" and len(self.errores) < 20:
+                    self.errores.append(f"{op}: {e}")
+            self.latencias[op].append(time.perf_counter_ns() - start)
+            self.resultados[op][resultado] += 1
+            for producto, delta in deltas.items():
+                self.deltas[producto] += delta
+            hechas += 1
+
+        return {
+            "latencias": dict(self.latencias),
+            "resultados": {op: dict(c) for op, c in self.resultados.items()},
+            "deltas": dict(self.deltas),
+            "errores": self.errores,
+        }
+
+
+def _crear_engine(spec: Tuple[str, object]):
+    motor, destino = spec
+    return MySQLEngine(destino) if motor == "mysql" else SQLiteEngine(destino)
+
+
+def _proceso(spec, plan: Plan, indice: int, barrera, cola):
+    """Punto de entrada de cada proceso (spawn: configura su propio motor)"""
+    warm_cache.enabled = False
+    DatabaseManager.set_engine(_crear_engine(spec))
+    try:
+        cola.put(Terminal(plan, indice).ejecutar(barrera.wait))
+    except Exception as e:
+        cola.put({"fatal": f"worker {indice}: {e}"})
+    finally:
+        DatabaseManager.set_engine(None)
+
+
+def correr_hilos(plan: Plan, workers: int) -> List[Dict]:
+    barrera = threading.Barrier(workers)
+    terminales = [Terminal(plan, i) for i in range(workers)]
+    salidas: List[Optional[Dict]] = [None] * workers
+
+    def _correr(i: int):
+        salidas[i] = terminales[i].ejecutar(barrera.wait)
+
+    threads = [threading.Thread(target=_correr, args=(i,)) for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return [s for s in salidas if s is not None]
+
+
+def correr_procesos(plan: Plan, workers: int, spec) -> List[Dict]:
+    ctx = multiprocessing.get_context("spawn")
+    barrera = ctx.Barrier(workers)
+    cola = ctx.Queue()
+    procesos = [
+        ctx.Process(target=_proceso, args=(spec, plan, i, barrera, cola), daemon=True)
+        for i in range(workers)
+    ]
+    for p in procesos:
+        p.start()
+
+    # Vaciar la cola antes del join (un resultado grande bloquea la salida del hijo)
+    salidas = [cola.get() for _ in procesos]
+    for p in procesos:
+        p.join()
+
+    fatales = [s["fatal"] for s in salidas if "fatal" in s]
+    for fatal in fatales:
+        print(f"❌ {fatal}")
+    return [s for s in salidas if "fatal" not in s]
+
+
+# ============================================
+# CONCILIACIÓN
+# ============================================
+
+_CONTEOS = {
+    "venta": "ventas_cabecera",
+    "compra": "compras",
+    "produccion": "subproducto_producciones",
+}
+
+
+def foto(productos: List[str]) -> Dict:
+    """Stock de los productos, último movimiento del ledger y filas por tabla"""
+    conn = get_connection()
+    if not conn:
+        raise ConnectionError("No hay conexión a BD")
+
+    try:
+        with conn.cursor() as cursor:
+            marcas = ", ".join(["%s"] * len(productos))
+            cursor.execute(
+                f"SELECT producto, cantidad_stock FROM inventario WHERE producto IN ({marcas})",
+                tuple(productos)
+            )
+            stock = {r["producto"]: float(r["cantidad_stock"] or 0) for r in cursor.fetchall() or []}
+            cursor.execute("SELECT COALESCE(MAX(id), 0) AS id FROM inventario_movimientos")
+            ultimo = int(cursor.fetchone()["id"])
+            filas = {}
+            for op, tabla in _CONTEOS.items():
+                cursor.execute(f"SELECT COUNT(*) AS total FROM {tabla}")
+                filas[op] = int(cursor.fetchone()["total"])
+        return {"stock": stock, "ultimo_movimiento": ultimo, "filas": filas}
+    finally:
+        close_connection(conn)
+
+
+def _ledger_desde(productos: List[str], movimiento_id: int) -> Dict[str, float]:
+    conn = get_connection()
+    if not conn:
+        raise ConnectionError("No hay conexión a BD")
+
+    try:
+        with conn.cursor() as cursor:
+            marcas = ", ".join(["%s"] * len(productos))
+            cursor.execute(
+                f"""SELECT producto, SUM(cantidad_base) AS delta FROM inventario_movimientos
+                    WHERE id > %s AND producto IN ({marcas}) GROUP BY producto""",
+                (movimiento_id, *productos)
+            )
+            return {r["producto"]: float(r["delta"] or 0) for r in cursor.fetchall() or []}
+    finally:
+        close_connection(conn)
+
+
+def conciliar(antes: Dict, despues: Dict, deltas: Dict[str, float],
+              resultados: Dict[str, Counter], productos: List[str]) -> List[str]:
+    """
+    Returns:
+        List[str]: Inconsistencias encontradas (vacía si todo cuadra)
+    """
+    problemas = []
+    ledger = _ledger_desde(productos, antes["ultimo_movimiento"])
+
+    for producto in productos:
+        inicial = antes["stock"].get(producto, 0.0)
+        final = despues["stock"].get(producto, 0.0)
+        tolerancia = TOLERANCIA * max(1.0, abs(inicial), abs(final))
+        segun_ledger = inicial + ledger.get(producto, 0.0)
+        segun_cliente = inicial + deltas.get(producto, 0.0)
+
+        if final < -tolerancia:
+            problemas.append(f"Stock negativo: {producto} = {final:.4f}")
+        if abs(final - segun_ledger) > tolerancia:
+            problemas.append(
+                f"Actualización perdida: {producto} stock {final:.4f}, ledger dice {segun_ledger:.4f}"
+            )
+        elif abs(final - segun_cliente) > tolerancia:
+            problemas.append(
+                f"Movimientos sin operación exitosa: {producto} stock {final:.4f}, "
+                f"operaciones dicen {segun_cliente:.4f} (¿producción fallida a medias?)"
+            )
+
+    for op in _CONTEOS:
+        nuevas = despues["filas"][op] - antes["filas"][op]
+        exitosas = resultados.get(op, Counter())["ok"]
+        if nuevas != exitosas:
+            problemas.append(f"{_CONTEOS[op]}: {nuevas} filas nuevas para {exitosas} operaciones '{op}' ok")
+
+    return problemas
+
+
+# ============================================
+# REPORTE
+# ============================================
+
+def _percentil(ordenadas: List[int], q: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * q / 100))] / 1e6
+
+
+def resumir(salidas: List[Dict], elapsed: float) -> Dict:
+    latencias: Dict[str, List[int]] = defaultdict(list)
+    resultados: Dict[str, Counter] = defaultdict(Counter)
+    deltas: Dict[str, float] = defaultdict(float)
+    errores: List[str] = []
+
+    for salida in salidas:
+        for op, muestras in salida["latencias"].items():
+            latencias[op].extend(muestras)
+        for op, conteo in salida["resultados"].items():
+            resultados[op].update(conteo)
+        for producto, delta in salida["deltas"].items():
+            deltas[producto] += delta
+        errores.extend(salida["errores"])
+
+    operaciones = {}
+    for op in OPERACIONES:
+        if op not in latencias:
+            continue
+        ordenadas = sorted(latencias[op])
+        operaciones[op] = {
+            "n": len(ordenadas),
+            **{r: resultados[op][r] for r in RESULTADOS},
+            "p50_ms": _percentil(ordenadas, 50),
+            "p95_ms": _percentil(ordenadas, 95),
+            "p99_ms": _percentil(ordenadas, 99),
+            "max_ms": ordenadas[-1] / 1e6,
+        }
+
+    total = sum(o["n"] for o in operaciones.values())
+    return {
+        "segundos": elapsed,
+        "operaciones": total,
+        "ops_s": total / elapsed if elapsed else 0.0,
+        "ok_s": sum(o["ok"] for o in operaciones.values()) / elapsed if elapsed else 0.0,
+        "por_operacion": operaciones,
+        "deltas": dict(deltas),
+        "resultados": resultados,
+        "errores": errores,
+    }
+
+
+def imprimir(resumen: Dict):
+    print(f"\n⏱️ {resumen['operaciones']} operaciones en {resumen['segundos']:.2f}s "
+          f"({resumen['ops_s']:.0f} ops/s, {resumen['ok_s']:.0f} ok/s)\n")
+    print(f"   {'operación':<12}{'n':>7}{'ok':>7}{'rech.':>7}{'dlock':>7}{'lock':>7}{'error':>7}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for op, r in resumen["por_operacion"].items():
+        print(f"   {op:<12}{r['n']:>7}{r['ok']:>7}{r['rechazo']:>7}{r['deadlock']:>7}"
+              f"{r['lock_wait']:>7}{r['error']:>7}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}")
+
+    deadlocks = sum(r["deadlock"] for r in resumen["por_operacion"].values())
+    esperas = sum(r["lock_wait"] for r in resumen["por_operacion"].values())
+    print(f"\n🔒 Deadlocks: {deadlocks} · Esperas de lock agotadas: {esperas}")
+
+    for error in resumen["errores"][:10]:
+        print(f"   ❌ {error}")
+
+
+# ============================================
+# CLI
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga concurrente multi-terminal")
+    parser.add_argument("--engine", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument(
+        "--mysql-database",
+        help="BD MySQL de pruebas con datos (OBLIGATORIA para mysql: se escriben datos)"
+    )
+    parser.add_argument(
+        "--dataset",
+        help="SQLite con datos a copiar (por defecto el dataset 'chico' de benchmarks)"
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Terminales concurrentes")
+    parser.add_argument("--modo", choices=("hilos", "procesos"), default="hilos")
+    parser.add_argument("--duracion", type=float, default=10, help="Segundos de carga")
+    parser.add_argument("--operaciones", type=int, help="Operaciones por worker (en vez de --duracion)")
+    parser.add_argument("--mezcla", default=MEZCLA_DEFAULT, help="Pesos por operación")
+    parser.add_argument("--productos", type=int, default=5, help="Tamaño del conjunto caliente")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--salida", help="Guarda el resumen en JSON")
+    args = parser.parse_args()
+
+    try:
+        mezcla = parse_mezcla(args.mezcla)
+    except ValueError as e:
+        parser.error(str(e))
+
+    warm_cache.enabled = False
+    carpeta = None
+
+    if args.engine == "mysql":
+        if not args.mysql_database:
+            parser.error("--mysql-database es obligatorio con --engine mysql")
+        cfg = dict(get_db_config())
+        cfg["database"] = args.mysql_database
+        spec = ("mysql", cfg)
+    else:
+        if args.dataset:
+            origen = args.dataset
+        else:
+            from benchmarks.runner import dataset
+            origen = dataset("chico", args.seed)
+        carpeta = tempfile.mkdtemp(prefix="carga_")
+        copia = os.path.join(carpeta, "carga.sqlite3")
+        shutil.copyfile(origen, copia)
+        spec = ("sqlite", copia)
+
+    engine = _crear_engine(spec)
+    print(f"🗄️ Motor: {engine.describe()} · {args.workers} {args.modo} · mezcla {mezcla}")
+    DatabaseManager.set_engine(engine)
+
+    try:
+        if not DatabaseManager.initialize_database():
+            print("❌ No se pudo crear el esquema")
+            return 1
+
+        plan = cargar_plan(args, mezcla)
+        productos = [i["producto"] for i in plan.insumos]
+        antes = foto(productos)
+
+        start = time.perf_counter()
+        if args.modo == "procesos":
+            salidas = correr_procesos(plan, args.workers, spec)
+        else:
+            salidas = correr_hilos(plan, args.workers)
+        resumen = resumir(salidas, time.perf_counter() - start)
+
+        despues = foto(productos)
+        problemas = conciliar(antes, despues, resumen["deltas"], resumen["resultados"], productos)
+    except Exception as e:
+        print(f"❌ Error en la prueba de carga: {e}")
+        return 1
+    finally:
+        DatabaseManager.set_engine(None)
+        if carpeta:
+            shutil.rmtree(carpeta, ignore_errors=True)
+
+    imprimir(resumen)
+
+    print(f"\n🧮 Conciliación de {len(productos)} insumos:")
+    for problema in problemas:
+        print(f"   ❌ {problema}")
+    if not problemas:
+        print("   ✅ Stock y filas cuadran con las operaciones realizadas")
+
+    if args.salida:
+        os.makedirs(os.path.dirname(args.salida) or ".", exist_ok=True)
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "engine": args.engine, "workers": args.workers, "modo": args.modo,
+                    "mezcla": mezcla, "problemas": problemas,
+                    **{k: resumen[k] for k in ("segundos", "operaciones", "ops_s", "ok_s", "por_operacion")},
+                },
+                f, indent=2, ensure_ascii=False
+            )
+        print(f"💾 Resumen: {args.salida}")
+
+    if len(salidas) < args.workers:
+        return 1
+    return 1 if problemas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,7 +6,7 @@ from Core.Common.database import get_connection
 from Core.Database.manager import DatabaseMigrationManager
 from Core.Common.logger import setup_logger
 
-logger = setup_logger()
+logger = setup_logger("scripts.migrations")
 
 
 def main():
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# scripts/rebuild_inventario.py - Reconstruye el inventario desde el historial
+
+import argparse
+import json
+import sys
+
+from Core.Backends.costos_backend import propagador_costos
+from Core.Backends.reconstruccion_backend import ReconstruccionBackend
+from Core.Common.logger import setup_logger
+
+logger = setup_logger("scripts.rebuild_inventario")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recalcula stock y costo promedio desde compras, gastos, producciones e intercambios"
+    )
+    parser.add_argument(
+        "--aplicar", action="store_true",
+        help="Escribir la instantánea corregida (por defecto sólo reporta)"
+    )
+    parser.add_argument(
+        "--tolerancia", type=float, default=1e-4,
+        help="Diferencia mínima para reportar un producto"
+    )
+    parser.add_argument("--json", dest="json_path", help="Guardar el reporte en JSON")
+    parser.add_argument("--limite", type=int, default=50, help="Filas a mostrar")
+    args = parser.parse_args()
+
+    backend = ReconstruccionBackend()
+
+    try:
+        reporte = backend.comparar(tolerancia=args.tolerancia)
+    except Exception as e:
+        print(f"❌ Error reconstruyendo inventario: {e}")
+        return 1
+
+    print_report(reporte, args.limite)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 Reporte guardado en {args.json_path}")
+
+    if args.aplicar:
+        corregidos = backend.aplicar(reporte)
+        # Los costos de recetas se recalculan en segundo plano
+        propagador_costos.esperar()
+        print(f"\n✅ {corregidos} productos corregidos")
+
+    return 0
+
+
+def print_report(reporte: dict, limite: int):
+    total = reporte["movimientos"]
+    calculo = reporte["segundos_calculo"]
+
+    print("\n📊 Reconstrucción de inventario:")
+    print(f"   Movimientos: {total} ({reporte['productos']} productos)")
+    print(f"   Lectura: {reporte['segundos_lectura']:.2f}s | Cálculo: {calculo:.2f}s"
+          + (f" ({total / calculo:,.0f} movimientos/s)" if calculo > 0 else ""))
+
+    if reporte["descartados"]:
+        print(f"   ⚠️ {reporte['descartados']} movimientos con unidad desconocida")
+
+    if reporte["costo_ambiguo"]:
+        print(f"   ℹ️ {len(reporte['costo_ambiguo'])} productos con entradas y salidas en el mismo "
+              f"segundo: su costo no se compara ni se corrige (sólo el stock)")
+
+    if reporte["sin_historial"]:
+        print(f"   ℹ️ {len(reporte['sin_historial'])} productos sin historial (no se tocan), "
+              f"p. ej. cargados antes del ledger")
+
+    diferencias = reporte["diferencias"]
+    if not diferencias:
+        print("\n✅ Inventario consistente con el historial")
+        return
+
+    print(f"\n⚠️ {len(diferencias)} productos desfasados:")
+    print(f"   {'Producto':<30}{'Stock actual':>16}{'Reconstruido':>16}"
+          f"{'Costo actual':>14}{'Reconstruido':>14}")
+
+    for d in diferencias[:limite]:
+        stock_actual = "—" if d["stock_actual"] is None else f"{d['stock_actual']:.4f}"
+        costo_actual = "—" if d["costo_actual"] is None else f"{d['costo_actual']:.4f}"
+        costo = "empate" if d["costo_ambiguo"] else f"{d['costo_reconstruido']:.4f}"
+        aviso = " ⚠️" if d["salidas_sin_stock"] else ""
+        print(f"   {d['producto'][:29]:<30}{stock_actual:>16}{d['stock_reconstruido']:>16.4f}"
+              f"{costo_actual:>14}{costo:>14}{aviso}")
+
+    if len(diferencias) > limite:
+        print(f"   ... y {len(diferencias) - limite} más")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# scripts/replay_workload.py - Reproduce una carga grabada y compara latencias
+
+"""
+Reproduce un journal de Core.Common.workload_recorder contra el snapshot
+tomado al iniciar la grabación y compara, método por método, la latencia
+original con la de esta versión del código.
+
+- --velocidad 1 respeta los tiempos originales, 10 los acelera 10×,
+  0 encadena las llamadas sin esperar
+- El snapshot se copia a una carpeta temporal: la grabación no se altera
+- Con MySQL, restaurar antes el dump tomado al grabar en --mysql-database
+
+Uso:
+    python -m scripts.replay_workload workloads/20250301_090000 --velocidad 0
+    python -m scripts.replay_workload workloads/20250301_090000 --engine mysql \\
+        --mysql-database economia_replay --velocidad 5 --salida replay.json
+"""
+
+import argparse
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from Core.Common.config import get_db_config
+from Core.Common.database import DatabaseManager
+from Core.Common.logger import setup_logger
+from Core.Common.warm_cache import warm_cache
+from Core.Common.workload_recorder import SNAPSHOT, decodificar, leer_journal
+from Core.Database.engines import MySQLEngine, SQLiteEngine
+
+logger = setup_logger("scripts.replay_workload")
+
+
+# ============================================
+# REPRODUCCIÓN
+# ============================================
+
+class Reproductor:
+    """Ejecuta las llamadas del journal y mide cada una"""
+
+    def __init__(self, velocidad: float, filtro: Optional[str] = None):
+        self.velocidad = velocidad
+        self.filtro = filtro
+        self._instancias: Dict[str, object] = {}
+        # método → {"original": [ms], "replay": [ms], "divergencias": n}
+        self.metodos: Dict[str, Dict] = defaultdict(
+            lambda: {"original": [], "replay": [], "divergencias": 0}
+        )
+        self.omitidas = 0
+        self.retraso_max = 0.0
+
+    def _metodo(self, ruta: str):
+        """'modulo:Clase.metodo' → método ligado a una instancia compartida"""
+        modulo, _, calificado = ruta.partition(":")
+        clase, _, nombre = calificado.rpartition(".")
+        clave = f"{modulo}:{clase}"
+        if clave not in self._instancias:
+            cls = getattr(importlib.import_module(modulo), clase)
+            self._instancias[clave] = cls()
+        return getattr(self._instancias[clave], nombre)
+
+    def ejecutar(self, llamadas) -> float:
+        """
+        Returns:
+            float: Segundos de reproducción
+        """
+        inicio = time.perf_counter()
+        for llamada in llamadas:
+            ruta = llamada["m"]
+            if (self.filtro and self.filtro not in ruta) or "x" in llamada:
+                self.omitidas += 1
+                continue
+
+            if self.velocidad > 0:
+                objetivo = inicio + llamada["t"] / self.velocidad
+                espera = objetivo - time.perf_counter()
+                if espera > 0:
+                    time.sleep(espera)
+                else:
+                    self.retraso_max = max(self.retraso_max, -espera)
+
+            try:
+                metodo = self._metodo(ruta)
+            except (ImportError, AttributeError) as e:
+                logger.warning("⚠️ Método inexistente en esta versión: %s (%s)", ruta, e)
+                self.omitidas += 1
+                continue
+
+            args = decodificar(llamada.get("a", []))
+            kwargs = decodificar(llamada.get("k", {}))
+
+            error = None
+            start = time.perf_counter_ns()
+            try:
+                metodo(*args, **kwargs)
+            except Exception as e:
+                error = type(e).__name__
+            elapsed = (time.perf_counter_ns() - start) / 1e6
+
+            nombre = ruta.partition(":")[2]
+            datos = self.metodos[nombre]
+            datos["original"].append(llamada["d"])
+            datos["replay"].append(elapsed)
+            if error != llamada.get("e"):
+                datos["divergencias"] += 1
+
+        return time.perf_counter() - inicio
+
+
+# ============================================
+# REPORTE
+# ============================================
+
+def _percentil(ordenadas: List[float], q: float) -> float:
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * q / 100))]
+
+
+def comparar(metodos: Dict[str, Dict]) -> List[Dict]:
+    """Latencias original vs reproducción por método (mayor tiempo total primero)"""
+    filas = []
+    for nombre, datos in metodos.items():
+        original, replay = sorted(datos["original"]), sorted(datos["replay"])
+        total_original, total_replay = sum(original), sum(replay)
+        filas.append({
+            "metodo": nombre,
+            "n": len(replay),
+            "original_p50_ms": _percentil(original, 50),
+            "replay_p50_ms": _percentil(replay, 50),
+            "original_p95_ms": _percentil(original, 95),
+            "replay_p95_ms": _percentil(replay, 95),
+            "original_total_ms": total_original,
+            "replay_total_ms": total_replay,
+            "cambio_pct": (total_replay / total_original - 1) * 100 if total_original else 0.0,
+            "divergencias": datos["divergencias"],
+        })
+    filas.sort(key=lambda f: f["replay_total_ms"], reverse=True)
+    return filas
+
+
+def imprimir(filas: List[Dict], segundos: float, reproductor: Reproductor):
+    print(f"\n   {'método':<52}{'n':>6}{'p50 orig':>10}{'p50 rep':>10}"
+          f"{'p95 orig':>10}{'p95 rep':>10}{'Δ total':>9}")
+    for f in filas:
+        marca = " ⚠️" if f["divergencias"] else ""
+        print(f"   {f['metodo']:<52}{f['n']:>6}{f['original_p50_ms']:>10.2f}{f['replay_p50_ms']:>10.2f}"
+              f"{f['original_p95_ms']:>10.2f}{f['replay_p95_ms']:>10.2f}{f['cambio_pct']:>+8.0f}%{marca}")
+
+    original = sum(f["original_total_ms"] for f in filas)
+    replay = sum(f["replay_total_ms"] for f in filas)
+    llamadas = sum(f["n"] for f in filas)
+    divergencias = sum(f["divergencias"] for f in filas)
+
+    print(f"\n⏱️ {llamadas} llamadas reproducidas en {segundos:.1f}s")
+    print(f"   Tiempo en backends: {original / 1000:.2f}s original → {replay / 1000:.2f}s reproducción")
+    if reproductor.omitidas:
+        print(f"   Omitidas (filtro, no serializables o inexistentes): {reproductor.omitidas}")
+    if reproductor.velocidad > 0 and reproductor.retraso_max > 0.05:
+        print(f"   ⚠️ La reproducción llegó a ir {reproductor.retraso_max:.2f}s atrasada")
+    if divergencias:
+        print(f"   ⚠️ {divergencias} llamadas terminaron distinto que en la grabación "
+              f"(¿snapshot distinto al del inicio?)")
+
+
+# ============================================
+# CLI
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduce una carga grabada")
+    parser.add_argument("grabacion", help="Carpeta de la grabación (o el journal .jsonl.gz)")
+    parser.add_argument("--velocidad", type=float, default=1.0,
+                        help="1 = tiempos originales, N = N× más rápido, 0 = sin esperas")
+    parser.add_argument("--engine", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--sqlite-path", help="BD de partida (por defecto el snapshot de la grabación)")
+    parser.add_argument(
+        "--mysql-database",
+        help="BD MySQL restaurada desde el dump de la grabación (OBLIGATORIA para mysql)"
+    )
+    parser.add_argument("--filtro", help="Sólo métodos cuyo nombre contenga el texto")
+    parser.add_argument("--salida", help="Guarda la comparación en JSON")
+    args = parser.parse_args()
+
+    if args.velocidad < 0:
+        parser.error("--velocidad no puede ser negativa")
+
+    try:
+        encabezado, llamadas = leer_journal(args.grabacion)
+    except OSError as e:
+        print(f"❌ No se pudo abrir el journal: {e}")
+        return 1
+
+    warm_cache.enabled = False
+    carpeta = None
+
+    if args.engine == "mysql":
+        if not args.mysql_database:
+            parser.error("--mysql-database es obligatorio con --engine mysql")
+        cfg = dict(get_db_config())
+        cfg["database"] = args.mysql_database
+        engine = MySQLEngine(cfg)
+    else:
+        origen = args.sqlite_path
+        if not origen and encabezado.get("snapshot") and os.path.isdir(args.grabacion):
+            origen = os.path.join(args.grabacion, encabezado["snapshot"])
+        if not origen or not os.path.exists(origen):
+            parser.error(f"La grabación no tiene {SNAPSHOT}: indica --sqlite-path")
+        carpeta = tempfile.mkdtemp(prefix="replay_")
+        copia = os.path.join(carpeta, "replay.sqlite3")
+        shutil.copyfile(origen, copia)
+        engine = SQLiteEngine(copia)
+
+    print(f"🎬 Grabación del {encabezado.get('inicio')} ({encabezado.get('engine')})")
+    print(f"🗄️ Reproduciendo sobre {engine.describe()} · velocidad "
+          f"{'sin esperas' if args.velocidad == 0 else f'{args.velocidad:g}×'}")
+    DatabaseManager.set_engine(engine)
+
+    reproductor = Reproductor(args.velocidad, args.filtro)
+    try:
+        # Migraciones pendientes: el snapshot puede ser de una versión anterior
+        if not DatabaseManager.initialize_database():
+            print("❌ No se pudo preparar el esquema")
+            return 1
+        segundos = reproductor.ejecutar(llamadas)
+    except KeyboardInterrupt:
+        print("\n⏹️ Reproducción interrumpida")
+        segundos = 0.0
+    finally:
+        DatabaseManager.set_engine(None)
+        if carpeta:
+            shutil.rmtree(carpeta, ignore_errors=True)
+
+    filas = comparar(reproductor.metodos)
+    if not filas:
+        print("⚠️ El journal no tiene llamadas reproducibles")
+        return 1
+    imprimir(filas, segundos, reproductor)
+
+    if args.salida:
+        os.makedirs(os.path.dirname(args.salida) or ".", exist_ok=True)
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(
+                {"grabacion": encabezado, "velocidad": args.velocidad, "metodos": filas},
+                f, indent=2, ensure_ascii=False
+            )
+        print(f"💾 Comparación: {args.salida}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# scripts/startup_report.py - Resume los arranques registrados en STARTUP_LOG
+
+"""
+Lee las líneas JSON que Core.Common.startup_timeline agrega en cada
+arranque y muestra la mediana por etapa y p50/p95 del tiempo hasta
+interactivo contra el objetivo (exit 1 si la mediana lo supera).
+
+Uso:
+    python -m scripts.startup_report
+    python -m scripts.startup_report --ultimos 20 --objetivo 1500
+"""
+
+import argparse
+import json
+import statistics
+import sys
+from collections import defaultdict
+
+from Core.Common.constants import STARTUP_LOG, STARTUP_TARGET_MS
+
+
+def _percentil(ordenados, q: float) -> float:
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * q / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumen de tiempos de arranque")
+    parser.add_argument("--archivo", default=STARTUP_LOG)
+    parser.add_argument("--ultimos", type=int, default=50, help="Arranques a considerar")
+    parser.add_argument("--objetivo", type=int, help="ms (por defecto STARTUP_TARGET_MS)")
+    args = parser.parse_args()
+
+    try:
+        with open(args.archivo, encoding="utf-8") as f:
+            arranques = [json.loads(linea) for linea in f if linea.strip()][-args.ultimos:]
+    except OSError as e:
+        print(f"❌ No se pudo leer {args.archivo}: {e}")
+        return 1
+
+    if not arranques:
+        print("⚠️ No hay arranques registrados")
+        return 1
+
+    objetivo = args.objetivo or arranques[-1].get("objetivo_ms") or STARTUP_TARGET_MS
+
+    por_etapa = defaultdict(list)
+    for arranque in arranques:
+        for etapa in arranque["etapas"]:
+            por_etapa[etapa["etapa"]].append(etapa["ms"])
+
+    print(f"⏱️ {len(arranques)} arranques ({arranques[0]['at']} → {arranques[-1]['at']})\n")
+    print(f"   {'etapa':<28}{'mediana ms':>12}{'máx ms':>10}")
+    for nombre, muestras in por_etapa.items():
+        print(f"   {nombre:<28}{statistics.median(muestras):>12.1f}{max(muestras):>10.1f}")
+
+    paint = sorted(a["primer_paint_ms"] for a in arranques if a.get("primer_paint_ms") is not None)
+    interactivo = sorted(a["interactivo_ms"] for a in arranques)
+    if paint:
+        print(f"\n🖼️ Primer paint: p50 {_percentil(paint, 50):.0f}ms · p95 {_percentil(paint, 95):.0f}ms")
+    p50 = _percentil(interactivo, 50)
+    print(f"🚀 Interactivo:  p50 {p50:.0f}ms · p95 {_percentil(interactivo, 95):.0f}ms "
+          f"(objetivo {objetivo}ms)")
+
+    if p50 > objetivo:
+        print("❌ La mediana supera el objetivo")
+        return 1
+    print("✅ Dentro del objetivo")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# scripts/stress_stock.py - Prueba de concurrencia de stock (sin actualizaciones perdidas)
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from Core.Common.config import get_db_config
+from Core.Common.database import DatabaseManager, get_connection, close_connection
+from Core.Common.logger import setup_logger
+from Core.Common.warm_cache import warm_cache
+from Core.Database.engines import MySQLEngine, SQLiteEngine
+
+logger = setup_logger("scripts.stress_stock")
+
+PRODUCTO = "stress_harina"
+
+# Costo por gramo del stock inicial
+COSTO_GRAMO = 0.01
+
+
+def costo_compra(hilo: int, operacion: int) -> float:
+    """
+    Costo por gramo de cada compra de la fase 2 (1 a 97, distinto por hilo
+    y operación): una actualización perdida del promedio se nota en el costo
+    final, no sólo en el stock.
+    """
+    return 1.0 + (hilo * 31 + operacion * 7) % 97
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test de consumo/compra concurrente")
+    parser.add_argument("--engine", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument(
+        "--mysql-database",
+        help="BD MySQL de pruebas (OBLIGATORIA para mysql: se escriben datos)"
+    )
+    parser.add_argument("--hilos", type=int, default=8, help="Hilos concurrentes")
+    parser.add_argument("--operaciones", type=int, default=100, help="Operaciones por hilo")
+    args = parser.parse_args()
+
+    warm_cache.enabled = False
+
+    if args.engine == "mysql":
+        if not args.mysql_database:
+            parser.error("--mysql-database es obligatorio con --engine mysql")
+        cfg = dict(get_db_config())
+        cfg["database"] = args.mysql_database
+        engine = MySQLEngine(cfg)
+    else:
+        engine = SQLiteEngine(os.path.join(tempfile.mkdtemp(prefix="stress_"), "stress.sqlite3"))
+
+    print(f"🗄️ Motor: {engine.describe()}")
+    DatabaseManager.set_engine(engine)
+
+    try:
+        if not DatabaseManager.initialize_database():
+            print("❌ No se pudo crear el esquema")
+            return 1
+        ok = run_stress(args.hilos, args.operaciones)
+    finally:
+        _limpiar()
+        DatabaseManager.set_engine(None)
+
+    return 0 if ok else 1
+
+
+def run_stress(hilos: int, operaciones: int) -> bool:
+    """
+    Fase 1: consumos concurrentes que superan el stock disponible.
+    Fase 2: compras concurrentes a costos distintos; el promedio final debe
+    ser Σprecio/Σcantidad (incluido el stock que quedó de la fase 1).
+
+    Returns:
+        True si no hubo actualizaciones perdidas ni stock negativo
+    """
+    from Core.Backends.inventario_backend import InventarioBackend
+
+    inv = InventarioBackend()
+    _limpiar()
+
+    # Stock para la mitad de los consumos (100 g cada uno)
+    consumo_g = 100
+    stock_inicial = hilos * operaciones * consumo_g // 2
+    inv.actualizar_stock_desde_compra(PRODUCTO, stock_inicial, "g", stock_inicial * COSTO_GRAMO)
+
+    # ---------- Fase 1: consumo ----------
+    exitos, rechazos, errores = _en_paralelo(
+        hilos, operaciones, lambda hilo, i: inv.consumir_stock(PRODUCTO, consumo_g, "g")
+    )
+    stock, costo = _leer_producto()
+    esperado = stock_inicial - len(exitos) * consumo_g
+
+    print(f"\n📉 Consumo: {len(exitos)} ok, {rechazos} sin stock, {errores} errores")
+    print(f"   Stock final: {stock:.4f} g (esperado {esperado:.4f} g)")
+    ok_consumo = abs(stock - esperado) < 1e-6 and stock >= 0 and errores == 0
+
+    # ---------- Fase 2: compras ----------
+    compra_g = 1000
+    exitos, rechazos, errores = _en_paralelo(
+        hilos, operaciones,
+        lambda hilo, i: inv.actualizar_stock_desde_compra(
+            PRODUCTO, 1, "kg", compra_g * costo_compra(hilo, i)
+        )
+    )
+    stock_compra, costo_compra_final = _leer_producto()
+    esperado = stock + len(exitos) * compra_g
+    precio_total = stock * costo + sum(compra_g * costo_compra(h, i) for h, i in exitos)
+    costo_esperado = precio_total / esperado if esperado else 0.0
+
+    print(f"\n📈 Compras: {len(exitos)} ok, {errores} errores")
+    print(f"   Stock final: {stock_compra:.4f} g (esperado {esperado:.4f} g)")
+    print(f"   Costo promedio: {costo_compra_final:.6f} (esperado {costo_esperado:.6f})")
+    # Tolerancia relativa: MySQL redondea el promedio a 4 decimales en cada compra
+    ok_compra = (
+        abs(stock_compra - esperado) < 1e-6
+        and abs(costo_compra_final - costo_esperado) <= 1e-4 * costo_esperado
+        and errores == 0
+    )
+
+    ok = ok_consumo and ok_compra
+    print(f"\n{'✅ Sin actualizaciones perdidas' if ok else '❌ Inconsistencia detectada'}")
+    return ok
+
+
+def _en_paralelo(hilos: int, operaciones: int, operacion):
+    """
+    Ejecuta operacion(hilo, i) en varios hilos y cuenta resultados.
+
+    Returns:
+        (exitos, rechazos, errores): exitos es la lista de (hilo, i) que
+        terminaron bien
+    """
+    contadores = {"rechazo": 0, "error": 0}
+    exitos = []
+    lock = threading.Lock()
+    barrera = threading.Barrier(hilos)
+
+    def _worker(hilo: int):
+        barrera.wait()
+        for i in range(operaciones):
+            try:
+                operacion(hilo, i)
+                resultado = "ok"
+            except ValueError:
+                resultado = "rechazo"
+            except Exception as e:
+                logger.error(f"❌ Error en worker: {e}")
+                resultado = "error"
+            with lock:
+                if resultado == "ok":
+                    exitos.append((hilo, i))
+                else:
+                    contadores[resultado] += 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=_worker, args=(h,)) for h in range(hilos)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    total = hilos * operaciones
+    print(f"⏱️ {total} operaciones en {elapsed:.2f}s ({total / elapsed:.0f} ops/s)")
+    return exitos, contadores["rechazo"], contadores["error"]
+
+
+def _leer_producto():
+    conn = get_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT cantidad_stock, costo_promedio_ponderado FROM inventario WHERE producto = %s",
+                (PRODUCTO,)
+            )
+            row = cursor.fetchone() or {}
+        return float(row.get("cantidad_stock") or 0), float(row.get("costo_promedio_ponderado") or 0)
+    finally:
+        close_connection(conn)
+
+
+def _limpiar():
+    conn = get_connection()
+    if not conn:
+        return
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("DELETE FROM inventario WHERE producto = %s", (PRODUCTO,))
+        conn.commit()
+    finally:
+        close_connection(conn)
+
+
+if __name__ == "__main__":
+    sys.exit(main())